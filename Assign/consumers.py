@@ -1,15 +1,28 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from .models import AssignQuiz, AssignParticipant, AssignQuestion, AssignAnswer
+from games_hub.guard import GuardMixin
+from games_hub.logs import bind_log_context
+from games_hub.metrics import MetricsMixin
+from games_hub.permutations import discard_room, shuffle_order, to_original
+from games_hub.presence import PresenceMixin
+from games_hub.profiling import ProfilingMixin
+from games_hub.replay import ResumableRoomMixin
+from games_hub.tokens import participant_lookup
+from games_hub.wire import BinaryProtocolMixin
 from games_hub.models import HubGameStep
 
+logger = logging.getLogger(__name__)
 
-class AssignConsumer(AsyncWebsocketConsumer):
+
+class AssignConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, ResumableRoomMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_code = self.scope['url_route']['kwargs']['room_code']
         self.room_group_name = f'assign_{self.room_code}'
+        bind_log_context(room=self.room_code)
 
         # Join room group
         await self.channel_layer.group_add(
@@ -38,7 +51,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get('type')
             
-            print("Assign Consumer: ", message_type)
+            logger.debug('Received %s', message_type)
             if message_type == 'admin_start_quiz':
                 await self.handle_admin_start_quiz(text_data_json)
             elif message_type == 'admin_send_question':
@@ -67,8 +80,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
             await self.start_quiz_db(quiz.id)
             
             # Broadcast to all participants
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_started',
                     'message': 'Drag & Drop Quiz has started!'
@@ -119,8 +131,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
         effective_time_limit = custom_time_limit if custom_time_limit is not None else question.time_limit
         
         # Broadcast new question to all participants
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_started',
                 'question': {
@@ -141,8 +152,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
         if quiz:
             await self.clear_current_question(quiz.id)
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'question_ended',
                     'message': 'Question time is up!'
@@ -157,8 +167,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
             # Collect final scores
             final_scores = await self.get_final_scores()
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_ended',
                     'message': 'Drag & Drop Quiz has ended. Thank you for participating!',
@@ -203,8 +212,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
             }))
 
             # Broadcast to admin dashboard (live answers)
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_answered',
                     'answer': {
@@ -225,11 +233,16 @@ class AssignConsumer(AsyncWebsocketConsumer):
         participant = await self.get_participant_by_name(participant_name, hub_session)
         
         if participant:
-            await self.mark_participant_active(participant['id'])
-            
+            self.join_presence(AssignParticipant, participant['id'], self.room_group_name, hub_session)
+
+        # Reconnects replay missed room events from memory when possible; the
+        # socket joins presence first so a resumed player still counts
+        if await self.resume(data):
+            return
+
+        if participant:
             # Broadcast to admin
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_joined',
                     'participant': {
@@ -332,7 +345,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
     def get_participant_by_name(self, participant_name, hub_session):
         try:
             quiz = AssignQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session))
             return {
                 'id': participant.id,
                 'name': participant.name,
@@ -385,6 +398,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
             quiz.save()
         except AssignQuiz.DoesNotExist:
             pass
+        discard_room(self.room_code)
 
     @database_sync_to_async
     def update_quiz_question(self, quiz, question):
@@ -417,7 +431,7 @@ class AssignConsumer(AsyncWebsocketConsumer):
     def save_participant_answer(self, participant_name, hub_session, user_matches, time_taken):
         try:
             quiz = AssignQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session))
             
             if not quiz.current_question:
                 return None
@@ -432,16 +446,16 @@ class AssignConsumer(AsyncWebsocketConsumer):
             if existing_answer:
                 return None  # Already answered
             
-            # Get the same randomized data using the same room code
-            randomized_data = quiz.current_question.get_randomized_items(room_code=self.room_code)
-            position_to_original = randomized_data['position_to_original']
+            # The room's cached order maps shuffled positions back
+            question = quiz.current_question
+            order = shuffle_order('assign', question.id, self.room_code, len(question.right_items))
             
             # Convert user matches from shuffled positions to original positions
             original_user_matches = {}
             for left_idx, shuffled_right_pos in user_matches.items():
-                original_right_idx = position_to_original.get(int(shuffled_right_pos))
-                if original_right_idx is not None:
-                    original_user_matches[left_idx] = original_right_idx
+                original = to_original(order, [shuffled_right_pos])
+                if original:
+                    original_user_matches[left_idx] = original[0]
             
             # Create new answer with original indices
             answer = AssignAnswer.objects.create(
@@ -461,16 +475,6 @@ class AssignConsumer(AsyncWebsocketConsumer):
             
         except (AssignQuiz.DoesNotExist, AssignParticipant.DoesNotExist):
             return None
-
-    @database_sync_to_async
-    def mark_participant_active(self, participant_id):
-        try:
-            participant = AssignParticipant.objects.get(id=participant_id)
-            participant.is_active = True
-            participant.last_activity = timezone.now()
-            participant.save()
-        except AssignParticipant.DoesNotExist:
-            pass
     
     @database_sync_to_async
     def get_final_scores(self):
@@ -1,5 +1,6 @@
 from django.db import models
 from games_website.models import SyncBase
+from games_hub.permutations import shuffle_order
 from django.contrib.auth.models import User
 from django.utils import timezone
 import random
@@ -127,43 +128,17 @@ class AssignQuestion(SyncBase):
         }
     
     def get_randomized_items(self, room_code=None):
-        """Return items with right items shuffled for gameplay"""
-        import random
-        
-        # Create a deterministic seed based on question ID and room code
-        seed_string = f"{self.id}_{room_code or 'default'}"
-        seed = abs(hash(seed_string)) % (2**32)
-        
-        # Save the current random state
-        random_state = random.getstate()
-        
-        try:
-            # Set our deterministic seed
-            random.seed(seed)
-            
-            # Create a copy of right items with original indices
-            right_items_with_indices = [(i, item) for i, item in enumerate(self.right_items)]
-            
-            # Shuffle the right items deterministically
-            shuffled_right_items = right_items_with_indices.copy()
-            random.shuffle(shuffled_right_items)
-            
-            # Create mapping from shuffled position to original index
-            position_to_original = {}
-            shuffled_right_items_formatted = []
-            
-            for new_pos, (original_idx, text) in enumerate(shuffled_right_items):
-                position_to_original[new_pos] = original_idx
-                shuffled_right_items_formatted.append({'id': new_pos, 'text': text})
-            
-        finally:
-            # Always restore the previous random state
-            random.setstate(random_state)
-        
+        """Return items with right items shuffled for gameplay
+
+        The order is the same for the whole room, in every worker (see
+        games_hub/permutations.py).
+        """
+        order = shuffle_order('assign', self.id, room_code, len(self.right_items))
+
         return {
             'left_items': [{'id': i, 'text': item} for i, item in enumerate(self.left_items)],
-            'right_items': shuffled_right_items_formatted,
-            'position_to_original': position_to_original  # Maps shuffled position to original index
+            'right_items': [{'id': pos, 'text': self.right_items[idx]} for pos, idx in enumerate(order)],
+            'position_to_original': dict(enumerate(order))  # Maps shuffled position to original index
         }
     
     def __str__(self):
@@ -179,6 +154,9 @@ class AssignParticipant(SyncBase):
     questions_answered = models.IntegerField(default=0)
     last_activity = models.DateTimeField(auto_now=True)
     hub_session_code = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    hub_participant = models.ForeignKey(
+        'games_hub.HubParticipant', null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+    )
     
     class Meta:
         unique_together = ['quiz', 'name', 'hub_session_code']
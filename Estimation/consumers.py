@@ -1,15 +1,27 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from .models import EstimationQuiz, EstimationParticipant, EstimationQuestion, EstimationAnswer
+from games_hub.guard import GuardMixin
+from games_hub.logs import bind_log_context
+from games_hub.metrics import MetricsMixin
+from games_hub.presence import PresenceMixin
+from games_hub.profiling import ProfilingMixin
+from games_hub.replay import ResumableRoomMixin
+from games_hub.tokens import participant_lookup
+from games_hub.wire import BinaryProtocolMixin
 from games_hub.models import HubGameStep
 
+logger = logging.getLogger(__name__)
 
-class EstimationConsumer(AsyncWebsocketConsumer):
+
+class EstimationConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, ResumableRoomMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_code = self.scope['url_route']['kwargs']['room_code']
         self.room_group_name = f'estimation_{self.room_code}'
+        bind_log_context(room=self.room_code)
 
         # Join room group
         await self.channel_layer.group_add(
@@ -38,7 +50,7 @@ class EstimationConsumer(AsyncWebsocketConsumer):
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get('type')
             
-            print("Estimation Consumer: ", message_type)
+            logger.debug('Received %s', message_type)
             if message_type == 'admin_start_quiz':
                 await self.handle_admin_start_quiz(text_data_json)
             elif message_type == 'admin_send_question':
@@ -67,8 +79,7 @@ class EstimationConsumer(AsyncWebsocketConsumer):
             await self.start_quiz_db(quiz.id)
             
             # Broadcast to all participants
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_started',
                     'message': 'Estimation Quiz has started!'
@@ -119,8 +130,7 @@ class EstimationConsumer(AsyncWebsocketConsumer):
         effective_time_limit = custom_time_limit if custom_time_limit is not None else 90
         
         # Broadcast new question to all participants
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_started',
                 'question': {
@@ -156,7 +166,7 @@ class EstimationConsumer(AsyncWebsocketConsumer):
             }
             if rank_results is not None:
                 payload['rank_results'] = rank_results
-            await self.channel_layer.group_send(self.room_group_name, payload)
+            await self.room_send(payload)
 
     async def handle_admin_end_quiz(self, data):
         """Handle admin ending the quiz"""
@@ -166,8 +176,7 @@ class EstimationConsumer(AsyncWebsocketConsumer):
             # Collect final scores
             final_scores = await self.get_final_scores()
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_ended',
                     'message': 'Estimation Quiz has ended. Thank you for participating!',
@@ -212,8 +221,7 @@ class EstimationConsumer(AsyncWebsocketConsumer):
             }))
 
             # Broadcast to admin dashboard (live answers)
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_answered',
                     'answer': {
@@ -236,11 +244,16 @@ class EstimationConsumer(AsyncWebsocketConsumer):
         participant = await self.get_participant_by_name(participant_name, hub_session)
         
         if participant:
-            await self.mark_participant_active(participant['id'])
-            
+            self.join_presence(EstimationParticipant, participant['id'], self.room_group_name, hub_session)
+
+        # Reconnects replay missed room events from memory when possible; the
+        # socket joins presence first so a resumed player still counts
+        if await self.resume(data):
+            return
+
+        if participant:
             # Broadcast to admin
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_joined',
                     'participant': {
@@ -344,7 +357,7 @@ class EstimationConsumer(AsyncWebsocketConsumer):
     def get_participant_by_name(self, participant_name, hub_session):
         try:
             quiz = EstimationQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session))
             return {
                 'id': participant.id,
                 'name': participant.name,
@@ -464,7 +477,7 @@ class EstimationConsumer(AsyncWebsocketConsumer):
     def save_participant_answer(self, participant_name, hub_session_code, user_answer, time_taken):
         try:            # Collect final scores
             quiz = EstimationQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
             
             if not quiz.current_question:
                 return None
@@ -506,16 +519,6 @@ class EstimationConsumer(AsyncWebsocketConsumer):
         except (EstimationQuiz.DoesNotExist, EstimationParticipant.DoesNotExist):
             return None
 
-    @database_sync_to_async
-    def mark_participant_active(self, participant_id):
-        try:
-            participant = EstimationParticipant.objects.get(id=participant_id)
-            participant.is_active = True
-            participant.last_activity = timezone.now()
-            participant.save()
-        except EstimationParticipant.DoesNotExist:
-            pass
-
     @database_sync_to_async
     def get_final_scores(self):
         try:
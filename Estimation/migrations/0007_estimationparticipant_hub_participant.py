@@ -0,0 +1,26 @@
+# Generated by Django 5.2.11 on 2026-10-19 08:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("Estimation", "0006_estimationbundle"),
+        ("games_hub", "0006_hubsession_scoreboard_visible"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="estimationparticipant",
+            name="hub_participant",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="games_hub.hubparticipant",
+            ),
+        ),
+    ]
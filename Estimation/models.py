@@ -273,6 +273,9 @@ class EstimationParticipant(SyncBase):
     questions_answered = models.IntegerField(default=0)
     last_activity = models.DateTimeField(auto_now=True)
     hub_session_code = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    hub_participant = models.ForeignKey(
+        'games_hub.HubParticipant', null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+    )
     
     class Meta:
         unique_together = ['quiz', 'name', 'hub_session_code']
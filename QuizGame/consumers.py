@@ -1,15 +1,27 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from .models import Quiz, QuizParticipant, QuizQuestion, QuizAnswer
+from games_hub.guard import GuardMixin
+from games_hub.logs import bind_log_context
+from games_hub.metrics import MetricsMixin
+from games_hub.presence import PresenceMixin, presence
+from games_hub.profiling import ProfilingMixin
+from games_hub.replay import ResumableRoomMixin
+from games_hub.tokens import participant_lookup
+from games_hub.wire import BinaryProtocolMixin
 from games_hub.models import HubGameStep, HubSession
 
+logger = logging.getLogger(__name__)
 
-class QuizConsumer(AsyncWebsocketConsumer):
+
+class QuizConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, ResumableRoomMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_code = self.scope['url_route']['kwargs']['room_code']
         self.room_group_name = f'quiz_{self.room_code}'
+        bind_log_context(room=self.room_code)
 
         # Join room group
         await self.channel_layer.group_add(
@@ -38,7 +50,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get('type')
             
-            print("Quiz Consumer: ", message_type)
+            logger.debug('Received %s', message_type)
             if message_type == 'admin_start_quiz':
                 await self.handle_admin_start_quiz(text_data_json)
             elif message_type == 'tutorial_completed':
@@ -69,8 +81,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
             show_tutorial = data.get('show_tutorial', True)
             await self.start_quiz_db(quiz.id)
 
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_started',
                     'message': 'Quiz has started!'
@@ -79,8 +90,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
 
             if show_tutorial:
                 await self.reset_tutorial_completed(quiz.id)
-                await self.channel_layer.group_send(
-                    self.room_group_name,
+                await self.room_send(
                     {
                         'type': 'tutorial_start',
                         'message': 'Tutorial gestartet'
@@ -98,8 +108,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
             return
 
         completed, total = await self.get_tutorial_progress(quiz.id, hub_session)
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'tutorial_progress',
                 'completed': completed,
@@ -151,8 +160,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
         effective_time_limit = custom_time_limit if custom_time_limit is not None else question.time_limit
 
         # Broadcast new question to all participants
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_started',
                 'question': {
@@ -187,8 +195,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
             correct_payload = await self.get_current_question_correct_payload()
             await self.clear_current_question(quiz.id)
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'question_ended',
                     'message': 'Question time is up!',
@@ -211,8 +218,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
             # Fetch final scores per participant
             final_scores = await self.get_final_scores()
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_ended',
                     'message': 'Quiz has ended. Thank you for participating!',
@@ -250,8 +256,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
             }))
 
             # Broadcast to admin dashboard (live answers)
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_answered',
                     'answer': {
@@ -276,11 +281,16 @@ class QuizConsumer(AsyncWebsocketConsumer):
         participant = await self.get_participant_by_name(participant_name, hub_session)
         
         if participant:
-            await self.mark_participant_active(participant['id'])
-            
+            self.join_presence(QuizParticipant, participant['id'], self.room_group_name, hub_session)
+
+        # Reconnects replay missed room events from memory when possible; the
+        # socket joins presence first so a resumed player still counts
+        if await self.resume(data):
+            return
+
+        if participant:
             # Broadcast to admin
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_joined',
                     'participant': {
@@ -430,7 +440,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
     def get_participant_by_name(self, participant_name, hub_session):
         try:
             quiz = Quiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session))
             return {
                 'id': participant.id,
                 'name': participant.name,
@@ -447,7 +457,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
     def mark_tutorial_completed(self, participant_name, hub_session_code):
         try:
             quiz = Quiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
             participant.tutorial_completed = True
             participant.save(update_fields=['tutorial_completed'])
         except (Quiz.DoesNotExist, QuizParticipant.DoesNotExist):
@@ -455,9 +465,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_tutorial_progress(self, quiz_id, hub_session_code):
-        qs = QuizParticipant.objects.filter(quiz_id=quiz_id, is_active=True)
-        if hub_session_code:
-            qs = qs.filter(hub_session_code=hub_session_code)
+        qs = self.present_participants(QuizParticipant.objects.filter(quiz_id=quiz_id), hub_session_code)
         total = qs.count()
         completed = qs.filter(tutorial_completed=True).count()
         return completed, total
@@ -568,6 +576,20 @@ class QuizConsumer(AsyncWebsocketConsumer):
             }
         })
 
+    def present_participants(self, participants_qs, hub_session_code):
+        """Narrow ``participants_qs`` to the players connected to this room.
+
+        Falls back to ``is_active`` while presence knows nobody here yet,
+        e.g. right after a restart.
+        """
+        present = presence.present(self.room_group_name, hub_session_code or None)
+        if present:
+            return participants_qs.filter(pk__in=present)
+        participants_qs = participants_qs.filter(is_active=True)
+        if hub_session_code:
+            participants_qs = participants_qs.filter(hub_session_code=hub_session_code)
+        return participants_qs
+
     @database_sync_to_async
     def get_answer_progress(self, hub_session_code):
         """Return (answered_count, active_participant_count) for the current question."""
@@ -575,9 +597,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
             quiz = Quiz.objects.select_related('current_question').get(room_code=self.room_code)
             if not quiz.current_question:
                 return 0, 0
-            participants_qs = quiz.participants.filter(is_active=True)
-            if hub_session_code:
-                participants_qs = participants_qs.filter(hub_session_code=hub_session_code)
+            participants_qs = self.present_participants(quiz.participants.all(), hub_session_code)
             total = participants_qs.count()
             answered = QuizAnswer.objects.filter(
                 quiz=quiz,
@@ -592,7 +612,7 @@ class QuizConsumer(AsyncWebsocketConsumer):
     def save_participant_answer(self, participant_name, hub_session_code, answer_text, time_taken):
         try:
             quiz = Quiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
             
             if not quiz.current_question:
                 return None
@@ -624,16 +644,6 @@ class QuizConsumer(AsyncWebsocketConsumer):
         except (Quiz.DoesNotExist, QuizParticipant.DoesNotExist):
             return None
 
-    @database_sync_to_async
-    def mark_participant_active(self, participant_id):
-        try:
-            participant = QuizParticipant.objects.get(id=participant_id)
-            participant.is_active = True
-            participant.last_activity = timezone.now()
-            participant.save()
-        except QuizParticipant.DoesNotExist:
-            pass
-
     @database_sync_to_async
     def get_final_scores(self):
         try:
@@ -120,6 +120,9 @@ class QuizParticipant(SyncBase):
     questions_answered = models.IntegerField(default=0)
     last_activity = models.DateTimeField(auto_now=True)
     hub_session_code = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    hub_participant = models.ForeignKey(
+        'games_hub.HubParticipant', null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+    )
     tutorial_completed = models.BooleanField(default=False)
 
     class Meta:
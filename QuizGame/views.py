@@ -5,6 +5,10 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.db.models import Avg, Count, Q
 import json
+from games_hub.enrolment import resolve_play_participant
+from games_hub.presence import present_count
+from games_hub.status import record_activity, versioned_status
+from games_hub.tokens import get_participant_or_404, issue_token
 from .models import Quiz, QuizQuestion, QuizParticipant, QuizAnswer, QuizSession
 
 
@@ -68,6 +72,7 @@ def quiz_join_view(request):
                 return JsonResponse({
                     'success': True,
                     'participant_id': existing.id,
+                    'token': issue_token(existing),
                     'quiz_status': quiz.status,
                     'rejoin': True,
                 })
@@ -101,6 +106,7 @@ def quiz_join_view(request):
             return JsonResponse({
                 'success': True,
                 'participant_id': participant.id,
+                'token': issue_token(participant),
                 'quiz_status': quiz.status,
                 'rejoin': False,
             })
@@ -208,6 +214,7 @@ def join_quiz(request):
             return JsonResponse({
                 'success': True,
                 'participant_id': existing.id,
+                'token': issue_token(existing),
                 'quiz_status': quiz.status,
                 'rejoin': True,
             })
@@ -241,6 +248,7 @@ def join_quiz(request):
         return JsonResponse({
             'success': True,
             'participant_id': participant.id,
+            'token': issue_token(participant),
             'quiz_status': quiz.status,
             'rejoin': False,
         })
@@ -261,19 +269,10 @@ def quiz_play(request, room_code, participant_name):
     """Quiz play page for participants"""
     try:
         session_code = request.GET.get('hub_session')
-        quiz = get_object_or_404(Quiz, room_code=room_code)
-        participant = get_object_or_404(
-            QuizParticipant, 
-            quiz=quiz, 
-            name=participant_name,
-            hub_session_code=session_code
+        quiz, participant = resolve_play_participant(
+            request, Quiz, QuizParticipant, room_code, participant_name
         )
         
-        # Mark participant as active
-        participant.is_active = True
-        participant.last_activity = timezone.now()
-        participant.save()
-        
         context = {
             'quiz': quiz,
             'participant': participant,
@@ -364,12 +363,7 @@ def submit_answer(request, room_code, participant_name):
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(Quiz, room_code=room_code)
-        participant = get_object_or_404(
-            QuizParticipant, 
-            quiz=quiz, 
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, QuizParticipant, quiz, participant_name)
         
         # Check if there's an active question
         if not quiz.current_question or quiz.status != 'active':
@@ -433,27 +427,22 @@ def submit_answer(request, room_code, participant_name):
         })
 
 
+@versioned_status('quiz')
 def get_quiz_status(request, room_code, participant_name):
     """Get current quiz status for participant"""
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(Quiz, room_code=room_code)
-        participant = get_object_or_404(
-            QuizParticipant, 
-            quiz=quiz, 
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, QuizParticipant, quiz, participant_name)
         
-        # Update last activity
-        participant.last_activity = timezone.now()
-        participant.save()
+        # Polls are presence heartbeats (see games_hub/presence.py)
+        record_activity(participant, f'quiz_{room_code}')
         
         status_data = {
             'quiz_status': quiz.status,
             'current_question': None,
             'participant_score': participant.total_score,
-            'participant_count': quiz.get_participant_count(),
+            'participant_count': present_count(f'quiz_{room_code}', quiz.participants),
             'questions_answered': participant.questions_answered
         }
         
@@ -506,12 +495,7 @@ def leave_quiz(request, room_code, participant_name):
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(Quiz, room_code=room_code)
-        participant = get_object_or_404(
-            QuizParticipant, 
-            quiz=quiz, 
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, QuizParticipant, quiz, participant_name)
         
         # Mark participant as inactive instead of deleting
         participant.is_active = False
@@ -17,6 +17,11 @@ urlpatterns = [
     path('games/delete/', views.delete_game_instance, name='delete_game_instance'),
     path('games/delete-all/', views.delete_all_game_instances, name='delete_all_game_instances'),
     path('sessions/clear/', views.clear_all_sessions, name='clear_sessions'),
+    path('cleanup/<str:job_id>/', views.cleanup_status, name='cleanup_status'),
+    path('profiling/', views.profiling, name='profiling'),
+    path('profiling/<int:capture_id>.<str:fmt>', views.download_profile, name='download_profile'),
+    path('export/results/', views.export_results, name='export_results'),
+    path('questions/import/', views.import_questions, name='import_questions'),
     path('sessions/end/', views.end_session, name='end_session'),
     path('sessions/delete/', views.delete_session, name='delete_session'),
     path('sessions/duplicate/', views.duplicate_session, name='duplicate_session'),
@@ -3,12 +3,13 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate, login, logout
 from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 from django.db.models import Count, Q, Avg
 from django.utils import timezone
 from django.contrib import messages
 import json
+import logging
 from QuizGame.models import Quiz, QuizQuestion, QuizParticipant, QuizAnswer, QuizSession, QuizBundle
 from sorting_ladder.models import SortingLadderGame, SortingLadderParticipant, SortingQuestion, SortingItem, SortingLadderSession, SortingBundle
 from Assign.models import AssignQuiz, AssignQuestion, AssignParticipant, AssignBundle
@@ -19,7 +20,17 @@ from clue_rush.models import ClueRushGame, ClueRushParticipant, ClueQuestion, Cl
 from who_is_that.models import WhoThatQuiz, WhoThatQuestion, WhoThatParticipant, WhoThatBundle
 from who_is_lying.models import WhoQuiz, WhoQuestion, WhoParticipant, WhoBundle
 from games_hub.models import HubSession, HubParticipant, HubGameStep
+from games_hub.profiling import profiler
+from games_hub.registry import room_group_name
+from games_hub.replay import discard_room_log
 from games_website.services import sync_all_models_to_supabase, restore_all_models_from_supabase
+from game_archive.models import GameArchive
+from game_archive.services import with_archived
+from games_website.cleanup import get_job, start_cleanup
+from games_website.export import CONTENT_TYPES as EXPORT_CONTENT_TYPES, ExportError, export_filename, iter_export, parse_bound
+from question_import.services import QuestionImportError, import_file
+
+logger = logging.getLogger(__name__)
 
 
 def is_admin(user):
@@ -198,13 +209,11 @@ def clear_all_sessions(request):
         return JsonResponse({'success': False, 'error': 'Unauthorized'}, status=403)
     
     try:
-        # Delete all quiz sessions
-        QuizSession.objects.all().delete()
-        # Delete all hub sessions
-        HubSession.objects.all().delete()
+        # Delete quiz and hub sessions in the background, chunk by chunk
+        job_id = start_cleanup('Clear all sessions', [QuizSession.objects.all(), HubSession.objects.all()])
         
-        messages.success(request, 'All sessions have been cleared successfully.')
-        return JsonResponse({'success': True})
+        messages.success(request, 'Clearing all sessions has been started.')
+        return JsonResponse({'success': True, 'job_id': job_id})
     except Exception as e:
         messages.error(request, f'Error clearing sessions: {str(e)}')
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
@@ -515,6 +524,7 @@ def end_sorting_ladder_game_by_room_code(request, room_code):
                 session.end_round()
         except (SortingLadderSession.DoesNotExist, AttributeError):
             pass
+        discard_room_log(room_group_name('sorting_ladder', quiz.room_code))
 
         return JsonResponse({'success': True})
     except Exception as e:
@@ -1409,8 +1419,11 @@ def delete_game_instance(request):
         if creator_field and not request.user.is_superuser and getattr(obj, creator_field) != request.user:
             return JsonResponse({'success': False, 'error': 'Unauthorized'}, status=403)
 
-        obj.delete()
-        return JsonResponse({'success': True})
+        job_id = start_cleanup(
+            f'Delete {game_type} #{obj.id}',
+            [model.objects.filter(id=obj.id), GameArchive.objects.filter(game_key=game_type, game_id=obj.id)],
+        )
+        return JsonResponse({'success': True, 'job_id': job_id})
     except json.JSONDecodeError:
         return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
 
@@ -1430,9 +1443,116 @@ def delete_all_game_instances(request):
         'clue_rush':      ClueRushGame,
         'sorting_ladder': SortingLadderGame,
     }
-    for model in MODEL_MAP.values():
-        model.objects.all().delete()
-    return JsonResponse({'success': True})
+    querysets = [model.objects.all() for model in MODEL_MAP.values()]
+    job_id = start_cleanup('Delete all games', querysets + [GameArchive.objects.all()])
+    return JsonResponse({'success': True, 'job_id': job_id})
+
+
+@admin_required
+def export_results(request):
+    """Stream answers or participants of all games as CSV/JSONL (optionally gzipped).
+
+    Query parameters: format, kind, session, game (repeatable), since, until, gzip.
+    """
+    fmt = request.GET.get('format', 'csv')
+    kind = request.GET.get('kind', 'answers')
+    session_code = request.GET.get('session') or None
+    compress = request.GET.get('gzip') in ('1', 'true', 'yes')
+    try:
+        blocks = iter_export(
+            fmt=fmt,
+            kind=kind,
+            session_code=session_code,
+            game_keys=request.GET.getlist('game'),
+            since=parse_bound(request.GET.get('since')),
+            until=parse_bound(request.GET.get('until'), end=True),
+            compress=compress,
+        )
+    except ExportError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    content_type = 'application/gzip' if compress else EXPORT_CONTENT_TYPES[fmt]
+    response = StreamingHttpResponse(blocks, content_type=content_type)
+    filename = export_filename(fmt, kind, session_code, compress)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@admin_required
+@require_POST
+def import_questions(request):
+    """Bulk import questions from an uploaded CSV/JSON/JSONL file or zip archive.
+
+    Form fields: file, game_type, bundle (optional), dry_run, skip_invalid.
+    Returns the import report with per-row errors.
+    """
+    upload = request.FILES.get('file')
+    game_type = request.POST.get('game_type', '')
+    if not upload or not game_type:
+        return JsonResponse({'success': False, 'error': 'file and game_type are required'}, status=400)
+
+    try:
+        report = import_file(
+            upload.file,
+            upload.name,
+            game_type,
+            request.user,
+            bundle=(request.POST.get('bundle') or '').strip() or None,
+            dry_run=request.POST.get('dry_run') in ('1', 'true', 'on'),
+            skip_invalid=request.POST.get('skip_invalid') in ('1', 'true', 'on'),
+        )
+    except QuestionImportError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    status = 200 if report.ok or request.POST.get('skip_invalid') in ('1', 'true', 'on') else 400
+    return JsonResponse({'success': status == 200, 'report': report.as_dict()}, status=status)
+
+
+@admin_required
+def profiling(request):
+    """Arm request/message profiling and list the captured profiles."""
+    if request.method == 'POST':
+        if request.POST.get('action') == 'clear':
+            profiler.clear()
+        else:
+            try:
+                limit = int(request.POST.get('limit') or 10)
+            except ValueError:
+                limit = 10
+            profiler.configure(
+                enabled=request.POST.get('action') == 'arm',
+                rooms=(request.POST.get('rooms') or '').split(','),
+                message_types=(request.POST.get('message_types') or '').split(','),
+                limit=limit,
+            )
+        return redirect('admin_dashboard:profiling')
+    return render(request, 'admin_dashboard/profiling.html', {
+        'profiler': profiler,
+        'captures': list(profiler.captures),
+    })
+
+
+@admin_required
+def download_profile(request, capture_id, fmt):
+    """A captured profile as .pstats (cProfile) or speedscope JSON (samples)."""
+    capture = profiler.get(capture_id)
+    if capture is None or fmt not in ('pstats', 'speedscope.json'):
+        raise Http404('Unknown profile')
+    if fmt == 'pstats':
+        response = HttpResponse(capture.stats, content_type='application/octet-stream')
+    else:
+        response = HttpResponse(json.dumps(capture.speedscope()), content_type='application/json')
+    response['Content-Disposition'] = f'attachment; filename="profile-{capture.id}.{fmt}"'
+    return response
+
+
+@admin_required
+def cleanup_status(request, job_id):
+    """Progress of a background cleanup started by one of the delete views."""
+    job = get_job(job_id)
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Unknown job'}, status=404)
+    return JsonResponse({'success': True, 'job': job})
 
 
 @admin_required
@@ -3569,8 +3689,8 @@ def where_game_details(request, quiz_id):
     if not request.user.is_superuser and quiz.creator != request.user:
         return redirect('admin_dashboard:where_management')
     
-    participants = quiz.participants.all().order_by('-total_score', 'name')
-    answers = WhereAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('submitted_at')
+    participants = with_archived(quiz.participants.all().order_by('-total_score', 'name'), 'where', quiz.id)
+    answers = with_archived(WhereAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('submitted_at'), 'where', quiz.id)
     
     # Calculate quiz statistics
     quiz_stats = {
@@ -4708,8 +4828,8 @@ def estimation_game_details(request, quiz_id):
     if not request.user.is_superuser and quiz.creator != request.user:
         return redirect('admin_dashboard:estimation_management')
     
-    participants = quiz.participants.all().order_by('-total_score', 'name')
-    answers = EstimationAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('submitted_at')
+    participants = with_archived(quiz.participants.all().order_by('-total_score', 'name'), 'estimation', quiz.id)
+    answers = with_archived(EstimationAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('submitted_at'), 'estimation', quiz.id)
     
     # Calculate quiz statistics
     quiz_stats = {
@@ -5396,8 +5516,8 @@ def who_game_details(request, quiz_id):
     if not request.user.is_superuser and quiz.creator != request.user:
         return redirect('admin_dashboard:who_management')
     
-    participants = quiz.participants.all().order_by('-total_score', 'name')
-    answers = WhoAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('submitted_at')
+    participants = with_archived(quiz.participants.all().order_by('-total_score', 'name'), 'who', quiz.id)
+    answers = with_archived(WhoAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('submitted_at'), 'who', quiz.id)
     
     # Calculate quiz statistics
     quiz_stats = {
@@ -6062,8 +6182,8 @@ def who_that_game_details(request, quiz_id):
     if not request.user.is_superuser and quiz.creator != request.user:
         return redirect('admin_dashboard:who_that_management')
     
-    participants = quiz.participants.all().order_by('-total_score', 'name')
-    answers = WhoThatAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('submitted_at')
+    participants = with_archived(quiz.participants.all().order_by('-total_score', 'name'), 'who_that', quiz.id)
+    answers = with_archived(WhoThatAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('submitted_at'), 'who_that', quiz.id)
     
     # Calculate quiz statistics
     quiz_stats = {
@@ -6757,8 +6877,8 @@ def blackjack_game_details(request, quiz_id):
         return redirect('admin_dashboard:blackjack_management')
     
     # Order participants by final_score (lower is better), then by name
-    participants = quiz.participants.all().order_by('final_score', 'name')
-    answers = BlackJackAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('question_number', 'submitted_at')
+    participants = with_archived(quiz.participants.all().order_by('final_score', 'name'), 'blackjack', quiz.id)
+    answers = with_archived(BlackJackAnswer.objects.filter(quiz=quiz).select_related('question', 'participant').order_by('question_number', 'submitted_at'), 'blackjack', quiz.id)
     
     # Calculate quiz statistics
     quiz_stats = {
@@ -7120,7 +7240,7 @@ def get_estimation_questions(request):
         })
         
     except Exception as e:
-        print(e)
+        logger.exception('Fetching estimation questions failed')
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -0,0 +1,279 @@
+// Assign play page (templates/assign/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    class AssignPlayer extends GamesRuntime.Player {
+        constructor() {
+            super('assign');
+            this.userMatches = {};
+
+            this.init();
+        }
+
+        handleWebSocketMessage(data) {
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+
+                case 'question_started':
+                    this.onQuestionStarted(data.question);
+                    break;
+
+                case 'question_ended':
+                    this.onQuestionEnded();
+                    break;
+
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                case 'answer_submitted':
+                    document.getElementById('correctMatches').textContent = data.correct_matches;
+                    document.getElementById('pointsEarned').textContent = data.points_earned;
+                    document.getElementById('accuracyPercent').textContent = data.accuracy + '%';
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        bindEvents() {
+            // Submit answer button
+            document.getElementById('submitAnswerBtn').addEventListener('click', () => {
+                this.submitAnswer();
+            });
+        }
+
+        onQuizStarted() {
+            this.showState('waitingQuizState');
+        }
+
+        onQuestionStarted(question) {
+            this.hasAnswered = false;
+            this.userMatches = {};
+            this.questionStartTime = Date.now();
+
+            this.loadQuestion(question);
+            this.startQuestionTimer(question.time_limit);
+            this.showState('questionState');
+        }
+
+        onQuestionEnded() {
+            clearInterval(this.questionTimer);
+            console.log("User Matches", this.userMatches);
+            if (Object.keys(this.userMatches).length > 0) {
+                // Stay on submitted state briefly, then return to waiting
+                setTimeout(() => {
+                    this.showWaitingForNextQuestion();
+                }, 1000);
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        loadQuestion(question) {
+            document.getElementById('questionText').textContent = question.question_text;
+            this.setupDragDrop(question.left_items, question.right_items);
+        }
+
+        setupDragDrop(leftItems, rightItems) {
+            const leftItemsList = document.getElementById('leftItemsList');
+            const zonesList = document.getElementById('zonesList');
+
+            // Clear previous content
+            leftItemsList.innerHTML = '';
+            zonesList.innerHTML = '';
+            // Normalize arrays: allow strings or objects
+            const normLeft = (leftItems || []).map((it, i) => (typeof it === 'string' ? { id: i, text: it } : it));
+            const normRight = (rightItems || []).map((it, i) => (typeof it === 'string' ? { id: i, text: it } : it));
+
+            // Create draggable items (from left)
+            normLeft.forEach((item, index) => {
+                const draggableDiv = document.createElement('div');
+                draggableDiv.className = 'draggable-item';
+                draggableDiv.draggable = true;
+                draggableDiv.textContent = item.text;
+                draggableDiv.dataset.leftIndex = index;
+
+                // Add drag event listeners
+                draggableDiv.addEventListener('dragstart', (e) => {
+                    e.dataTransfer.setData('text/plain', index);
+                    draggableDiv.classList.add('dragging');
+                });
+
+                draggableDiv.addEventListener('dragend', () => {
+                    draggableDiv.classList.remove('dragging');
+                });
+
+                leftItemsList.appendChild(draggableDiv);
+            });
+
+            // Create drop zones for each left item (label from right if available)
+            //const zoneCount = Math.max(normLeft.length, normRight.length);
+            const zoneCount = normRight.length
+            for (let index = 0; index < zoneCount; index++) {
+                const item = normRight[index] || { text: '' };
+                const dropZone = document.createElement('div');
+                dropZone.className = 'drop-zone';
+                dropZone.dataset.rightIndex = index;
+
+                const label = document.createElement('div');
+                label.className = 'drop-zone-label';
+                label.textContent = item.text;
+                dropZone.appendChild(label);
+
+                // Add drop event listeners
+                dropZone.addEventListener('dragover', (e) => {
+                    e.preventDefault();
+                    dropZone.classList.add('drag-over');
+                });
+
+                dropZone.addEventListener('dragleave', () => {
+                    dropZone.classList.remove('drag-over');
+                });
+
+                dropZone.addEventListener('drop', (e) => {
+                    e.preventDefault();
+                    dropZone.classList.remove('drag-over');
+
+                    const leftIndex = e.dataTransfer.getData('text/plain');
+                    this.handleDrop(leftIndex, index, dropZone, normLeft[leftIndex].text);
+                });
+
+                zonesList.appendChild(dropZone);
+            }
+
+            document.getElementById('submitAnswerBtn').disabled = true;
+        }
+
+        handleDrop(leftIndex, rightIndex, dropZone, itemText) {
+            // Remove any existing item in this drop zone
+            const existingItem = dropZone.querySelector('.dropped-item');
+            if (existingItem) {
+                // Return previous item to draggable state
+                const prevLeftIndex = existingItem.dataset.leftIndex;
+                const prevDraggable = document.querySelector(`[data-left-index="${prevLeftIndex}"]`);
+                if (prevDraggable) {
+                    prevDraggable.classList.remove('matched');
+                    prevDraggable.draggable = true;
+                }
+                existingItem.remove();
+            }
+
+            // Remove this item from any other drop zone
+            document.querySelectorAll('.dropped-item').forEach(item => {
+                if (item.dataset.leftIndex === leftIndex) {
+                    const oldDropZone = item.parentElement;
+                    oldDropZone.classList.remove('occupied');
+                    item.remove();
+                }
+            });
+
+            // Create dropped item
+            const droppedItem = document.createElement('div');
+            droppedItem.className = 'dropped-item';
+            droppedItem.textContent = itemText;
+            droppedItem.dataset.leftIndex = leftIndex;
+
+            // Add click to remove functionality
+            droppedItem.addEventListener('click', () => {
+                this.removeMatch(leftIndex, rightIndex, dropZone);
+            });
+
+            dropZone.appendChild(droppedItem);
+            dropZone.classList.add('occupied');
+
+            // Mark original item as matched
+            const draggableItem = document.querySelector(`[data-left-index="${leftIndex}"]`);
+            if (draggableItem) {
+                draggableItem.classList.add('matched');
+                draggableItem.draggable = false;
+            }
+
+            // Update user matches
+            this.userMatches[leftIndex] = rightIndex;
+
+            // Enable submit button if at least one match is made
+            document.getElementById('submitAnswerBtn').disabled = Object.keys(this.userMatches).length === 0;
+        }
+
+        removeMatch(leftIndex, rightIndex, dropZone) {
+            // Remove from user matches
+            delete this.userMatches[leftIndex];
+
+            // Remove dropped item
+            const droppedItem = dropZone.querySelector('.dropped-item');
+            if (droppedItem) {
+                droppedItem.remove();
+            }
+
+            // Remove occupied state
+            dropZone.classList.remove('occupied');
+
+            // Restore draggable item
+            const draggableItem = document.querySelector(`[data-left-index="${leftIndex}"]`);
+            if (draggableItem) {
+                draggableItem.classList.remove('matched');
+                draggableItem.draggable = true;
+            }
+
+            // Update submit button state
+            document.getElementById('submitAnswerBtn').disabled = Object.keys(this.userMatches).length === 0;
+        }
+
+        submitAnswer() {
+            if (Object.keys(this.userMatches).length === 0 || this.hasAnswered) return;
+
+            const timeTaken = (Date.now() - this.questionStartTime) / 1000;
+
+            // Disable drag-drop interface
+            document.querySelectorAll('.draggable-item').forEach(item => {
+                item.draggable = false;
+                item.style.cursor = 'default';
+            });
+
+            document.querySelectorAll('.drop-zone').forEach(zone => {
+                zone.style.pointerEvents = 'none';
+            });
+
+            // Send answer via WebSocket
+            this.websocket.send(JSON.stringify({
+                type: 'participant_submit_answer',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                user_matches: this.userMatches,
+                time_taken: timeTaken
+            }));
+
+            this.hasAnswered = true;
+
+            // Show submitted state after a brief delay
+            setTimeout(() => {
+                this.showState('answerSubmittedState');
+            }, 500);
+        }
+
+        onTimeUp() {
+            if (this.hasAnswered) return;
+
+            // Auto-submit if any matches are made, otherwise show waiting
+            if (Object.keys(this.userMatches).length > 0) {
+                this.submitAnswer();
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+    }
+
+    // Initialize Assign Player
+    const player = new AssignPlayer();
+
+    GamesRuntime.followHubSession();
+});
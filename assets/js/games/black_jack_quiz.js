@@ -0,0 +1,284 @@
+// Black Jack quiz play page (templates/black_jack_quiz/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    // BlackJack Quiz Player Class
+    class BlackJackPlayer extends GamesRuntime.Player {
+        constructor() {
+            super('blackjack');
+            this.currentPoints = GamesRuntime.page.totalPoints;
+            this.isBusted = GamesRuntime.page.isBusted;
+
+            this.init();
+        }
+
+        init() {
+            this.updatePointsDisplay();
+            super.init();
+
+            // Show busted state if already busted
+            if (this.isBusted) {
+                this.showState('bustedState');
+            }
+        }
+
+        handleWebSocketMessage(data) {
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+
+                case 'question_started':
+                    this.onQuestionStarted(data.question);
+                    break;
+
+                case 'question_ended':
+                    this.onQuestionEnded(data);
+                    break;
+
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                case 'answer_submitted':
+                    this.onAnswerSubmitted(data);
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        bindEvents() {
+            // Submit answer button
+            document.getElementById('submitAnswerBtn').addEventListener('click', () => {
+                this.submitAnswer();
+            });
+
+            // Answer input
+            const answerInput = document.getElementById('answerInput');
+            answerInput.addEventListener('input', () => {
+                const hasValue = answerInput.value.trim() !== '';
+                document.getElementById('submitAnswerBtn').disabled = !hasValue || this.hasAnswered || this.isBusted;
+            });
+
+            // Allow Enter key to submit
+            answerInput.addEventListener('keypress', (e) => {
+                if (e.key === 'Enter' && !document.getElementById('submitAnswerBtn').disabled) {
+                    this.submitAnswer();
+                }
+            });
+        }
+
+        onQuizStarted() {
+            this.showState('waitingQuizState');
+        }
+
+        onQuestionStarted(question) {
+            if (this.isBusted) return; // Don't show questions if busted
+
+            this.hasAnswered = false;
+            this.questionStartTime = Date.now();
+
+            this.loadQuestion(question);
+            this.startQuestionTimer(question.time_limit || 30);
+            this.showState('questionState');
+
+            // Update question progress
+            document.getElementById('questionProgress').textContent = `${question.question_number}/5`;
+            //document.getElementById('questionNumber').textContent = question.question_number;
+
+            // Focus on input
+            setTimeout(() => {
+                document.getElementById('answerInput').focus();
+            }, 500);
+        }
+
+        onQuestionEnded(data) {
+            clearInterval(this.questionTimer);
+
+            if (data.correct_answer && this.hasAnswered && !this.isBusted) {
+                this.showCorrectAnswer(data.correct_answer);
+            } else if (data.quiz_complete) {
+                setTimeout(() => {
+                    this.showState('quizEndedState');
+                }, 2000);
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        loadQuestion(question) {
+            document.getElementById('questionText').textContent = question.question_text;
+            document.getElementById('currentQuestionNumber').textContent = question.question_number;
+
+            // Show hint if available
+            const hintDisplay = document.getElementById('hintDisplay');
+            const hintText = document.getElementById('hintText');
+            if (question.hint_text) {
+                hintText.textContent = question.hint_text;
+                hintDisplay.style.display = 'flex';
+            } else {
+                hintDisplay.style.display = 'none';
+            }
+
+            // Reset input
+            const answerInput = document.getElementById('answerInput');
+            answerInput.value = '';
+            answerInput.disabled = this.isBusted;
+
+            // Reset submit button
+            const submitBtn = document.getElementById('submitAnswerBtn');
+            submitBtn.disabled = this.isBusted || true;
+            submitBtn.classList.remove('loading');
+        }
+
+        submitAnswer() {
+            if (this.isBusted) return;
+
+            const answerInput = document.getElementById('answerInput');
+            const userAnswer = answerInput.value.trim();
+
+            if (!userAnswer || this.hasAnswered) return;
+
+            const timeTaken = (Date.now() - this.questionStartTime) / 1000;
+
+            // Disable interface
+            answerInput.disabled = true;
+            const submitBtn = document.getElementById('submitAnswerBtn');
+            submitBtn.classList.add('loading');
+
+            // Send answer via WebSocket
+            this.websocket.send(JSON.stringify({
+                type: 'participant_submit_answer',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                user_answer: parseInt(userAnswer),
+                time_taken: timeTaken
+            }));
+
+            this.hasAnswered = true;
+
+            // Show submitted state after a brief delay
+            setTimeout(() => {
+                this.showState('answerSubmittedState');
+            }, 500);
+        }
+
+        onAnswerSubmitted(data) {
+            // Update the submitted state with actual results
+            document.getElementById('submittedAnswer').textContent = data.user_answer;
+            document.getElementById('pointsEarned').textContent = data.points_earned;
+            document.getElementById('totalPoints').textContent = data.total_points;
+
+            // Update current state
+            this.currentPoints = data.total_points;
+            this.isBusted = data.is_busted;
+
+            this.updatePointsDisplay();
+
+            // Show status if busted
+            if (data.is_busted) {
+                const statusItem = document.getElementById('statusItem');
+                const statusValue = document.getElementById('statusValue');
+                statusValue.textContent = 'BUSTED!';
+                statusItem.style.display = 'flex';
+
+                // Show busted state after delay
+                setTimeout(() => {
+                    this.showState('bustedState');
+                    document.getElementById('bustPoints').textContent = data.total_points;
+                }, 3000);
+            }
+        }
+
+        onTimeUp() {
+            if (this.hasAnswered || this.isBusted) return;
+
+            // Auto-submit if there's an answer
+            const answerInput = document.getElementById('answerInput');
+            if (answerInput.value.trim()) {
+                this.submitAnswer();
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        showCorrectAnswer(correctAnswerData) {
+            document.getElementById('correctAnswerDisplay').textContent = correctAnswerData.correct_answer;
+            document.getElementById('userAnswerDisplay').textContent = document.getElementById('submittedAnswer').textContent;
+            document.getElementById('correctAnswerComparison').textContent = correctAnswerData.correct_answer;
+
+            // Show calculation
+            const userAnswer = parseInt(document.getElementById('submittedAnswer').textContent);
+            const correctAnswer = correctAnswerData.correct_answer;
+            const calculation = `|${userAnswer} - ${correctAnswer}| = ${Math.abs(userAnswer - correctAnswer)} points`;
+            document.getElementById('calculationDisplay').textContent = calculation;
+
+            // Show explanation if available
+            if (correctAnswerData.explanation) {
+                document.getElementById('explanationText').textContent = correctAnswerData.explanation;
+                document.getElementById('explanationText').style.display = 'block';
+            }
+
+            this.showState('correctAnswerState');
+
+            // Auto-transition back to waiting after 5 seconds
+            setTimeout(() => {
+                if (this.isBusted) {
+                    this.showState('bustedState');
+                } else {
+                    this.showWaitingForNextQuestion();
+                }
+            }, 1000);
+        }
+
+        showWaitingForNextQuestion() {
+            if (this.isBusted) {
+                this.showState('bustedState');
+                return;
+            }
+
+            // Switch to a safe waiting state without destroying existing DOM nodes
+            this.showState('waitingQuestionState');
+            const waiting = document.getElementById('waitingQuestionState');
+            if (waiting) {
+                try { lucide.createIcons(); } catch (e) { /* ignore */ }
+            }
+        }
+
+        updatePointsDisplay() {
+            document.getElementById('currentPoints').textContent = this.currentPoints;
+
+            const distance = this.isBusted ? this.currentPoints - 21 : 21 - this.currentPoints;
+            document.getElementById('distanceFrom21').textContent = distance;
+
+            // Update bust warning
+            const bustWarning = document.getElementById('bustWarning');
+            if (this.currentPoints >= 18 && !this.isBusted) {
+                bustWarning.classList.add('show');
+            } else {
+                bustWarning.classList.remove('show');
+            }
+
+            // Update header avatar and status
+            const avatar = document.querySelector('.participant-avatar');
+            if (this.isBusted) {
+                avatar.classList.add('busted');
+            } else if (this.currentPoints === 21) {
+                avatar.classList.add('blackjack');
+            }
+        }
+
+    }
+
+    // Initialize BlackJack Player
+    const player = new BlackJackPlayer();
+
+    // Back to the lobby when the host ends the hub session
+    GamesRuntime.followHubSession();
+});
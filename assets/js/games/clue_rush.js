@@ -0,0 +1,266 @@
+// Clue Rush play page (templates/clue_rush/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    class QuizPlayer extends GamesRuntime.Player {
+        constructor() {
+            super('clue-rush');
+            this.timerWarning = 15;
+            this.timerDanger = 5;
+            this.selectedAnswer = null;
+
+            this.init();
+        }
+
+        showCorrectAnswer(correctAnswerData) {
+            const toText = (val) => {
+                if (val == null) return '-';
+                if (typeof val === 'object') {
+                    return val.formatted_answer || val.text || val.value || '-';
+                }
+                return String(val);
+            };
+
+            const correctText = toText(correctAnswerData);
+            const userTextEl = document.getElementById('submittedAnswerText');
+            const userAnswer = userTextEl ? userTextEl.textContent : (this.selectedAnswer || '-');
+
+            const display = document.getElementById('correctAnswerDisplay');
+            const compUser = document.getElementById('userAnswerDisplay');
+            const compCorrect = document.getElementById('correctAnswerComparison');
+            if (display) display.textContent = correctText;
+            if (compUser) compUser.textContent = userAnswer;
+            if (compCorrect) compCorrect.textContent = correctText;
+
+            this.showState('correctAnswerState');
+            setTimeout(() => {
+                this.showWaitingForNextQuestion();
+            }, 2000);
+        }
+
+        // Timers run per clue on 'clue_started'
+        resumeQuestion(question) {
+            this.loadQuestion(question);
+        }
+
+        handleWebSocketMessage(data) {
+            console.log("Data: ", data);
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+
+                case 'question_started':
+                    this.onQuestionStarted(data.question, data.question.time_limit);
+                    break;
+
+                case 'question_ended':
+                    this.onQuestionEnded(data);
+                    break;
+
+                case 'clue_started':
+                    this.showClue(data.clue);
+                    break;
+
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        bindEvents() {
+            // Submit answer button
+            document.getElementById('submitAnswerBtn').addEventListener('click', () => {
+                this.submitAnswer();
+            });
+        }
+
+        onQuizStarted() {
+            this.showState('waitingQuizState');
+        }
+
+        onQuestionStarted(question, timeLimit) {
+            this.hasAnswered = false;
+            this.selectedAnswer = null;
+            this.questionStartTime = Date.now();
+
+            this.resetClues();
+            this.loadQuestion(question);
+            this.showState('questionState');
+        }
+
+        onQuestionEnded(data) {
+            clearInterval(this.questionTimer);
+            if (data && data.correct_answer && this.hasAnswered) {
+                this.showCorrectAnswer(data.correct_answer);
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        resetClues() {
+            try {
+                const list = document.getElementById('playerCluesList');
+                if (list) list.innerHTML = '';
+                const listSubmitted = document.getElementById('playerCluesListSubmitted');
+                if (listSubmitted) listSubmitted.innerHTML = '';
+            } catch (e) { console.error(e); }
+        }
+
+        addClue(clue) {
+            try {
+                if (!clue) return;
+                const list = document.getElementById('playerCluesList');
+                const listSubmitted = document.getElementById('playerCluesListSubmitted');
+                if (!list && !listSubmitted) return;
+                if (list) {
+                    const li = document.createElement('li');
+                    li.className = 'list-group-item d-flex justify-content-between align-items-center';
+                    li.innerHTML = `<div><strong>#${clue.order}</strong> ${clue.clue_text}</div><span class="badge bg-primary">New</span>`;
+                    list.appendChild(li);
+                }
+                if (listSubmitted) {
+                    const li2 = document.createElement('li');
+                    li2.className = 'list-group-item d-flex justify-content-between align-items-center';
+                    li2.innerHTML = `<div><strong>#${clue.order}</strong> ${clue.clue_text}</div><span class="badge bg-primary">New</span>`;
+                    listSubmitted.appendChild(li2);
+                }
+            } catch (e) { console.error(e); }
+        }
+
+        showClue(clue) {
+            try {
+                // Replace any existing clue with the latest one
+                this.resetClues();
+                this.addClue(clue);
+                // Auto-hide after duration
+                const duration = parseInt(clue.duration, 10);
+                if (!isNaN(duration) && duration > 0) {
+                    clearTimeout(this._clueHideTimer);
+                    this._clueHideTimer = setTimeout(() => {
+                        this.resetClues();
+                    }, duration * 1000);
+                    // Start per-clue timer on both displays
+                    this.startClueTimer(duration);
+                }
+            } catch (e) { console.error(e); }
+        }
+
+        startClueTimer(duration) {
+            clearInterval(this.questionTimer);
+            let timeLeft = duration;
+            const timerEl = document.getElementById('playerTimeLeft');
+            const circleEl = document.getElementById('playerTimerCircle');
+            const timerElSubmitted = document.getElementById('playerTimeLeftSubmitted');
+            const circleElSubmitted = document.getElementById('playerTimerCircleSubmitted');
+
+            const updateTimer = () => {
+                const elements = [
+                    { timer: timerEl, circle: circleEl },
+                    { timer: timerElSubmitted, circle: circleElSubmitted },
+                ];
+                elements.forEach(el => {
+                    if (el.timer) el.timer.textContent = timeLeft;
+                    if (el.circle) {
+                        el.circle.classList.remove('danger', 'warning');
+                        if (timeLeft <= 5) {
+                            el.circle.classList.add('danger');
+                        } else if (timeLeft <= 15) {
+                            el.circle.classList.add('warning');
+                        }
+                    }
+                });
+            };
+
+            updateTimer();
+            this.questionTimer = setInterval(() => {
+                timeLeft--;
+                updateTimer();
+                if (timeLeft <= 0) {
+                    clearInterval(this.questionTimer);
+                }
+            }, 1000);
+        }
+
+        loadQuestion(question) {
+            document.getElementById('questionText').textContent = question.question_text;
+            const optionsContainer = document.getElementById('answerOptions');
+            optionsContainer.innerHTML = '';
+
+            const input = document.createElement('input');
+            input.type = 'text';
+            input.className = 'short-answer-input';
+            input.placeholder = 'Type your answer here...';
+            input.id = 'shortAnswerInput';
+            input.autocomplete = 'off';
+            input.addEventListener('input', () => {
+                this.selectedAnswer = input.value.trim();
+                document.getElementById('submitAnswerBtn').disabled = !this.selectedAnswer;
+            });
+            optionsContainer.appendChild(input);
+
+            // Reset submit button state until user types
+            document.getElementById('submitAnswerBtn').disabled = true;
+        }
+
+        submitAnswer() {
+            if (!this.selectedAnswer || this.hasAnswered) return;
+
+            const timeTaken = (Date.now() - this.questionStartTime) / 1000;
+
+            // Disable all options
+            document.querySelectorAll('.answer-option').forEach(option => {
+                option.classList.add('disabled');
+            });
+
+            // Disable short answer input if exists
+            const shortAnswerInput = document.getElementById('shortAnswerInput');
+            if (shortAnswerInput) {
+                shortAnswerInput.disabled = true;
+            }
+
+            // Send answer via WebSocket
+            this.websocket.send(JSON.stringify({
+                type: 'participant_submit_answer',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                answer: this.selectedAnswer,
+                time_taken: timeTaken
+            }));
+
+            this.hasAnswered = true;
+
+            // Show submitted state
+            setTimeout(() => {
+                document.getElementById('submittedAnswerText').textContent = this.selectedAnswer;
+                document.getElementById('submittedTime').textContent = timeTaken.toFixed(1);
+                this.showState('answerSubmittedState');
+            }, 500);
+        }
+
+        onTimeUp() {
+            if (this.hasAnswered) return;
+
+            // Auto-submit if an answer is selected, otherwise show time's up
+            if (this.selectedAnswer) {
+                this.submitAnswer();
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+    }
+
+    // Initialize Quiz Player
+    const player = new QuizPlayer();
+
+    // Back to the lobby when the host ends the hub session
+    GamesRuntime.followHubSession();
+});
@@ -0,0 +1,226 @@
+// Estimation play page (templates/estimation/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    class EstimationPlayer extends GamesRuntime.Player {
+        constructor() {
+            super('estimation');
+            this.currentUnit = '';
+
+            this.init();
+        }
+
+        handleWebSocketMessage(data) {
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+
+                case 'question_started':
+                    this.onQuestionStarted(data.question);
+                    break;
+
+                case 'question_ended':
+                    this.onQuestionEnded(data);
+                    break;
+
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                case 'answer_submitted':
+                    this.onAnswerSubmitted(data);
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        bindEvents() {
+            // Submit answer button
+            document.getElementById('submitAnswerBtn').addEventListener('click', () => {
+                this.submitAnswer();
+            });
+
+            // Estimate input
+            const estimateInput = document.getElementById('estimateInput');
+            estimateInput.addEventListener('input', () => {
+                const hasValue = estimateInput.value.trim() !== '';
+                document.getElementById('submitAnswerBtn').disabled = !hasValue || this.hasAnswered;
+            });
+
+            // Allow Enter key to submit
+            estimateInput.addEventListener('keypress', (e) => {
+                if (e.key === 'Enter' && !document.getElementById('submitAnswerBtn').disabled) {
+                    this.submitAnswer();
+                }
+            });
+        }
+
+        onQuizStarted() {
+            this.showState('waitingQuizState');
+        }
+
+        onQuestionStarted(question) {
+            this.hasAnswered = false;
+            this.questionStartTime = Date.now();
+            this.currentUnit = question.unit_display || '';
+
+            this.loadQuestion(question);
+            this.startQuestionTimer(question.time_limit || 90);
+            this.showState('questionState');
+
+            // Focus on input
+            setTimeout(() => {
+                document.getElementById('estimateInput').focus();
+            }, 500);
+        }
+
+        onQuestionEnded(data) {
+            clearInterval(this.questionTimer);
+
+            if (data.correct_answer && this.hasAnswered) {
+                this.showCorrectAnswer(data.correct_answer);
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        loadQuestion(question) {
+            document.getElementById('questionText').textContent = question.question_text;
+
+            // Set unit display
+            const unitDisplay = document.getElementById('unitDisplay');
+            if (question.unit_display) {
+                unitDisplay.textContent = question.unit_display;
+                unitDisplay.style.display = 'block';
+            } else {
+                unitDisplay.style.display = 'none';
+            }
+
+            // Show hint if available
+            const hintDisplay = document.getElementById('hintDisplay');
+            const hintText = document.getElementById('hintText');
+            if (question.hint_text) {
+                hintText.textContent = question.hint_text;
+                hintDisplay.style.display = 'flex';
+            } else {
+                hintDisplay.style.display = 'none';
+            }
+
+            // Reset input
+            const estimateInput = document.getElementById('estimateInput');
+            estimateInput.value = '';
+            estimateInput.disabled = false;
+
+            // Reset submit button
+            const submitBtn = document.getElementById('submitAnswerBtn');
+            submitBtn.disabled = true;
+            submitBtn.classList.remove('loading');
+
+            this.currentUnit = question.unit_display || '';
+        }
+
+        submitAnswer() {
+            const estimateInput = document.getElementById('estimateInput');
+            const userAnswer = estimateInput.value.trim();
+
+            if (!userAnswer || this.hasAnswered) return;
+
+            const timeTaken = (Date.now() - this.questionStartTime) / 1000;
+
+            // Disable interface
+            estimateInput.disabled = true;
+            const submitBtn = document.getElementById('submitAnswerBtn');
+            submitBtn.classList.add('loading');
+
+            // Send answer via WebSocket
+            this.websocket.send(JSON.stringify({
+                type: 'participant_submit_answer',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                user_answer: parseFloat(userAnswer),
+                time_taken: timeTaken
+            }));
+
+            this.hasAnswered = true;
+
+            // Show submitted state after a brief delay
+            setTimeout(() => {
+                this.showState('answerSubmittedState');
+            }, 500);
+        }
+
+        onAnswerSubmitted(data) {
+            //Convert accuracy percentage to 2 decimal places
+            data.accuracy_percentage = parseFloat(data.accuracy_percentage).toFixed(2);
+
+            // Update the submitted state with actual results
+            document.getElementById('submittedEstimate').textContent = data.user_answer + (this.currentUnit ? ' ' + this.currentUnit : '');
+            document.getElementById('pointsEarned').textContent = data.points_earned;
+            document.getElementById('accuracyPercent').textContent = data.accuracy_percentage + '%';
+        }
+
+        onTimeUp() {
+            if (this.hasAnswered) return;
+
+            // Auto-submit if there's an answer
+            const estimateInput = document.getElementById('estimateInput');
+            if (estimateInput.value.trim()) {
+                this.submitAnswer();
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        showCorrectAnswer(correctAnswerData) {
+            document.getElementById('correctAnswerDisplay').textContent = correctAnswerData.formatted_answer;
+            document.getElementById('userEstimateDisplay').textContent = document.getElementById('submittedEstimate').textContent;
+            document.getElementById('correctAnswerComparison').textContent = correctAnswerData.formatted_answer;
+
+            // Show explanation if available
+            if (correctAnswerData.explanation) {
+                document.getElementById('explanationText').textContent = correctAnswerData.explanation;
+                document.getElementById('explanationText').style.display = 'block';
+            }
+
+            // Set performance badge
+            const accuracy = parseFloat(document.getElementById('accuracyPercent').textContent);
+            const performanceBadge = document.getElementById('performanceBadge');
+            const performanceText = performanceBadge.querySelector('.performance-text');
+
+            if (accuracy >= 95) {
+                performanceBadge.className = 'performance-badge excellent';
+                performanceText.textContent = 'Excellent Estimate!';
+            } else if (accuracy >= 80) {
+                performanceBadge.className = 'performance-badge good';
+                performanceText.textContent = 'Great Estimate!';
+            } else if (accuracy >= 60) {
+                performanceBadge.className = 'performance-badge fair';
+                performanceText.textContent = 'Good Try!';
+            } else {
+                performanceBadge.className = 'performance-badge poor';
+                performanceText.textContent = 'Keep Practicing!';
+            }
+
+            this.showState('correctAnswerState');
+
+            // Auto-transition back to waiting after 1 second
+            setTimeout(() => {
+                this.showWaitingForNextQuestion();
+            }, 2000);
+        }
+
+    }
+
+    // Initialize Estimation Player
+    const player = new EstimationPlayer();
+
+    // Back to the lobby when the host ends the hub session
+    GamesRuntime.followHubSession();
+});
@@ -0,0 +1,390 @@
+// Quiz play page (templates/quiz/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    class QuizPlayer extends GamesRuntime.Player {
+        constructor() {
+            super('quiz');
+            this.timerWarning = 15;
+            this.timerDanger = 5;
+            this.selectedAnswer = null;
+
+            this.init();
+        }
+
+        handleWebSocketMessage(data) {
+            console.log("Data: ", data);
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+
+                case 'tutorial_start':
+                    tutShow();
+                    break;
+
+                case 'question_started':
+                    if (typeof tutForceClose === 'function') tutForceClose();
+                    if (data.question) {
+                        this.onQuestionStarted(data.question, data.question.time_limit);
+                    }
+                    break;
+
+                case 'answer_submitted':
+                    // Score may have changed — refresh after brief delay
+                    scheduleLeaderboardRefresh(1500);
+                    break;
+
+                case 'question_ended':
+                    this.onQuestionEnded(data);
+                    scheduleLeaderboardRefresh(1200);
+                    break;
+
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    scheduleLeaderboardRefresh(1000);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        showCorrectAnswer(correctAnswerData) {
+            const toText = (val) => {
+                if (val == null) return '-';
+                if (typeof val === 'object') {
+                    return val.formatted_answer || val.text || val.value || '-';
+                }
+                return String(val);
+            };
+
+            const correctText = toText(correctAnswerData);
+            const userTextEl = document.getElementById('submittedAnswerText');
+            const userAnswer = userTextEl ? userTextEl.textContent : (this.selectedAnswer || '-');
+
+            const display = document.getElementById('correctAnswerDisplay');
+            const compUser = document.getElementById('userAnswerDisplay');
+            const compCorrect = document.getElementById('correctAnswerComparison');
+            if (display) display.textContent = correctText;
+            if (compUser) compUser.textContent = userAnswer;
+            if (compCorrect) compCorrect.textContent = correctText;
+
+            this.showState('correctAnswerState');
+            setTimeout(() => {
+                this.showWaitingForNextQuestion();
+            }, 2000);
+        }
+
+        bindEvents() {
+            // Submit answer button
+            document.getElementById('submitAnswerBtn').addEventListener('click', () => {
+                this.submitAnswer();
+            });
+        }
+
+        onQuizStarted() {
+            // Tutorial is shown via separate 'tutorial_start' event
+            // Simply show the waiting view here (will be overlaid by the tutorial)
+            this.showState('waitingQuizState');
+        }
+
+        onQuestionStarted(question, timeLimit) {
+            this.hasAnswered = false;
+            this.selectedAnswer = null;
+            this.questionStartTime = Date.now();
+
+            this.loadQuestion(question);
+            this.startQuestionTimer(timeLimit);
+            this.showState('questionState');
+        }
+
+        onQuestionEnded(data) {
+            console.log("Question Ended: ", data)
+            clearInterval(this.questionTimer);
+
+            if (data && data.correct_answer && this.hasAnswered) {
+                this.showCorrectAnswer(data.correct_answer);
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        loadQuestion(question) {
+            document.getElementById('questionText').textContent = question.question_text;
+            const optionsContainer = document.getElementById('answerOptions');
+            optionsContainer.innerHTML = '';
+
+            if (question.question_type === 'multiple_choice') {
+                question.options.forEach(option => {
+                    const optionEl = this.createMultipleChoiceOption(option.key, option.text);
+                    optionsContainer.appendChild(optionEl);
+                });
+            } else if (question.question_type === 'true_false') {
+                const trueOption = this.createMultipleChoiceOption('True', 'True');
+                const falseOption = this.createMultipleChoiceOption('False', 'False');
+                optionsContainer.appendChild(trueOption);
+                optionsContainer.appendChild(falseOption);
+            } else if (question.question_type === 'short_answer') {
+                const input = document.createElement('input');
+                input.type = 'text';
+                input.className = 'short-answer-input';
+                input.placeholder = 'Type your answer here...';
+                input.id = 'shortAnswerInput';
+                input.addEventListener('input', () => {
+                    this.selectedAnswer = input.value.trim();
+                    document.getElementById('submitAnswerBtn').disabled = !this.selectedAnswer;
+                });
+                optionsContainer.appendChild(input);
+            }
+
+            document.getElementById('submitAnswerBtn').disabled = true;
+        }
+
+        createMultipleChoiceOption(key, text) {
+            const option = document.createElement('div');
+            option.className = 'answer-option';
+            option.dataset.value = key;
+
+            option.innerHTML = `
+                <div class="option-key">${key}</div>
+                <div class="option-text">${text}</div>
+            `;
+
+            option.addEventListener('click', () => {
+                if (this.hasAnswered) return;
+
+                // Clear previous selection
+                document.querySelectorAll('.answer-option').forEach(opt => {
+                    opt.classList.remove('selected');
+                });
+
+                // Select this option
+                option.classList.add('selected');
+                this.selectedAnswer = key;
+                document.getElementById('submitAnswerBtn').disabled = false;
+            });
+
+            return option;
+        }
+
+        submitAnswer() {
+            if (!this.selectedAnswer || this.hasAnswered) return;
+
+            const timeTaken = (Date.now() - this.questionStartTime) / 1000;
+
+            // Disable all options
+            document.querySelectorAll('.answer-option').forEach(option => {
+                option.classList.add('disabled');
+            });
+
+            // Disable short answer input if exists
+            const shortAnswerInput = document.getElementById('shortAnswerInput');
+            if (shortAnswerInput) {
+                shortAnswerInput.disabled = true;
+            }
+
+            // Send answer via WebSocket
+            this.websocket.send(JSON.stringify({
+                type: 'participant_submit_answer',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                answer: this.selectedAnswer,
+                time_taken: timeTaken
+            }));
+
+            this.hasAnswered = true;
+
+            // Show submitted state
+            setTimeout(() => {
+                document.getElementById('submittedAnswerText').textContent = this.selectedAnswer;
+                document.getElementById('submittedTime').textContent = timeTaken.toFixed(1);
+                this.showState('answerSubmittedState');
+            }, 500);
+        }
+
+        onTimeUp() {
+            if (this.hasAnswered) return;
+
+            // Auto-submit if an answer is selected, otherwise show time's up
+            if (this.selectedAnswer) {
+                this.submitAnswer();
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+    }
+
+    // Initialize Quiz Player
+    const player = new QuizPlayer();
+
+    // ---- Leaderboard Logic ----
+    let lbFetchTimeout = null;
+    const MY_NAME = player.participantName;
+
+    function renderLeaderboard(participants) {
+        const list = document.getElementById('leaderboardList');
+        const hint = document.getElementById('lbRefreshHint');
+        if (!list) return;
+        if (!participants || participants.length === 0) {
+            list.innerHTML = '<div class="lb-empty"><span>No data yet</span></div>';
+            return;
+        }
+        const rows = participants.map((p, i) => {
+            const rank = i + 1;
+            const isMe = p.name === MY_NAME;
+            const rankClass = rank === 1 ? 'top1' : rank === 2 ? 'top2' : rank === 3 ? 'top3' : '';
+            const rankDisplay = rank <= 3 ? ['🥇','🥈','🥉'][rank-1] : rank;
+            return `<div class="lb-row${isMe ? ' lb-me' : ''}">
+                <div class="lb-rank ${rankClass}">${rankDisplay}</div>
+                <div class="lb-avatar">${p.name.charAt(0).toUpperCase()}</div>
+                <div class="lb-name">${p.name}${isMe ? ' (You)' : ''}</div>
+                <div class="lb-score">${p.weighted_score ?? p.total_score ?? 0} pts</div>
+            </div>`;
+        }).join('');
+        list.innerHTML = rows;
+        if (hint) {
+            const now = new Date();
+            hint.textContent = `Updated: ${now.getHours()}:${String(now.getMinutes()).padStart(2,'0')}`;
+        }
+        // Update header score for current participant
+        const me = participants.find(p => p.name === MY_NAME);
+        const scoreEl = document.getElementById('myScoreHeader');
+        if (me && scoreEl) scoreEl.textContent = (me.weighted_score ?? me.total_score ?? 0) + ' pts';
+        try { lucide.createIcons(); } catch(_) {}
+    }
+
+    function fetchLeaderboard() {
+        const hub = player.hubSession;
+        if (!hub) return;
+        fetch(`/hub/api/session/${hub}/leaderboard/`)
+            .then(r => r.json())
+            .then(data => { if (data.participants) renderLeaderboard(data.participants); })
+            .catch(() => {});
+    }
+
+    function scheduleLeaderboardRefresh(delayMs) {
+        clearTimeout(lbFetchTimeout);
+        lbFetchTimeout = setTimeout(fetchLeaderboard, delayMs || 0);
+    }
+
+    // Initial load (slight delay to let WS connect first)
+    if (player.hubSession) {
+        scheduleLeaderboardRefresh(800);
+    } else {
+        const sb = document.getElementById('leaderboardSidebar');
+        if (sb) sb.style.display = 'none';
+    }
+    // ---- End Leaderboard Logic ----
+
+    // ---- Tutorial Logic ----
+    let tutStep = 0;
+    let tutSelected = null;
+    const TUT_CORRECT = 'Adler';
+
+    function tutShow() {
+        tutStep = 0;
+        tutSelected = null;
+        // Reset dots and steps
+        document.querySelectorAll('.tut-step').forEach((s, i) => s.classList.toggle('active', i === 0));
+        document.querySelectorAll('.tut-dot').forEach((d, i) => { d.className = 'tut-dot' + (i === 0 ? ' active' : ''); });
+        // Reset practice question
+        document.querySelectorAll('.tut-answer').forEach(a => {
+            a.className = 'tut-answer';
+            a.onclick = function() { tutSelectAnswer(this); };
+        });
+        const fb = document.getElementById('tutFeedback');
+        if (fb) { fb.style.display = 'none'; fb.textContent = ''; }
+        const cb = document.getElementById('tutCheckBtn');
+        if (cb) { cb.disabled = true; cb.textContent = 'Check Answer'; cb.onclick = tutCheck; }
+
+        const ov = document.getElementById('tutorialOverlay');
+        ov.style.display = 'flex';
+        ov.style.opacity = '0';
+        ov.style.transition = 'opacity .35s ease';
+        requestAnimationFrame(() => { ov.style.opacity = '1'; });
+    }
+
+    function tutNext() {
+        const cur = document.getElementById('tutStep' + tutStep);
+        const dot = document.getElementById('tutDot' + tutStep);
+        cur.classList.remove('active');
+        dot.classList.remove('active');
+        dot.classList.add('done');
+        tutStep++;
+        const nxt = document.getElementById('tutStep' + tutStep);
+        const ndot = document.getElementById('tutDot' + tutStep);
+        if (nxt) nxt.classList.add('active');
+        if (ndot) ndot.classList.add('active');
+    }
+
+    function tutSelectAnswer(el) {
+        if (el.classList.contains('disabled-tut')) return;
+        document.querySelectorAll('.tut-answer').forEach(a => a.classList.remove('selected'));
+        el.classList.add('selected');
+        tutSelected = el.dataset.val;
+        document.getElementById('tutCheckBtn').disabled = false;
+    }
+
+    function tutCheck() {
+        if (!tutSelected) return;
+        const options = document.querySelectorAll('.tut-answer');
+        const fb = document.getElementById('tutFeedback');
+        const cb = document.getElementById('tutCheckBtn');
+        options.forEach(opt => {
+            opt.classList.add('disabled-tut');
+            opt.onclick = null;
+            if (opt.dataset.val === TUT_CORRECT) opt.classList.add('correct');
+            else if (opt.dataset.val === tutSelected) opt.classList.add('incorrect');
+        });
+        if (tutSelected === TUT_CORRECT) {
+            fb.textContent = '✅ Correct! Well done!';
+            fb.style.background = '#f0fdf4'; fb.style.border = '1px solid #22c55e'; fb.style.color = '#15803d';
+        } else {
+            fb.textContent = `❌ Wrong! The correct answer was "${TUT_CORRECT}".`;
+            fb.style.background = '#fef2f2'; fb.style.border = '1px solid #ef4444'; fb.style.color = '#b91c1c';
+        }
+        fb.style.display = 'block';
+        cb.textContent = 'Next →';
+        cb.disabled = false;
+        cb.onclick = tutNext;
+    }
+
+    function tutClose() {
+        // Report tutorial completion to the server
+        if (player.websocket && player.websocket.readyState === WebSocket.OPEN) {
+            player.websocket.send(JSON.stringify({
+                type: 'tutorial_completed',
+                participant_name: player.participantName,
+                hub_session: player.hubSession
+            }));
+        }
+        const ov = document.getElementById('tutorialOverlay');
+        ov.style.opacity = '0';
+        ov.style.transition = 'opacity .3s ease';
+        setTimeout(() => { ov.style.display = 'none'; }, 320);
+    }
+
+    function tutForceClose() {
+        const ov = document.getElementById('tutorialOverlay');
+        if (ov && ov.style.display !== 'none') {
+            tutClose();
+        }
+    }
+
+    // Make functions globally accessible (for onclick attributes in HTML)
+    window.tutNext = tutNext;
+    window.tutClose = tutClose;
+    window.tutCheck = tutCheck;
+    window.tutSelectAnswer = tutSelectAnswer;
+    window.tutForceClose = tutForceClose;
+    // ---- End Tutorial Logic ----
+
+    // Back to the lobby when the host ends the hub session
+    GamesRuntime.followHubSession();
+});
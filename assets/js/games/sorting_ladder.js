@@ -0,0 +1,718 @@
+// Sorting Ladder play page (templates/sorting_ladder/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    // Sorting Ladder Player Client
+    class SortingLadderPlayer extends GamesRuntime.Player {
+        constructor() {
+            super('sorting-ladder');
+            this.roundTimer = null;
+            this.roundTimeLeft = 0;
+            this.currentQuestion = null;
+            this.currentRound = 0;
+            this.shuffledItems = [];
+            this.visibleCount = 0;
+            this.currentSelection = [];
+            this.isEliminated = false;
+            this.hasSubmittedMove = false;
+            this.totalRoundsForQuestion = 0;
+            this.roundStatuses = [];
+            this.ladderItems = [];
+            this.containerItems = [];
+            this.lockedIds = new Set();
+            this.currentRoundItemId = null;
+            this.moreRoundsInQuestion = false;
+            this.pendingRoundResult = null;
+            this.roundTimerEnded = false;
+
+            this.init();
+        }
+
+        renderRoundIndicators() {
+            const container = document.getElementById('roundIndicators');
+            if (!container) return;
+
+            container.innerHTML = '';
+            for (let i = 0; i < this.totalRoundsForQuestion; i++) {
+                const circle = document.createElement('div');
+                circle.className = 'round-indicator';
+                const status = this.roundStatuses[i];
+                if (status === 'success') {
+                    circle.classList.add('round-success');
+                    circle.textContent = '✓';
+                } else if (status === 'fail') {
+                    circle.classList.add('round-fail');
+                    circle.textContent = '×';
+                }
+                container.appendChild(circle);
+            }
+        }
+
+        init() {
+            this.connectWebSocket();
+        }
+
+        joinMessage() {
+            return {
+                type: 'participant_join',
+                name: this.participantName,
+                hub_session_code: this.hubSession,
+                last_seq: this.lastSeq,
+                seq_log: this.seqLog,
+            };
+        }
+
+        handleWebSocketMessage(data) {
+            console.log('Sorting Ladder WS data:', data);
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+                case 'question_started':
+                    this.onQuestionStarted(data);
+                    break;
+                case 'round_result':
+                    this.onRoundResult(data);
+                    break;
+                case 'question_ended':
+                    this.onQuestionEnded(data);
+                    break;
+                case 'topic_selected':
+                    this.onTopicSelected(data.topic, data.session);
+                    break;
+                case 'round_started':
+                    this.onRoundStarted(data.round);
+                    break;
+                case 'round_ended':
+                    this.onRoundEnded(data.survivors);
+                    break;
+                case 'no_more_rounds':
+                    this.onNoMoreRounds();
+                    break;
+                case 'move_submitted':
+                    this.onMoveSubmitted(data);
+                    break;
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        onQuizStarted() {
+            this.showState('waitingQuizState');
+        }
+
+        onQuizEnded(data) {
+            // Stop any running question timer
+            if (this.roundTimer) {
+                clearInterval(this.roundTimer);
+            }
+
+            // Determine final total rounds survived across the whole quiz
+            let finalRounds = null;
+
+            // Prefer server-sent final_scores so we reflect authoritative value
+            if (data && Array.isArray(data.final_scores)) {
+                const me = data.final_scores.find(p => p.name === this.participantName);
+                if (me && typeof me.rounds_survived === 'number') {
+                    finalRounds = me.rounds_survived;
+                }
+            }
+
+            // Fallback to the last value we tracked from round_result
+            if (finalRounds === null && typeof this.currentTotalRoundsSurvived === 'number') {
+                finalRounds = this.currentTotalRoundsSurvived;
+            }
+
+            const finalRoundsEl = document.getElementById('finalRoundsSurvived');
+            if (finalRoundsEl && typeof finalRounds === 'number') {
+                finalRoundsEl.textContent = finalRounds;
+            }
+
+            this.showState('quizEndedState');
+
+            this.returnToLobby(2000);
+        }
+
+        onQuestionStarted(data) {
+            // Reset per-question state
+            this.currentQuestion = data.question;
+            this.shuffledItems = data.items || [];
+            this.currentRound = 1;
+            this.currentSelection = [];
+            this.isEliminated = false;
+            this.moreRoundsInQuestion = true;
+
+            // Total rounds = number_of_items_in_topic - 1
+            this.totalRoundsForQuestion = Math.max((this.shuffledItems.length || 0) - 1, 1);
+            this.roundStatuses = new Array(this.totalRoundsForQuestion).fill(null);
+
+            // Initialize ladder with a single anchor item and put the
+            // rest into the container
+            if (this.shuffledItems.length > 0) {
+                const anchor = this.shuffledItems[0];
+                this.ladderItems = [anchor];
+                this.lockedIds = new Set([anchor.id]);
+                this.containerItems = this.shuffledItems.slice(1);
+            } else {
+                this.ladderItems = [];
+                this.lockedIds = new Set();
+                this.containerItems = [];
+            }
+
+            // Show the main topic state
+            this.showState('topicState');
+            const titleEl = document.getElementById('topicTitle');
+            const descEl = document.getElementById('topicDescription');
+            const upperLabelEl = document.getElementById('ladderUpperLabel');
+            const lowerLabelEl = document.getElementById('ladderLowerLabel');
+            if (titleEl) titleEl.textContent = this.currentQuestion?.text || '';
+            if (descEl) descEl.textContent = this.currentQuestion?.description || '';
+
+            // Set ladder extreme labels from the question, falling back
+            // to empty string if not provided.
+            if (upperLabelEl) upperLabelEl.textContent = this.currentQuestion?.upper_label || '';
+            if (lowerLabelEl) lowerLabelEl.textContent = this.currentQuestion?.lower_label || '';
+
+            // Render round indicator circles
+            this.renderRoundIndicators();
+
+            // Start timer from payload or question's per-round limit
+            const timeLimit = data.time_limit_seconds || this.currentQuestion?.round_time_limit || 0;
+            // If there is no timer, mark as "timer ended" so results are applied immediately
+            this.roundTimerEnded = (timeLimit <= 0);
+            console.log('Starting player timer with time limit:', timeLimit);
+            console.log("Data Time Limit ", data.time_limit_seconds);
+            console.log({"Current Question Time ": this.currentQuestion?.round_time_limit});
+            this.startPlayerTimer(timeLimit);
+
+            // Render first round
+            this.renderCurrentRound();
+        }
+
+        startPlayerTimer(seconds) {
+            if (!seconds || seconds <= 0) return;
+            if (this.roundTimer) {
+                clearInterval(this.roundTimer);
+            }
+            this.roundTimeLeft = seconds;
+            // Reset per-round submission state
+            this.hasSubmittedMove = false;
+            this.roundTimerEnded = false;
+            this.pendingRoundResult = null;
+            const timeEl = document.getElementById('playerTimeLeft');
+            const circle = document.getElementById('playerTimerCircle');
+
+            // Elements on the round result card
+            const timeElResult = document.getElementById('playerTimeLeftResult');
+            const circleResult = document.getElementById('playerTimerCircleResult');
+            // Elements on the waiting state card
+            const timeElWaiting = document.getElementById('playerTimeLeftWaiting');
+            const circleWaiting = document.getElementById('playerTimerCircleWaiting');
+            const timeElFinal = document.getElementById('finalPlayerTimeLeft');
+            const circleFinal = document.getElementById('finalPlayerTimerCircle');
+
+            if (timeEl) timeEl.textContent = this.roundTimeLeft;
+            if (timeElResult) timeElResult.textContent = this.roundTimeLeft;
+            if (timeElWaiting) timeElWaiting.textContent = this.roundTimeLeft;
+            if (timeElFinal) timeElFinal.textContent = this.roundTimeLeft;
+
+            const applyTimerClasses = (circleEl) => {
+                if (!circleEl) return;
+                circleEl.className = 'timer-circle';
+                if (this.roundTimeLeft <= 5) {
+                    circleEl.classList.add('danger');
+                } else if (this.roundTimeLeft <= 10) {
+                    circleEl.classList.add('warning');
+                }
+            };
+
+            applyTimerClasses(circle);
+            applyTimerClasses(circleResult);
+            applyTimerClasses(circleWaiting);
+            applyTimerClasses(circleFinal);
+
+            this.roundTimer = setInterval(() => {
+                this.roundTimeLeft -= 1;
+                const safeValue = Math.max(this.roundTimeLeft, 0);
+                if (timeEl) timeEl.textContent = safeValue;
+                if (timeElResult) timeElResult.textContent = safeValue;
+                if (timeElWaiting) timeElWaiting.textContent = safeValue;
+                if (timeElFinal) timeElFinal.textContent = safeValue;
+
+                applyTimerClasses(circle);
+                applyTimerClasses(circleResult);
+                applyTimerClasses(circleWaiting);
+                applyTimerClasses(circleFinal);
+
+                if (this.roundTimeLeft <= 0) {
+                    clearInterval(this.roundTimer);
+                    this.roundTimerEnded = true;
+
+                    // If we already have the round result from the
+                    // server, apply it now; otherwise it will be
+                    // applied when onRoundResult arrives.
+                    if (this.pendingRoundResult) {
+                        this.applyRoundResult(this.pendingRoundResult);
+                    }
+
+                    // Only auto-submit a timeout if this player has
+                    // NOT already submitted a move for this round.
+                    if (this.moreRoundsInQuestion && !this.hasSubmittedMove)  {
+                        // Submit round as failed due to timeout
+                        this.submitCurrentRound(true);
+                        // Show waiting state while we await the
+                        // authoritative result.
+                        this.showState('waitingRoundState');
+                    }
+                }
+            }, 1000);
+        }
+
+        renderCurrentRound() {
+            const topicLayoutContainer = document.getElementById('topicLayout');
+            const topicButtons = document.getElementById('topicButtons');
+            const ladderContainer = document.getElementById('ladderContainer');
+            const pool = document.getElementById('itemPool');
+            if (!ladderContainer || !pool) return;
+
+            ladderContainer.innerHTML = '';
+            pool.innerHTML = '';
+
+            // Render ladder rows with numbered triangle drop targets.
+            // There is one drop target per potential position in the
+            // ladder: before the first item, between items, and after
+            // the last item.
+            const ladderLength = this.ladderItems.length;
+            const totalPositions = ladderLength + 1;
+
+            for (let position = 0; position < totalPositions; position++) {
+                const slotRow = document.createElement('div');
+                slotRow.className = 'ladder-slot-row';
+
+                // Ladder row content for this index, if any, on the LEFT
+                if (position < ladderLength) {
+                    const item = this.ladderItems[position];
+                    const row = document.createElement('div');
+                    row.className = 'ladder-row';
+                    row.dataset.itemId = item.id;
+
+                    const text = document.createElement('div');
+                    text.className = 'ladder-row-text';
+                    text.textContent = item.text;
+                    row.appendChild(text);
+
+                    const isLocked = this.lockedIds.has(item.id);
+                    if (!isLocked && this.currentRoundItemId === item.id) {
+                        const clearBtn = document.createElement('button');
+                        clearBtn.type = 'button';
+                        clearBtn.className = 'slot-clear-btn';
+                        clearBtn.innerHTML = '&times;';
+                        clearBtn.addEventListener('click', () => {
+                            this.removeCurrentRoundItem(item.id);
+                        });
+                        row.appendChild(clearBtn);
+                    }
+
+                    slotRow.appendChild(row);
+                } else {
+                    // For the final position (after the last item), add
+                    // a flexible spacer so the triangle visually aligns
+                    // with the gap below the last row.
+                    const spacer = document.createElement('div');
+                    spacer.style.flex = '1';
+                    slotRow.appendChild(spacer);
+                }
+
+                // Triangle drop target (numbered) on the RIGHT
+                const target = document.createElement('div');
+                target.className = 'triangle-container';
+                target.dataset.position = String(position);
+                const label = document.createElement('span');
+                label.className = 'number';
+                // Number from 1..N to match visual design
+                label.textContent = String(position + 1);
+                target.appendChild(label);
+
+                target.addEventListener('dragover', (e) => this.onTriangleDragOver(e, target));
+                target.addEventListener('dragleave', () => {
+                    target.classList.remove('over');
+                });
+                target.addEventListener('drop', (e) => this.onTriangleDrop(e, position));
+
+                slotRow.appendChild(target);
+
+                ladderContainer.appendChild(slotRow);
+            }
+
+            // Render container items (not yet on the ladder)
+            this.containerItems.forEach((item, index) => {
+                const card = document.createElement('div');
+                card.className = 'answer-card';
+                card.draggable = true;
+                card.dataset.itemId = item.id;
+                card.innerHTML = `
+                    <div class="option-key">${index + 1}</div>
+                    <div class="option-text">${item.text}</div>
+                `;
+
+                card.addEventListener('dragstart', (e) => this.onCardDragStart(e, card));
+                card.addEventListener('dragend', () => this.onCardDragEnd(card));
+
+                pool.appendChild(card);
+            });
+
+            // Submit button
+            let submitBtn = document.getElementById('submitRoundBtn');
+            if (!submitBtn) {
+                submitBtn = document.createElement('button');
+                submitBtn.type = 'button';
+                submitBtn.className = 'col btn btn-primary w-100 m-3 submit-answer';
+                submitBtn.id = 'submitRoundBtn';
+                submitBtn.textContent = 'Check Order';
+                submitBtn.addEventListener('click', () => this.submitCurrentRound());
+                topicButtons.appendChild(submitBtn);
+            }
+
+            // Reset button: returns the placed item (if any) back to the
+            // item container, similar to clicking the "×" on a ladder row.
+            let resetBtn = document.getElementById('resetRoundBtn');
+            if (!resetBtn) {
+                resetBtn = document.createElement('button');
+                resetBtn.type = 'button';
+                resetBtn.className = 'col btn btn-danger w-100 m-3 submit-answer';
+                resetBtn.id = 'resetRoundBtn';
+                resetBtn.textContent = 'Reset';
+                resetBtn.addEventListener('click', () => {
+                    if (!this.currentRoundItemId) return;
+                    this.removeCurrentRoundItem(this.currentRoundItemId);
+                });
+                topicButtons.appendChild(resetBtn);
+            }
+        }
+
+        onCardDragStart(event, card) {
+            if (this.isEliminated) return;
+            const id = parseInt(card.dataset.itemId || '0', 10);
+            if (isNaN(id)) return;
+            // Only one current-round item at a time
+            if (this.currentRoundItemId && this.currentRoundItemId !== id) {
+                return;
+            }
+            this.currentRoundItemId = id;
+            if (event.dataTransfer) {
+                event.dataTransfer.effectAllowed = 'move';
+                event.dataTransfer.setData('text/plain', String(id));
+            }
+            card.classList.add('dragging');
+        }
+
+        onCardDragEnd(card) {
+            card.classList.remove('dragging');
+        }
+
+        clearLadderPreviews() {
+            document.querySelectorAll('.ladder-row').forEach(r => {
+                r.classList.remove('preview-before', 'preview-after', 'draggable-over');
+            });
+        }
+
+        onTriangleDragOver(event, target) {
+            event.preventDefault();
+            if (event.dataTransfer) {
+                event.dataTransfer.dropEffect = 'move';
+            }
+            target.classList.add('over');
+        }
+
+        onTriangleDrop(event, position) {
+            event.preventDefault();
+            const pool = document.getElementById('itemPool');
+            if (!pool) return;
+
+            const dragging = document.querySelector('.answer-card.dragging');
+            if (!dragging) return;
+
+            const droppedId = parseInt(dragging.dataset.itemId || '0', 10);
+            if (isNaN(droppedId)) return;
+
+            // Remove from containerItems
+            this.containerItems = this.containerItems.filter(it => it.id !== droppedId);
+
+            // Clear visual state on all triangle targets
+            document.querySelectorAll('.triangle-container').forEach(t => t.classList.remove('over'));
+
+            const itemObj = this.shuffledItems.find(it => it.id === droppedId);
+            if (!itemObj) return;
+
+            // Remove any existing occurrence of this item on the ladder
+            this.ladderItems = this.ladderItems.filter(it => it.id !== droppedId);
+
+            // Clamp position to valid range and insert
+            const clampedPos = Math.max(0, Math.min(position, this.ladderItems.length));
+            this.ladderItems.splice(clampedPos, 0, itemObj);
+
+            this.currentRoundItemId = droppedId;
+            this.renderCurrentRound();
+        }
+
+        removeCurrentRoundItem(itemId) {
+            // Remove from ladder and return to container
+            this.ladderItems = this.ladderItems.filter(it => it.id !== itemId);
+            const original = this.shuffledItems.find(it => it.id === itemId);
+            if (original) {
+                this.containerItems.push(original);
+            }
+            this.currentRoundItemId = null;
+            this.renderCurrentRound();
+        }
+
+        submitCurrentRound(roundTimeOut = false) {
+            if (!this.websocket || this.websocket.readyState !== WebSocket.OPEN) return;
+            if (this.isEliminated) return;
+
+            // For normal submissions, require that exactly one item has been placed this round.
+            // For timeouts, allow submission even if no item is placed so the round is recorded as failed.
+            if (!this.currentRoundItemId && !roundTimeOut) {
+                alert('Please place one item from the container onto the ladder before checking.');
+                return;
+            }
+
+            const orderedIds = this.ladderItems.map(it => it.id);
+            // For normal submissions we require some items; for timeouts
+            // we allow an empty ladder and let the backend record failure.
+            if (!orderedIds.length && !roundTimeOut) return;
+
+            // Mark that this player has submitted for this round so we
+            // don't auto-submit again on timer expiry.
+            this.hasSubmittedMove = true;
+
+            const payload = {
+                type: 'participant_submit_round',
+                participant_name: this.participantName,
+                hub_session_code: this.hubSession,
+                ordered_item_ids: orderedIds,
+                round_time_out: !!roundTimeOut,
+            };
+            this.websocket.send(JSON.stringify(payload));
+
+            // After submitting, wait for other players while the
+            // round timer continues to run.
+            this.showState('waitingRoundState');
+        }
+
+        onRoundResult(data) {
+            if (data.participant_name !== this.participantName) {
+                return;
+            }
+
+            // Store the latest result so we can show it when the
+            // round timer has fully elapsed.
+            this.pendingRoundResult = data;
+
+            // If the timer is still running, stay in the waiting
+            // state and defer showing the round result.
+            if (!this.roundTimerEnded) {
+                this.showState('waitingRoundState');
+                return;
+            }
+
+            this.applyRoundResult(data);
+        }
+
+        applyRoundResult(data) {
+            if (data.participant_name !== this.participantName) {
+                return;
+            }
+
+            const resultTitle = document.getElementById('roundResultTitle');
+            const resultText = document.getElementById('roundResultText');
+
+            // Track latest total rounds survived across the entire quiz (for end screen)
+            if (typeof data.rounds_survived === 'number') {
+                this.currentTotalRoundsSurvived = data.rounds_survived;
+            }
+
+            // Icons for success/failure
+            const iconSuccess = document.getElementById('roundResultIconSuccess');
+            const iconFail = document.getElementById('roundResultIconFail');
+
+            // Track per-round status locally
+            const roundIndex = Math.max(this.currentRound - 1, 0);
+            if (roundIndex < this.roundStatuses.length) {
+                this.roundStatuses[roundIndex] = data.is_correct ? 'success' : 'fail';
+            }
+            this.renderRoundIndicators();
+
+            if (data.is_correct) {
+                if (iconSuccess) iconSuccess.classList.remove('d-none');
+                if (iconFail) iconFail.classList.add('d-none');
+
+                const roundsForQuestion = typeof data.per_question_rounds === 'number'
+                    ? data.per_question_rounds
+                    : (data.rounds_survived || 0);
+
+                if (resultTitle) resultTitle.textContent = 'Correct!';
+                if (resultText) {
+                    resultText.textContent = `You have survived ${roundsForQuestion} round(s) for this question and earned ${data.points} point(s) so far.`;
+                }
+            } else {
+                if (iconSuccess) iconSuccess.classList.add('d-none');
+                if (iconFail) iconFail.classList.remove('d-none');
+
+                if (resultTitle) resultTitle.textContent = 'Round Failed';
+
+                const roundsCompletedForQuestion = typeof data.per_question_rounds === 'number'
+                    ? data.per_question_rounds
+                    : (data.rounds_survived || 0);
+                const totalPossibleRoundsForQuestion = Math.max((this.shuffledItems || []).length - 1, 1);
+
+                if (resultText) {
+                    resultText.textContent = `You have completed ${roundsCompletedForQuestion} successful round(s) out of ${totalPossibleRoundsForQuestion} and earned ${data.points} point(s) so far. Get ready for the next round.`;
+                }
+            }
+
+            // Always show round result state briefly
+            this.showState('roundResultState');
+
+            // Reorder ladderItems to the correct order returned by the
+            // server (moves misplaced item to its correct ladder
+            // position).
+            console.log("DATA ", data)
+            console.log("Correct Order IDs ", data.correct_order_ids)
+            console.log("Correct Order IDs Array ", Array.isArray(data.correct_order_ids))
+            console.log("length ", data.correct_order_ids.length)
+            // Without one (round timed out) the server's ladder of this
+            // participant is used, which also restores it after a reload
+            const byId = new Map(this.shuffledItems.map(it => [it.id, it]));
+            const ladderIds = Array.isArray(data.correct_order_ids) && data.correct_order_ids.length
+                ? data.correct_order_ids
+                : data.placed_ids;
+            if (Array.isArray(ladderIds) && ladderIds.length) {
+                console.log("By ID ", byId)
+                const ordered = [];
+                ladderIds.forEach(id => {
+                    const item = byId.get(id);
+                    if (item) {
+                        ordered.push(item);
+                    }
+                });
+                this.ladderItems = ordered;
+                console.log("Ladder Items ",this.ladderItems)
+            }else{
+                console.log("No correct order IDs")
+            }
+
+            // Lock all current ladder items for subsequent rounds and
+            // rebuild the container with remaining items.
+            this.lockedIds = new Set(this.ladderItems.map(it => it.id));
+            this.currentRoundItemId = null;
+            this.containerItems = Array.isArray(data.remaining_ids)
+                ? data.remaining_ids.map(id => byId.get(id)).filter(it => it && !this.lockedIds.has(it.id))
+                : this.shuffledItems.filter(it => !this.lockedIds.has(it.id));
+            this.renderCurrentRound();
+
+            if (data.has_more_rounds) {
+                setTimeout(() => {
+                    this.showState('topicState');
+
+                    // Reset per-round submission state for the next round
+                    this.hasSubmittedMove = false;
+                    this.pendingRoundResult = null;
+
+                    const timeLimit = this.currentQuestion?.round_time_limit || 0;
+                    // If there is no timer, mark the round as "timer ended"
+                    // immediately so that onRoundResult applies results without waiting.
+                    this.roundTimerEnded = (timeLimit <= 0);
+
+                    console.log("Current Question ", this.currentQuestion)
+                    console.log("Time Limit ", timeLimit)
+                    this.startPlayerTimer(timeLimit);
+
+                    this.currentRound += 1;
+                    this.renderCurrentRound();
+                }, 1500);
+            } else {
+                // Final state: show full correct order with arrows and question
+                setTimeout(() => {
+                    this.renderFinalOrder();
+                    this.showState('finalOrderState');
+                    clearInterval(this.roundTimer);
+                    this.moreRoundsInQuestion = false;
+                }, 1500);
+            }
+        }
+
+        renderFinalOrder() {
+            const container = document.getElementById('finalOrderItems');
+            const questionEl = document.getElementById('finalOrderQuestionText');
+            if (!container) return;
+
+            container.innerHTML = '';
+            if (questionEl && this.currentQuestion) {
+                questionEl.textContent = this.currentQuestion.text || '';
+            }
+
+            // Use the final ladderItems (already reordered from
+            // correct_order_ids) as the authoritative correct order.
+            this.ladderItems.forEach((item, index) => {
+                const itemEl = document.createElement('div');
+                itemEl.className = 'final-order-item';
+                itemEl.textContent = item.text;
+                container.appendChild(itemEl);
+
+                if (index < this.ladderItems.length - 1) {
+                    const arrow = document.createElement('div');
+                    arrow.className = 'final-order-arrow';
+                    arrow.textContent = '→';
+                    container.appendChild(arrow);
+                }
+            });
+        }
+
+        onQuestionEnded(data) {
+            this.showWaitingForNextQuestion();
+        }
+
+        showCorrectAnswer(correctAnswerData) {
+            const toText = (val) => {
+                if (val == null) return '-';
+                if (typeof val === 'object') {
+                    return val.formatted_answer || val.text || val.value || '-';
+                }
+                return String(val);
+            };
+
+            const correctText = toText(correctAnswerData);
+            const userTextEl = document.getElementById('submittedAnswerText');
+            const userAnswer = userTextEl ? userTextEl.textContent : (this.selectedAnswer || '-');
+
+            const display = document.getElementById('correctAnswerDisplay');
+            const compUser = document.getElementById('userAnswerDisplay');
+            const compCorrect = document.getElementById('correctAnswerComparison');
+            if (display) display.textContent = correctText;
+            if (compUser) compUser.textContent = userAnswer;
+            if (compCorrect) compCorrect.textContent = correctText;
+
+            this.showState('correctAnswerState');
+            setTimeout(() => {
+                this.showWaitingForNextQuestion();
+            }, 2000);
+        }
+
+    }
+
+    // Initialize Quiz Player
+    const player = new SortingLadderPlayer();
+    window.sortingPlayer = player;
+
+    // Back to the lobby when the host ends the hub session
+    GamesRuntime.followHubSession();
+});
@@ -0,0 +1,322 @@
+// Where Is This play page (templates/where_is_this/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    // Where Quiz Player Class
+    class WherePlayer extends GamesRuntime.Player {
+        constructor() {
+            super('where');
+            this.gameMap = null;
+            this.resultMap = null;
+            this.selectedMarker = null;
+            this.selectedLatitude = null;
+            this.selectedLongitude = null;
+
+            this.init();
+        }
+
+        init() {
+            this.initializeMaps();
+            super.init();
+        }
+
+        initializeMaps() {
+            // Initialize game map
+            this.gameMap = L.map('gameMap', {
+                center: [20, 0],
+                zoom: 2,
+                minZoom: 2,
+                maxZoom: 15,
+                worldCopyJump: true
+            });
+
+            L.tileLayer(GamesRuntime.page.map.tileUrl, {
+                attribution: '© OpenStreetMap contributors'
+            }).addTo(this.gameMap);
+
+            // Add click handler for map
+            this.gameMap.on('click', (e) => {
+                this.selectLocation(e.latlng.lat, e.latlng.lng);
+            });
+        }
+
+        handleWebSocketMessage(data) {
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+
+                case 'question_started':
+                    this.onQuestionStarted(data.question);
+                    break;
+
+                case 'question_ended':
+                    this.onQuestionEnded(data);
+                    break;
+
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                case 'answer_submitted':
+                    this.onAnswerSubmitted(data);
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        bindEvents() {
+            // Submit answer button
+            document.getElementById('submitAnswerBtn').addEventListener('click', () => {
+                this.submitAnswer();
+            });
+
+            // Clear selection button
+            document.getElementById('clearSelectionBtn').addEventListener('click', () => {
+                this.clearSelection();
+            });
+        }
+
+        selectLocation(lat, lng) {
+            if (this.hasAnswered) return;
+
+            this.selectedLatitude = lat;
+            this.selectedLongitude = lng;
+
+            // Remove previous marker
+            if (this.selectedMarker) {
+                this.gameMap.removeLayer(this.selectedMarker);
+            }
+
+            // Add new marker
+            this.selectedMarker = L.marker([lat, lng], {
+                icon: L.icon({
+                    iconUrl: GamesRuntime.page.map.markerRed,
+                    shadowUrl: GamesRuntime.page.map.markerShadow,
+                    iconSize: [25, 41],
+                    iconAnchor: [12, 41],
+                    popupAnchor: [1, -34],
+                    shadowSize: [41, 41]
+                })
+            }).addTo(this.gameMap);
+
+            // Update UI
+            document.getElementById('selectedCoords').textContent = `${lat.toFixed(4)}°, ${lng.toFixed(4)}°`;
+            document.getElementById('selectionInfo').style.display = 'flex';
+            document.getElementById('clearSelectionBtn').disabled = false;
+            document.getElementById('submitAnswerBtn').disabled = false;
+        }
+
+        clearSelection() {
+            this.selectedLatitude = null;
+            this.selectedLongitude = null;
+
+            if (this.selectedMarker) {
+                this.gameMap.removeLayer(this.selectedMarker);
+                this.selectedMarker = null;
+            }
+
+            document.getElementById('selectedCoords').textContent = 'No location selected';
+            document.getElementById('selectionInfo').style.display = 'none';
+            document.getElementById('clearSelectionBtn').disabled = true;
+            document.getElementById('submitAnswerBtn').disabled = true;
+        }
+
+        onQuizStarted() {
+            this.showState('waitingQuizState');
+        }
+
+        onQuestionStarted(question) {
+            this.hasAnswered = false;
+            document.getElementById('closestGuesses').classList.add('d-none');
+            this.clearSelection();
+            this.questionStartTime = Date.now();
+
+            this.loadQuestion(question);
+            this.startQuestionTimer(question.time_limit);
+            this.showState('questionState');
+        }
+
+        onQuestionEnded(data) {
+            clearInterval(this.questionTimer);
+
+            // Stay on the own result and show where everyone else guessed
+            if (this.hasAnswered && this.resultMap && data.guesses && data.guesses.count) {
+                WhereGuesses.draw(this.resultMap, data.guesses);
+                const closest = document.getElementById('closestGuesses');
+                closest.innerHTML = WhereGuesses.closestList(data.guesses);
+                closest.classList.remove('d-none');
+                return;
+            }
+
+            if (this.hasAnswered) {
+                // Stay on submitted state briefly, then return to waiting
+                setTimeout(() => {
+                    this.showWaitingForNextQuestion();
+                }, 1000);
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        onAnswerSubmitted(data) {
+            // Update submitted details
+            document.getElementById('submittedDistance').textContent = data.formatted_distance;
+            document.getElementById('submittedPoints').textContent = data.points_earned;
+            document.getElementById('submittedAccuracy').textContent = data.accuracy_percentage + '%';
+
+            // Show result on map
+            this.showResultOnMap(data.correct_latitude, data.correct_longitude);
+        }
+
+        loadQuestion(question) {
+            document.getElementById('questionText').textContent = question.question_text;
+            document.getElementById('maxPoints').textContent = question.points;
+
+            // Update difficulty badge
+            const difficultyMeta = document.getElementById('difficultyMeta');
+            const badge = difficultyMeta.querySelector('.badge');
+            badge.className = `badge badge-${question.difficulty}`;
+            badge.textContent = question.difficulty.charAt(0).toUpperCase() + question.difficulty.slice(1);
+
+            // Show image if available
+            const imageContainer = document.getElementById('questionImageContainer');
+            const imageEl = document.getElementById('questionImage');
+            if (question.image_url) {
+                imageEl.src = question.image_url;
+                imageContainer.style.display = 'block';
+            } else {
+                imageContainer.style.display = 'none';
+            }
+
+            // Show hint if available
+            const hintContainer = document.getElementById('questionHint');
+            const hintText = document.getElementById('hintText');
+            if (question.hint_text) {
+                hintText.textContent = question.hint_text;
+                hintContainer.style.display = 'flex';
+            } else {
+                hintContainer.style.display = 'none';
+            }
+        }
+
+        submitAnswer() {
+            if (this.selectedLatitude === null || this.selectedLongitude === null || this.hasAnswered) return;
+
+            const timeTaken = (Date.now() - this.questionStartTime) / 1000;
+
+            // Disable map interaction
+            this.gameMap.off('click');
+            document.getElementById('gameMap').style.cursor = 'default';
+
+            // Send answer via WebSocket
+            this.websocket.send(JSON.stringify({
+                type: 'participant_submit_answer',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                latitude: this.selectedLatitude,
+                longitude: this.selectedLongitude,
+                time_taken: timeTaken
+            }));
+
+            this.hasAnswered = true;
+
+            // Show submitted state after a brief delay
+            setTimeout(() => {
+                this.showState('answerSubmittedState');
+            }, 500);
+        }
+
+        showResultOnMap(correctLat, correctLng) {
+            if (this.resultMap) {
+                this.resultMap.remove();
+            }
+            // Initialize result map
+            this.resultMap = L.map('resultMap', {
+                center: [correctLat, correctLng],
+                zoom: 6
+            });
+
+            L.tileLayer(GamesRuntime.page.map.tileUrl, {
+                attribution: '© OpenStreetMap contributors'
+            }).addTo(this.resultMap);
+
+            // Add user's guess marker (red)
+            L.marker([this.selectedLatitude, this.selectedLongitude], {
+                icon: L.icon({
+                    iconUrl: GamesRuntime.page.map.markerRed,
+                    shadowUrl: GamesRuntime.page.map.markerShadow,
+                    iconSize: [25, 41],
+                    iconAnchor: [12, 41],
+                    popupAnchor: [1, -34],
+                    shadowSize: [41, 41]
+                })
+            }).addTo(this.resultMap).bindPopup('Your guess');
+
+            // Add correct location marker (green)
+            L.marker([correctLat, correctLng], {
+                icon: L.icon({
+                    iconUrl: GamesRuntime.page.map.markerGreen,
+                    shadowUrl: GamesRuntime.page.map.markerShadow,
+                    iconSize: [25, 41],
+                    iconAnchor: [12, 41],
+                    popupAnchor: [1, -34],
+                    shadowSize: [41, 41]
+                })
+            }).addTo(this.resultMap).bindPopup('Correct location');
+
+            // Add line between them
+            L.polyline([
+                [this.selectedLatitude, this.selectedLongitude],
+                [correctLat, correctLng]
+            ], {
+                color: 'red',
+                weight: 3,
+                opacity: 0.7
+            }).addTo(this.resultMap);
+
+            // Fit bounds to show both markers
+            const bounds = L.latLngBounds([
+                [this.selectedLatitude, this.selectedLongitude],
+                [correctLat, correctLng]
+            ]);
+            this.resultMap.fitBounds(bounds, { padding: [20, 20] });
+        }
+
+        onTimeUp() {
+            if (this.hasAnswered) return;
+
+            // Auto-submit if location is selected
+            if (this.selectedLatitude !== null && this.selectedLongitude !== null) {
+                this.submitAnswer();
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        showState(stateId) {
+            super.showState(stateId);
+
+            // Reset map interaction when showing question state
+            if (stateId === 'questionState' && this.gameMap) {
+                this.gameMap.on('click', (e) => {
+                    this.selectLocation(e.latlng.lat, e.latlng.lng);
+                });
+                document.getElementById('gameMap').style.cursor = 'crosshair';
+            }
+        }
+
+    }
+
+    // Initialize Where Player
+    const player = new WherePlayer();
+
+    // Back to the lobby when the host ends the hub session
+    GamesRuntime.followHubSession();
+});
@@ -0,0 +1,233 @@
+// Who Is Lying play page (templates/who_is_lying/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    class WhoPlayer extends GamesRuntime.Player {
+        constructor() {
+            super('who');
+            this.selectedPeople = new Set();
+
+            this.init();
+        }
+
+        handleWebSocketMessage(data) {
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+
+                case 'question_started':
+                    this.onQuestionStarted(data.question);
+                    break;
+
+                case 'question_ended':
+                    this.onQuestionEnded();
+                    break;
+
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                case 'answer_submitted':
+                    this.onAnswerSubmitted(data);
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        bindEvents() {
+            // Submit answer button
+            document.getElementById('submitAnswerBtn').addEventListener('click', () => {
+                this.submitAnswer();
+            });
+
+            // Clear selection button
+            document.getElementById('clearSelectionBtn').addEventListener('click', () => {
+                this.clearSelection();
+            });
+        }
+
+        onQuizStarted() {
+            this.showState('waitingQuizState');
+        }
+
+        onQuestionStarted(question) {
+            this.hasAnswered = false;
+            this.selectedPeople.clear();
+            this.questionStartTime = Date.now();
+
+            this.loadQuestion(question);
+            this.startQuestionTimer(question.time_limit);
+            this.showState('questionState');
+        }
+
+        onQuestionEnded() {
+            clearInterval(this.questionTimer);
+
+            if (this.hasAnswered) {
+                // Stay on submitted state briefly, then return to waiting
+                setTimeout(() => {
+                    this.showWaitingForNextQuestion();
+                }, 1000);
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        loadQuestion(question) {
+            document.getElementById('statementText').textContent = question.statement;
+            this.setupPeopleSelection(question.people);
+        }
+
+        setupPeopleSelection(people) {
+            const peopleGrid = document.getElementById('peopleGrid');
+
+            // Clear previous content
+            peopleGrid.innerHTML = '';
+
+            // Create person cards
+            people.forEach((person, index) => {
+                const personDiv = document.createElement('div');
+                personDiv.className = 'person-card';
+                personDiv.dataset.personIndex = index;
+
+                personDiv.innerHTML = `
+                    <div class="person-name">${person.name}</div>
+                    <div class="person-status">Click to select as liar</div>
+                `;
+
+                // Add click event listener
+                personDiv.addEventListener('click', () => {
+                    this.togglePersonSelection(index, personDiv);
+                });
+
+                peopleGrid.appendChild(personDiv);
+            });
+
+            this.updateSelectionSummary();
+        }
+
+        togglePersonSelection(index, element) {
+            if (this.selectedPeople.has(index)) {
+                // Remove selection
+                this.selectedPeople.delete(index);
+                element.classList.remove('selected');
+                element.querySelector('.person-status').textContent = 'Click to select as liar';
+            } else {
+                // Add selection
+                this.selectedPeople.add(index);
+                element.classList.add('selected');
+                element.querySelector('.person-status').textContent = 'Selected as liar';
+            }
+
+            this.updateSelectionSummary();
+        }
+
+        clearSelection() {
+            this.selectedPeople.clear();
+            document.querySelectorAll('.person-card').forEach(card => {
+                card.classList.remove('selected');
+                card.querySelector('.person-status').textContent = 'Click to select as liar';
+            });
+            this.updateSelectionSummary();
+        }
+
+        updateSelectionSummary() {
+            const selectedCount = document.getElementById('selectedCount');
+            selectedCount.textContent = this.selectedPeople.size;
+        }
+
+        submitAnswer() {
+            if (this.hasAnswered) return;
+
+            const timeTaken = (Date.now() - this.questionStartTime) / 1000;
+            const selectedLiars = Array.from(this.selectedPeople);
+
+            // Disable interface
+            document.querySelectorAll('.person-card').forEach(card => {
+                card.style.pointerEvents = 'none';
+                card.style.opacity = '0.7';
+            });
+
+            document.getElementById('clearSelectionBtn').disabled = true;
+
+            // Send answer via WebSocket
+            this.websocket.send(JSON.stringify({
+                type: 'participant_submit_answer',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                selected_liars: selectedLiars,
+                time_taken: timeTaken
+            }));
+
+            this.hasAnswered = true;
+
+            // Show submitted state after a brief delay
+            setTimeout(() => {
+                this.showState('answerSubmittedState');
+            }, 500);
+        }
+
+        onTimeUp() {
+            if (this.hasAnswered) return;
+
+            // Auto-submit current selection
+            this.submitAnswer();
+        }
+
+        onAnswerSubmitted(data) {
+            // Update submitted state with results
+            document.getElementById('correctIdentifications').textContent = data.correct_identifications;
+            document.getElementById('pointsEarned').textContent = data.points_earned;
+            document.getElementById('accuracyPercent').textContent = data.accuracy + '%';
+
+            // Show detailed breakdown
+            this.showResultsBreakdown(data.analysis);
+        }
+
+        showResultsBreakdown(analysis) {
+            const sections = {
+                'correctLiarsSection': analysis.correct_liars,
+                'missedLiarsSection': analysis.missed_liars,
+                'falseAccusationsSection': analysis.false_accusations,
+                'correctTruthSection': analysis.correct_truth_tellers
+            };
+
+            const tagClasses = {
+                'correctLiarsTags': 'correct-liar',
+                'missedLiarsTags': 'missed-liar',
+                'falseAccusationsTags': 'false-accusation',
+                'correctTruthTags': 'correct-truth'
+            };
+
+            for (const [sectionId, people] of Object.entries(sections)) {
+                const section = document.getElementById(sectionId);
+                const tagsContainer = document.getElementById(sectionId.replace('Section', 'Tags'));
+
+                if (people && people.length > 0) {
+                    section.style.display = 'block';
+
+                    const tagClass = tagClasses[sectionId.replace('Section', 'Tags')];
+                    tagsContainer.innerHTML = people.map(person => 
+                        `<span class="person-tag ${tagClass}">${person}</span>`
+                    ).join('');
+                } else {
+                    section.style.display = 'none';
+                }
+            }
+        }
+
+    }
+
+    // Initialize Who Player
+    const player = new WhoPlayer();
+
+    // Back to the lobby when the host ends the hub session
+    GamesRuntime.followHubSession();
+});
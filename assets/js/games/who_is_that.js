@@ -0,0 +1,255 @@
+// Who Is That play page (templates/who_is_that/play.html); page data comes from window.GAME_PAGE
+document.addEventListener('DOMContentLoaded', function() {
+    lucide.createIcons();
+
+    // Who is That Quiz Player Class
+    class WhoThatPlayer extends GamesRuntime.Player {
+        constructor() {
+            super('who_that');
+            this.timerWarning = 10;
+            this.timerDanger = 5;
+
+            this.init();
+        }
+
+        handleWebSocketMessage(data) {
+            switch(data.type) {
+                case 'quiz_started':
+                    this.onQuizStarted();
+                    break;
+
+                case 'question_started':
+                    this.onQuestionStarted(data.question);
+                    break;
+
+                case 'question_ended':
+                    this.onQuestionEnded(data);
+                    break;
+
+                case 'quiz_ended':
+                    this.onQuizEnded(data);
+                    break;
+
+                case 'participant_count_updated':
+                    this.updateParticipantCount(data.count);
+                    break;
+
+                case 'answer_submitted':
+                    this.onAnswerSubmitted(data);
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        bindEvents() {
+            // Submit answer button
+            document.getElementById('submitAnswerBtn').addEventListener('click', () => {
+                this.submitAnswer();
+            });
+
+            // Name input
+            const nameInput = document.getElementById('nameInput');
+            nameInput.addEventListener('input', () => {
+                const hasValue = nameInput.value.trim() !== '';
+                document.getElementById('submitAnswerBtn').disabled = !hasValue || this.hasAnswered;
+            });
+
+            // Allow Enter key to submit
+            nameInput.addEventListener('keypress', (e) => {
+                if (e.key === 'Enter' && !document.getElementById('submitAnswerBtn').disabled) {
+                    this.submitAnswer();
+                }
+            });
+        }
+
+        onQuizStarted() {
+            this.showState('waitingQuizState');
+        }
+
+        onQuestionStarted(question) {
+            this.hasAnswered = false;
+            this.questionStartTime = Date.now();
+
+            this.loadQuestion(question);
+            this.startQuestionTimer(question.time_limit || 30);
+            this.showState('questionState');
+
+            // Focus on input
+            setTimeout(() => {
+                document.getElementById('nameInput').focus();
+            }, 500);
+        }
+
+        onQuestionEnded(data) {
+            clearInterval(this.questionTimer);
+
+            if (data.correct_answer && this.hasAnswered) {
+                this.showCorrectAnswer(data.correct_answer);
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        loadQuestion(question) {
+            document.getElementById('questionText').textContent = question.question_text;
+
+            // Update photo
+            const photoDisplay = document.getElementById('photoDisplay');
+            if (question.image_url) {
+                photoDisplay.innerHTML = `<img src="${question.image_url}" alt="Who is this person?" class="question-photo" id="questionPhoto">`;
+            } else {
+                photoDisplay.innerHTML = `
+                    <div class="no-photo-placeholder">
+                        <i data-lucide="image"></i>
+                        <span>No photo available</span>
+                    </div>
+                `;
+                lucide.createIcons();
+            }
+
+            // Show category if available
+            const categoryDisplay = document.getElementById('categoryDisplay');
+            const categoryText = document.getElementById('categoryText');
+            const questionMeta = document.getElementById('questionMeta');
+
+            if (question.category) {
+                categoryText.textContent = question.category;
+                categoryDisplay.style.display = 'flex';
+                questionMeta.style.display = 'flex';
+            } else {
+                categoryDisplay.style.display = 'none';
+            }
+
+            // Show hint if available
+            const hintDisplay = document.getElementById('hintDisplay');
+            const hintText = document.getElementById('hintText');
+            if (question.hint_text) {
+                hintText.textContent = question.hint_text;
+                hintDisplay.style.display = 'flex';
+                questionMeta.style.display = 'flex';
+            } else {
+                hintDisplay.style.display = 'none';
+            }
+
+            // If no category or hint, hide meta section
+            if (!question.category && !question.hint_text) {
+                questionMeta.style.display = 'none';
+            }
+
+            // Reset input
+            const nameInput = document.getElementById('nameInput');
+            nameInput.value = '';
+            nameInput.disabled = false;
+
+            // Reset submit button
+            const submitBtn = document.getElementById('submitAnswerBtn');
+            submitBtn.disabled = true;
+            submitBtn.classList.remove('loading');
+        }
+
+        submitAnswer() {
+            const nameInput = document.getElementById('nameInput');
+            const userAnswer = nameInput.value.trim();
+
+            if (!userAnswer || this.hasAnswered) return;
+
+            const timeTaken = (Date.now() - this.questionStartTime) / 1000;
+
+            // Disable interface
+            nameInput.disabled = true;
+            const submitBtn = document.getElementById('submitAnswerBtn');
+            submitBtn.classList.add('loading');
+
+            // Send answer via WebSocket
+            this.websocket.send(JSON.stringify({
+                type: 'participant_submit_answer',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                user_answer: userAnswer,
+                time_taken: timeTaken
+            }));
+
+            this.hasAnswered = true;
+
+            // Show submitted state after a brief delay
+            setTimeout(() => {
+                this.showState('answerSubmittedState');
+            }, 500);
+        }
+
+        onAnswerSubmitted(data) {
+            // Update the submitted state with actual results
+            document.getElementById('submittedAnswer').textContent = document.getElementById("nameInput").value;
+            const resultElement = document.getElementById('answerResult');
+            resultElement.textContent = data.is_correct ? 'Correct!' : 'Incorrect';
+            resultElement.className = `summary-value result ${data.is_correct ? 'correct' : 'incorrect'}`;
+            document.getElementById('pointsEarned').textContent = data.points_earned;
+            document.getElementById('matchQuality').textContent = data.match_quality;
+        }
+
+        onTimeUp() {
+            if (this.hasAnswered) return;
+
+            // Auto-submit if there's an answer
+            const nameInput = document.getElementById('nameInput');
+            if (nameInput.value.trim()) {
+                this.submitAnswer();
+            } else {
+                this.showWaitingForNextQuestion();
+            }
+        }
+
+        showCorrectAnswer(correctAnswerData) {
+            document.getElementById('correctAnswerDisplay').textContent = correctAnswerData.correct_answer;
+            document.getElementById('userAnswerDisplay').textContent = document.getElementById('nameInput').value;
+            document.getElementById('correctAnswerComparison').textContent = correctAnswerData.correct_answer;
+
+            // Show alternative answers if available
+            if (correctAnswerData.alternative_answers && correctAnswerData.alternative_answers.length > 0) {
+                document.getElementById('altAnswersList').textContent = correctAnswerData.alternative_answers.join(', ');
+                document.getElementById('alternativeAnswersDisplay').style.display = 'block';
+            }
+
+            // Show explanation if available
+            if (correctAnswerData.explanation) {
+                document.getElementById('explanationText').textContent = correctAnswerData.explanation;
+                document.getElementById('explanationText').style.display = 'block';
+            }
+
+            // Set performance badge based on result
+            const isCorrect = document.getElementById('answerResult').textContent === 'Correct!';
+            const performanceBadge = document.getElementById('performanceBadge');
+            const performanceText = performanceBadge.querySelector('.performance-text');
+
+            if (isCorrect) {
+                const matchQuality = document.getElementById('matchQuality').textContent;
+                if (matchQuality === 'Perfect Match') {
+                    performanceBadge.className = 'performance-badge correct';
+                    performanceText.textContent = 'Perfect Match!';
+                } else {
+                    performanceBadge.className = 'performance-badge partial';
+                    performanceText.textContent = 'Good Match!';
+                }
+            } else {
+                performanceBadge.className = 'performance-badge incorrect';
+                performanceText.textContent = 'Better Luck Next Time!';
+            }
+
+            this.showState('correctAnswerState');
+
+            // Auto-transition back to waiting after 1 second
+            setTimeout(() => {
+                this.showWaitingForNextQuestion();
+            }, 2000);
+        }
+
+    }
+
+    // Initialize Who is That Player
+    const player = new WhoThatPlayer();
+
+    // Back to the lobby when the host ends the hub session
+    GamesRuntime.followHubSession();
+});
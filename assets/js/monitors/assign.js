@@ -0,0 +1,24 @@
+// Assign Quiz Monitor (templates/admin_dashboard/assign_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    class AssignMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('assign', 'assign');
+            this.init();
+        }
+
+        // Response quality from the share of correct matches
+        responseQuality(response) {
+            if (response.accuracy >= 90) return 'excellent';
+            if (response.accuracy >= 70) return 'good';
+            if (response.accuracy >= 50) return 'fair';
+            return 'poor';
+        }
+
+        responseDetails(response) {
+            return `${response.correct_matches}/${response.total_matches} matches • ${response.accuracy}% accuracy • +${response.points_earned} pts`;
+        }
+    }
+
+    new AssignMonitor();
+});
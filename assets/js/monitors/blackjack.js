@@ -0,0 +1,59 @@
+// BlackJack Quiz Monitor (templates/admin_dashboard/blackjack_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    class BlackJackMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('blackjack', 'blackjack');
+            this.timerWarning = 20;
+            this.timerDanger = 10;
+            this.init();
+        }
+
+        handleWebSocketMessage(data) {
+            // The last question shows its result a moment longer
+            if (data.type === 'question_ended' && data.quiz_complete) {
+                console.log('Question ended:', data.message);
+                setTimeout(() => location.reload(), 2000);
+                return;
+            }
+            super.handleWebSocketMessage(data);
+        }
+
+        participantMarkup(participant) {
+            return `
+                <div class="participant-avatar ${participant.is_busted ? 'busted' : ''}">
+                    ${participant.name.charAt(0).toUpperCase()}
+                </div>
+                <div class="participant-info">
+                    <div class="participant-name">
+                        ${participant.name}
+                        ${participant.is_busted ? '<span class="bust-badge">BUST</span>' : ''}
+                    </div>
+                    <div class="participant-score" id="score-${participant.id}">${participant.total_points || 0} points</div>
+                    <div class="participant-status">0/5 answered</div>
+                </div>
+                <div class="participant-status-dot">
+                    ${this.editScoreButton(participant, participant.total_points, 'me-1')}
+                    <div class="status-dot online"></div>
+                </div>
+            `;
+        }
+
+        // Points count up to the bust limit, so fewer is better
+        responseQuality(response) {
+            if (response.is_busted) return 'busted';
+            if (response.points_earned === 0) return 'excellent';
+            if (response.points_earned <= 2) return 'good';
+            if (response.points_earned <= 5) return 'fair';
+            return 'poor';
+        }
+
+        responseDetails(response) {
+            return `Answer: <span class="response-answer">${response.user_answer}</span> • 
+                        ${response.points_earned} pts • Total: ${response.total_points}
+                        ${response.is_busted ? ' • <strong>BUSTED!</strong>' : ''}`;
+        }
+    }
+
+    new BlackJackMonitor();
+});
@@ -0,0 +1,120 @@
+// Clue Rush Monitor (templates/admin_dashboard/clue_rush_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    class ClueRushMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('clue-rush', 'clue_rush');
+            this.init();
+        }
+
+        handleWebSocketMessage(data) {
+            switch(data.type) {
+                case 'close_answer_approved':
+                    console.log('Close answer approved for', data.participant_name, '+', data.points_earned, 'pts');
+                    break;
+                case 'clue_started':
+                    this.markClueSent(data.clue);
+                    break;
+                case 'clue_sequence_completed':
+                    this.disableClueSending();
+                    break;
+                default:
+                    super.handleWebSocketMessage(data);
+            }
+        }
+
+        bindEvents() {
+            super.bindEvents();
+
+            // Send Next Clue button
+            const sendClueBtn = document.getElementById('sendClueBtn');
+            if (sendClueBtn) {
+                sendClueBtn.addEventListener('click', () => {
+                    if (!this.send({ type: 'admin_send_clue' })) return;
+                    sendClueBtn.classList.add('loading');
+                    setTimeout(() => sendClueBtn.classList.remove('loading'), 400);
+                });
+            }
+        }
+
+        markClueSent(clue) {
+            try {
+                const list = document.getElementById('clueList');
+                if (!list) return;
+                const item = list.querySelector(`[data-clue-order="${clue.order}"]`);
+                if (!item) return;
+                item.classList.add('clue-sent');
+                const badge = item.querySelector('.clue-status');
+                if (badge) { badge.classList.remove('bg-secondary'); badge.classList.add('bg-success'); badge.textContent = 'Sent'; }
+            } catch (e) { console.error(e); }
+        }
+
+        disableClueSending() {
+            const btn = document.getElementById('sendClueBtn');
+            if (btn) { btn.disabled = true; btn.title = 'All clues sent'; btn.innerHTML = '<i data-lucide="check"></i> All Clues Sent'; try{ lucide.createIcons(); }catch(_){} }
+        }
+
+        participantBadge(participant) {
+            return '<div class="accuracy-badge">0%</div>';
+        }
+
+        // Close answers wait for the host's approval; some answers let the
+        // host set the points directly
+        responseAdded(responseEl, response) {
+            const allowChangePoints = !!response.change_points;
+            const showApproval = !!response.is_close && !response.is_correct;
+            if (allowChangePoints) {
+                responseEl.insertAdjacentHTML('beforeend', `
+                <div class="input-group input-group-sm ms-2 change-points-group" style="max-width: 200px;">
+                    <input type="number" class="form-control change-points-input" min="0" value="${response.points_earned || 0}">
+                    <button type="button" class="btn btn-success change-points-submit" title="Set points">
+                        Set
+                    </button>
+                </div>`);
+                const input = responseEl.querySelector('.change-points-input');
+                const submitBtn = responseEl.querySelector('.change-points-submit');
+                submitBtn.addEventListener('click', () => {
+                    if (!this.isConnected()) return;
+                    const value = parseInt(input.value || '0', 10);
+                    if (isNaN(value) || value < 0) return;
+                    submitBtn.disabled = true;
+                    input.disabled = true;
+                    this.send({
+                        type: 'admin_change_points',
+                        participant_name: response.participant_name,
+                        points: value
+                    });
+                });
+            } else if (showApproval) {
+                responseEl.insertAdjacentHTML('beforeend', `
+                <div class="btn-group ms-2" role="group">
+                    <button type="button" class="btn btn-sm btn-success approve-close-answer" title="Award points">
+                        <i data-lucide="check"></i>
+                    </button>
+                    <button type="button" class="btn btn-sm btn-outline-danger reject-close-answer" title="Reject">
+                        <i data-lucide="x"></i>
+                    </button>
+                </div>`);
+                const approveBtn = responseEl.querySelector('.approve-close-answer');
+                const rejectBtn = responseEl.querySelector('.reject-close-answer');
+                approveBtn.addEventListener('click', () => {
+                    if (!this.isConnected()) return;
+                    approveBtn.disabled = true;
+                    rejectBtn.disabled = true;
+                    this.send({
+                        type: 'admin_accept_close_answer',
+                        participant_name: response.participant_name
+                    });
+                });
+                rejectBtn.addEventListener('click', () => {
+                    rejectBtn.disabled = true;
+                    approveBtn.disabled = true;
+                    responseEl.style.opacity = '0.8';
+                });
+            }
+            try { lucide.createIcons(); } catch(_) {}
+        }
+    }
+
+    new ClueRushMonitor();
+});
@@ -0,0 +1,35 @@
+// Estimation Quiz Monitor (templates/admin_dashboard/estimation_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    class EstimationMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('estimation', 'estimation');
+            this.init();
+        }
+
+        participantAvatar(participant) {
+            return participant.name.charAt(0).toUpperCase();
+        }
+
+        participantScore(participant) {
+            return `<div class="participant-score" id="score-${participant.id}">${participant.total_score || 0} pts</div>
+                    <div class="participant-accuracy">0% avg</div>`;
+        }
+
+        responseQuality(response) {
+            const accuracy = parseFloat(response.accuracy_percentage);
+            if (accuracy >= 90) return 'excellent';
+            if (accuracy >= 70) return 'good';
+            if (accuracy >= 50) return 'fair';
+            return 'poor';
+        }
+
+        responseDetails(response) {
+            const accuracy = parseFloat(response.accuracy_percentage).toFixed(2);
+            return `Estimated: <span class="response-estimate">${response.formatted_answer}</span> • 
+                        ${accuracy}% accuracy • +${response.points_earned} pts`;
+        }
+    }
+
+    new EstimationMonitor();
+});
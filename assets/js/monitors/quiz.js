@@ -0,0 +1,16 @@
+// Quick Quiz Monitor (templates/admin_dashboard/quiz_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    class QuizMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('quiz', 'quiz');
+            this.init();
+        }
+
+        participantBadge(participant) {
+            return '<div class="accuracy-badge">0%</div>';
+        }
+    }
+
+    new QuizMonitor();
+});
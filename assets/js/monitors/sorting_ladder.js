@@ -0,0 +1,29 @@
+// Sorting Ladder Monitor (templates/admin_dashboard/sorting_ladder_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    class SortingLadderMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('sorting-ladder', 'sorting_ladder');
+            this.init();
+        }
+
+        handleWebSocketMessage(data) {
+            if (data.type === 'quiz_ended' && this.questionTimer) {
+                clearInterval(this.questionTimer);
+                this.questionTimer = null;
+            }
+            super.handleWebSocketMessage(data);
+        }
+
+        // The time limit is per round; a question has a round per item
+        timeOverride(seconds, button) {
+            return seconds * button.dataset.questionTotalElements + 10;
+        }
+
+        participantBadge(participant) {
+            return '<div class="accuracy-badge">0%</div>';
+        }
+    }
+
+    new SortingLadderMonitor();
+});
@@ -0,0 +1,106 @@
+// Where Quiz Monitor (templates/admin_dashboard/where_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    const page = MonitorRuntime.page;
+
+    class WhereMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('where', 'where');
+            this.previewMap = null;
+            this.init();
+        }
+
+        init() {
+            super.init();
+            this.showLastGuesses();
+        }
+
+        handleWebSocketMessage(data) {
+            if (data.type === 'question_ended') {
+                this.keepGuesses(data.guesses);
+            } else if (data.type === 'quiz_ended') {
+                this.keepGuesses(null);
+            }
+            super.handleWebSocketMessage(data);
+        }
+
+        bindEvents() {
+            super.bindEvents();
+
+            // Preview Location buttons
+            document.querySelectorAll('.preview-location-btn').forEach(btn => {
+                btn.addEventListener('click', (e) => {
+                    const lat = parseFloat(e.target.dataset.lat);
+                    const lng = parseFloat(e.target.dataset.lng);
+                    this.showLocationPreview(lat, lng);
+                });
+            });
+
+            // Show Location button (for current question)
+            document.getElementById('showLocationBtn')?.addEventListener('click', (e) => {
+                const lat = parseFloat(e.target.dataset.lat);
+                const lng = parseFloat(e.target.dataset.lng);
+                this.showLocationPreview(lat, lng);
+            });
+        }
+
+        // The page reloads on question_ended; the guesses survive it in sessionStorage
+        keepGuesses(guesses) {
+            try { sessionStorage.setItem(`where_guesses_${this.roomCode}`, JSON.stringify(guesses || null)); } catch(_) {}
+        }
+
+        showLastGuesses() {
+            let guesses = null;
+            try { guesses = JSON.parse(sessionStorage.getItem(`where_guesses_${this.roomCode}`)); } catch(_) {}
+            if (!guesses || !guesses.count || page.hasQuestion) return;
+
+            document.getElementById('guessMapCard').classList.remove('d-none');
+            document.getElementById('guessCount').textContent = guesses.count;
+            const map = L.map('guessMap', { center: [20, 0], zoom: 2, worldCopyJump: true });
+            L.tileLayer(page.tileUrl, {
+                attribution: '© OpenStreetMap contributors'
+            }).addTo(map);
+            WhereGuesses.draw(map, guesses);
+            document.getElementById('closestGuesses').innerHTML = WhereGuesses.closestList(guesses);
+        }
+
+        showLocationPreview(lat, lng) {
+            const modal = new bootstrap.Modal(document.getElementById('locationPreviewModal'));
+            modal.show();
+
+            // Initialize map when modal is shown
+            modal._element.addEventListener('shown.bs.modal', () => {
+                if (!this.previewMap) {
+                    this.previewMap = L.map('previewMap');
+                    L.tileLayer(page.tileUrl, {
+                        attribution: '© OpenStreetMap contributors'
+                    }).addTo(this.previewMap);
+                }
+
+                this.previewMap.setView([lat, lng], 10);
+                L.marker([lat, lng]).addTo(this.previewMap);
+
+                setTimeout(() => {
+                    this.previewMap.invalidateSize();
+                }, 250);
+            });
+        }
+
+        participantScore(participant) {
+            return `<div class="participant-stats">
+                        <span class="score" id="score-${participant.id}">${participant.total_score || 0} pts</span>
+                        <span class="accuracy">0% avg</span>
+                    </div>`;
+        }
+
+        responseQuality(response) {
+            return response.accuracy_category;
+        }
+
+        responseDetails(response) {
+            return `${response.formatted_distance} away • ${response.accuracy_percentage}% accuracy • +${response.points_earned} pts`;
+        }
+    }
+
+    new WhereMonitor();
+});
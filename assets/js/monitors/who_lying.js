@@ -0,0 +1,24 @@
+// Who is Lying Monitor (templates/admin_dashboard/who_lying_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    class WhoMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('who', 'who');
+            this.init();
+        }
+
+        // Response quality from the share of correct identifications
+        responseQuality(response) {
+            if (response.accuracy >= 90) return 'excellent';
+            if (response.accuracy >= 70) return 'good';
+            if (response.accuracy >= 50) return 'fair';
+            return 'poor';
+        }
+
+        responseDetails(response) {
+            return `${response.correct_identifications}/${response.total_people} correct • ${response.accuracy}% accuracy • +${response.points_earned} pts`;
+        }
+    }
+
+    new WhoMonitor();
+});
@@ -0,0 +1,37 @@
+// Who is That Quiz Monitor (templates/admin_dashboard/who_that_monitor.html);
+// page data comes from window.MONITOR_PAGE, the shared parts from js/monitor.js
+document.addEventListener('DOMContentLoaded', function() {
+    class WhoThatMonitor extends MonitorRuntime.Monitor {
+        constructor() {
+            super('who_that', 'who_that');
+            this.timerWarning = 10;
+            this.timerDanger = 5;
+            this.init();
+        }
+
+        participantAvatar(participant) {
+            return participant.name.charAt(0).toUpperCase();
+        }
+
+        participantScore(participant) {
+            return `<div class="participant-score" id="score-${participant.id}">${participant.total_score || 0} pts</div>
+                    <div class="participant-stats">
+                        <span class="correct-answers">0/0</span>
+                        <span class="accuracy-percent">0%</span>
+                    </div>`;
+        }
+
+        responseQuality(response) {
+            if (!response.is_correct) return 'incorrect';
+            return response.accuracy_percentage >= 80 ? 'correct' : 'partial';
+        }
+
+        responseDetails(response) {
+            return `Answered: <span class="response-answer">"${response.user_answer}"</span> • 
+                        ${response.is_correct ? '✓ Correct' : '✗ Incorrect'} • 
+                        ${response.match_quality} • +${response.points_earned} pts`;
+        }
+    }
+
+    new WhoThatMonitor();
+});
@@ -0,0 +1,682 @@
+// Shared runtime of the admin monitor pages: the room socket with reconnect,
+// the sent-question state, the question and quiz timers, the participant
+// list and live responses, following the hub session to the next step, the
+// score edit modal and the lobby link copy buttons. Each monitor's module
+// (assets/js/monitors/) extends MonitorRuntime.Monitor with its own
+// messages and markup. Page data is set by the monitor template in
+// window.MONITOR_PAGE.
+(function (global) {
+    'use strict';
+
+    const page = global.MONITOR_PAGE || {};
+
+    // Monitor URL of each game, for the hub's navigate message
+    const MONITOR_ROUTES = {
+        quiz: (room) => `/admin-dashboard/quiz/${room}/monitor/`,
+        assign: (room) => `/admin-dashboard/assign/${room}/monitor/`,
+        estimation: (room) => `/admin-dashboard/estimation/${room}/monitor/`,
+        where: (room) => `/admin-dashboard/where/monitor/${room}/`,
+        who: (room) => `/admin-dashboard/who/${room}/monitor/`,
+        who_that: (room) => `/admin-dashboard/who-that/${room}/monitor/`,
+        blackjack: (room) => `/admin-dashboard/blackjack/${room}/monitor/`,
+        clue_rush: (room) => `/admin-dashboard/clue-rush/${room}/monitor/`,
+        sorting_ladder: (room) => `/admin-dashboard/sorting-ladder/${room}/monitor/`,
+    };
+
+    // Follow the host's hub session: open the next step's monitor, back to
+    // the lobby when the session ends
+    function followHubSession() {
+        const hubCode = new URLSearchParams(window.location.search).get('hub_session');
+        if (!hubCode) {
+            return null;
+        }
+        global.__hubCode = hubCode;
+        try { sessionStorage.setItem('_hub_admin', hubCode); } catch (_) { }
+
+        const wsScheme = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const hubWS = new WebSocket(`${wsScheme}//${window.location.host}/ws/hub/${hubCode}/`);
+        hubWS.onmessage = (e) => {
+            try {
+                const data = JSON.parse(e.data);
+                if (data.type === 'navigate' && data.step) {
+                    const route = MONITOR_ROUTES[data.step.game_key];
+                    if (route) {
+                        const u = new URL(route(data.step.room_code), window.location.origin);
+                        u.searchParams.set('hub_session', hubCode);
+                        window.location.href = u.toString();
+                    }
+                } else if (data.type === 'session_ended') {
+                    const u = new URL(`/hub/lobby/${hubCode}/`, window.location.origin);
+                    u.searchParams.set('ended', '1');
+                    window.location.href = u.toString();
+                }
+            } catch (err) {
+                console.error('Failed to parse hub message:', e.data, err);
+            }
+        };
+        hubWS.onerror = (err) => {
+            console.error('Hub WebSocket error:', err);
+        };
+        return hubWS;
+    }
+
+    // Score edit modal: opened by .edit-score-btn, saved to page.scoreUrl
+    function bindScoreEditor() {
+        const modal = document.getElementById('editScoreModal');
+        if (!modal) return;
+        const unit = page.scoreUnit || 'pts';
+        let currentParticipantId = null;
+        document.addEventListener('click', function (e) {
+            const btn = e.target.closest('.edit-score-btn');
+            if (!btn) return;
+            currentParticipantId = btn.dataset.participantId;
+            document.getElementById('editScoreName').textContent = btn.dataset.participantName;
+            document.getElementById('editScoreInput').value = btn.dataset.currentScore;
+            document.getElementById('editScoreError').classList.add('d-none');
+        });
+        document.getElementById('editScoreSave').addEventListener('click', function () {
+            const score = parseInt(document.getElementById('editScoreInput').value, 10);
+            const errEl = document.getElementById('editScoreError');
+            if (isNaN(score) || score < 0) {
+                errEl.textContent = 'Please enter a valid number (≥ 0).';
+                errEl.classList.remove('d-none');
+                return;
+            }
+            errEl.classList.add('d-none');
+            this.disabled = true;
+            fetch(page.scoreUrl, {
+                method: 'POST',
+                headers: {'X-CSRFToken': page.csrfToken, 'Content-Type': 'application/json'},
+                body: JSON.stringify({participant_id: currentParticipantId, score: score})
+            })
+            .then(r => r.json())
+            .then(data => {
+                if (data.success) {
+                    const scoreEl = document.getElementById('score-' + currentParticipantId);
+                    if (scoreEl) scoreEl.textContent = data.new_score + ' ' + unit;
+                    const btn = document.querySelector(`.edit-score-btn[data-participant-id="${currentParticipantId}"]`);
+                    if (btn) btn.dataset.currentScore = data.new_score;
+                    bootstrap.Modal.getInstance(modal).hide();
+                } else {
+                    errEl.textContent = data.error || 'Error saving.';
+                    errEl.classList.remove('d-none');
+                }
+            })
+            .catch(() => {
+                errEl.textContent = 'Network error.';
+                errEl.classList.remove('d-none');
+            })
+            .finally(() => { this.disabled = false; });
+        });
+    }
+
+    function bindLobbyCopy() {
+        document.querySelectorAll('.copy-lobby-btn-monitor').forEach(btn => {
+            btn.addEventListener('click', function () {
+                navigator.clipboard.writeText(this.dataset.url).then(() => {
+                    const icon = this.querySelector('i');
+                    icon.setAttribute('data-lucide', 'check');
+                    lucide.createIcons();
+                    setTimeout(() => { icon.setAttribute('data-lucide', 'copy'); lucide.createIcons(); }, 1500);
+                });
+            });
+        });
+    }
+
+    // Readiness of the next question (prefetch_status): how many phones have
+    // its image cached, shown next to that question's send button
+    function showPrefetchStatus(data) {
+        document.querySelectorAll('.prefetch-status').forEach(el => el.remove());
+        const item = data.question_id && document.querySelector(`.question-item[data-question-id="${data.question_id}"]`);
+        if (!item) return;
+        const badge = document.createElement('span');
+        const ready = data.total > 0 && data.ready >= data.total;
+        badge.className = 'prefetch-status small ' + (ready ? 'text-success' : 'text-muted');
+        badge.style.whiteSpace = 'nowrap';
+        badge.title = 'Phones that have already loaded the image of this question';
+        badge.textContent = `preloaded ${data.ready}/${data.total}`;
+        const button = item.querySelector('.send-question-btn');
+        (button ? button.parentElement : item).appendChild(badge);
+    }
+
+    // Hub session of the host: the page's, the query string's or the remembered one
+    function hubSessionCode() {
+        const qs = new URLSearchParams(window.location.search);
+        let hub = page.hubSession || qs.get('hub_session') || global.__hubCode;
+        if (!hub) {
+            try { hub = sessionStorage.getItem('_hub_admin'); } catch (_) { }
+        }
+        return hub || null;
+    }
+
+    class Monitor {
+        // socketPath: the game's route below /ws/, e.g. 'quiz';
+        // gameKey: the game's key in the hub, e.g. 'quiz'
+        constructor(socketPath, gameKey) {
+            this.socketPath = socketPath;
+            this.gameKey = gameKey;
+            this.roomCode = page.roomCode;
+            this.websocket = null;
+            this.questionTimer = null;
+            this.quizStartTime = page.startedAt ? new Date(page.startedAt) : null;
+            this.isActive = page.status === 'active';
+            // Seconds left at which the timer circle turns warning / danger
+            this.timerWarning = 40;
+            this.timerDanger = 20;
+        }
+
+        init() {
+            lucide.createIcons();
+            this.connectWebSocket();
+            this.bindEvents();
+            this.startQuizTimer();
+            this.applySentStates();
+
+            // Count down the question that is running while the page loads
+            if (page.hasQuestion) {
+                this.startQuestionTimer();
+            }
+        }
+
+        // -- room socket ---------------------------------------------------
+
+        isConnected() {
+            return this.websocket && this.websocket.readyState === WebSocket.OPEN;
+        }
+
+        send(message) {
+            if (!this.isConnected()) return false;
+            this.websocket.send(JSON.stringify(message));
+            return true;
+        }
+
+        connectWebSocket() {
+            const wsScheme = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+            this.websocket = new WebSocket(`${wsScheme}//${window.location.host}/ws/${this.socketPath}/${this.roomCode}/`);
+
+            this.websocket.onopen = () => {
+                console.log('WebSocket connected');
+                this.updateConnectionStatus(true);
+            };
+
+            this.websocket.onmessage = (event) => {
+                this.handleWebSocketMessage(JSON.parse(event.data));
+            };
+
+            this.websocket.onclose = () => {
+                console.log('WebSocket disconnected');
+                this.updateConnectionStatus(false);
+                setTimeout(() => this.connectWebSocket(), 3000);
+            };
+
+            this.websocket.onerror = (error) => {
+                console.error('WebSocket error:', error);
+                this.updateConnectionStatus(false);
+            };
+        }
+
+        updateConnectionStatus(connected) {
+            // Connection indicator could be added here
+        }
+
+        // Messages every game's room sends; modules handle their own first
+        // and pass the rest on
+        handleWebSocketMessage(data) {
+            switch (data.type) {
+                case 'connection_established':
+                    console.log('Connected:', data.message);
+                    break;
+
+                case 'participant_joined':
+                    this.addParticipant(data.participant);
+                    this.updateParticipantCount();
+                    break;
+
+                case 'participant_answered':
+                    this.addLiveResponse(data.answer);
+                    break;
+
+                case 'quiz_started':
+                    console.log('Quiz started:', data.message);
+                    this.isActive = true;
+                    if (data.timestamp) this.quizStartTime = new Date(data.timestamp);
+                    // Enable question send buttons if they were disabled before start
+                    document.querySelectorAll('.send-question-btn').forEach(btn => {
+                        btn.disabled = false;
+                        btn.removeAttribute('title');
+                    });
+                    // Re-apply sent state so already-sent questions remain blocked
+                    this.applySentStates();
+                    break;
+
+                case 'tutorial_start':
+                    this.updateTutorialProgress(0, 0, false);
+                    break;
+
+                case 'tutorial_progress':
+                    this.updateTutorialProgress(data.completed, data.total, data.all_done);
+                    break;
+
+                case 'prefetch_status':
+                    showPrefetchStatus(data);
+                    break;
+
+                case 'question_started':
+                    console.log('Question started');
+                    location.reload();
+                    break;
+
+                case 'question_ended':
+                    console.log('Question ended:', data.message);
+                    location.reload();
+                    break;
+
+                case 'quiz_ended':
+                    console.log('Quiz ended:', data.message);
+                    // Clear persisted sent state so a new session starts fresh
+                    this.resetSentStates();
+                    location.reload();
+                    break;
+
+                default:
+                    console.log('Unknown message type:', data.type);
+            }
+        }
+
+        // -- sent questions (localStorage, survives the reloads) ----------
+
+        getStorageKey() {
+            return `quiz_sent_${this.roomCode}`;
+        }
+
+        getSentSet() {
+            try {
+                const raw = localStorage.getItem(this.getStorageKey());
+                if (!raw) return new Set();
+                const arr = JSON.parse(raw);
+                return new Set(Array.isArray(arr) ? arr : []);
+            } catch (_) { return new Set(); }
+        }
+
+        saveSentSet(sentSet) {
+            try { localStorage.setItem(this.getStorageKey(), JSON.stringify([...sentSet])); } catch (_) { }
+        }
+
+        isQuestionSent(qid) {
+            return this.getSentSet().has(String(qid));
+        }
+
+        markQuestionSent(qid) {
+            const sent = this.getSentSet();
+            sent.add(String(qid));
+            this.saveSentSet(sent);
+        }
+
+        applySentStates() {
+            document.querySelectorAll('.send-question-btn').forEach(btn => {
+                const qid = btn.getAttribute('data-question-id');
+                if (this.isQuestionSent(qid)) {
+                    this.updateSendButtonAsSent(btn);
+                }
+            });
+        }
+
+        updateSendButtonAsSent(btn) {
+            btn.disabled = false;
+            btn.classList.remove('loading');
+            btn.innerHTML = '<i data-lucide="send"></i> Send Question';
+            btn.removeAttribute('title');
+            // Add "already sent" hint next to button if not already there
+            const wrapper = btn.closest('.d-flex');
+            if (wrapper && !wrapper.querySelector('.already-sent-hint')) {
+                const hint = document.createElement('span');
+                hint.className = 'already-sent-hint text-muted small';
+                hint.style.whiteSpace = 'nowrap';
+                hint.innerHTML = '<i data-lucide="check-circle" style="width:13px;height:13px;color:#6c757d;vertical-align:-2px;"></i> already sent';
+                wrapper.appendChild(hint);
+            }
+            try { lucide.createIcons(); } catch (_) { }
+        }
+
+        // Reset all persisted and UI states for sent questions
+        resetSentStates() {
+            try { localStorage.removeItem(this.getStorageKey()); } catch (_) { }
+            document.querySelectorAll('.send-question-btn').forEach(btn => {
+                btn.disabled = false;
+                btn.classList.remove('loading');
+                btn.innerHTML = '<i data-lucide="send"></i> Send Question';
+                btn.removeAttribute('title');
+            });
+            try { lucide.createIcons(); } catch (_) { }
+        }
+
+        // -- host controls ---------------------------------------------------
+
+        bindEvents() {
+            document.getElementById('startQuizBtn')?.addEventListener('click', () => {
+                this.startQuiz();
+            });
+
+            document.getElementById('endQuizBtn')?.addEventListener('click', () => {
+                if (confirm('Are you sure you want to end this quiz?')) {
+                    this.endQuiz();
+                }
+            });
+
+            document.getElementById('backToHubBtn')?.addEventListener('click', () => {
+                this.backToHub();
+            });
+
+            // End quiz from warning modal → end quiz, then navigate
+            document.getElementById('endQuizFromWarningBtn')?.addEventListener('click', () => {
+                bootstrap.Modal.getInstance(document.getElementById('quizActiveWarningModal'))?.hide();
+                this.endQuiz();
+                setTimeout(() => this.navigateToHub(), 800);
+            });
+
+            document.querySelectorAll('.send-question-btn').forEach(btn => {
+                btn.addEventListener('click', () => {
+                    const questionId = btn.dataset.questionId;
+                    if (!this.isActive) {
+                        alert('Start the quiz before sending questions.');
+                        return;
+                    }
+                    // Ask for confirmation if question was already sent
+                    if (this.isQuestionSent(questionId)) {
+                        if (!confirm('This question has already been sent. Do you want to send it again?')) {
+                            return;
+                        }
+                    }
+                    this.sendQuestion(questionId);
+                });
+            });
+
+            document.getElementById('endQuestionBtn')?.addEventListener('click', () => {
+                this.endCurrentQuestion();
+            });
+        }
+
+        startQuiz() {
+            if (!this.isConnected()) return;
+            // Also notify hub directly (in case backend mirror is unavailable)
+            const hub = hubSessionCode();
+            if (hub) {
+                const wsScheme = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+                const hubWs = new WebSocket(`${wsScheme}//${window.location.host}/ws/hub/${hub}/`);
+                hubWs.onopen = () => {
+                    hubWs.send(JSON.stringify({
+                        type: 'broadcast',
+                        event: { type: 'quiz_started', game_key: this.gameKey, room_code: this.roomCode, title: page.title }
+                    }));
+                    setTimeout(() => hubWs.close(), 100);
+                };
+            }
+            const message = { type: 'admin_start_quiz' };
+            const tutorialToggle = document.getElementById('showTutorialToggle');
+            if (tutorialToggle) message.show_tutorial = tutorialToggle.checked;
+            this.send(message);
+            location.reload();
+        }
+
+        endQuiz() {
+            if (this.send({ type: 'admin_end_quiz' })) {
+                // Immediately reset UI/local state on admin action
+                this.resetSentStates();
+            }
+        }
+
+        // A running quiz asks first where the page has the warning modal
+        backToHub() {
+            const warning = document.getElementById('quizActiveWarningModal');
+            if (this.isActive && warning) {
+                new bootstrap.Modal(warning).show();
+                return;
+            }
+            this.navigateToHub();
+        }
+
+        navigateToHub() {
+            const hub = hubSessionCode();
+            if (hub) {
+                window.location.href = `/hub/monitor/${hub}/`;
+            } else if (page.homeUrl) {
+                window.location.href = page.homeUrl;
+            }
+        }
+
+        // Seconds the host set for the question, as the timer should show them
+        timeOverride(seconds, button) {
+            return seconds;
+        }
+
+        sendQuestion(questionId) {
+            if (!this.isConnected()) return;
+            const btn = document.querySelector(`.send-question-btn[data-question-id="${questionId}"]`);
+            if (btn) btn.classList.add('loading');
+
+            // Read optional time override from the question's input
+            let customTime = null;
+            const item = btn ? btn.closest('.question-item') : null;
+            const input = item ? item.querySelector('.question-time-input') : null;
+            if (input && input.value) {
+                const v = parseInt(input.value, 10);
+                if (!isNaN(v) && v > 0) customTime = v;
+            }
+
+            const payload = { type: 'admin_send_question', question_id: questionId };
+            if (customTime) {
+                payload.custom_time_limit = customTime;
+                // Persist for admin-side timer after backend switches state
+                try { localStorage.setItem(`override_time_${this.roomCode}`, String(this.timeOverride(customTime, btn))); } catch (_) { }
+            }
+            this.send(payload);
+
+            // Optimistically mark as sent to prevent duplicate sends
+            this.markQuestionSent(questionId);
+            if (btn) this.updateSendButtonAsSent(btn);
+        }
+
+        endCurrentQuestion() {
+            this.send({ type: 'admin_end_question' });
+        }
+
+        onQuestionTimeout() {
+            console.log('Question timed out');
+            this.send({ type: 'admin_end_question' });
+        }
+
+        // -- timers ----------------------------------------------------------
+
+        startQuestionTimer() {
+            // Prefer any override set at send-time (stored just before backend switched state)
+            let override = null;
+            try {
+                const raw = localStorage.getItem(`override_time_${this.roomCode}`);
+                if (raw) {
+                    const v = parseInt(raw, 10);
+                    if (!isNaN(v) && v > 0) override = v;
+                }
+            } catch (_) { }
+            const timerElement = document.getElementById('questionTimeLeft');
+            let serverTimeLeft = 0;
+            if (timerElement && timerElement.textContent) {
+                const sv = parseInt(timerElement.textContent, 10);
+                if (!isNaN(sv) && sv > 0) serverTimeLeft = sv;
+            }
+            let currentTime = (override !== null) ? override : serverTimeLeft;
+            if (currentTime <= 0) return;
+
+            const circleElement = document.getElementById('questionTimerCircle');
+            this.questionTimer = setInterval(() => {
+                currentTime--;
+                if (timerElement) timerElement.textContent = currentTime;
+
+                if (circleElement) {
+                    circleElement.className = 'timer-circle';
+                    if (currentTime <= this.timerDanger) {
+                        circleElement.classList.add('danger');
+                    } else if (currentTime <= this.timerWarning) {
+                        circleElement.classList.add('warning');
+                    }
+                }
+
+                if (currentTime <= 0) {
+                    clearInterval(this.questionTimer);
+                    this.onQuestionTimeout();
+                }
+            }, 1000);
+            // Clear one-time override so subsequent questions use their own values
+            try { localStorage.removeItem(`override_time_${this.roomCode}`); } catch (_) { }
+        }
+
+        startQuizTimer() {
+            if (!this.quizStartTime) return;
+
+            const updateTimer = () => {
+                const elapsed = Math.floor((new Date() - this.quizStartTime) / 1000);
+                const minutes = Math.floor(elapsed / 60);
+                const seconds = elapsed % 60;
+                const timerElement = document.getElementById('quizTimer');
+                if (timerElement) {
+                    timerElement.textContent =
+                        `${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
+                }
+            };
+
+            updateTimer();
+            setInterval(updateTimer, 1000);
+        }
+
+        updateTutorialProgress(completed, total, allDone) {
+            const card = document.getElementById('tutorialProgressCard');
+            if (card) card.style.display = '';
+            const text = document.getElementById('tutProgressText');
+            const bar = document.getElementById('tutProgressBar');
+            const badge = document.getElementById('tutAllDoneBadge');
+            if (text) text.textContent = completed + ' / ' + total;
+            const pct = total > 0 ? Math.round((completed / total) * 100) : 0;
+            if (bar) {
+                bar.style.width = pct + '%';
+                bar.setAttribute('aria-valuenow', pct);
+            }
+            if (badge) {
+                badge.style.display = allDone ? '' : 'none';
+                if (allDone) lucide.createIcons();
+            }
+        }
+
+        // -- participants (the leaderboard) and live responses ---------------
+
+        participantAvatar(participant) {
+            return '<i data-lucide="user"></i>';
+        }
+
+        // Score line and, per game, its statistics below the name
+        participantScore(participant) {
+            return `<div class="participant-score" id="score-${participant.id}">${participant.total_score || 0} pts</div>`;
+        }
+
+        // Badge next to the edit button, e.g. the accuracy
+        participantBadge(participant) {
+            return '';
+        }
+
+        participantMarkup(participant) {
+            const badge = this.participantBadge(participant);
+            return `
+                <div class="participant-avatar">
+                    ${this.participantAvatar(participant)}
+                </div>
+                <div class="participant-info">
+                    <div class="participant-name">${participant.name}</div>
+                    ${this.participantScore(participant)}
+                </div>
+                <div class="${badge ? 'participant-stats' : 'participant-status'}">
+                    ${badge}
+                    ${this.editScoreButton(participant, participant.total_score, badge ? 'ms-1' : 'me-1')}
+                    <div class="status-dot online"></div>
+                </div>
+            `;
+        }
+
+        editScoreButton(participant, score, margin) {
+            return `<button class="btn btn-link btn-sm p-0 ${margin} edit-score-btn" title="Set points manually"
+                        data-participant-id="${participant.id}"
+                        data-participant-name="${participant.name}"
+                        data-current-score="${score || 0}"
+                        data-bs-toggle="modal" data-bs-target="#editScoreModal">
+                        <i data-lucide="pencil" style="width:14px;height:14px;color:#6c757d;"></i>
+                    </button>`;
+        }
+
+        addParticipant(participant) {
+            const participantsList = document.getElementById('participantsList');
+            if (!participantsList) return;
+
+            participantsList.querySelector('.no-participants')?.remove();
+            if (participantsList.querySelector(`[data-participant-name="${participant.name}"]`)) return;
+
+            const participantEl = document.createElement('div');
+            participantEl.className = 'participant-item';
+            participantEl.dataset.participantName = participant.name;
+            participantEl.innerHTML = this.participantMarkup(participant);
+            participantsList.appendChild(participantEl);
+            lucide.createIcons();
+        }
+
+        updateParticipantCount() {
+            const count = document.querySelectorAll('.participant-item').length;
+            const countElement = document.getElementById('participantCount');
+            const badgeElement = document.getElementById('participantBadge');
+            if (countElement) countElement.textContent = count;
+            if (badgeElement) badgeElement.textContent = count;
+        }
+
+        responseQuality(response) {
+            if (response.accuracy_rating === 'Excellent') return 'excellent';
+            if (response.accuracy_rating === 'Very Good' || response.accuracy_rating === 'Good') return 'good';
+            if (response.accuracy_rating === 'Fair') return 'fair';
+            return 'poor';
+        }
+
+        responseDetails(response) {
+            return `Sent Answer: ${response.answer_text} • +${response.points_earned} pts`;
+        }
+
+        // Called with each new response element, e.g. for review buttons
+        responseAdded(responseEl, response) { }
+
+        addLiveResponse(response) {
+            const responsesContainer = document.getElementById('liveResponses');
+            if (!responsesContainer) return;
+
+            responsesContainer.querySelector('.no-responses')?.remove();
+
+            const responseEl = document.createElement('div');
+            responseEl.className = 'response-item';
+            responseEl.innerHTML = `
+                <div class="response-avatar ${this.responseQuality(response)}">
+                    ${response.participant_name.charAt(0).toUpperCase()}
+                </div>
+                <div class="response-content">
+                    <div class="response-name">${response.participant_name}</div>
+                    <div class="response-details">
+                        ${this.responseDetails(response)}
+                    </div>
+                </div>
+                <div class="response-time">${response.time_taken ? response.time_taken.toFixed(1) + 's' : '-'}</div>
+            `;
+            responsesContainer.insertBefore(responseEl, responsesContainer.firstChild);
+            this.responseAdded(responseEl, response);
+
+            const responseCount = document.getElementById('responseCount');
+            if (responseCount) responseCount.textContent = document.querySelectorAll('.response-item').length;
+        }
+    }
+
+    global.MonitorRuntime = { page, Monitor, followHubSession, hubSessionCode, showPrefetchStatus };
+
+    followHubSession();
+    bindScoreEditor();
+    bindLobbyCopy();
+})(window);
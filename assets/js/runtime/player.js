@@ -0,0 +1,256 @@
+// Shared runtime of the game play pages: the game socket with resume and
+// reconnect, the question timer, state switching and the way back to the hub
+// lobby. Each game's module (assets/js/games/) extends GamesRuntime.Player.
+// Page data (room, participant, current question) is set by the play
+// template in window.GAME_PAGE.
+(function (global) {
+    'use strict';
+
+    const page = global.GAME_PAGE || {};
+
+    function socketUrl(path) {
+        const wsScheme = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        return `${wsScheme}//${window.location.host}${path}`;
+    }
+
+    // Hub session of this browser: remembered by the lobby, or in the query string
+    function hubSessionCode() {
+        let hubCode = null;
+        try { hubCode = localStorage.getItem('hub_session_code'); } catch (_) { }
+        if (!hubCode) {
+            const qp = new URLSearchParams(window.location.search);
+            hubCode = qp.get('hub_session') || '';
+        }
+        return hubCode;
+    }
+
+    class Player {
+        // socketPath: the game's route below /ws/, e.g. 'quiz'
+        constructor(socketPath) {
+            this.socketPath = socketPath;
+            this.roomCode = page.roomCode;
+            this.participantName = page.participantName;
+            this.hubSession = page.hubSession;
+            this.websocket = null;
+            this.questionTimer = null;
+            this.questionStartTime = null;
+            this.hasAnswered = false;
+            // Seconds left at which the timer circle turns warning / danger
+            this.timerWarning = 20;
+            this.timerDanger = 10;
+        }
+
+        init() {
+            this.connectWebSocket();
+            this.bindEvents();
+
+            // Resume the question that is running while the page loads
+            if (page.question) {
+                this.resumeQuestion(page.question);
+            }
+        }
+
+        bindEvents() { }
+
+        resumeQuestion(question) {
+            this.startQuestionTimer(question.time_limit);
+            this.loadQuestion(question);
+        }
+
+        connectWebSocket() {
+            const token = encodeURIComponent(page.token || '');
+            this.websocket = GamesWire.open(socketUrl(`/ws/${this.socketPath}/${this.roomCode}/?token=${token}`));
+
+            this.websocket.onopen = () => {
+                console.log('WebSocket connected');
+                this.hideConnectionStatus();
+
+                this.websocket.send(JSON.stringify(this.joinMessage()));
+            };
+
+            this.websocket.onmessage = (event) => {
+                const data = GamesWire.parse(event.data);
+                // Remember the room sequence number so a reconnect can resume
+                if (typeof data.seq === 'number') { this.lastSeq = data.seq; this.seqLog = data.seq_log; }
+                if (data.type === 'prefetch') {
+                    this.prefetchAssets(data);
+                    return;
+                }
+                this.handleWebSocketMessage(data);
+            };
+
+            this.websocket.onclose = () => {
+                console.log('WebSocket disconnected');
+                this.showConnectionStatus();
+                // Attempt to reconnect after 3 seconds
+                setTimeout(() => this.connectWebSocket(), 3000);
+            };
+
+            this.websocket.onerror = (error) => {
+                console.error('WebSocket error:', error);
+                this.showConnectionStatus();
+            };
+        }
+
+        // Sent on every (re)connect; last_seq lets the room replay what was missed
+        joinMessage() {
+            return {
+                type: 'participant_join',
+                participant_name: this.participantName,
+                hub_session: this.hubSession,
+                last_seq: this.lastSeq,
+                seq_log: this.seqLog,
+            };
+        }
+
+        handleWebSocketMessage(data) { }
+
+        // Load the next question's images into the cache while the answer is
+        // shown, then tell the room this phone is ready for it
+        prefetchAssets(data) {
+            if (this.prefetchedQuestion === data.question_id) return;
+            this.prefetchedQuestion = data.question_id;
+            const loads = (data.assets || []).map((url) => new Promise((resolve) => {
+                const img = new Image();
+                img.onload = () => resolve(true);
+                img.onerror = () => resolve(false);
+                img.src = url;
+            }));
+            Promise.all(loads).then((loaded) => {
+                if (!loaded.every(Boolean)) return;
+                if (this.websocket && this.websocket.readyState === WebSocket.OPEN) {
+                    this.websocket.send(JSON.stringify({
+                        type: 'prefetch_ready',
+                        question_id: data.question_id,
+                    }));
+                }
+            });
+        }
+
+        // Counts down on the question timer and on the one of the submitted state
+        startQuestionTimer(timeLimit) {
+            clearInterval(this.questionTimer);
+
+            let timeLeft = timeLimit;
+            const timers = [
+                [document.getElementById('playerTimeLeft'), document.getElementById('playerTimerCircle')],
+                [document.getElementById('playerTimeLeftSubmitted'), document.getElementById('playerTimerCircleSubmitted')],
+            ];
+
+            const updateTimer = () => {
+                const level = timeLeft <= this.timerDanger ? ' danger' : timeLeft <= this.timerWarning ? ' warning' : '';
+                timers.forEach(([timer, circle]) => {
+                    if (timer) timer.textContent = timeLeft;
+                    if (circle) circle.className = 'timer-circle' + level;
+                });
+            };
+
+            updateTimer();
+
+            this.questionTimer = setInterval(() => {
+                timeLeft--;
+                updateTimer();
+
+                if (timeLeft <= 0) {
+                    clearInterval(this.questionTimer);
+                    this.onTimeUp();
+                }
+            }, 1000);
+        }
+
+        onTimeUp() { }
+
+        onQuizEnded(data) {
+            clearInterval(this.questionTimer);
+            // If final scores are provided, update the displayed score for this participant
+            try {
+                if (data && Array.isArray(data.final_scores)) {
+                    const me = data.final_scores.find(p => p.name === this.participantName);
+                    if (me && typeof me.total_score === 'number') {
+                        const scoreEl = document.querySelector('#quizEndedState .score-value');
+                        if (scoreEl) scoreEl.textContent = me.total_score;
+                    }
+                }
+            } catch (e) { console.warn('Unable to update final score:', e); }
+            this.showState('quizEndedState');
+            this.returnToLobby(2000);
+        }
+
+        // Back to the hub lobby with the nickname preserved
+        returnToLobby(delay) {
+            setTimeout(() => {
+                const hubCode = hubSessionCode();
+                if (hubCode) {
+                    const url = new URL(`/hub/lobby/${hubCode}/`, window.location.origin);
+                    url.searchParams.set('nickname', this.participantName);
+                    window.location.href = url.toString();
+                }
+            }, delay);
+        }
+
+        showWaitingForNextQuestion() {
+            // Switch to a safe waiting state without destroying existing DOM nodes
+            this.showState('waitingQuestionState');
+            const waiting = document.getElementById('waitingQuestionState');
+            if (waiting) {
+                try { lucide.createIcons(); } catch (e) { /* ignore */ }
+            }
+        }
+
+        showState(stateId) {
+            // Hide all states
+            document.querySelectorAll('.game-state').forEach(state => {
+                state.classList.add('d-none');
+            });
+
+            // Show target state
+            const targetState = document.getElementById(stateId);
+            if (targetState) {
+                targetState.classList.remove('d-none');
+            }
+        }
+
+        updateParticipantCount(count) {
+            const countElement = document.getElementById('waitingParticipantCount');
+            if (countElement) {
+                countElement.textContent = count;
+            }
+        }
+
+        showConnectionStatus() {
+            document.getElementById('connectionStatus').classList.remove('d-none');
+        }
+
+        hideConnectionStatus() {
+            document.getElementById('connectionStatus').classList.add('d-none');
+        }
+    }
+
+    // Listen on the hub session so the page returns to the lobby when the host ends it
+    function followHubSession() {
+        const hubCode = hubSessionCode();
+        if (!hubCode) {
+            return null;
+        }
+
+        const hubWS = GamesWire.open(socketUrl(`/ws/hub/${hubCode}/`));
+        hubWS.onmessage = (event) => {
+            try {
+                const data = GamesWire.parse(event.data);
+                if (data.type === 'session_ended') {
+                    const u = new URL(`/hub/lobby/${hubCode}/`, window.location.origin);
+                    u.searchParams.set('ended', '1');
+                    window.location.href = u.toString();
+                }
+            } catch (err) {
+                console.error('Failed to parse hub message:', event.data, err);
+            }
+        };
+        hubWS.onerror = (err) => {
+            console.error('Hub WebSocket error:', err);
+        };
+        return hubWS;
+    }
+
+    global.GamesRuntime = { page, Player, followHubSession, hubSessionCode };
+})(window);
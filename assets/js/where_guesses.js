@@ -0,0 +1,69 @@
+// Where everyone guessed: draws the guesses summary of a Where Is This
+// question_ended (heatmap cells, clusters, closest guesses; see
+// where_is_this/guesses.py) onto a Leaflet map. Used by the play page and
+// the monitor.
+(function (global) {
+    'use strict';
+
+    // Inline, so the play page and the monitor need no extra stylesheet
+    const CLUSTER_STYLE = 'display:flex;align-items:center;justify-content:center;width:28px;height:28px;' +
+        'border-radius:50%;background:#212529;color:#fff;font-size:12px;font-weight:600;' +
+        'border:2px solid #fff;box-shadow:0 1px 4px rgba(0,0,0,.4);';
+
+    function escapeHtml(text) {
+        const div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
+
+    // Returns the layer group it added, or null if nobody guessed
+    function draw(map, guesses) {
+        if (!guesses || !guesses.count) return null;
+        const layer = L.layerGroup().addTo(map);
+        const largest = Math.max(...guesses.heatmap.map((cell) => cell[2]));
+        const points = [];
+
+        guesses.heatmap.forEach(([lat, lon, count]) => {
+            L.circleMarker([lat, lon], {
+                radius: 6 + 14 * Math.sqrt(count / largest),
+                stroke: false,
+                fillColor: '#dc3545',
+                fillOpacity: 0.25 + 0.45 * (count / largest),
+            }).addTo(layer).bindTooltip(`${count} guess${count === 1 ? '' : 'es'}`);
+            points.push([lat, lon]);
+        });
+
+        guesses.clusters.forEach((cluster) => {
+            L.marker([cluster.lat, cluster.lon], {
+                icon: L.divIcon({
+                    className: 'guess-cluster',
+                    html: `<span style="${CLUSTER_STYLE}">${cluster.count}</span>`,
+                    iconSize: [28, 28],
+                }),
+            }).addTo(layer).bindPopup(
+                `${cluster.count} guess${cluster.count === 1 ? '' : 'es'}<br>` +
+                `Closest: ${escapeHtml(cluster.closest.name)} (${cluster.closest.distance_km} km)`
+            );
+        });
+
+        if (guesses.correct) {
+            L.circleMarker(guesses.correct, {
+                radius: 8, color: '#198754', weight: 3, fillColor: '#198754', fillOpacity: 0.9,
+            }).addTo(layer).bindTooltip('Correct location');
+            points.push(guesses.correct);
+        }
+        if (points.length > 1) {
+            map.fitBounds(L.latLngBounds(points), { padding: [24, 24], maxZoom: 8 });
+        }
+        return layer;
+    }
+
+    // "Anna – 12.3 km" lines of the closest guesses
+    function closestList(guesses) {
+        return (guesses && guesses.closest || []).map((guess, i) =>
+            `<li><strong>${i + 1}.</strong> ${escapeHtml(guess.name)} – ${guess.distance_km} km</li>`
+        ).join('');
+    }
+
+    global.WhereGuesses = { draw, closestList };
+})(window);
@@ -0,0 +1,127 @@
+// Browser side of the opt-in games.msgpack.v1 WebSocket sub-protocol (see games_hub/wire.py).
+// GamesWire.open(url) offers the binary protocol when enabled; GamesWire.parse(event.data)
+// returns the message object for JSON text and msgpack frames alike. Clients keep sending JSON.
+(function (global) {
+    'use strict';
+
+    const SUBPROTOCOL = 'games.msgpack.v1';
+    const JSON_SUBPROTOCOL = 'games.json.v1';
+
+    // Append-only; must match FIELDS in games_hub/wire.py
+    const FIELDS = [
+        'type', 'message', 'seq', 'seq_log', 'room_code', 'game_key', 'id', 'name', 'participant',
+        'participant_name', 'hub_session', 'last_seq', 'question', 'question_id', 'question_text',
+        'question_type', 'question_number', 'time_limit', 'options', 'key', 'text', 'answer',
+        'answer_text', 'user_answer', 'correct_answer', 'formatted_answer', 'is_correct', 'points',
+        'points_earned', 'total_score', 'total_points', 'final_scores', 'time_taken', 'accuracy',
+        'accuracy_percentage', 'status', 'title', 'image_url', 'hint_text', 'event',
+        'rounds_survived', 'is_eliminated', 'is_busted', 'total_possible_points', 'unit', 'round',
+        'survivors', 'correct_order_ids', 'placed_after_id', 'placed_before_id', 'clue', 'session',
+        'step', 'order', 'index', 'explanation', 'difference', 'percentage_difference',
+        'distance_km', 'formatted_distance', 'correct_matches', 'total_matches', 'nickname',
+        'participants'
+    ];
+
+    const script = document.currentScript;
+    const textDecoder = new TextDecoder();
+
+    function decode(buffer) {
+        const view = new DataView(buffer);
+        const bytes = new Uint8Array(buffer);
+        let pos = 0;
+
+        function str(length) {
+            const value = textDecoder.decode(bytes.subarray(pos, pos + length));
+            pos += length;
+            return value;
+        }
+        function array(length) {
+            const value = new Array(length);
+            for (let i = 0; i < length; i++) value[i] = read();
+            return value;
+        }
+        function map(length) {
+            const value = {};
+            for (let i = 0; i < length; i++) {
+                const key = read();
+                value[typeof key === 'number' && key < FIELDS.length ? FIELDS[key] : key] = read();
+            }
+            return value;
+        }
+        function uint(size) {
+            const value = size === 1 ? view.getUint8(pos) : size === 2 ? view.getUint16(pos)
+                : size === 4 ? view.getUint32(pos) : Number(view.getBigUint64(pos));
+            pos += size;
+            return value;
+        }
+        function int(size) {
+            const value = size === 1 ? view.getInt8(pos) : size === 2 ? view.getInt16(pos)
+                : size === 4 ? view.getInt32(pos) : Number(view.getBigInt64(pos));
+            pos += size;
+            return value;
+        }
+        function read() {
+            const byte = bytes[pos++];
+            if (byte < 0x80) return byte;
+            if (byte < 0x90) return map(byte & 0x0f);
+            if (byte < 0xa0) return array(byte & 0x0f);
+            if (byte < 0xc0) return str(byte & 0x1f);
+            if (byte >= 0xe0) return byte - 0x100;
+            switch (byte) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xc4: case 0xc5: case 0xc6: {
+                    const length = uint(1 << (byte - 0xc4));
+                    const value = bytes.slice(pos, pos + length);
+                    pos += length;
+                    return value;
+                }
+                case 0xca: { const value = view.getFloat32(pos); pos += 4; return value; }
+                case 0xcb: { const value = view.getFloat64(pos); pos += 8; return value; }
+                case 0xcc: return uint(1);
+                case 0xcd: return uint(2);
+                case 0xce: return uint(4);
+                case 0xcf: return uint(8);
+                case 0xd0: return int(1);
+                case 0xd1: return int(2);
+                case 0xd2: return int(4);
+                case 0xd3: return int(8);
+                case 0xd9: return str(uint(1));
+                case 0xda: return str(uint(2));
+                case 0xdb: return str(uint(4));
+                case 0xdc: return array(uint(2));
+                case 0xdd: return array(uint(4));
+                case 0xde: return map(uint(2));
+                case 0xdf: return map(uint(4));
+            }
+            throw new Error('Unsupported msgpack byte 0x' + byte.toString(16));
+        }
+
+        return read();
+    }
+
+    function enabled() {
+        // ?wire=msgpack|json overrides the server default for this browser
+        const choice = new URLSearchParams(global.location.search).get('wire');
+        if (choice) {
+            try { global.localStorage.setItem('gamesWire', choice); } catch (e) { /* private mode */ }
+        }
+        let stored = null;
+        try { stored = global.localStorage.getItem('gamesWire'); } catch (e) { /* private mode */ }
+        const preference = choice || stored || (script && script.dataset.msgpack);
+        return preference === 'msgpack' || preference === 'on';
+    }
+
+    function open(url) {
+        const socket = enabled() ? new WebSocket(url, [SUBPROTOCOL, JSON_SUBPROTOCOL]) : new WebSocket(url);
+        socket.binaryType = 'arraybuffer';
+        return socket;
+    }
+
+    function parse(data) {
+        return typeof data === 'string' ? JSON.parse(data) : decode(data);
+    }
+
+    global.GamesWire = { SUBPROTOCOL, FIELDS, decode, open, parse };
+})(window);
@@ -1,15 +1,27 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from .models import BlackJackQuiz, BlackJackParticipant, BlackJackQuestion, BlackJackAnswer
+from games_hub.guard import GuardMixin
+from games_hub.logs import bind_log_context
+from games_hub.metrics import MetricsMixin
+from games_hub.presence import PresenceMixin
+from games_hub.profiling import ProfilingMixin
+from games_hub.replay import ResumableRoomMixin
+from games_hub.tokens import participant_lookup
+from games_hub.wire import BinaryProtocolMixin
 from games_hub.models import HubGameStep
 
+logger = logging.getLogger(__name__)
 
-class BlackJackConsumer(AsyncWebsocketConsumer):
+
+class BlackJackConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, ResumableRoomMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_code = self.scope['url_route']['kwargs']['room_code']
         self.room_group_name = f'blackjack_{self.room_code}'
+        bind_log_context(room=self.room_code)
 
         # Join room group
         await self.channel_layer.group_add(
@@ -38,7 +50,7 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get('type')
             
-            print("BlackJack Consumer: ", message_type)
+            logger.debug('Received %s', message_type)
             if message_type == 'admin_start_quiz':
                 await self.handle_admin_start_quiz(text_data_json)
             elif message_type == 'admin_send_question':
@@ -64,12 +76,11 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
         """Handle admin starting the quiz"""
         quiz = await self.get_quiz()
         if quiz:
-            print(quiz.get('id'))
+            logger.info('Starting quiz %s', quiz.get('id'))
             await self.start_quiz_db(quiz.get('id'))
             
             # Broadcast to all participants
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_started',
                     'message': 'BlackJack Quiz has started!'
@@ -120,8 +131,7 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
         effective_time_limit = custom_time_limit if custom_time_limit is not None else question.time_limit
         
         # Broadcast new question to all participants
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_started',
                 'question': {
@@ -146,8 +156,7 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
             # Check if quiz is complete (5 questions asked)
             quiz_complete = quiz['current_question_number'] >= 5
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'question_ended',
                     'message': 'Time\'s up!',
@@ -164,8 +173,7 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
             # Collect final totals (BlackJack uses total_points)
             final_scores = await self.get_final_scores()
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_ended',
                     'message': 'BlackJack Quiz has ended. Thank you for playing!',
@@ -212,8 +220,7 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
             }))
 
             # Broadcast to admin dashboard (live answers)
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_answered',
                     'answer': {
@@ -237,11 +244,16 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
         participant = await self.get_participant_by_name(participant_name, hub_session)
         
         if participant:
-            await self.mark_participant_active(participant['id'])
-            
+            self.join_presence(BlackJackParticipant, participant['id'], self.room_group_name, hub_session)
+
+        # Reconnects replay missed room events from memory when possible; the
+        # socket joins presence first so a resumed player still counts
+        if await self.resume(data):
+            return
+
+        if participant:
             # Broadcast to admin
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_joined',
                     'participant': {
@@ -355,7 +367,7 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
     def get_participant_by_name(self, participant_name, hub_session):
         try:
             quiz = BlackJackQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session))
             return {
                 'id': participant.id,
                 'name': participant.name,
@@ -441,7 +453,7 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
     def save_participant_answer(self, participant_name, hub_session_code, user_answer, time_taken):
         try:
             quiz = BlackJackQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
             
             if not quiz.current_question:
                 return None
@@ -489,16 +501,6 @@ class BlackJackConsumer(AsyncWebsocketConsumer):
         except (BlackJackQuiz.DoesNotExist, BlackJackParticipant.DoesNotExist):
             return None
 
-    @database_sync_to_async
-    def mark_participant_active(self, participant_id):
-        try:
-            participant = BlackJackParticipant.objects.get(id=participant_id)
-            participant.is_active = True
-            participant.last_activity = timezone.now()
-            participant.save()
-        except BlackJackParticipant.DoesNotExist:
-            pass
-
     @database_sync_to_async
     def get_final_scores(self):
         try:
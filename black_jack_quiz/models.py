@@ -138,6 +138,9 @@ class BlackJackParticipant(SyncBase):
     is_busted = models.BooleanField(default=False)  # True if they went over 21
     final_score = models.IntegerField(default=0)  # Final score calculation
     hub_session_code = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    hub_participant = models.ForeignKey(
+        'games_hub.HubParticipant', null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+    )
     
     class Meta:
         unique_together = ['quiz', 'name', 'hub_session_code']
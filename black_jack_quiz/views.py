@@ -5,6 +5,10 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.db.models import Avg, Count, Q
 import json
+from games_hub.enrolment import resolve_play_participant
+from games_hub.presence import present_count
+from games_hub.status import record_activity, versioned_status
+from games_hub.tokens import get_participant_or_404, issue_token
 from .models import BlackJackQuiz, BlackJackQuestion, BlackJackParticipant, BlackJackAnswer, BlackJackSession
 
 
@@ -101,6 +105,7 @@ def blackjack_join_view(request):
             return JsonResponse({
                 'success': True,
                 'participant_id': participant.id,
+                'token': issue_token(participant),
                 'quiz_status': quiz.status
             })
             
@@ -152,19 +157,10 @@ def blackjack_play(request, room_code, participant_name):
     """BlackJack quiz play page for participants"""
     try:
         session_code = request.GET.get('hub_session')
-        quiz = get_object_or_404(BlackJackQuiz, room_code=room_code)
-        participant = get_object_or_404(
-            BlackJackParticipant, 
-            quiz=quiz, 
-            name=participant_name,
-            hub_session_code=session_code
+        quiz, participant = resolve_play_participant(
+            request, BlackJackQuiz, BlackJackParticipant, room_code, participant_name
         )
         
-        # Mark participant as active
-        participant.is_active = True
-        participant.last_activity = timezone.now()
-        participant.save()
-        
         context = {
             'quiz': quiz,
             'participant': participant,
@@ -259,12 +255,7 @@ def submit_answer(request, room_code, participant_name):
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(BlackJackQuiz, room_code=room_code)
-        participant = get_object_or_404(
-            BlackJackParticipant, 
-            quiz=quiz, 
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, BlackJackParticipant, quiz, participant_name)
         
         # Check if there's an active question
         if not quiz.current_question or quiz.status != 'active':
@@ -345,27 +336,22 @@ def submit_answer(request, room_code, participant_name):
         })
 
 
+@versioned_status('blackjack')
 def get_quiz_status(request, room_code, participant_name):
     """Get current quiz status for participant"""
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(BlackJackQuiz, room_code=room_code)
-        participant = get_object_or_404(
-            BlackJackParticipant, 
-            quiz=quiz, 
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, BlackJackParticipant, quiz, participant_name)
         
-        # Update last activity
-        participant.last_activity = timezone.now()
-        participant.save()
+        # Polls are presence heartbeats (see games_hub/presence.py)
+        record_activity(participant, f'blackjack_{room_code}')
         
         status_data = {
             'quiz_status': quiz.status,
             'current_question': None,
             'participant_points': participant.total_points,
-            'participant_count': quiz.get_participant_count(),
+            'participant_count': present_count(f'blackjack_{room_code}', quiz.participants),
             'questions_answered': participant.questions_answered,
             'is_busted': participant.is_busted,
             'status': participant.get_status(),
@@ -409,12 +395,7 @@ def leave_quiz(request, room_code, participant_name):
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(BlackJackQuiz, room_code=room_code)
-        participant = get_object_or_404(
-            BlackJackParticipant, 
-            quiz=quiz, 
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, BlackJackParticipant, quiz, participant_name)
         
         # Mark participant as inactive instead of deleting
         participant.is_active = False
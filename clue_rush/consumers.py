@@ -1,20 +1,32 @@
 import json
-import asyncio
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from .models import ClueRushGame, ClueRushParticipant, ClueQuestion, ClueAnswer
+from games_hub.guard import GuardMixin
+from games_hub.logs import bind_log_context
+from games_hub.metrics import MetricsMixin
+from games_hub.presence import PresenceMixin
+from games_hub.profiling import ProfilingMixin
+from games_hub.replay import ResumableRoomMixin
+from games_hub.tokens import participant_lookup
+from games_hub.wire import BinaryProtocolMixin
 from games_hub.models import HubGameStep, HubSession
+from .schedule import build_schedule, room_clues, send_next_clue, start_schedule, stop_schedule
 try:
     from rapidfuzz import fuzz
 except Exception:
     fuzz = None
 
+logger = logging.getLogger(__name__)
 
-class ClueRushGameConsumer(AsyncWebsocketConsumer):
+
+class ClueRushGameConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, ResumableRoomMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_code = self.scope['url_route']['kwargs']['room_code']
         self.room_group_name = f'cluerush_{self.room_code}'
+        bind_log_context(room=self.room_code)
 
         # Join room group
         await self.channel_layer.group_add(
@@ -31,8 +43,8 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
         }))
 
     async def clue_started(self, event):
-        """Send started clue to clients"""
-        await self.send(text_data=json.dumps({
+        """Send started clue to clients (serialised once by the schedule)"""
+        await self.send(text_data=event.get('text') or json.dumps({
             'type': 'clue_started',
             'clue': event['clue']
         }))
@@ -56,7 +68,7 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get('type')
             
-            print("ClueRushGame Consumer: ", message_type)
+            logger.debug('Received %s', message_type)
             if message_type == 'admin_start_quiz':
                 await self.handle_admin_start_quiz(text_data_json)
             elif message_type == 'admin_send_question':
@@ -91,8 +103,7 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
             await self.start_quiz_db(quiz.id)
             
             # Broadcast to all participants
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_started',
                     'message': 'ClueRushGame has started!'
@@ -132,15 +143,15 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
         except Exception:
             pass
 
-        # Update quiz with new question
+        # Update quiz with new question and load its clues once
         await self.update_quiz_question(quiz, question)
+        schedule = await self.load_clue_schedule(quiz.id, question)
         
         # Determine the effective time limit for this send (do NOT persist on the question)
         effective_time_limit = custom_time_limit if custom_time_limit is not None else question.time_limit
 
         # Broadcast new question to all participants
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_started',
                 'question': {
@@ -163,30 +174,21 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
             }
         })
 
-        # Start automatic clue sending for this question
-        try:
-            if hasattr(self, 'auto_clue_task') and self.auto_clue_task and not self.auto_clue_task.done():
-                self.auto_clue_task.cancel()
-        except Exception:
-            pass
-        self.auto_clue_task = asyncio.create_task(self._auto_send_clues())
+        # Start automatic clue sending for this question; the task belongs
+        # to the room, not to this socket
+        start_schedule(self.room_code, schedule)
 
     async def handle_admin_end_question(self, data):
         """Handle admin ending current question"""
         quiz = await self.get_quiz()
         if quiz:
             # Stop automatic clue sending if running
-            try:
-                if hasattr(self, 'auto_clue_task') and self.auto_clue_task and not self.auto_clue_task.done():
-                    self.auto_clue_task.cancel()
-            except Exception:
-                pass
+            stop_schedule(self.room_code)
             # Build correct answer payload before clearing the current question
             correct_payload = await self.get_current_question_correct_payload()
             await self.clear_current_question(quiz.id)
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'question_ended',
                     'message': 'Question time is up!',
@@ -203,47 +205,24 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
 
     async def handle_admin_send_clue(self, data):
         """Handle admin requesting to send the next clue for the current question."""
-        # Avoid direct ORM attribute access in async context
-        has_question = await self._has_current_question()
-        if not has_question:
+        room = await self.get_room_clues()
+        if not room:
             return
-        # Advance to next clue in DB, retrieve details
-        next_clue = await self.advance_next_clue()
-        if not next_clue:
-            # No more clues to send; optionally notify
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'clue_sequence_completed',
-                    'message': 'All clues have been sent.'
-                }
-            )
-            return
-        # Broadcast clue start to all clients
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'clue_started',
-                'clue': next_clue,
-            }
-        )
+        # Advances the room's schedule and broadcasts the clue (or that all
+        # clues have been sent)
+        await send_next_clue(room)
 
     async def handle_admin_end_quiz(self, data):
         """Handle admin ending the quiz"""
         quiz = await self.get_quiz()
         if quiz:
             # Stop automatic clue sending if running
-            try:
-                if hasattr(self, 'auto_clue_task') and self.auto_clue_task and not self.auto_clue_task.done():
-                    self.auto_clue_task.cancel()
-            except Exception:
-                pass
+            stop_schedule(self.room_code)
             await self.end_quiz_db(quiz.id)
             # Fetch final scores per participant
             final_scores = await self.get_final_scores()
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_ended',
                     'message': 'ClueRushGame has ended. Thank you for participating!',
@@ -282,8 +261,7 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
             }))
 
             # Broadcast to admin dashboard (live answers)
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_answered',
                     'answer': {
@@ -304,11 +282,16 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
         participant = await self.get_participant_by_name(participant_name, hub_session)
         
         if participant:
-            await self.mark_participant_active(participant['id'])
-            
+            self.join_presence(ClueRushParticipant, participant['id'], self.room_group_name, hub_session)
+
+        # Reconnects replay missed room events from memory when possible; the
+        # socket joins presence first so a resumed player still counts
+        if await self.resume(data):
+            return
+
+        if participant:
             # Broadcast to admin
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_joined',
                     'participant': {
@@ -338,8 +321,7 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
                 'points_earned': result['points_earned'],
             }))
             # Optionally notify all admins in the room
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_answered',
                     'answer': {
@@ -367,8 +349,7 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
         if not result:
             return
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'participant_answered',
                 'answer': {
@@ -457,7 +438,7 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
 
             # Resolve participant within this room's session if possible
             if session_code:
-                participant = quiz.participants.get(name=participant_name, hub_session_code=session_code)
+                participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, session_code))
             else:
                 participant = quiz.participants.get(name=participant_name)
 
@@ -481,11 +462,8 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
                     'time_taken': answer.time_taken,
                 }
 
-            # Compute points like model.save() would on initial create
-            total_clues = quiz.current_question.clues.count()
-            current_clue_number = quiz.session.current_clue_number if hasattr(quiz, 'session') and quiz.session else 0
-            base_points = quiz.current_question.points
-            awarded = base_points + (total_clues - current_clue_number + 1)
+            # Points of a correct answer at the clue showing now
+            awarded = room_clues(self.room_code, quiz).current_points()
 
             answer.is_correct = True
             answer.points_earned = awarded
@@ -514,7 +492,7 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
                 session_code = None
 
             if session_code:
-                participant = quiz.participants.get(name=participant_name, hub_session_code=session_code)
+                participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, session_code))
             else:
                 participant = quiz.participants.get(name=participant_name)
 
@@ -542,42 +520,17 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
         except (ClueRushGame.DoesNotExist, ClueRushParticipant.DoesNotExist):
             return None
 
-    async def _auto_send_clues(self):
-        """Automatically send clues sequentially using each clue's duration."""
-        while True:
-            # Check we still have an active question
-            if not await self._has_current_question():
-                break
-            clue = await self.advance_next_clue()
-            if not clue:
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        'type': 'clue_sequence_completed',
-                        'message': 'All clues have been sent.'
-                    }
-                )
-                break
-            # Broadcast clue
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'clue_started',
-                    'clue': clue,
-                }
-            )
-            try:
-                await asyncio.sleep(max(0, int(clue.get('duration', 0))))
-            except asyncio.CancelledError:
-                break
+    @database_sync_to_async
+    def load_clue_schedule(self, quiz_id, question):
+        return build_schedule(quiz_id, question)
 
     @database_sync_to_async
-    def _has_current_question(self) -> bool:
+    def get_room_clues(self):
         try:
-            quiz = ClueRushGame.objects.only('id', 'current_question').get(room_code=self.room_code)
-            return bool(quiz.current_question_id)
+            quiz = ClueRushGame.objects.select_related('current_question').get(room_code=self.room_code)
         except ClueRushGame.DoesNotExist:
-            return False
+            return None
+        return room_clues(self.room_code, quiz)
 
     @database_sync_to_async
     def get_question(self, question_id):
@@ -606,7 +559,7 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
     def get_participant_by_name(self, participant_name, hub_session):
         try:
             quiz = ClueRushGame.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session))
             return {
                 'id': participant.id,
                 'name': participant.name,
@@ -678,42 +631,6 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
             pass
 
 
-    @database_sync_to_async
-    def advance_next_clue(self):
-        """Advance the session to the next clue for the current question and return clue info dict.
-        Returns None if there is no next clue.
-        """
-        try:
-            quiz = ClueRushGame.objects.select_related('session', 'current_question').get(room_code=self.room_code)
-            if not quiz.current_question:
-                return None
-            # Determine next order
-            current_order = quiz.session.current_clue_number if hasattr(quiz, 'session') and quiz.session else 0
-            next_obj = quiz.current_question.clues.order_by('order').filter(order__gt=current_order).first()
-
-            from icecream import ic
-            ic(current_order, next_obj)
-            if not next_obj:
-                return None
-            # Update DB state
-            quiz.current_clue = next_obj
-            quiz.clue_start_time = timezone.now()
-            if hasattr(quiz, 'session') and quiz.session:
-                session = quiz.session
-                session.current_clue_number = next_obj.order
-                session.is_clue_active = True
-                session.clue_end_time = timezone.now() + timezone.timedelta(seconds=next_obj.duration)
-                session.save()
-            quiz.save()
-            return {
-                'id': next_obj.id,
-                'order': next_obj.order,
-                'clue_text': next_obj.clue_text,
-                'duration': next_obj.duration,
-            }
-        except ClueRushGame.DoesNotExist:
-            return None
-
     # --- Hub mirroring helpers (Stage B) ---
     @database_sync_to_async
     def _get_hub_session_code_for_room(self):
@@ -743,8 +660,8 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def save_participant_answer(self, participant_name,hub_session_code, answer_text, time_taken):
         try:
-            quiz = ClueRushGame.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
+            quiz = ClueRushGame.objects.select_related('current_question').get(room_code=self.room_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
             
             if not quiz.current_question:
                 return None
@@ -759,14 +676,15 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
             if existing_answer:
                 return None  # Already answered
             
-            # Create new answer
-            answer = ClueAnswer.objects.create(
+            # Create new answer, scored from the room's clue schedule
+            answer = ClueAnswer(
                 quiz=quiz,
                 participant=participant,
                 question=quiz.current_question,
                 answer_text=answer_text,
                 time_taken=time_taken
             )
+            answer.save(points=room_clues(self.room_code, quiz).current_points())
             # Compute closeness using rapidfuzz if available (only when not exactly correct)
             is_close = False
             try:
@@ -789,16 +707,6 @@ class ClueRushGameConsumer(AsyncWebsocketConsumer):
         except (ClueRushGame.DoesNotExist, ClueRushParticipant.DoesNotExist):
             return None
 
-    @database_sync_to_async
-    def mark_participant_active(self, participant_id):
-        try:
-            participant = ClueRushParticipant.objects.get(id=participant_id)
-            participant.is_active = True
-            participant.last_activity = timezone.now()
-            participant.save()
-        except ClueRushParticipant.DoesNotExist:
-            pass
-
     @database_sync_to_async
     def get_final_scores(self):
         try:
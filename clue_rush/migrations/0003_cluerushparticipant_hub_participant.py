@@ -0,0 +1,26 @@
+# Generated by Django 5.2.11 on 2026-10-19 08:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clue_rush", "0002_clue_synced_clue_updated_at_clueanswer_synced_and_more"),
+        ("games_hub", "0006_hubsession_scoreboard_visible"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cluerushparticipant",
+            name="hub_participant",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="games_hub.hubparticipant",
+            ),
+        ),
+    ]
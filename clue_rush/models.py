@@ -2,9 +2,12 @@ from django.db import models
 from games_website.models import SyncBase
 from django.contrib.auth.models import User
 from django.utils import timezone
+import logging
 import random
 import string
 
+logger = logging.getLogger(__name__)
+
 
 class ClueRushGame(SyncBase):
     STATUS_CHOICES = [
@@ -84,6 +87,9 @@ class ClueRushParticipant(SyncBase):
     # guess_clue_number = models.PositiveIntegerField(null=True, blank=True)
 
     hub_session_code = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    hub_participant = models.ForeignKey(
+        'games_hub.HubParticipant', null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+    )
 
     class Meta:
         unique_together = ['quiz', 'name', 'hub_session_code']
@@ -153,20 +159,31 @@ class ClueAnswer(SyncBase):
         unique_together = ['quiz', 'participant', 'question']
         ordering = ['-submitted_at']
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, points=None, **kwargs):
+        """On first save, grade the answer and award its points.
+
+        ``points`` is what a correct answer earns at this moment, taken from
+        the room's clue schedule (see clue_rush/schedule.py). Without it the
+        question's clues are counted and the clue shown is read from the
+        session.
+        """
         if not self.pk:
             correct = self.answer_text.strip().lower() == self.question.answer.strip().lower()
             self.is_correct = correct
 
-            total_clues = self.question.clues.count()
-            current_clue_number = self.quiz.session.current_clue_number
-            points = self.quiz.current_question.points
-            if correct:
-                self.points_earned = points + (total_clues - current_clue_number + 1)
-                from icecream import ic
-                ic(points, total_clues, current_clue_number, self.points_earned)
-            else:
+            if not correct:
                 self.points_earned = 0
+            elif points is not None:
+                self.points_earned = points
+            else:
+                total_clues = self.question.clues.count()
+                current_clue_number = self.quiz.session.current_clue_number
+                points = self.quiz.current_question.points
+                self.points_earned = points + (total_clues - current_clue_number + 1)
+                logger.debug(
+                    'Correct answer after clue %s of %s: %s + %s points',
+                    current_clue_number, total_clues, points, self.points_earned - points,
+                )
 
         super().save(*args, **kwargs)
 
@@ -190,23 +207,6 @@ class ClueRushSession(SyncBase):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def start_next_clue(self):
-        # next_clue = self.quiz.clues.filter(order=self.current_clue_number + 1).first()
-        next_clue = Clue.objects.filter(clue_question__game=self.quiz, order=self.current_clue_number + 1).first()
-        if not next_clue:
-            self.end_game()
-            return
-
-        self.current_clue_number = next_clue.order
-        self.quiz.current_clue = next_clue
-        self.quiz.clue_start_time = timezone.now()
-
-        self.is_clue_active = True
-        self.clue_end_time = timezone.now() + timezone.timedelta(seconds=next_clue.duration)
-
-        self.quiz.save()
-        self.save()
-
     def send_question(self, question):
         """Send a question to all participants"""
         self.quiz.current_question = question
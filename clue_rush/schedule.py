@@ -0,0 +1,175 @@
+"""Clue schedule of the question a Clue Rush room is playing.
+
+When the host sends a question, its clues are loaded once into a
+``ClueSchedule``, an immutable record of:
+
+* ``events``: the ``clue_started`` broadcast of every clue, in order, built
+  and serialised once (``text`` is the message the sockets send as is);
+* ``points``: what a correct answer earns while clue ``n`` is showing,
+  ``points[0]`` before the first clue; the question's points plus one for
+  every clue not yet shown.
+
+The room's ``RoomClues`` keeps the schedule, the number of clues shown and
+the task that sends them one after another, each for its duration. The
+task belongs to the room, not to the host's socket: a host who reconnects
+can end the question and stop it, and it keeps running if the host's phone
+drops. Scoring an answer is an index into ``points``.
+
+Like the room replay buffers (see games_hub/replay.py) this lives in
+process memory. The clue shown is also written to the game and session
+rows, so after a restart a room's schedule is loaded again from its
+question on the next answer or clue and picks up where it was.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import namedtuple
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.utils import timezone
+
+from games_hub.replay import room_log
+from games_hub.status import bump_room_version
+
+from .models import Clue, ClueRushGame, ClueRushSession
+
+
+logger = logging.getLogger(__name__)
+
+ClueSchedule = namedtuple('ClueSchedule', ['quiz_id', 'question_id', 'events', 'points'])
+
+SEQUENCE_COMPLETED = {'type': 'clue_sequence_completed', 'message': 'All clues have been sent.'}
+
+_rooms = {}
+_rooms_lock = threading.Lock()
+
+
+def group_name(room_code):
+    return f'cluerush_{room_code}'
+
+
+def build_schedule(quiz_id, question):
+    """Load the clues of ``question`` (one query) into a ``ClueSchedule``."""
+    rows = Clue.objects.filter(clue_question_id=question.id).order_by('order').values_list(
+        'id', 'order', 'clue_text', 'duration',
+    )
+    events = []
+    for clue_id, order, text, duration in rows:
+        clue = {'id': clue_id, 'order': order, 'clue_text': text, 'duration': duration}
+        message = {'type': 'clue_started', 'clue': clue}
+        events.append({**message, 'text': json.dumps(message)})
+    total = len(events)
+    points = tuple(question.points + total - shown + 1 for shown in range(total + 1))
+    return ClueSchedule(quiz_id, question.id, tuple(events), points)
+
+
+class RoomClues:
+    """The schedule a room is playing, how many of its clues are shown and the task sending them."""
+
+    def __init__(self, room_code, schedule, shown=0):
+        self.room_code = room_code
+        self.schedule = schedule
+        self.shown = shown
+        self.task = None
+        self._lock = threading.Lock()
+
+    def advance(self):
+        """Event of the next clue (now shown), or None after the last one."""
+        with self._lock:
+            if self.shown >= len(self.schedule.events):
+                return None
+            self.shown += 1
+            return self.schedule.events[self.shown - 1]
+
+    def current_points(self):
+        return self.schedule.points[self.shown]
+
+
+@database_sync_to_async
+def _persist_clue(quiz_id, event):
+    now = timezone.now()
+    clue = event['clue']
+    ClueRushGame.objects.filter(pk=quiz_id).update(
+        current_clue_id=clue['id'], clue_start_time=now, synced=False, updated_at=now,
+    )
+    ClueRushSession.objects.filter(quiz_id=quiz_id).update(
+        current_clue_number=clue['order'], is_clue_active=True,
+        clue_end_time=now + timezone.timedelta(seconds=clue['duration']), synced=False, updated_at=now,
+    )
+    # update() sends no post_save; the status endpoints must see the new clue
+    bump_room_version('clue_rush', quiz_id)
+
+
+async def broadcast(room_code, event):
+    """Numbered room broadcast, like ``ResumableRoomMixin.room_send`` but without a socket."""
+    group = group_name(room_code)
+    await get_channel_layer().group_send(group, room_log(group).append(event))
+
+
+async def send_next_clue(room):
+    """Show the room's next clue; returns its event, or None (and says so) when all are shown."""
+    event = room.advance()
+    if event is None:
+        await broadcast(room.room_code, SEQUENCE_COMPLETED)
+        return None
+    await _persist_clue(room.schedule.quiz_id, event)
+    await broadcast(room.room_code, event)
+    return event
+
+
+async def _run(room):
+    try:
+        while True:
+            event = await send_next_clue(room)
+            if event is None:
+                break
+            await asyncio.sleep(max(0, int(event['clue']['duration'])))
+    except asyncio.CancelledError:
+        pass
+    except Exception:
+        logger.exception('Clue schedule of room %s failed', room.room_code)
+
+
+def start_schedule(room_code, schedule, auto=True):
+    """Play ``schedule`` in the room from its first clue; the previous question's task is stopped."""
+    room = RoomClues(room_code, schedule)
+    with _rooms_lock:
+        previous = _rooms.get(room_code)
+        _rooms[room_code] = room
+    if previous is not None and previous.task is not None:
+        previous.task.cancel()
+    if auto:
+        room.task = asyncio.get_running_loop().create_task(_run(room))
+    return room
+
+
+def stop_schedule(room_code):
+    """Stop the room's clues (question or quiz ended)."""
+    with _rooms_lock:
+        room = _rooms.pop(room_code, None)
+    if room is not None and room.task is not None:
+        room.task.cancel()
+
+
+def room_clues(room_code, quiz):
+    """Clues of the room's current question; loaded from the rows if this process has none."""
+    question = quiz.current_question
+    if question is None:
+        return None
+    with _rooms_lock:
+        room = _rooms.get(room_code)
+    if room is not None and room.schedule.question_id == question.id:
+        return room
+    schedule = build_schedule(quiz.id, question)
+    # The clue shown before the restart, from the session row
+    shown_order = ClueRushSession.objects.filter(quiz_id=quiz.id).values_list('current_clue_number', flat=True).first() or 0
+    shown = sum(1 for event in schedule.events if event['clue']['order'] <= shown_order)
+    room = RoomClues(room_code, schedule, shown)
+    with _rooms_lock:
+        current = _rooms.get(room_code)
+        if current is not None and current.schedule.question_id == question.id:
+            return current
+        _rooms[room_code] = room
+    return room
@@ -0,0 +1,70 @@
+import json
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from games_hub.replay import discard_room_log
+from games_hub.status import aroom_version
+
+from .models import Clue, ClueAnswer, ClueQuestion, ClueRushGame, ClueRushParticipant, ClueRushSession
+from .schedule import build_schedule, group_name, room_clues, start_schedule, stop_schedule
+
+
+class ClueScheduleTest(TestCase):
+    """Einmal geladener Hinweisplan je Frage, Punkte per Index, Versand durch den Raum."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = ClueRushGame.objects.create(creator=user)
+        ClueRushSession.objects.create(quiz=self.quiz)
+        self.question = ClueQuestion.objects.create(question_text='Wer bin ich?', answer='Einstein', points=10, created_by=user)
+        for order, text in enumerate(['Physiker', 'Relativität', 'E=mc²'], start=1):
+            Clue.objects.create(clue_question=self.question, order=order, clue_text=text, duration=0)
+        self.quiz.current_question = self.question
+        self.quiz.save()
+        self.addCleanup(stop_schedule, self.quiz.room_code)
+        self.addCleanup(discard_room_log, group_name(self.quiz.room_code))
+
+    def test_schedule_is_loaded_once(self):
+        """Eine Abfrage lädt alle Hinweise; die Nachrichten sind vorab serialisiert."""
+        with self.assertNumQueries(1):
+            schedule = build_schedule(self.quiz.id, self.question)
+        self.assertEqual(schedule.points, (14, 13, 12, 11))
+        self.assertEqual([event['clue']['order'] for event in schedule.events], [1, 2, 3])
+        self.assertEqual(json.loads(schedule.events[1]['text']), {'type': 'clue_started', 'clue': schedule.events[1]['clue']})
+
+    def test_answer_points_follow_the_clue_shown(self):
+        """Nach einem Neustart zählt der Hinweis aus der Sitzung; die Punkte kommen aus der Tabelle."""
+        ClueRushSession.objects.filter(quiz=self.quiz).update(current_clue_number=2)
+        room = room_clues(self.quiz.room_code, self.quiz)
+        self.assertEqual((room.shown, room.current_points()), (2, 12))
+        with self.assertNumQueries(0):
+            self.assertIs(room_clues(self.quiz.room_code, self.quiz), room)
+
+        participant = ClueRushParticipant.objects.create(quiz=self.quiz, name='Anna')
+        answer = ClueAnswer(quiz=self.quiz, participant=participant, question=self.question, answer_text=' einstein ')
+        answer.save(points=room.current_points())
+        self.assertEqual((answer.is_correct, answer.points_earned), (True, 12))
+
+    def test_room_task_sends_all_clues(self):
+        """Der Raum-Task sendet alle Hinweise nacheinander, ohne Admin-Socket, und meldet das Ende."""
+        layer = get_channel_layer()
+        group = group_name(self.quiz.room_code)
+        schedule = build_schedule(self.quiz.id, self.question)
+        version = async_to_sync(aroom_version)('clue_rush', self.quiz.id)
+
+        async def play():
+            channel = await layer.new_channel()
+            await layer.group_add(group, channel)
+            room = start_schedule(self.quiz.room_code, schedule)
+            await room.task
+            return [await layer.receive(channel) for _ in range(4)]
+
+        messages = async_to_sync(play)()
+        self.assertEqual([m['type'] for m in messages], ['clue_started'] * 3 + ['clue_sequence_completed'])
+        self.assertEqual([m['seq'] for m in messages], [1, 2, 3, 4])
+        session = ClueRushSession.objects.get(quiz=self.quiz)
+        self.assertEqual(session.current_clue_number, 3)
+        self.assertNotEqual(async_to_sync(aroom_version)('clue_rush', self.quiz.id), version)
@@ -4,8 +4,14 @@ from django.views.decorators.http import require_http_methods, require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 import json
+import logging
+from games_hub.enrolment import resolve_play_participant
+from games_hub.status import record_activity, versioned_status
+from games_hub.tokens import get_participant_or_404, issue_token
 from .models import ClueRushGame, ClueRushParticipant
 
+logger = logging.getLogger(__name__)
+
 
 def join_view(request):
     """Combined view for Clue Rush join page (GET) and join action (POST)."""
@@ -15,7 +21,6 @@ def join_view(request):
     elif request.method == 'POST':
         try:
             data = json.loads(request.body)
-            print("data ", data)
             participant_name = data.get('participant_name', '').strip()
             room_code = data.get('room_code', '').strip()
             hub_session = (data.get('hub_session') or '').strip() or None
@@ -70,12 +75,12 @@ def join_view(request):
                     participant.hub_session_code = hub_session
                 participant.save()
 
-            return JsonResponse({'success': True, 'participant_id': participant.id, 'game_status': quiz.status})
+            return JsonResponse({'success': True, 'participant_id': participant.id, 'token': issue_token(participant), 'game_status': quiz.status})
 
         except json.JSONDecodeError:
             return JsonResponse({'success': False, 'error': 'Invalid request format.'})
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception('Clue Rush join failed')
             return JsonResponse({'success': False, 'error': 'An error occurred. Please try again.'})
 
 
@@ -104,18 +109,10 @@ def play(request, room_code, participant_name):
     """Clue Rush play page for participants."""
     try:
         session_code = request.GET.get('hub_session')
-        quiz = get_object_or_404(ClueRushGame, room_code=room_code)
-        participant = get_object_or_404(
-            ClueRushParticipant,
-            quiz=quiz,
-            name=participant_name,
-            hub_session_code=session_code
+        quiz, participant = resolve_play_participant(
+            request, ClueRushGame, ClueRushParticipant, room_code, participant_name
         )
 
-        participant.is_active = True
-        participant.last_activity = timezone.now()
-        participant.save()
-
         context = {
             'quiz': quiz,
             'participant': participant,
@@ -147,12 +144,7 @@ def submit_guess(request, room_code, participant_name):
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(ClueRushGame, room_code=room_code)
-        participant = get_object_or_404(
-            ClueRushParticipant,
-            quiz=quiz,
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, ClueRushParticipant, quiz, participant_name)
 
         if quiz.status != 'active':
             return JsonResponse({'success': False, 'error': 'No active quiz.'})
@@ -185,20 +177,16 @@ def submit_guess(request, room_code, participant_name):
         return JsonResponse({'success': False, 'error': 'An error occurred while submitting your guess.'})
 
 
+@versioned_status('clue_rush')
 def get_game_status(request, room_code, participant_name):
     """Get current quiz status for participant."""
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(ClueRushGame, room_code=room_code)
-        participant = get_object_or_404(
-            ClueRushParticipant,
-            quiz=quiz,
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, ClueRushParticipant, quiz, participant_name)
 
-        participant.last_activity = timezone.now()
-        participant.save()
+        # Polls are presence heartbeats (see games_hub/presence.py)
+        record_activity(participant, f'cluerush_{room_code}')
 
         status_data = {
             'game_status': quiz.status,
@@ -218,12 +206,7 @@ def leave_game(request, room_code, participant_name):
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(ClueRushGame, room_code=room_code)
-        participant = get_object_or_404(
-            ClueRushParticipant,
-            quiz=quiz,
-            name=participant_name,
-            hub_session_code=session_code
-        )
+        participant = get_participant_or_404(request, ClueRushParticipant, quiz, participant_name)
         participant.is_active = False
         participant.save()
         return JsonResponse({'success': True})
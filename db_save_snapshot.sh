@@ -1,15 +1,9 @@
 #!/bin/bash
 # Speichert den aktuellen Stand der Datenbank als neuen Test-Snapshot.
 # Überschreibt den bisherigen Snapshot!
+# Der Snapshot wird über die Online-Backup-API erstellt und kann daher
+# auch bei laufendem Server gezogen werden.
 
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
-DB="$SCRIPT_DIR/db.sqlite3"
-SNAPSHOT="$SCRIPT_DIR/db.sqlite3.test_snapshot"
 
-if [ ! -f "$DB" ]; then
-    echo "Fehler: Datenbank nicht gefunden ($DB)"
-    exit 1
-fi
-
-cp "$DB" "$SNAPSHOT"
-echo "Snapshot gespeichert: db.sqlite3.test_snapshot"
+exec python "$SCRIPT_DIR/manage.py" snapshot_db --label test_snapshot --keep 1 "$@"
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import GameArchive
+
+
+@admin.register(GameArchive)
+class GameArchiveAdmin(admin.ModelAdmin):
+    list_display = ('game_key', 'room_code', 'title', 'hub_session_code', 'participant_count', 'row_count', 'completed_at', 'archived_at')
+    list_filter = ('game_key',)
+    search_fields = ('room_code', 'title', 'hub_session_code')
+    exclude = ('payload',)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class GameArchiveConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'game_archive'
+
+    def ready(self):  # noqa: D401
+        from . import signals  # noqa: F401
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games_hub.registry import GAME_TYPES
+from game_archive.services import DEFAULT_CHUNK_SIZE, archive_completed_games
+
+
+class Command(BaseCommand):
+    help = "Move participants and answers of long-finished games into compressed archives"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help="Archive games finished more than this many days ago")
+        parser.add_argument('--game', action='append', choices=sorted(GAME_TYPES), help="Only archive this game type (repeatable)")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows deleted per query")
+        parser.add_argument('--dry-run', action='store_true', help="Only list what would be archived")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared archive service."""
+        if options['days'] < 0:
+            raise CommandError("--days must not be negative")
+
+        results = archive_completed_games(
+            options['days'],
+            game_keys=options['game'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            log=self.stdout.write,
+        )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{len(results)} game(s) eligible for archiving"))
+        else:
+            archived = [a for _, a in results if a]
+            rows = sum(a.row_count for a in archived)
+            self.stdout.write(self.style.SUCCESS(f"Archived {len(archived)} game(s), {rows} rows"))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from game_archive.models import GameArchive
+from game_archive.services import ArchiveError, restore_archive
+
+
+class Command(BaseCommand):
+    help = "Restore archived games back into the live tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive_ids', nargs='*', type=int, help="IDs of the archives to restore")
+        parser.add_argument('--session', help="Restore all archives of this hub session code")
+        parser.add_argument('--game', help="Restore only archives of this game type")
+        parser.add_argument('--room', help="Restore only archives of this room code")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared archive service."""
+        archives = GameArchive.objects.all()
+        if options['archive_ids']:
+            archives = archives.filter(id__in=options['archive_ids'])
+        elif not (options['session'] or options['room']):
+            raise CommandError("Pass archive IDs, --session or --room")
+        if options['session']:
+            archives = archives.filter(hub_session_code=options['session'].upper())
+        if options['game']:
+            archives = archives.filter(game_key=options['game'])
+        if options['room']:
+            archives = archives.filter(room_code=options['room'].upper())
+
+        restored = 0
+        for archive in archives:
+            try:
+                rows = restore_archive(archive)
+            except ArchiveError as e:
+                raise CommandError(str(e))
+            restored += 1
+            self.stdout.write(f"Restored {archive}: {rows} rows\n")
+
+        self.stdout.write(self.style.SUCCESS(f"Restored {restored} archive(s)"))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.11 on 2026-10-19 08:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="GameArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("synced", models.BooleanField(default=False)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("game_key", models.CharField(db_index=True, max_length=20)),
+                ("game_id", models.BigIntegerField(db_index=True)),
+                ("room_code", models.CharField(blank=True, max_length=16)),
+                ("title", models.CharField(blank=True, max_length=200)),
+                (
+                    "hub_session_code",
+                    models.CharField(
+                        blank=True, db_index=True, max_length=16, null=True
+                    ),
+                ),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("participant_count", models.IntegerField(default=0)),
+                ("row_count", models.IntegerField(default=0)),
+                ("leaderboard", models.JSONField(blank=True, default=list)),
+                ("payload", models.BinaryField()),
+            ],
+            options={
+                "ordering": ["-archived_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+import zlib
+
+from django.core import serializers
+from django.db import models
+from django.utils import timezone
+from games_website.models import SyncBase
+
+
+class GameArchive(SyncBase):
+    """Compressed copy of the participant and answer rows of one finished game.
+
+    One archive covers a single game instance within a single hub session
+    (or the standalone rows of the game when ``hub_session_code`` is empty).
+    The rows are stored as Django's JSON serialisation, zlib-compressed, so
+    they can be restored with their original primary keys. ``leaderboard``
+    keeps an uncompressed per-player summary for the hub leaderboard.
+    """
+    game_key = models.CharField(max_length=20, db_index=True)
+    game_id = models.BigIntegerField(db_index=True)
+    room_code = models.CharField(max_length=16, blank=True)
+    title = models.CharField(max_length=200, blank=True)
+    hub_session_code = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+    participant_count = models.IntegerField(default=0)
+    row_count = models.IntegerField(default=0)
+    leaderboard = models.JSONField(default=list, blank=True)
+    payload = models.BinaryField()
+
+    class Meta:
+        ordering = ['-archived_at']
+
+    @staticmethod
+    def pack(objects):
+        return zlib.compress(serializers.serialize('json', objects).encode('utf-8'), 9)
+
+    def deserialized(self):
+        """Yield DeserializedObject wrappers for every archived row."""
+        data = zlib.decompress(bytes(self.payload)).decode('utf-8')
+        return serializers.deserialize('json', data)
+
+    def load_objects(self):
+        """Return the archived rows as read-only model instances.
+
+        Foreign keys between archived rows (answer -> participant) and the
+        participants' reverse relations are pre-populated the same way
+        ``prefetch_related`` would, so templates and model helpers that walk
+        those relations keep working without touching the database.
+        """
+        cached = getattr(self, '_objects_cache', None)
+        if cached is not None:
+            return cached
+
+        objects = [d.object for d in self.deserialized()]
+        by_model = {}
+        for obj in objects:
+            by_model.setdefault(type(obj), {})[obj.pk] = obj
+
+        for obj in objects:
+            for field in obj._meta.concrete_fields:
+                if not field.is_relation:
+                    continue
+                target = by_model.get(field.related_model, {}).get(getattr(obj, field.attname))
+                if target is None:
+                    continue
+                field.set_cached_value(obj, target)
+                cache_name = field.remote_field.cache_name
+                prefetched = target.__dict__.setdefault('_prefetched_objects_cache', {})
+                qs = prefetched.get(cache_name)
+                if qs is None:
+                    qs = type(obj)._default_manager.none()
+                    qs._result_cache = []
+                    qs._prefetch_done = True
+                    prefetched[cache_name] = qs
+                qs._result_cache.append(obj)
+
+        self._objects_cache = objects
+        return objects
+
+    def __str__(self):
+        session = f" / {self.hub_session_code}" if self.hub_session_code else ""
+        return f"Archive {self.game_key}:{self.room_code}{session}"
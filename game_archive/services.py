@@ -0,0 +1,230 @@
+"""Move the rows of long-finished games out of the hot tables.
+
+A game's participants and everything that cascades from them (answers,
+round submissions, ...) are packed into one ``GameArchive`` per game and
+hub session, then deleted from the live tables. Each unit is archived in its
+own short transaction and deleted in bounded chunks, so a large backlog
+never holds the SQLite write lock for long.
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from games_hub.models import HubParticipant, HubSession
+from games_hub.registry import GAME_TYPES, cascade_children
+from .models import GameArchive
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class ArchiveError(Exception):
+    """Raised when an archive cannot be restored."""
+
+
+class ArchivedRows(list):
+    """Live and archived rows merged into a list that behaves like a small queryset.
+
+    Only what the detail views use is supported: ``count()``, ``exists()``
+    and ``filter()`` with exact-match keyword lookups.
+    """
+
+    def count(self):
+        return len(self)
+
+    def exists(self):
+        return bool(self)
+
+    def filter(self, **lookups):
+        return ArchivedRows(
+            obj for obj in self
+            if all(getattr(obj, key) == value for key, value in lookups.items())
+        )
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _participant_summary(game_type, participant):
+    score = getattr(participant, game_type.score_field, 0) or 0
+    accuracy_fn = getattr(participant, 'get_average_accuracy', None)
+    return {
+        'name': participant.name,
+        'score': score,
+        'accuracy': accuracy_fn() if callable(accuracy_fn) else 0,
+        'joined_at': participant.joined_at.isoformat() if participant.joined_at else None,
+        'hub_participant_id': participant.hub_participant_id,
+    }
+
+
+def find_archivable_units(older_than_days, game_keys=None):
+    """Yield ``(game_type, game_id, hub_session_code, completed_at)`` tuples.
+
+    Rows played inside a hub session are eligible once the session ended
+    more than ``older_than_days`` ago. Standalone rows (no session code) are
+    eligible once their game is completed and ended before the cutoff.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    ended_sessions = dict(
+        HubSession.objects.filter(ended_at__lt=cutoff).values_list('code', 'ended_at')
+    )
+
+    for key, game_type in GAME_TYPES.items():
+        if game_keys and key not in game_keys:
+            continue
+        completed_games = dict(
+            game_type.game_model.objects
+            .filter(status='completed', ended_at__lt=cutoff)
+            .values_list('id', 'ended_at')
+        )
+        pairs = (
+            game_type.participant_model.objects
+            .order_by()
+            .values_list('quiz_id', 'hub_session_code')
+            .distinct()
+        )
+        for game_id, session_code in pairs:
+            if session_code:
+                if session_code in ended_sessions:
+                    yield game_type, game_id, session_code, ended_sessions[session_code]
+            elif game_id in completed_games:
+                yield game_type, game_id, None, completed_games[game_id]
+
+
+def archive_unit(game_type, game_id, session_code, completed_at=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Archive and delete the rows of one game within one hub session.
+
+    Returns the created GameArchive, or None if there was nothing to archive.
+    """
+    participant_model = game_type.participant_model
+    with transaction.atomic():
+        participants = list(
+            participant_model.objects
+            .filter(quiz_id=game_id, hub_session_code=session_code)
+            .order_by('pk')
+        )
+        if not participants:
+            return None
+
+        participant_ids = [p.pk for p in participants]
+        leaderboard = [_participant_summary(game_type, p) for p in participants]
+
+        children = []
+        for child_model, fk_name in cascade_children(participant_model):
+            for ids in _chunks(participant_ids, chunk_size):
+                rows = list(child_model.objects.filter(**{f'{fk_name}__in': ids}).order_by('pk'))
+                children.append((child_model, [r.pk for r in rows], rows))
+
+        objects = participants + [row for _, _, rows in children for row in rows]
+        game = game_type.game_model.objects.filter(pk=game_id).only('room_code', 'title').first()
+        archive = GameArchive.objects.create(
+            game_key=game_type.key,
+            game_id=game_id,
+            room_code=getattr(game, 'room_code', ''),
+            title=getattr(game, 'title', ''),
+            hub_session_code=session_code,
+            completed_at=completed_at,
+            participant_count=len(participants),
+            row_count=len(objects),
+            leaderboard=leaderboard,
+            payload=GameArchive.pack(objects),
+        )
+
+        # Children first so the participant delete has nothing left to collect
+        for child_model, child_ids, _ in children:
+            for ids in _chunks(child_ids, chunk_size):
+                child_model.objects.filter(pk__in=ids).delete()
+        for ids in _chunks(participant_ids, chunk_size):
+            participant_model.objects.filter(pk__in=ids).delete()
+
+    return archive
+
+
+def archive_completed_games(older_than_days, game_keys=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, log=None):
+    """Archive every eligible unit; returns the list of (unit, archive) pairs."""
+    log = log or (lambda msg: None)
+    results = []
+    for game_type, game_id, session_code, completed_at in list(find_archivable_units(older_than_days, game_keys)):
+        label = f"{game_type.key} #{game_id}" + (f" (session {session_code})" if session_code else "")
+        if dry_run:
+            log(f"Would archive {label}\n")
+            results.append(((game_type.key, game_id, session_code), None))
+            continue
+        archive = archive_unit(game_type, game_id, session_code, completed_at, chunk_size)
+        if archive:
+            log(f"Archived {label}: {archive.participant_count} participants, {archive.row_count} rows\n")
+        results.append(((game_type.key, game_id, session_code), archive))
+    return results
+
+
+def restore_archive(archive):
+    """Write the archived rows back into the live tables and drop the archive.
+
+    Rows keep their original primary keys. Restoring fails (and changes
+    nothing) if a conflicting row was created in the meantime.
+    """
+    deserialized = list(archive.deserialized())
+    # Hub players may have been deleted since; unlink instead of failing
+    hub_ids = {getattr(obj.object, 'hub_participant_id', None) for obj in deserialized} - {None}
+    if hub_ids:
+        existing = set(HubParticipant.objects.filter(pk__in=hub_ids).values_list('pk', flat=True))
+        for obj in deserialized:
+            if getattr(obj.object, 'hub_participant_id', None) not in existing | {None}:
+                obj.object.hub_participant_id = None
+    try:
+        with transaction.atomic():
+            for obj in deserialized:
+                obj.save()
+            archive.delete()
+    except IntegrityError as e:
+        raise ArchiveError(f"Cannot restore {archive}: {e}")
+    return len(deserialized)
+
+
+def with_archived(queryset, game_key, game_id):
+    """Return ``queryset`` extended by the archived rows of the same model.
+
+    When the game has no archives the queryset is returned unchanged.
+    Otherwise the result is an ``ArchivedRows`` list ordered like the
+    queryset (or the model's default ordering).
+    """
+    archives = list(GameArchive.objects.filter(game_key=game_key, game_id=game_id))
+    if not archives:
+        return queryset
+
+    model = queryset.model
+    rows = list(queryset)
+    for archive in archives:
+        rows.extend(obj for obj in archive.load_objects() if isinstance(obj, model))
+
+    ordering = list(queryset.query.order_by or model._meta.ordering)
+    for field_name in reversed(ordering):
+        reverse = field_name.startswith('-')
+        attr = field_name.lstrip('-')
+        rows.sort(key=lambda o: (getattr(o, attr) is None, getattr(o, attr)), reverse=reverse)
+    return ArchivedRows(rows)
+
+
+def archived_leaderboard(game_key, game_id, session_code, since=None, until=None):
+    """Return leaderboard summaries archived for a game within a hub session."""
+    archives = GameArchive.objects.filter(
+        game_key=game_key, game_id=game_id, hub_session_code=session_code,
+    ).only('leaderboard')
+    return [
+        entry
+        for archive in archives
+        for entry in archive.leaderboard
+        if entry_in_window(entry, since, until)
+    ]
+
+
+def entry_in_window(entry, since=None, until=None):
+    """Whether an archived leaderboard entry joined between ``since`` and ``until``."""
+    joined_at = entry.get('joined_at')
+    if not joined_at or not (since or until):
+        return True
+    joined = timezone.datetime.fromisoformat(joined_at)
+    return not ((since and joined < since) or (until and joined > until))
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from Estimation.models import EstimationAnswer, EstimationParticipant, EstimationQuestion, EstimationQuiz
+from games_hub.models import HubSession
+from game_archive.models import GameArchive
+from game_archive.services import archive_completed_games, restore_archive, with_archived
+
+
+class GameArchiveTest(TestCase):
+    """Archivierung beendeter Spiele und Wiederherstellung."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = EstimationQuiz.objects.create(title='Archiv', creator=user)
+        question = EstimationQuestion.objects.create(
+            question_text='Wie hoch ist der Mount Everest?', correct_answer=8849, created_by=user,
+        )
+        self.session = HubSession.objects.create(
+            code='OLD1', started_at=timezone.now() - timedelta(days=61), ended_at=timezone.now() - timedelta(days=60),
+        )
+        self.player = EstimationParticipant.objects.create(quiz=self.quiz, name='Anna', hub_session_code='OLD1')
+        EstimationAnswer.objects.create(quiz=self.quiz, participant=self.player, question=question, user_answer=8800)
+        self.player.refresh_from_db()
+
+    def test_archive_moves_rows_out_of_live_tables(self):
+        """Teilnehmer und Antworten landen im Archiv und bleiben in der Detailansicht sichtbar."""
+        results = archive_completed_games(30)
+        self.assertEqual(len(results), 1)
+        self.assertFalse(EstimationParticipant.objects.exists())
+        self.assertFalse(EstimationAnswer.objects.exists())
+
+        archive = GameArchive.objects.get()
+        self.assertEqual(archive.row_count, 2)
+        self.assertEqual(archive.leaderboard[0]['score'], self.player.total_score)
+
+        participants = with_archived(self.quiz.participants.all(), 'estimation', self.quiz.id)
+        self.assertEqual(participants.count(), 1)
+        self.assertEqual(participants[0].estimation_answers.all().count(), 1)
+
+    def test_recent_sessions_are_kept(self):
+        """Sessions innerhalb der Frist werden nicht archiviert."""
+        self.assertEqual(archive_completed_games(90), [])
+        self.assertTrue(EstimationParticipant.objects.exists())
+
+    def test_restore_keeps_primary_keys(self):
+        """Wiederhergestellte Zeilen behalten ihre ursprünglichen IDs."""
+        archive_completed_games(30)
+        restore_archive(GameArchive.objects.get())
+        self.assertFalse(GameArchive.objects.exists())
+        self.assertEqual(EstimationParticipant.objects.get().pk, self.player.pk)
+        self.assertEqual(EstimationAnswer.objects.count(), 1)
@@ -6,4 +6,11 @@ class GamesHubConfig(AppConfig):
     name = 'games_hub'
 
     def ready(self):  # noqa: D401
+        from django.core import checks
+
         from . import signals  # noqa: F401
+        from .profiling import check_view_middleware_is_last
+        from .status import check_shared_cache
+
+        checks.register(check_view_middleware_is_last)
+        checks.register(check_shared_cache)
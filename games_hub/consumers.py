@@ -1,9 +1,17 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from django.core.cache import cache
 from .models import HubSession, HubParticipant, HubGameStep, GameVote
+from .enrolment import navigate_step_with_participants
+from .guard import GuardMixin
+from .logs import bind_log_context
+from .metrics import MetricsMixin
+from .presence import PresenceMixin
+from .profiling import ProfilingMixin
+from .wire import BinaryProtocolMixin
 from QuizGame.models import Quiz as QuizGameModel
 from Assign.models import AssignQuiz
 from Estimation.models import EstimationQuiz
@@ -14,11 +22,21 @@ from black_jack_quiz.models import BlackJackQuiz
 from clue_rush.models import ClueRushGame
 from sorting_ladder.models import SortingLadderGame
 
+logger = logging.getLogger(__name__)
+
+
+class HubConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
+    # Sent by the hub monitor and the game monitors, never by the lobby
+    admin_message_types = frozenset({
+        'start_session', 'next_step', 'broadcast', 'navigate_to_game',
+        'navigate_direct', 'end_session', 'toggle_scoreboard',
+    })
+    admin_requires_staff = False
 
-class HubConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.session_code = self.scope['url_route']['kwargs']['session_code']
         self.group_name = f"hub_{self.session_code}"
+        bind_log_context(session=self.session_code)
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
         await self.send_json({'type': 'connection_established', 'message': 'Connected to hub', 'session_code': self.session_code})
@@ -61,6 +79,7 @@ class HubConsumer(AsyncWebsocketConsumer):
         if not participant:
             await self.send_json({'type': 'error', 'message': 'Unable to join'})
             return
+        self.join_presence(HubParticipant, participant, self.group_name)
         
         # Determine if there's an active game to redirect the participant
         game_key, room_code = await self.get_active_game_for_session()
@@ -79,13 +98,12 @@ class HubConsumer(AsyncWebsocketConsumer):
         await self.handle_navigate_to_current()
 
     async def handle_next_step(self):
-        print("Handle Next Step")
         await self.advance_step_db()
         await self.handle_navigate_to_current()
 
     async def handle_navigate_to_current(self):
         step = await self.get_current_step()
-        await self.channel_layer.group_send(self.group_name, {'type': 'navigate', 'step': step})
+        await self.broadcast_navigate(step)
 
     async def handle_navigate_to_game(self, data):
         index = data.get('index')
@@ -115,6 +133,11 @@ class HubConsumer(AsyncWebsocketConsumer):
             'room_code': room_code,
             'title': ''
         }
+        await self.broadcast_navigate(step)
+
+    async def broadcast_navigate(self, step):
+        """Enrol the lobby into the step's game and send everyone there."""
+        step = await self.enrol_participants(step)
         await self.channel_layer.group_send(self.group_name, {'type': 'navigate', 'step': step})
 
     async def send_state(self):
@@ -137,22 +160,19 @@ class HubConsumer(AsyncWebsocketConsumer):
     async def hub_event(self, event):
         ev = event.get('event', {})
         etype = ev.get('type')
-        print("Hub Consumer:", etype, "event", ev)
+        logger.debug('Hub event %s: %s', etype, ev)
 
         # Generate a unique event key (type + game_key + room_code)
         event_key = f"{etype}:{ev.get('game_key')}:{ev.get('room_code')}"
 
         # Check if this event was already processed recently
         if cache.get(event_key):
-            print(f"Duplicate event ignored: {event_key}")
+            logger.debug('Duplicate hub event ignored: %s', event_key)
             return  # ignore duplicate
 
         # Mark this event as processed for 5 seconds (adjust as needed)
         cache.set(event_key, True, timeout=5)
 
-        print("Hub Consumer: event_key", event_key)
-        print("Hub Consumer: etype", etype)
-        print("Hub Consumer: ev", ev)
         # If a game ended, ensure we add/record it as a step for Game Flow when launched via navigate_direct
         if etype in ('quiz_started', 'game_ended') and ev.get('game_key') and ev.get('room_code'):
             await self.ensure_step_for_room(ev.get('game_key'), ev.get('room_code'), ev.get('title', ''))
@@ -169,7 +189,7 @@ class HubConsumer(AsyncWebsocketConsumer):
                 'room_code': ev.get('room_code'),
                 'title': ev.get('title', ''),
             }
-            await self.channel_layer.group_send(self.group_name, {'type': 'navigate', 'step': step})
+            await self.broadcast_navigate(step)
 
         # If a game signals it ended, auto-advance or end session
         # if etype in ('quiz_ended', 'game_ended'):
@@ -209,9 +229,10 @@ class HubConsumer(AsyncWebsocketConsumer):
         except HubSession.DoesNotExist:
             return None
         participant, _ = HubParticipant.objects.get_or_create(session=session, nickname=nickname)
-        participant.is_active = True
-        participant.last_seen = timezone.now()
-        participant.save()
+        # last_seen is kept by the presence tracker; only a comeback is saved
+        if not participant.is_active:
+            participant.is_active = True
+            participant.save(update_fields=['is_active', 'updated_at', 'synced'])
         return participant.id
 
     @database_sync_to_async
@@ -232,7 +253,7 @@ class HubConsumer(AsyncWebsocketConsumer):
             if total == 0:
                 return
             
-            print("Advancing step for session", self.session_code, "from", session.current_step_index, "to", session.current_step_index + 1, "total", total)
+            logger.info('Advancing hub session from step %s of %s', session.current_step_index, total)
             session.current_step_index = min(session.current_step_index + 1, total - 1)
             session.save()
         except HubSession.DoesNotExist:
@@ -343,6 +364,10 @@ class HubConsumer(AsyncWebsocketConsumer):
         await self.reset_all_quizzes_to_waiting()
         await self.channel_layer.group_send(self.group_name, {'type': 'session_ended'})
 
+    @database_sync_to_async
+    def enrol_participants(self, step):
+        return navigate_step_with_participants(self.session_code, step)
+
     @database_sync_to_async
     def get_current_step(self):
         try:
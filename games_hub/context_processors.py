@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def wire(request):
+    """Default WebSocket encoding for the play pages (see games_hub/wire.py)."""
+    return {'websocket_msgpack': getattr(settings, 'WEBSOCKET_MSGPACK', False)}
@@ -0,0 +1,116 @@
+"""Enrol hub participants into a game when the hub navigates to it.
+
+Without this every phone POSTs to the game's join view on ``navigate``,
+each doing a name lookup, a participant count and an insert, followed by
+another save on the play page. Enrolling the whole lobby at once costs a
+handful of queries per step, and clients receive their participant IDs in
+the ``navigate`` event so the play page is a primary-key lookup.
+"""
+from django.http import Http404
+from django.utils import timezone
+
+from .models import HubParticipant, HubSession
+from .presence import presence
+from .registry import get_game_type, participant_game_type, room_group_name
+from .tokens import issue_token, read_token, token_from_request
+
+
+def enrol_hub_participants(session_code, game_key, room_code):
+    """Create game participants for all active hub participants of a session.
+
+    Existing participants (rejoins) are reactivated. Returns a mapping of
+    hub nickname to game participant ID, or an empty dict if the game or
+    session does not exist.
+    """
+    game_type = get_game_type(game_key)
+    if game_type is None or not room_code:
+        return {}
+    game = game_type.game_model.objects.filter(room_code=room_code).only('id', 'max_participants').first()
+    if game is None:
+        return {}
+    hub_ids = dict(
+        HubParticipant.objects
+        .filter(session__code=session_code, is_active=True)
+        .order_by('joined_at')
+        .values_list('nickname', 'id')
+    )
+    if not hub_ids:
+        return {}
+    nicknames = list(hub_ids)
+
+    participant_model = game_type.participant_model
+    existing = participant_model.objects.filter(quiz=game, hub_session_code=session_code)
+    known = {name.lower() for name in existing.values_list('name', flat=True)}
+    room_left = max(0, getattr(game, 'max_participants', len(nicknames)) - len(known))
+    missing = [n for n in nicknames if n.lower() not in known][:room_left]
+
+    if missing:
+        participant_model.objects.bulk_create(
+            [
+                participant_model(
+                    quiz=game, name=n, hub_session_code=session_code, hub_participant_id=hub_ids[n], is_active=True,
+                )
+                for n in missing
+            ],
+            ignore_conflicts=True,
+        )
+    existing.filter(is_active=False, name__in=nicknames).update(
+        is_active=True, synced=False, updated_at=timezone.now(),
+    )
+
+    # ignore_conflicts does not return PKs on SQLite, so read them back
+    ids = {name.lower(): pk for name, pk in existing.values_list('name', 'id')}
+    return {n: ids[n.lower()] for n in nicknames if n.lower() in ids}
+
+
+def navigate_step_with_participants(session_code, step):
+    """Return ``step`` extended with pre-issued participant IDs for its game."""
+    if not step or not step.get('room_code'):
+        return step
+    if not HubSession.objects.filter(code=session_code, ended_at__isnull=True).exists():
+        return step
+    return {**step, 'participants': enrol_hub_participants(session_code, step.get('game_key'), step['room_code'])}
+
+
+def resolve_play_participant(request, game_model, participant_model, room_code, participant_name):
+    """Return ``(game, participant)`` for a play page and reactivate the participant.
+
+    A pre-issued ``pid`` query parameter or participant token is resolved
+    with a single primary key lookup; otherwise the participant is looked up
+    by name and hub session as before. Raises Http404 if either cannot be
+    found. The participant gets a fresh signed ``token`` for the page's
+    requests and socket.
+    """
+    session_code = request.GET.get('hub_session')
+    pid = request.GET.get('pid')
+    token = read_token(token_from_request(request), room_code=room_code)
+    if token and token.name == participant_name:
+        pid, session_code = str(token.participant_id), token.session_code
+    participant = None
+    if pid and pid.isdigit():
+        participant = (
+            participant_model.objects.select_related('quiz')
+            .filter(pk=int(pid), quiz__room_code=room_code, name=participant_name, hub_session_code=session_code)
+            .first()
+        )
+    if participant is None:
+        game = game_model.objects.filter(room_code=room_code).first()
+        if game is None:
+            raise Http404("Game not found")
+        participant = participant_model.objects.filter(
+            quiz=game, name=participant_name, hub_session_code=session_code,
+        ).first()
+        if participant is None:
+            raise Http404("Participant not found")
+        participant.quiz = game
+
+    if not participant.is_active:
+        now = timezone.now()
+        participant_model.objects.filter(pk=participant.pk).update(is_active=True, updated_at=now, synced=False)
+        participant.is_active = True
+    # The page load itself is only a presence heartbeat, in the room the
+    # status endpoints count
+    room = room_group_name(participant_game_type(participant_model).key, room_code)
+    presence.heartbeat(participant_model, participant.pk, room, participant.hub_session_code)
+    participant.token = issue_token(participant)
+    return participant.quiz, participant
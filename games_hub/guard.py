@@ -0,0 +1,151 @@
+"""Per-connection guards for incoming WebSocket frames.
+
+``GuardMixin`` sits in front of every consumer's ``receive`` and drops
+frames that are
+
+* larger than ``WEBSOCKET_MAX_FRAME_BYTES``;
+* not a JSON (or msgpack) object with a ``type``;
+* admin-only (``admin_*`` or listed in ``admin_message_types``) while the
+  socket does not belong to a staff user;
+* over the socket's token bucket for that message type, or over the bucket
+  shared by all frames of the socket.
+
+Dropped frames never reach the consumer, so they cost no queries and no
+broadcasts. Admin sockets are not rate limited. Drops are counted per
+consumer, reason and message type in ``dropped`` (see ``dropped_messages``);
+types of non-admin sockets outside the rate limit table count as ``other``.
+"""
+import json
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from . import wire
+
+
+DEFAULT_MAX_FRAME_BYTES = 16 * 1024
+
+# (tokens per second, burst) per message type and socket
+DEFAULT_RATE_LIMITS = {
+    'ping': (1, 5),
+    'join': (0.5, 5),
+    'vote': (1, 5),
+    'participant_join': (0.5, 5),
+    'participant_submit_answer': (1, 5),
+    'participant_submit_move': (5, 15),
+    'participant_submit_round': (1, 5),
+    'tutorial_completed': (0.5, 3),
+    'prefetch_ready': (1, 5),
+    '*': (2, 10),
+}
+# All frames of one socket together
+DEFAULT_CONNECTION_RATE = (10, 30)
+
+TOO_LARGE = 'too_large'
+INVALID = 'invalid'
+NOT_ADMIN = 'not_admin'
+RATE_LIMITED = 'rate_limited'
+
+# Label for message types outside the rate limit table
+OTHER = 'other'
+
+dropped = Counter()
+
+
+def dropped_messages():
+    """Return ``{(consumer, reason, message_type): count}`` of dropped frames."""
+    return dict(dropped)
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'stamp')
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.stamp = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class GuardMixin:
+    """Consumer mixin: size, admin and rate checks before ``receive``."""
+
+    admin_message_types = frozenset()
+    # The hub is hosted by any logged-in user, the game monitors by staff
+    admin_requires_staff = True
+
+    frame_type = None
+    _buckets = None
+    _is_admin = None
+
+    def is_admin_socket(self):
+        if self._is_admin is None:
+            user = self.scope.get('user')
+            self._is_admin = bool(
+                user is not None and user.is_authenticated
+                and (not self.admin_requires_staff or user.is_staff or user.is_superuser)
+            )
+        return self._is_admin
+
+    def _bucket(self, key, limit):
+        if self._buckets is None:
+            self._buckets = {}
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*limit)
+        return bucket
+
+    def _drop(self, reason, message_type):
+        dropped[(type(self).__name__, reason, message_type)] += 1
+
+    def check_frame(self, message):
+        """Return the reason to drop ``message``, or None to let it through."""
+        text, data = message.get('text'), message.get('bytes')
+        size = len(text) if text is not None else len(data or b'')
+        if size > getattr(settings, 'WEBSOCKET_MAX_FRAME_BYTES', DEFAULT_MAX_FRAME_BYTES):
+            return TOO_LARGE, None
+        if text is None and not getattr(self, 'binary_protocol', False):
+            return INVALID, None
+        try:
+            payload = json.loads(text) if text is not None else wire.decode(data)
+        except ValueError:
+            return INVALID, None
+        message_type = payload.get('type') if isinstance(payload, dict) else None
+        if not isinstance(message_type, str):
+            return INVALID, None
+
+        if self.is_admin_socket():
+            return None, message_type
+
+        # Types chosen by untrusted clients are labelled from a fixed vocabulary
+        limits = getattr(settings, 'WEBSOCKET_RATE_LIMITS', DEFAULT_RATE_LIMITS)
+        label = message_type if message_type in limits or message_type in self.admin_message_types else OTHER
+        if message_type.startswith('admin_') or message_type in self.admin_message_types:
+            return NOT_ADMIN, label
+
+        key = message_type if message_type in limits else '*'
+        connection_rate = getattr(settings, 'WEBSOCKET_CONNECTION_RATE', DEFAULT_CONNECTION_RATE)
+        if not self._bucket(None, connection_rate).take() or not self._bucket(key, limits[key]).take():
+            return RATE_LIMITED, label
+        return None, label
+
+    async def websocket_receive(self, message):
+        reason, message_type = self.check_frame(message)
+        if reason is None:
+            # Label for the handler metrics (see games_hub/metrics.py)
+            self.frame_type = message_type
+            await super().websocket_receive(message)
+            return
+        self._drop(reason, message_type)
+        if reason == NOT_ADMIN:
+            await self.send(text_data=json.dumps({'type': 'error', 'message': 'Not allowed'}))
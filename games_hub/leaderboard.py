@@ -0,0 +1,234 @@
+"""Cross-game leaderboard of a hub session.
+
+Every step of a session contributes one SELECT over its game's participant
+table; the SELECTs are combined with UNION ALL, so the scores of a whole
+session are read in a single query regardless of how many steps it has.
+Rows are keyed on the linked ``HubParticipant`` so a player who shows up
+with different capitalisation in two games is still counted once; rows
+without a link (standalone players, data from before the link existed) fall
+back to matching on the nickname.
+"""
+from collections import defaultdict
+
+from django.db.models import (
+    Avg, Case, CharField, F, FloatField, IntegerField, OuterRef, Subquery, Value, When,
+)
+from django.db.models.functions import Abs, Coalesce, Greatest, Least
+
+from game_archive.models import GameArchive
+from game_archive.services import entry_in_window
+from .models import HubParticipant
+from .registry import GAME_TYPES
+
+
+# Names shown in the leaderboard header; keys match HubGameStep.game_key
+GAME_NAMES = {
+    'quiz': 'Quiz Game',
+    'clue_rush': 'Clue Rush Game',
+    'estimation': 'Estimation',
+    'assign': 'Assign',
+    'who': 'Who is Lying?',
+    'who_that': 'Who is That?',
+    'where': 'Where is This?',
+    'blackjack': 'Black Jack',
+    'sorting_ladder': 'Sorting Ladder',
+}
+
+
+def _answer_average(game_type, expression):
+    answers = (
+        game_type.answer_model.objects
+        .filter(participant=OuterRef('pk'))
+        .order_by()
+        .values('participant')
+        .annotate(value=Avg(expression))
+        .values('value')
+    )
+    return Coalesce(Subquery(answers, output_field=FloatField()), Value(0.0))
+
+
+def _estimation_accuracy(game_type):
+    correct = F('question__correct_answer')
+    deviation = Abs((F('user_answer') - correct) * 100.0 / correct)
+    per_answer = Case(
+        When(question__correct_answer=0, then=Case(When(user_answer=0, then=Value(100.0)), default=Value(0.0))),
+        default=Coalesce(Least(Value(100.0), Greatest(Value(0.0), 100.0 - deviation)), Value(0.0)),
+        output_field=FloatField(),
+    )
+    return _answer_average(game_type, per_answer)
+
+
+def _where_accuracy(game_type):
+    return _answer_average(game_type, 'accuracy_percentage')
+
+
+def _who_that_accuracy(game_type):
+    return Case(
+        When(questions_answered=0, then=Value(0.0)),
+        default=F('correct_answers') * 100.0 / F('questions_answered'),
+        output_field=FloatField(),
+    )
+
+
+# SQL equivalents of ``get_average_accuracy()``. Games that have the method
+# but no expression here are computed in Python after the main query.
+ACCURACY_EXPRESSIONS = {
+    'estimation': _estimation_accuracy,
+    'where': _where_accuracy,
+    'who_that': _who_that_accuracy,
+}
+
+
+def _step_rows(session, index, step, game_type):
+    qs = game_type.participant_model.objects.filter(quiz__room_code=step.room_code, hub_session_code=session.code)
+    # Only include participants who joined during this session's window
+    if session.started_at:
+        qs = qs.filter(joined_at__gte=session.started_at)
+    if session.ended_at:
+        qs = qs.filter(joined_at__lte=session.ended_at)
+    accuracy = ACCURACY_EXPRESSIONS.get(game_type.key)
+    return qs.order_by().annotate(
+        lb_step=Value(index, output_field=IntegerField()),
+        lb_score=Coalesce(F(game_type.score_field), Value(0)),
+        lb_accuracy=accuracy(game_type) if accuracy else Value(None, output_field=FloatField()),
+    ).values_list('lb_step', 'pk', 'name', 'hub_participant_id', 'lb_score', 'lb_accuracy')
+
+
+def _union(querysets):
+    if not querysets:
+        return []
+    first, *rest = querysets
+    return list(first.union(*rest, all=True)) if rest else list(first)
+
+
+def _game_rows(steps):
+    """Return ``{(game_key, room_code): (game_id, title)}`` for all steps in one query."""
+    by_type = defaultdict(set)
+    for step in steps:
+        by_type[step.game_key].add(step.room_code)
+    querysets = [
+        GAME_TYPES[key].game_model.objects
+        .filter(room_code__in=room_codes)
+        .order_by()
+        .annotate(lb_key=Value(key, output_field=CharField()))
+        .values_list('lb_key', 'room_code', 'pk', 'title')
+        for key, room_codes in by_type.items()
+    ]
+    return {(key, room_code): (pk, title) for key, room_code, pk, title in _union(querysets)}
+
+
+def _python_accuracies(game_type, participant_ids):
+    """Average answer accuracy for games without a SQL expression."""
+    per_participant = defaultdict(list)
+    answers = game_type.answer_model.objects.filter(participant_id__in=participant_ids).select_related('question')
+    for answer in answers:
+        per_participant[answer.participant_id].append(answer.get_accuracy_percentage())
+    return {
+        pk: round(sum(values) / len(values), 1)
+        for pk, values in per_participant.items()
+    }
+
+
+def build_leaderboard(session):
+    """Return the session leaderboard: games, participants and instance metadata.
+
+    The winner of each step earns ``order + 1`` hub points; ties share them
+    and nobody earns anything if no one scored.
+    """
+    all_steps = list(session.steps.order_by('order'))
+    steps = [s for s in all_steps if s.game_key in GAME_TYPES]
+    games = []
+    for step in all_steps:
+        if step.game_key not in [g['key'] for g in games]:
+            games.append({'key': step.game_key, 'name': GAME_NAMES.get(step.game_key, step.game_key.title())})
+
+    rows = _union([_step_rows(session, i, step, GAME_TYPES[step.game_key]) for i, step in enumerate(steps)])
+    game_rows = _game_rows(steps)
+    hub_players = {
+        pk: (nickname, adjustment)
+        for pk, nickname, adjustment in HubParticipant.objects.filter(session=session)
+        .values_list('pk', 'nickname', 'score_adjustment')
+    }
+    hub_by_nickname = {nickname.lower(): pk for pk, (nickname, _) in hub_players.items()}
+
+    def player_key(hub_id, name):
+        if hub_id in hub_players:
+            return hub_id
+        return hub_by_nickname.get((name or '').lower(), name)
+
+    # Per step: player key -> entry
+    results = [{} for _ in steps]
+    missing_accuracy = defaultdict(list)
+    for index, pk, name, hub_id, score, accuracy in rows:
+        key = player_key(hub_id, name)
+        results[index][key] = {'name': name, 'score': score, 'accuracy': accuracy, 'pk': pk}
+        if accuracy is None:
+            missing_accuracy[index].append(pk)
+
+    for index, step in enumerate(steps):
+        game_type = GAME_TYPES[step.game_key]
+        pks = missing_accuracy.get(index)
+        if not pks:
+            continue
+        if hasattr(game_type.participant_model, 'get_average_accuracy'):
+            accuracies = _python_accuracies(game_type, pks)
+        else:
+            accuracies = {}
+        for entry in results[index].values():
+            if entry['accuracy'] is None:
+                entry['accuracy'] = accuracies.get(entry['pk'], 0)
+
+    # Players of long-finished sessions may have been moved to the archive
+    archived = defaultdict(list)
+    for archive in GameArchive.objects.filter(hub_session_code=session.code).only('game_key', 'game_id', 'leaderboard'):
+        archived[(archive.game_key, archive.game_id)].extend(archive.leaderboard)
+    for index, step in enumerate(steps):
+        game_id, _ = game_rows.get((step.game_key, step.room_code), (None, ''))
+        for entry in archived.get((step.game_key, game_id), ()):
+            if not entry_in_window(entry, session.started_at, session.ended_at):
+                continue
+            key = player_key(entry.get('hub_participant_id'), entry['name'])
+            results[index].setdefault(key, {'name': entry['name'], 'score': entry['score'], 'accuracy': entry['accuracy']})
+
+    participants_data = {}
+    instance_meta = {}
+    for step, entries in zip(steps, results):
+        # Use a per-instance key so multiple steps of same type don't overwrite
+        instance_key = f"{step.game_key}:{step.room_code}"
+        _, title = game_rows.get((step.game_key, step.room_code), (None, ''))
+        hub_points = step.order + 1
+        instance_meta[instance_key] = {
+            'title': title or step.title or '',
+            'type': GAME_NAMES.get(step.game_key, step.game_key.title()),
+            'hub_points': hub_points,
+        }
+
+        max_score = max((e['score'] for e in entries.values()), default=0)
+        for key, entry in entries.items():
+            name = hub_players[key][0] if key in hub_players else entry['name']
+            pdata = participants_data.setdefault(key, {
+                'name': name,
+                'total_score': 0,
+                'weighted_score': 0,
+                'games_played': 0,
+                'game_scores': {},
+                'game_accuracies': {},
+            })
+            pdata['games_played'] += 1
+            pdata['game_scores'][instance_key] = entry['score']
+            pdata['game_accuracies'][instance_key] = round(entry['accuracy'] or 0, 1)
+            pdata['total_score'] += entry['score']
+            if max_score > 0 and entry['score'] == max_score:
+                pdata['weighted_score'] += hub_points
+
+    for key, pdata in participants_data.items():
+        hub = hub_players.get(key)
+        pdata['hub_participant_id'] = key if hub else None
+        pdata['score_adjustment'] = hub[1] if hub else 0
+        pdata['total_score'] += pdata['score_adjustment']
+
+    return {
+        'games': games,
+        'participants': sorted(participants_data.values(), key=lambda x: x['weighted_score'], reverse=True),
+        'instances': instance_meta,
+    }
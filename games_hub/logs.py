@@ -0,0 +1,107 @@
+"""Structured, non-blocking logging (configured in ``settings.LOGGING``).
+
+* ``QueueLogHandler`` only puts records on an in-memory queue; a listener
+  thread formats and writes them, so a slow stderr never stalls the event
+  loop. When the queue is full, records are dropped and counted instead of
+  blocking.
+* ``JsonFormatter`` writes one JSON object per line, including the context
+  fields bound for the current socket or request.
+* ``ContextFilter`` attaches those fields; ``bind_log_context`` sets them.
+  Consumers run each socket in its own task, so binding once in ``connect``
+  or ``join_presence`` covers every later message of that socket.
+* ``SampleFilter`` lets through one in ``every`` records at or below
+  ``max_level``, for per-message debug logs under load.
+
+Hot paths log with ``%``-style arguments, so a disabled level costs one
+cached level check and no formatting.
+"""
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+from contextvars import ContextVar
+
+
+_context = ContextVar('games_hub_log_context', default={})
+
+
+def bind_log_context(**fields):
+    """Add context fields (room, participant, ...) to later records of this task."""
+    _context.set({**_context.get(), **fields})
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.context = _context.get()
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """Pass one in ``every`` records at or below ``max_level``."""
+
+    def __init__(self, every=100, max_level='DEBUG'):
+        super().__init__()
+        self.every = max(1, int(every))
+        self.max_level = logging.getLevelName(max_level) if isinstance(max_level, str) else max_level
+        self._seen = itertools.count()
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        return next(self._seen) % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'context', None) or {})
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class QueueLogHandler(logging.handlers.QueueHandler):
+    """Queue records for a listener thread that writes them to ``stream``."""
+
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self.listener = logging.handlers.QueueListener(self.queue, self.target)
+        self.listener.start()
+        atexit.register(self._stop_listener)
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Resolve the message now, arguments may change later; the JSON is
+        # built on the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _stop_listener(self):
+        if self.listener._thread is not None:
+            try:
+                self.listener.stop()
+            except queue.Full:
+                pass
+
+    def close(self):
+        self._stop_listener()
+        super().close()
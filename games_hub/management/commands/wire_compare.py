@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games_hub import wire
+
+
+class Command(BaseCommand):
+    help = "Compare JSON and msgpack frame sizes and CPU time on captured WebSocket traffic"
+
+    def add_arguments(self, parser):
+        parser.add_argument('capture', help="File written with WEBSOCKET_CAPTURE_FILE (one JSON frame per line)")
+        parser.add_argument('--repeat', type=int, default=100, help="Timing passes over all frames")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared wire codec."""
+        if not wire.available():
+            raise CommandError("msgpack is not installed")
+        try:
+            with open(options['capture'], encoding='utf-8') as fh:
+                frames = [line for line in fh if line.strip()]
+        except OSError as e:
+            raise CommandError(str(e))
+        if not frames:
+            raise CommandError("No frames in capture")
+
+        try:
+            r = wire.compare(frames, repeat=options['repeat'])
+        except ValueError as e:
+            raise CommandError(f"Invalid frame in capture: {e}")
+        saved = 1 - r['msgpack_bytes'] / r['json_bytes']
+        self.stdout.write(f"{r['frames']} frames")
+        self.stdout.write(f"  size     JSON {r['json_bytes']:>9} B   msgpack {r['msgpack_bytes']:>9} B   ({saved:.0%} smaller)")
+        self.stdout.write(f"  encode   JSON {r['json_encode_us']:>7.2f} µs   msgpack {r['msgpack_encode_us']:>7.2f} µs per frame")
+        self.stdout.write(f"  decode   JSON {r['json_decode_us']:>7.2f} µs   msgpack {r['msgpack_decode_us']:>7.2f} µs per frame")
+        self.stdout.write(f"  server cost of a binary socket (parse + pack): {r['server_msgpack_us']:.2f} µs per frame")
@@ -0,0 +1,298 @@
+"""Prometheus metrics for consumers and views.
+
+Recorded per consumer class and message type (frames by their ``type``,
+channel layer events by handler type) and per URL route:
+
+* a latency histogram (``games_handler_seconds``, ``games_http_request_seconds``);
+* the number and total duration of database queries run while handling;
+* ``group_send`` fan-outs per consumer class and event type;
+* open sockets per consumer class and room group;
+* work queued on the ``sync_to_async`` executors, read at scrape time;
+* frames dropped by the guard (see games_hub/guard.py).
+
+The hot path only touches preallocated series: label dicts are filled on
+first use, the query tally of a socket is created once per connection and
+made current for its task, and counters are plain attribute increments.
+There are no locks; increments from concurrent threads can race and lose
+an occasional count, which is acceptable for metrics. Like presence and the
+replay buffers, the numbers cover the current process.
+
+``/metrics`` serves the Prometheus text format to staff users, or to any
+client sending ``Authorization: Bearer <METRICS_TOKEN>`` when that setting
+is set.
+"""
+import asyncio
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import SyncToAsync, iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+from . import guard
+
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Tally:
+    """Queries run by the current request or socket message."""
+
+    __slots__ = ('queries', 'seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+class Series:
+    __slots__ = ('buckets', 'total', 'count', 'queries', 'query_seconds')
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def observe(self, seconds, tally):
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.queries += tally.queries
+        self.query_seconds += tally.seconds
+
+
+# {consumer: {message_type: Series}}
+handlers = {}
+# {route: Series}
+routes = {}
+# {consumer: {event_type: count}}
+fanouts = {}
+# {consumer: {room: open sockets}}
+connections = {}
+
+_tally = ContextVar('games_hub_metrics_tally', default=None)
+
+
+def _series(table, key):
+    series = table.get(key)
+    if series is None:
+        series = table.setdefault(key, Series())
+    return series
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrappers`` hook adding queries to the current tally."""
+    tally = _tally.get()
+    if tally is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        tally.queries += 1
+        tally.seconds += time.perf_counter() - start
+
+
+def install_query_wrapper(connection):
+    if query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_wrapper)
+
+
+def _observe_request(request, seconds, tally):
+    match = getattr(request, 'resolver_match', None)
+    _series(routes, match.route if match is not None else 'unmatched').observe(seconds, tally)
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """Time every request and count its queries per URL route."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            tally = Tally()
+            token = _tally.set(tally)
+            start = time.perf_counter()
+            try:
+                return await get_response(request)
+            finally:
+                _tally.reset(token)
+                _observe_request(request, time.perf_counter() - start, tally)
+    else:
+        def middleware(request):
+            tally = Tally()
+            token = _tally.set(tally)
+            start = time.perf_counter()
+            try:
+                return get_response(request)
+            finally:
+                _tally.reset(token)
+                _observe_request(request, time.perf_counter() - start, tally)
+    return middleware
+
+
+class _CountingLayer:
+    """Channel layer proxy counting ``group_send`` calls per event type."""
+
+    __slots__ = ('layer', 'counts')
+
+    def __init__(self, layer, counts):
+        self.layer = layer
+        self.counts = counts
+
+    async def group_send(self, group, message):
+        event_type = message.get('type')
+        self.counts[event_type] = self.counts.get(event_type, 0) + 1
+        await self.layer.group_send(group, message)
+
+    def __getattr__(self, name):
+        return getattr(self.layer, name)
+
+
+class MetricsMixin:
+    """Consumer mixin: handler latency, queries, fan-outs and open sockets.
+
+    Frames are labelled with the ``type`` the guard parsed; frames the guard
+    dropped are counted there instead.
+    """
+
+    frame_type = None
+    _metrics_room = None
+
+    @property
+    def channel_layer(self):
+        return self.__dict__.get('_counting_layer')
+
+    @channel_layer.setter
+    def channel_layer(self, layer):
+        if layer is not None:
+            layer = _CountingLayer(layer, fanouts.setdefault(type(self).__name__, {}))
+        self.__dict__['_counting_layer'] = layer
+
+    async def __call__(self, scope, receive, send):
+        # The whole socket runs in this task, so one tally serves every message
+        self._tally = Tally()
+        self._handler_series = handlers.setdefault(type(self).__name__, {})
+        _tally.set(self._tally)
+        await super().__call__(scope, receive, send)
+
+    async def dispatch(self, message):
+        tally = self._tally
+        tally.queries = 0
+        tally.seconds = 0.0
+        self.frame_type = None
+        start = time.perf_counter()
+        try:
+            await super().dispatch(message)
+        finally:
+            label = message['type']
+            if label == 'websocket.receive':
+                label = self.frame_type
+            if label is not None:
+                _series(self._handler_series, label).observe(time.perf_counter() - start, tally)
+
+    async def websocket_connect(self, message):
+        await super().websocket_connect(message)
+        room = getattr(self, 'room_group_name', None) or getattr(self, 'group_name', None)
+        if room is not None:
+            rooms = connections.setdefault(type(self).__name__, {})
+            rooms[room] = rooms.get(room, 0) + 1
+            self._metrics_room = room
+
+    async def websocket_disconnect(self, message):
+        room, self._metrics_room = self._metrics_room, None
+        if room is not None:
+            rooms = connections.get(type(self).__name__, {})
+            open_sockets = rooms.get(room, 0) - 1
+            if open_sockets > 0:
+                rooms[room] = open_sockets
+            else:
+                rooms.pop(room, None)
+        await super().websocket_disconnect(message)
+
+
+def executor_queue_depths():
+    """Return ``{executor: queued work items}`` for the ``sync_to_async`` executors."""
+    def depth(executor):
+        queue = getattr(executor, '_work_queue', None)
+        return queue.qsize() if queue is not None else 0
+
+    depths = {
+        'thread_sensitive': depth(SyncToAsync.single_thread_executor)
+        + sum(depth(executor) for executor in list(SyncToAsync.context_to_thread_executor.values())),
+    }
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    default_executor = getattr(loop, '_default_executor', None)
+    depths['default'] = depth(default_executor) if default_executor is not None else 0
+    return depths
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+def _histogram(lines, name, help_text, table):
+    lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for labels, series in table:
+        cumulative = 0
+        for bound, hits in zip(BUCKETS, series.buckets):
+            cumulative += hits
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {series.count}')
+        lines.append(f'{name}_sum{{{labels}}} {series.total}')
+        lines.append(f'{name}_count{{{labels}}} {series.count}')
+
+
+def _counter(lines, name, help_text, samples, kind='counter'):
+    lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    lines += [f'{name}{{{labels}}} {value}' for labels, value in samples]
+
+
+def render():
+    """Return all metrics in the Prometheus text exposition format."""
+    handler_rows = [
+        (_labels(consumer=consumer, message_type=message_type), series)
+        for consumer, by_type in list(handlers.items())
+        for message_type, series in list(by_type.items())
+    ]
+    route_rows = [(_labels(route=route), series) for route, series in list(routes.items())]
+
+    lines = []
+    _histogram(lines, 'games_handler_seconds', 'Consumer handler latency per message type.', handler_rows)
+    _counter(lines, 'games_handler_db_queries_total', 'Database queries run by consumer handlers.',
+             [(labels, series.queries) for labels, series in handler_rows])
+    _counter(lines, 'games_handler_db_seconds_total', 'Time spent in database queries by consumer handlers.',
+             [(labels, series.query_seconds) for labels, series in handler_rows])
+    _histogram(lines, 'games_http_request_seconds', 'HTTP request latency per URL route.', route_rows)
+    _counter(lines, 'games_http_db_queries_total', 'Database queries run per URL route.',
+             [(labels, series.queries) for labels, series in route_rows])
+    _counter(lines, 'games_http_db_seconds_total', 'Time spent in database queries per URL route.',
+             [(labels, series.query_seconds) for labels, series in route_rows])
+    _counter(lines, 'games_group_send_total', 'Channel layer group_send fan-outs per event type.', [
+        (_labels(consumer=consumer, event_type=event_type), count)
+        for consumer, by_type in list(fanouts.items())
+        for event_type, count in list(by_type.items())
+    ])
+    _counter(lines, 'games_websocket_connections', 'Open sockets per room group.', [
+        (_labels(consumer=consumer, room=room), count)
+        for consumer, rooms in list(connections.items())
+        for room, count in list(rooms.items())
+    ], kind='gauge')
+    _counter(lines, 'games_executor_queue_depth', 'Work items waiting for a sync_to_async executor.', [
+        (_labels(executor=executor), depth) for executor, depth in executor_queue_depths().items()
+    ], kind='gauge')
+    _counter(lines, 'games_dropped_frames_total', 'WebSocket frames dropped by the guard.', [
+        (_labels(consumer=consumer, reason=reason, message_type=message_type or ''), count)
+        for (consumer, reason, message_type), count in guard.dropped_messages().items()
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+def clear():
+    for table in (handlers, routes, fanouts, connections):
+        table.clear()
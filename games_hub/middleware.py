@@ -0,0 +1,28 @@
+"""ASGI middleware for participant sockets."""
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from django.contrib.auth.models import AnonymousUser
+
+from .tokens import read_token
+
+
+class ParticipantTokenMiddleware:
+    """Authenticate sockets that carry a signed participant token.
+
+    The token is read from the ``token`` query parameter and verified
+    without the database; the result is stored in ``scope['participant']``.
+    Sockets without a valid token (host and admin pages) go through
+    ``AuthMiddlewareStack`` and its session and user lookup as before.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.auth_inner = AuthMiddlewareStack(inner)
+
+    async def __call__(self, scope, receive, send):
+        params = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        token = read_token((params.get('token') or [None])[0])
+        if token is not None:
+            return await self.inner(dict(scope, participant=token, user=AnonymousUser()), receive, send)
+        return await self.auth_inner(dict(scope, participant=None), receive, send)
@@ -0,0 +1,54 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Lower
+
+
+PARTICIPANT_MODELS = [
+    ('QuizGame', 'QuizParticipant'),
+    ('Estimation', 'EstimationParticipant'),
+    ('Assign', 'AssignParticipant'),
+    ('where_is_this', 'WhereParticipant'),
+    ('who_is_lying', 'WhoParticipant'),
+    ('who_is_that', 'WhoThatParticipant'),
+    ('black_jack_quiz', 'BlackJackParticipant'),
+    ('clue_rush', 'ClueRushParticipant'),
+    ('sorting_ladder', 'SortingLadderParticipant'),
+]
+
+
+def link_participants(apps, schema_editor):
+    """Point existing game participants at the hub player with the same nickname."""
+    HubParticipant = apps.get_model('games_hub', 'HubParticipant')
+    for app_label, model_name in PARTICIPANT_MODELS:
+        model = apps.get_model(app_label, model_name)
+        # Nicknames are matched case-insensitively, like the lobby does
+        match = (
+            HubParticipant.objects
+            .annotate(nickname_lower=Lower('nickname'))
+            .filter(session__code=OuterRef('hub_session_code'), nickname_lower=Lower(OuterRef('name')))
+            .order_by('pk')
+            .values('pk')[:1]
+        )
+        model.objects.filter(hub_participant__isnull=True, hub_session_code__isnull=False).update(
+            hub_participant=Subquery(match),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games_hub", "0006_hubsession_scoreboard_visible"),
+        ("Assign", "0007_assignparticipant_hub_participant"),
+        ("Estimation", "0007_estimationparticipant_hub_participant"),
+        ("QuizGame", "0008_quizparticipant_hub_participant"),
+        ("black_jack_quiz", "0006_blackjackparticipant_hub_participant"),
+        ("clue_rush", "0003_cluerushparticipant_hub_participant"),
+        ("sorting_ladder", "0005_sortingladderparticipant_hub_participant"),
+        ("where_is_this", "0006_whereparticipant_hub_participant"),
+        ("who_is_lying", "0007_whoparticipant_hub_participant"),
+        ("who_is_that", "0006_whothatparticipant_hub_participant"),
+    ]
+
+    operations = [
+        migrations.RunPython(link_participants, migrations.RunPython.noop),
+    ]
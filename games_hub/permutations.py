@@ -0,0 +1,83 @@
+"""Stable shuffle orders of a question's items within a room.
+
+Assign shuffles the right-hand items of a question, Who Is Lying its
+people; every phone of the room and the scoring of the answers must see
+the same order. The order is derived from keyed BLAKE2b digests instead of
+``random`` seeded with ``hash()``, which is salted per process:
+
+* each position ``i`` gets the digest of ``(game, question, room, i)``,
+  keyed with a key derived from ``SECRET_KEY``;
+* the positions sorted by their digests are the shuffled order.
+
+So every worker, and the same worker after a restart, computes the same
+order for a room, and rooms of the same question differ. An order is
+computed once per (game, question, room, size) and kept in process memory
+like the room replay buffers (see games_hub/replay.py), bounded and
+dropped with ``discard_room`` when the room's quiz ends.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+MAX_CACHED = 1024
+
+_orders = OrderedDict()
+_orders_lock = threading.Lock()
+_key = None
+
+
+def _secret():
+    global _key
+    if _key is None:
+        _key = hashlib.blake2b(
+            settings.SECRET_KEY.encode(), digest_size=32, person=b'games_hub.perm',
+        ).digest()
+    return _key
+
+
+def _compute(game, question_id, room_code, size):
+    key = _secret()
+    prefix = f'{game}:{question_id}:{room_code or "default"}:'.encode()
+
+    def digest(position):
+        return hashlib.blake2b(prefix + str(position).encode(), key=key, digest_size=8).digest()
+
+    return tuple(sorted(range(size), key=digest))
+
+
+def shuffle_order(game, question_id, room_code, size):
+    """Original indices in shuffled order: ``order[position]`` is the item shown at ``position``."""
+    cache_key = (game, question_id, room_code, size)
+    with _orders_lock:
+        order = _orders.get(cache_key)
+        if order is not None:
+            _orders.move_to_end(cache_key)
+            return order
+    order = _compute(game, question_id, room_code, size)
+    with _orders_lock:
+        _orders[cache_key] = order
+        while len(_orders) > MAX_CACHED:
+            _orders.popitem(last=False)
+    return order
+
+
+def to_original(order, positions):
+    """Original indices of shuffled ``positions``; positions that are not ints or out of range are skipped."""
+    originals = []
+    for position in positions:
+        try:
+            position = int(position)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= position < len(order):
+            originals.append(order[position])
+    return originals
+
+
+def discard_room(room_code):
+    with _orders_lock:
+        for key in [key for key in _orders if key[2] == room_code]:
+            del _orders[key]
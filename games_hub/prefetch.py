@@ -0,0 +1,284 @@
+"""Prefetch of the next question's images while the current one is revealed.
+
+When the host ends question N of a picture game (Where is this?, Who is
+That?), the room is sent a ``prefetch`` event with the image URLs of the
+question that follows N in the quiz's playlist (the selected questions in
+monitor order, minus those already asked in this room). Phones load the
+images into their HTTP cache and answer ``prefetch_ready``; the staff
+sockets of the room get ``prefetch_status`` with how many of the present
+participants are ready, so the monitor shows it before the next send.
+
+The event carries the question ID and asset URLs only, no question text or
+answers. The URLs are opaque (``asset_url``): an HMAC of the stored file
+name instead of the name itself, which for "Who is That?" often is the
+answer. ``question_started`` uses the same URLs, so the image is a cache
+hit on every phone that prefetched it.
+
+Readiness is recorded for the participant the socket joined presence as,
+never for a name the frame claims. Digests are resolved from the URLs this
+process handed out; after a restart, or for a URL another worker issued, a
+miss re-indexes the question images, at most once per
+``ASSET_REINDEX_INTERVAL`` seconds, and other misses are a plain 404.
+
+Like presence and the replay buffers (see games_hub/presence.py), the
+tracker lives in process memory and covers the sockets of this process.
+"""
+import json
+import os
+import threading
+import time
+
+from channels.db import database_sync_to_async
+from django.apps import apps
+from django.urls import reverse
+from django.utils.crypto import salted_hmac
+
+from .presence import presence
+
+
+# Image fields that can be served through asset_url, as (model label, field name)
+ASSET_FIELDS = (
+    ('where_is_this.WhereQuestion', 'image'),
+    ('who_is_that.WhoThatQuestion', 'image'),
+)
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+ASSET_REINDEX_INTERVAL = 60
+
+_assets = {}
+_assets_lock = threading.Lock()
+_reindex_lock = threading.Lock()
+_indexed_at = None
+
+
+def asset_digest(name):
+    return salted_hmac('games_hub.prefetch', name).hexdigest()[:24]
+
+
+def asset_url(field):
+    """Opaque, cacheable URL of a stored image, or None if there is none."""
+    if not field:
+        return None
+    digest = asset_digest(field.name)
+    with _assets_lock:
+        _assets[digest] = field.name
+    return reverse('games_hub:question_asset', args=[digest + os.path.splitext(field.name)[1].lower()])
+
+
+def _index_assets():
+    found = {}
+    for label, field in ASSET_FIELDS:
+        names = apps.get_model(label).objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+        for stored in names.values_list(field, flat=True):
+            found[asset_digest(stored)] = stored
+    return found
+
+
+def resolve_asset(digest):
+    """Stored file name for ``digest``, or None; a miss re-indexes the question images at most once per interval."""
+    global _indexed_at
+    with _assets_lock:
+        name = _assets.get(digest)
+    if name is not None:
+        return name
+    with _reindex_lock:
+        with _assets_lock:
+            name = _assets.get(digest)
+        if name is not None:
+            return name
+        if _indexed_at is not None and time.monotonic() - _indexed_at < ASSET_REINDEX_INTERVAL:
+            return None
+        found = _index_assets()
+        _indexed_at = time.monotonic()
+    with _assets_lock:
+        _assets.update(found)
+    return found.get(digest)
+
+
+def forget_assets():
+    """Drop the digest index, e.g. in tests; the next miss re-indexes."""
+    global _indexed_at
+    with _reindex_lock, _assets_lock:
+        _assets.clear()
+        _indexed_at = None
+
+
+def next_question(quiz, current_id, asked=()):
+    """The question after ``current_id`` in the playlist, skipping asked ones; None at the end.
+
+    The playlist is the quiz's selected questions in the order the monitor
+    lists them. Quizzes without a selection have no playlist.
+    """
+    playlist = list(quiz.selected_questions.order_by('-created_at'))
+    ids = [question.id for question in playlist]
+    start = ids.index(current_id) + 1 if current_id in ids else 0
+    for question in playlist[start:]:
+        if question.id not in asked and question.id != current_id:
+            return question
+    return None
+
+
+class _Room:
+    __slots__ = ('question_id', 'assets', 'ready', 'asked')
+
+    def __init__(self):
+        self.question_id = None
+        self.assets = []
+        self.ready = set()
+        self.asked = set()
+
+
+class PrefetchTracker:
+    def __init__(self):
+        self._rooms = {}
+        self._lock = threading.Lock()
+
+    def _room(self, room):
+        entry = self._rooms.get(room)
+        if entry is None:
+            entry = self._rooms[room] = _Room()
+        return entry
+
+    def asked(self, room, question_id):
+        """Note that ``question_id`` was sent; a prefetch for it is used up."""
+        with self._lock:
+            entry = self._room(room)
+            entry.asked.add(question_id)
+            if entry.question_id == question_id:
+                entry.question_id, entry.assets = None, []
+                entry.ready.clear()
+
+    def asked_ids(self, room):
+        with self._lock:
+            return set(self._room(room).asked)
+
+    def announce(self, room, question_id, assets):
+        with self._lock:
+            entry = self._room(room)
+            entry.question_id, entry.assets = question_id, list(assets)
+            entry.ready.clear()
+
+    def pending(self, room):
+        """The ``prefetch`` event of the announced question, or None."""
+        with self._lock:
+            entry = self._rooms.get(room)
+            if entry is None or entry.question_id is None:
+                return None
+            return {'type': 'prefetch', 'question_id': entry.question_id, 'assets': list(entry.assets)}
+
+    def confirm(self, room, question_id, participant):
+        """Record ``participant`` as ready; False if ``question_id`` is not the announced one."""
+        with self._lock:
+            entry = self._rooms.get(room)
+            if entry is None or entry.question_id is None or entry.question_id != question_id:
+                return False
+            entry.ready.add(participant)
+            return True
+
+    def status(self, room, total):
+        with self._lock:
+            entry = self._rooms.get(room)
+            if entry is None or entry.question_id is None:
+                return {'type': 'prefetch_status', 'question_id': None, 'ready': 0, 'total': total}
+            return {
+                'type': 'prefetch_status',
+                'question_id': entry.question_id,
+                'ready': min(len(entry.ready), total),
+                'total': total,
+            }
+
+    def discard(self, room):
+        with self._lock:
+            self._rooms.pop(room, None)
+
+    def clear(self):
+        with self._lock:
+            self._rooms.clear()
+
+
+prefetch = PrefetchTracker()
+
+
+class PrefetchMixin:
+    """Consumer mixin: ``prefetch`` after a reveal, ``prefetch_ready`` from phones.
+
+    Consumers call ``join_prefetch_staff`` once the socket is accepted, ``reset_prefetch``
+    when the quiz starts or ends, ``question_asked`` when a question is sent, ``announce_prefetch`` after ``question_ended``,
+    ``send_pending_prefetch`` to a participant who joins during a reveal and
+    route ``prefetch_ready`` frames to ``handle_prefetch_ready``. The
+    question's ``image`` is what gets prefetched.
+    """
+
+    @property
+    def staff_group_name(self):
+        return f'{self.room_group_name}_staff'
+
+    async def join_prefetch_staff(self):
+        """Subscribe a staff socket to readiness updates, starting with the current one."""
+        if not self.is_admin_socket():
+            return
+        await self.channel_layer.group_add(self.staff_group_name, self.channel_name)
+        if prefetch.pending(self.room_group_name) is not None:
+            await self.prefetch_status(prefetch.status(self.room_group_name, presence.count(self.room_group_name)))
+
+    async def leave_prefetch_staff(self):
+        await self.channel_layer.group_discard(self.staff_group_name, self.channel_name)
+
+    def question_asked(self, question_id):
+        prefetch.asked(self.room_group_name, question_id)
+
+    def reset_prefetch(self):
+        """Forget asked and announced questions, e.g. when the quiz starts over."""
+        prefetch.discard(self.room_group_name)
+
+    @database_sync_to_async
+    def _next_prefetch(self, quiz, current_id):
+        question = next_question(quiz, current_id, prefetch.asked_ids(self.room_group_name))
+        if question is None:
+            return None, []
+        return question.id, [url for url in [asset_url(question.image)] if url]
+
+    async def announce_prefetch(self, quiz, current_id):
+        """Send the room the assets of the question after ``current_id``, if it has any."""
+        question_id, assets = await self._next_prefetch(quiz, current_id)
+        if not assets:
+            return
+        prefetch.announce(self.room_group_name, question_id, assets)
+        await self.room_send({'type': 'prefetch', 'question_id': question_id, 'assets': assets})
+        await self.send_prefetch_status()
+
+    async def send_pending_prefetch(self):
+        event = prefetch.pending(self.room_group_name)
+        if event is not None:
+            await self.send(text_data=json.dumps(event))
+
+    async def send_prefetch_status(self):
+        status = prefetch.status(self.room_group_name, presence.count(self.room_group_name))
+        await self.channel_layer.group_send(self.staff_group_name, status)
+
+    async def handle_prefetch_ready(self, data):
+        try:
+            question_id = int(data.get('question_id'))
+        except (TypeError, ValueError):
+            return
+        # The participant this socket joined as; a name in the frame could be anyone's
+        participant = presence.participant(self.channel_name)
+        if participant and prefetch.confirm(self.room_group_name, question_id, participant):
+            await self.send_prefetch_status()
+
+    # Event handlers for group messages
+    async def prefetch(self, event):
+        """Send the next question's assets to preload"""
+        await self.send(text_data=json.dumps({
+            'type': 'prefetch',
+            'question_id': event['question_id'],
+            'assets': event['assets']
+        }))
+
+    async def prefetch_status(self, event):
+        """Send prefetch readiness to the monitor"""
+        await self.send(text_data=json.dumps({
+            'type': 'prefetch_status',
+            'question_id': event['question_id'],
+            'ready': event['ready'],
+            'total': event['total']
+        }))
@@ -0,0 +1,211 @@
+"""In-memory presence of game participants and hub players.
+
+Sockets register the participant they joined for, every received frame and
+every status poll counts as a heartbeat, and closing the last socket marks
+the participant disconnected. From that the tracker derives a live state:
+
+* ``active``: a recent heartbeat (socket open or polling);
+* ``idle``: a socket is open but nothing arrived for ``PRESENCE_IDLE_AFTER``;
+* ``disconnected``: the last socket closed and nothing arrived since.
+
+Room counts come from these states instead of ``COUNT(*)`` queries. The
+database only learns about presence in batches: every
+``PRESENCE_FLUSH_INTERVAL`` seconds one ``UPDATE`` per model writes
+``last_activity``/``last_seen``. ``update()`` skips the ``SyncBase``
+signals, so heartbeats never mark rows for the next sync. ``is_active``
+stays the explicit join/leave flag; a dropped socket only shows up in the
+live state.
+
+The tracker lives in process memory like the room replay buffers (see
+games_hub/replay.py), so counts cover the sockets of this process.
+"""
+import threading
+import time
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from .logs import bind_log_context
+
+
+ACTIVE = 'active'
+IDLE = 'idle'
+DISCONNECTED = 'disconnected'
+
+DEFAULT_IDLE_AFTER = 60
+DEFAULT_FLUSH_INTERVAL = 30
+
+# Models whose heartbeat column is not called last_activity
+LAST_SEEN_FIELDS = {'games_hub.hubparticipant': 'last_seen'}
+
+
+class _Entry:
+    __slots__ = ('room', 'session_code', 'channels', 'seen', 'seen_at', 'disconnected', 'dirty')
+
+    def __init__(self):
+        self.room = None
+        self.session_code = None
+        self.channels = set()
+        self.seen = 0.0
+        self.seen_at = None
+        self.disconnected = False
+        self.dirty = False
+
+
+class PresenceTracker:
+    def __init__(self):
+        self._entries = {}
+        self._channels = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _touch(self, key, room=None, session_code=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry()
+        if room is not None:
+            entry.room, entry.session_code = room, session_code
+        entry.seen = time.monotonic()
+        entry.seen_at = timezone.now()
+        entry.disconnected = False
+        entry.dirty = True
+        return entry
+
+    def connect(self, model, pk, channel_name, room, session_code=None):
+        """Register the socket ``channel_name`` of a participant in ``room``."""
+        key = (model, pk)
+        with self._lock:
+            previous = self._channels.get(channel_name)
+            if previous and previous != key and previous in self._entries:
+                self._entries[previous].channels.discard(channel_name)
+            self._channels[channel_name] = key
+            self._touch(key, room, session_code).channels.add(channel_name)
+
+    def heartbeat(self, model, pk, room=None, session_code=None):
+        with self._lock:
+            self._touch((model, pk), room, session_code)
+
+    def channel_heartbeat(self, channel_name):
+        with self._lock:
+            key = self._channels.get(channel_name)
+            if key is not None:
+                self._touch(key)
+
+    def participant(self, channel_name):
+        """``(model, pk)`` of the participant the socket ``channel_name`` joined as, or None."""
+        with self._lock:
+            return self._channels.get(channel_name)
+
+    def disconnect(self, channel_name):
+        with self._lock:
+            key = self._channels.pop(channel_name, None)
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.channels.discard(channel_name)
+            if not entry.channels:
+                entry.disconnected = True
+
+    def _state(self, entry, now):
+        if entry.disconnected:
+            return DISCONNECTED
+        recent = now - entry.seen < getattr(settings, 'PRESENCE_IDLE_AFTER', DEFAULT_IDLE_AFTER)
+        if entry.channels:
+            return ACTIVE if recent else IDLE
+        return ACTIVE if recent else DISCONNECTED
+
+    def state(self, model, pk):
+        with self._lock:
+            entry = self._entries.get((model, pk))
+            return self._state(entry, time.monotonic()) if entry else DISCONNECTED
+
+    def present(self, room, session_code=None):
+        """Return the primary keys of everyone in ``room`` who is not disconnected."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                pk for (model, pk), entry in self._entries.items()
+                if entry.room == room
+                and (session_code is None or entry.session_code == session_code)
+                and self._state(entry, now) != DISCONNECTED
+            ]
+
+    def count(self, room, session_code=None):
+        return len(self.present(room, session_code))
+
+    def flush_due(self):
+        interval = getattr(settings, 'PRESENCE_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+        return time.monotonic() - self._last_flush >= interval
+
+    def flush(self):
+        """Write heartbeats since the last flush, one UPDATE per model."""
+        now = time.monotonic()
+        batches = {}
+        with self._lock:
+            self._last_flush = now
+            for (model, pk), entry in list(self._entries.items()):
+                if entry.dirty:
+                    entry.dirty = False
+                    batch = batches.setdefault(model, {})
+                    batch[pk] = entry.seen_at
+                if self._state(entry, now) == DISCONNECTED and not entry.channels:
+                    del self._entries[(model, pk)]
+        for model, stamps in batches.items():
+            field = LAST_SEEN_FIELDS.get(model._meta.label_lower, 'last_activity')
+            seen = Case(*(When(pk=pk, then=Value(at)) for pk, at in stamps.items()), output_field=DateTimeField())
+            model.objects.filter(pk__in=list(stamps)).update(**{field: seen})
+
+    def flush_if_due(self):
+        if self.flush_due():
+            self.flush()
+
+    async def aflush_if_due(self):
+        if self.flush_due():
+            await database_sync_to_async(self.flush)()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._channels.clear()
+            self._last_flush = time.monotonic()
+
+
+presence = PresenceTracker()
+
+
+def present_count(room, participants, session_code=None):
+    """How many of ``participants`` are connected to ``room``.
+
+    Falls back to the ``is_active`` rows while presence knows nobody there
+    yet, e.g. right after a restart.
+    """
+    present = presence.present(room, session_code or None)
+    if present:
+        return len(present)
+    if session_code:
+        participants = participants.filter(hub_session_code=session_code)
+    return participants.filter(is_active=True).count()
+
+
+class PresenceMixin:
+    """Consumer mixin: heartbeats from received frames, disconnect on close.
+
+    Consumers call ``join_presence`` once they know which participant the
+    socket belongs to.
+    """
+
+    def join_presence(self, model, pk, room, session_code=None):
+        presence.connect(model, pk, self.channel_name, room, session_code)
+        bind_log_context(participant=pk)
+
+    async def websocket_receive(self, message):
+        presence.channel_heartbeat(self.channel_name)
+        await presence.aflush_if_due()
+        await super().websocket_receive(message)
+
+    async def websocket_disconnect(self, message):
+        presence.disconnect(self.channel_name)
+        await presence.aflush_if_due()
+        await super().websocket_disconnect(message)
@@ -0,0 +1,404 @@
+"""On-demand profiling of single requests and consumer messages.
+
+Profiling is off until an admin arms it on the admin dashboard profiling
+page. Armed, it captures
+
+* HTTP requests that carry ``?profile=1`` or an ``X-Profile: 1`` header;
+* consumer messages for the selected room codes or message types;
+
+until ``limit`` captures are taken. Each capture runs ``cProfile`` and a
+stack sampler on the event loop thread and on the threads doing the
+request's sync work (the sync view, and every thread that runs one of
+its queries). It also records each ORM query with its duration and the
+project line that issued it. Async code is profiled on the event loop
+thread, so interleaved tasks of other sockets can show up in a capture.
+Only one capture runs at a time; others pass through unprofiled.
+
+From Python 3.12 cProfile is built on the interpreter-wide
+``sys.monitoring`` and a second enabled profiler raises ``ValueError``, so
+a capture runs a single profiler started on the event loop thread, which
+already sees the sync threads. If another profiling tool holds
+``sys.monitoring``, the capture records samples and queries only.
+
+The last ``PROFILING_BUFFER_SIZE`` captures are kept in process memory
+(like presence and the replay buffers) and can be downloaded as
+``.pstats`` (cProfile) or speedscope JSON (samples).
+
+Disarmed, the middleware and ``ProfilingMixin`` cost one attribute check.
+"""
+import cProfile
+import itertools
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.checks import Error
+from django.utils import timezone
+
+
+DEFAULT_BUFFER_SIZE = 20
+DEFAULT_SAMPLE_INTERVAL = 0.001
+MAX_QUERIES = 500
+MAX_SQL_LENGTH = 1000
+
+# Before 3.12 a cProfile.Profile only sees the thread that enabled it
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+_capture = ContextVar('games_hub_profile_capture', default=None)
+_ids = itertools.count(1)
+# Instrumentation frames are never the origin of a query
+_SKIPPED_ORIGINS = (os.path.join('games_hub', 'metrics.py'), os.path.join('games_hub', 'profiling.py'))
+
+
+def _query_origin():
+    """Innermost project frame of the current stack, as ``file:line in function``."""
+    base = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack(limit=40)[:-3]):
+        filename = frame.filename
+        if filename.startswith(base) and 'site-packages' not in filename and not filename.endswith(_SKIPPED_ORIGINS):
+            return f'{os.path.relpath(filename, base)}:{frame.lineno} in {frame.name}'
+    return ''
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrappers`` hook recording queries of the current capture."""
+    capture = _capture.get()
+    if capture is None:
+        return execute(sql, params, many, context)
+    capture.add_thread()
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        capture.add_query(sql, time.perf_counter() - start, _query_origin())
+
+
+def install_query_wrapper(connection):
+    if query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_wrapper)
+
+
+class Capture:
+    """One profiled request or message."""
+
+    def __init__(self, kind, label, room):
+        self.id = next(_ids)
+        self.kind = kind
+        self.label = label
+        self.room = room
+        self.created_at = timezone.now()
+        self.duration = 0.0
+        self.queries = []
+        self.stats = None
+        self.frames = []
+        self.samples = {}
+        self._profiles = {}
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._start = None
+        self._interval = DEFAULT_SAMPLE_INTERVAL
+
+    # -- recording -------------------------------------------------------
+
+    def start(self):
+        self._start = time.perf_counter()
+        self.enable_thread()
+        self._interval = getattr(settings, 'PROFILING_SAMPLE_INTERVAL', DEFAULT_SAMPLE_INTERVAL)
+        self._sampler = threading.Thread(target=self._sample, daemon=True, name='profile-sampler')
+        self._sampler.start()
+
+    def stop(self):
+        self.disable_thread()
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self._start
+        stats = pstats.Stats()
+        for profile in self._profiles.values():
+            # pstats refuses a profile that recorded nothing
+            profile.create_stats()
+            if profile.stats:
+                stats.add(profile)
+        self.stats = marshal.dumps(stats.stats)
+        self._profiles = {}
+
+    def enable_thread(self):
+        """Run cProfile on the calling thread until ``disable_thread``.
+
+        From 3.12 the capture's first profiler covers every thread and no
+        second one is started.
+        """
+        self.add_thread()
+        if self._profiles and not PER_THREAD_PROFILES:
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another tool holds sys.monitoring; samples and queries only
+            return
+        self._profiles[threading.get_ident()] = profile
+
+    def disable_thread(self):
+        profile = self._profiles.get(threading.get_ident())
+        if profile is not None:
+            profile.disable()
+
+    def call_view(self, view, request, args, kwargs):
+        self.enable_thread()
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            self.disable_thread()
+            self._threads.discard(threading.get_ident())
+
+    def add_thread(self):
+        self._threads.add(threading.get_ident())
+
+    def add_query(self, sql, seconds, origin):
+        with self._lock:
+            if len(self.queries) < MAX_QUERIES:
+                self.queries.append((sql[:MAX_SQL_LENGTH], seconds, origin))
+
+    def _sample(self):
+        frame_ids = {}
+        while not self._stop.wait(self._interval):
+            current = sys._current_frames()
+            for ident in list(self._threads):
+                frame = current.get(ident)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    key = (code.co_name, code.co_filename, code.co_firstlineno)
+                    index = frame_ids.get(key)
+                    if index is None:
+                        index = frame_ids[key] = len(self.frames)
+                        self.frames.append(key)
+                    stack.append(index)
+                    frame = frame.f_back
+                if stack:
+                    stack.reverse()
+                    self.samples.setdefault(ident, []).append(stack)
+
+    # -- reading ---------------------------------------------------------
+
+    @property
+    def query_seconds(self):
+        return sum(seconds for _, seconds, _ in self.queries)
+
+    def top_functions(self, limit=15):
+        """``(function, calls, total, cumulative)`` rows by cumulative time."""
+        rows = [
+            (pstats.func_std_string(func), nc, tt, ct)
+            for func, (cc, nc, tt, ct, callers) in marshal.loads(self.stats).items()
+        ]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows[:limit]
+
+    def speedscope(self):
+        """Samples in the speedscope file format (one profile per thread)."""
+        interval = self._interval
+        profiles = []
+        for ident, stacks in self.samples.items():
+            profiles.append({
+                'type': 'sampled',
+                'name': f'{self.label} (thread {ident})',
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': len(stacks) * interval,
+                'samples': stacks,
+                'weights': [interval] * len(stacks),
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': f'{self.kind} {self.label}',
+            'exporter': 'games_hub.profiling',
+            'activeProfileIndex': 0,
+            'shared': {'frames': [{'name': name, 'file': file, 'line': line} for name, file, line in self.frames]},
+            'profiles': profiles,
+        }
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.rooms = frozenset()
+        self.message_types = frozenset()
+        self.remaining = 0
+        self.captures = deque(maxlen=DEFAULT_BUFFER_SIZE)
+        self._busy = threading.Lock()
+
+    def configure(self, enabled, rooms=(), message_types=(), limit=10):
+        size = getattr(settings, 'PROFILING_BUFFER_SIZE', DEFAULT_BUFFER_SIZE)
+        if self.captures.maxlen != size:
+            self.captures = deque(self.captures, maxlen=size)
+        self.rooms = frozenset(r.strip().upper() for r in rooms if r.strip())
+        self.message_types = frozenset(t.strip() for t in message_types if t.strip())
+        self.remaining = max(0, int(limit))
+        self.enabled = bool(enabled) and self.remaining > 0
+
+    def wants_request(self, request):
+        return request.GET.get('profile') == '1' or request.headers.get('X-Profile') == '1'
+
+    def wants_message(self, room, message_type):
+        return (room or '').upper() in self.rooms or message_type in self.message_types
+
+    def begin(self, kind, label, room=None):
+        """Start a capture, or return None if disarmed or another one is running."""
+        if not self.enabled or not self._busy.acquire(blocking=False):
+            return None
+        if self.remaining <= 0:
+            self.enabled = False
+            self._busy.release()
+            return None
+        self.remaining -= 1
+        capture = Capture(kind, label, room)
+        capture.start()
+        return capture
+
+    def end(self, capture, label=None, room=None):
+        try:
+            capture.stop()
+            capture.label = label or capture.label
+            capture.room = room or capture.room
+            self.captures.appendleft(capture)
+        finally:
+            if self.remaining <= 0:
+                self.enabled = False
+            self._busy.release()
+
+    def get(self, capture_id):
+        for capture in self.captures:
+            if capture.id == capture_id:
+                return capture
+        return None
+
+    def clear(self):
+        self.captures.clear()
+
+
+profiler = Profiler()
+
+
+def _end_request(capture, request):
+    match = getattr(request, 'resolver_match', None)
+    route = match.route if match is not None else request.path
+    room = match.kwargs.get('room_code') if match is not None else None
+    profiler.end(capture, f'{request.method} {route}', room)
+
+
+class ProfilingMiddleware:
+    """Profile requests flagged with ``?profile=1`` or ``X-Profile: 1`` while armed."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not profiler.enabled or not profiler.wants_request(request):
+            return self.get_response(request)
+        capture = profiler.begin('http', request.path)
+        if capture is None:
+            return self.get_response(request)
+        token = _capture.set(capture)
+        try:
+            return self.get_response(request)
+        finally:
+            _capture.reset(token)
+            _end_request(capture, request)
+
+    async def __acall__(self, request):
+        if not profiler.enabled or not profiler.wants_request(request):
+            return await self.get_response(request)
+        capture = profiler.begin('http', request.path)
+        if capture is None:
+            return await self.get_response(request)
+        request._profile_capture = capture
+        token = _capture.set(capture)
+        try:
+            return await self.get_response(request)
+        finally:
+            _capture.reset(token)
+            _end_request(capture, request)
+
+
+class ProfilingViewMiddleware:
+    """Run sync views of profiled async requests in a profiled worker thread.
+
+    ``process_view`` calls the view itself, so Django skips the
+    ``process_view`` of every middleware listed after this one. It must be
+    the last entry of ``MIDDLEWARE``, after ``CsrfViewMiddleware`` and all
+    other checks (``check_view_middleware_is_last``).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self._aprocess_view
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        # Sync views run in a worker thread; profile them there
+        capture = getattr(request, '_profile_capture', None)
+        if capture is None or iscoroutinefunction(view_func):
+            return None
+        return await sync_to_async(capture.call_view)(view_func, request, view_args, view_kwargs)
+
+
+VIEW_MIDDLEWARE = 'games_hub.profiling.ProfilingViewMiddleware'
+
+
+def check_view_middleware_is_last(app_configs=None, **kwargs):
+    """System check: ``ProfilingViewMiddleware`` may only be the last middleware."""
+    middleware = list(getattr(settings, 'MIDDLEWARE', []))
+    if VIEW_MIDDLEWARE in middleware and middleware[-1] != VIEW_MIDDLEWARE:
+        return [Error(
+            f'{VIEW_MIDDLEWARE} must be the last entry of MIDDLEWARE.',
+            hint='Its process_view answers the request, so middleware after it would skip their checks (CSRF).',
+            id='games_hub.E001',
+        )]
+    return []
+
+
+class ProfilingMixin:
+    """Consumer mixin: profile frames for the rooms and message types armed by an admin."""
+
+    async def websocket_receive(self, message):
+        if not profiler.enabled:
+            await super().websocket_receive(message)
+            return
+        room = getattr(self, 'room_code', None) or getattr(self, 'session_code', None)
+        message_type = getattr(self, 'frame_type', None)
+        capture = profiler.begin('ws', f'{type(self).__name__} {message_type}', room) \
+            if profiler.wants_message(room, message_type) else None
+        if capture is None:
+            await super().websocket_receive(message)
+            return
+        token = _capture.set(capture)
+        try:
+            await super().websocket_receive(message)
+        finally:
+            _capture.reset(token)
+            profiler.end(capture)
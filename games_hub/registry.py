@@ -0,0 +1,69 @@
+"""Registry of all game types that can be played as hub steps.
+
+Many cross-game features (leaderboards, cleanup, archival, export) need the
+same mapping from a ``game_key`` to its models. Keeping it in one place
+avoids yet another hand-written ``MODEL_MAP``.
+"""
+from collections import namedtuple
+
+from django.db import models
+
+from QuizGame.models import Quiz, QuizParticipant, QuizAnswer, QuizQuestion, QuizBundle
+from Assign.models import AssignQuiz, AssignParticipant, AssignAnswer, AssignQuestion, AssignBundle
+from Estimation.models import EstimationQuiz, EstimationParticipant, EstimationAnswer, EstimationQuestion, EstimationBundle
+from where_is_this.models import WhereQuiz, WhereParticipant, WhereAnswer, WhereQuestion, WhereBundle
+from who_is_lying.models import WhoQuiz, WhoParticipant, WhoAnswer, WhoQuestion, WhoBundle
+from who_is_that.models import WhoThatQuiz, WhoThatParticipant, WhoThatAnswer, WhoThatQuestion, WhoThatBundle
+from black_jack_quiz.models import BlackJackQuiz, BlackJackParticipant, BlackJackAnswer, BlackJackQuestion, BlackJackBundle
+from clue_rush.models import ClueRushGame, ClueRushParticipant, ClueAnswer, ClueQuestion
+from sorting_ladder.models import SortingLadderGame, SortingLadderParticipant, RoundSubmission, SortingQuestion, SortingBundle
+
+
+GameType = namedtuple(
+    'GameType',
+    ['key', 'label', 'game_model', 'participant_model', 'answer_model', 'question_model', 'bundle_model', 'score_field', 'room_prefix'],
+)
+
+GAME_TYPES = {
+    gt.key: gt for gt in [
+        GameType('quiz', 'Quick Quiz', Quiz, QuizParticipant, QuizAnswer, QuizQuestion, QuizBundle, 'total_score', 'quiz'),
+        GameType('estimation', 'Estimation', EstimationQuiz, EstimationParticipant, EstimationAnswer, EstimationQuestion, EstimationBundle, 'total_score', 'estimation'),
+        GameType('assign', 'Assign', AssignQuiz, AssignParticipant, AssignAnswer, AssignQuestion, AssignBundle, 'total_score', 'assign'),
+        GameType('where', 'Where Is This?', WhereQuiz, WhereParticipant, WhereAnswer, WhereQuestion, WhereBundle, 'total_score', 'where'),
+        GameType('who', 'Who Is Lying?', WhoQuiz, WhoParticipant, WhoAnswer, WhoQuestion, WhoBundle, 'total_score', 'who'),
+        GameType('who_that', 'Who Is That?', WhoThatQuiz, WhoThatParticipant, WhoThatAnswer, WhoThatQuestion, WhoThatBundle, 'total_score', 'who_that'),
+        GameType('blackjack', 'Black Jack Quiz', BlackJackQuiz, BlackJackParticipant, BlackJackAnswer, BlackJackQuestion, BlackJackBundle, 'total_points', 'blackjack'),
+        GameType('clue_rush', 'Clue Rush', ClueRushGame, ClueRushParticipant, ClueAnswer, ClueQuestion, None, 'total_score', 'cluerush'),
+        GameType('sorting_ladder', 'Sorting Ladder', SortingLadderGame, SortingLadderParticipant, RoundSubmission, SortingQuestion, SortingBundle, 'total_score', 'sortingladder'),
+    ]
+}
+
+
+def get_game_type(game_key):
+    """Return the GameType for ``game_key`` or None."""
+    return GAME_TYPES.get(game_key)
+
+
+def participant_game_type(participant_model):
+    """Return the GameType whose participants are ``participant_model`` rows, or None."""
+    return next((gt for gt in GAME_TYPES.values() if gt.participant_model is participant_model), None)
+
+
+def room_group_name(game_key, room_code):
+    """Channel group of a game room, as the game's consumer names it."""
+    return f'{GAME_TYPES[game_key].room_prefix}_{room_code}'
+
+
+def cascade_children(model):
+    """Return ``(related_model, fk_field_name)`` pairs deleted along with ``model``.
+
+    Only reverse foreign keys with ``on_delete=CASCADE`` are returned; this is
+    the part of the cascade graph that Django would otherwise collect into
+    memory on ``.delete()``.
+    """
+    children = []
+    for rel in model._meta.related_objects:
+        if rel.many_to_many or rel.on_delete is not models.CASCADE:
+            continue
+        children.append((rel.related_model, rel.field.name))
+    return children
@@ -0,0 +1,138 @@
+"""Sequence numbers and replay buffers for room broadcasts.
+
+Every event a game consumer broadcasts to its room is numbered and kept in
+a bounded per-room buffer. A client that reconnects sends the last sequence
+number it saw with ``participant_join``; if the missed events are still
+buffered they are replayed from memory through the normal event handlers,
+otherwise the client is told to resync and gets the usual DB-backed
+snapshot of the game state.
+
+Buffers live in process memory until the room's quiz ends or its game is
+deleted. Each log has a random ID that is sent along with the sequence
+numbers, so a client that reconnects to another worker (or after a
+restart) gets a resync instead of someone else's events.
+"""
+import json
+import threading
+import uuid
+from collections import deque
+
+from django.conf import settings
+
+
+DEFAULT_BUFFER_SIZE = 256
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+class RoomLog:
+    """Numbered events of one room; keeps the latest ``size`` events."""
+
+    def __init__(self, size):
+        self.id = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self.events = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def append(self, event):
+        """Number ``event``, buffer it and return the numbered copy."""
+        with self._lock:
+            self.seq += 1
+            event = {**event, 'seq': self.seq, 'seq_log': self.id}
+            self.events.append(event)
+        return event
+
+    def since(self, last_seq):
+        """Return the events after ``last_seq``, or None if some were dropped.
+
+        A ``last_seq`` ahead of the log (e.g. after a server restart) also
+        returns None.
+        """
+        with self._lock:
+            if last_seq > self.seq:
+                return None
+            if last_seq == self.seq:
+                return []
+            if not self.events or self.events[0]['seq'] > last_seq + 1:
+                return None
+            return [e for e in self.events if e['seq'] > last_seq]
+
+
+def room_log(group_name):
+    with _logs_lock:
+        log = _logs.get(group_name)
+        if log is None:
+            size = getattr(settings, 'ROOM_REPLAY_BUFFER_SIZE', DEFAULT_BUFFER_SIZE)
+            log = _logs[group_name] = RoomLog(size)
+        return log
+
+
+def discard_room_log(group_name):
+    with _logs_lock:
+        _logs.pop(group_name, None)
+
+
+def _with_seq(text_data, seq, log_id):
+    # Splice the number into the serialized object instead of re-encoding it
+    body = text_data[1:].lstrip()
+    return f'{{"seq": {seq}, "seq_log": "{log_id}"' + ('' if body.startswith('}') else ', ') + body
+
+
+class ResumableRoomMixin:
+    """Consumer mixin: numbered room broadcasts and replay on reconnect.
+
+    Consumers broadcast with ``room_send(event)`` instead of
+    ``channel_layer.group_send(self.room_group_name, event)``. Events whose
+    type is listed in ``transient_events`` are sent unnumbered and are not
+    replayed, since the resync snapshot supersedes them anyway. After an
+    event listed in ``final_events`` the room's log is discarded; a client
+    reconnecting later resyncs from the ended game's state.
+    """
+
+    transient_events = ('participant_joined', 'participant_left', 'participant_count_updated', 'answer_submitted')
+    final_events = ('quiz_ended',)
+
+    _event_seq = None
+    _event_log = None
+
+    async def room_send(self, event):
+        if event.get('type') not in self.transient_events:
+            event = room_log(self.room_group_name).append(event)
+        await self.channel_layer.group_send(self.room_group_name, event)
+        if event.get('type') in self.final_events:
+            discard_room_log(self.room_group_name)
+
+    async def dispatch(self, message):
+        self._event_seq, self._event_log = message.get('seq'), message.get('seq_log')
+        try:
+            await super().dispatch(message)
+        finally:
+            self._event_seq = self._event_log = None
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        if self._event_seq is not None and text_data and text_data.startswith('{'):
+            text_data = _with_seq(text_data, self._event_seq, self._event_log)
+        await super().send(text_data=text_data, bytes_data=bytes_data, close=close)
+
+    async def resume(self, data):
+        """Replay the events missed since ``data['last_seq']`` of ``data['seq_log']``.
+
+        Returns True if the client is up to date again. Otherwise the client
+        is sent the current sequence number and the caller should send its
+        full state.
+        """
+        log = room_log(self.room_group_name)
+        try:
+            last_seq = int(data.get('last_seq'))
+        except (TypeError, ValueError):
+            last_seq = None
+        missed = None
+        if last_seq is not None and data.get('seq_log') == log.id:
+            missed = log.since(last_seq)
+        if missed is None:
+            await self.send(text_data=json.dumps({'type': 'resync', 'seq': log.seq, 'seq_log': log.id}))
+            return False
+        for event in missed:
+            await self.dispatch(event)
+        return True
@@ -1,7 +1,12 @@
-from django.db.models.signals import pre_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from . import metrics, profiling
 from .models import HubSession, HubParticipant, HubGameStep
+from .registry import GAME_TYPES, room_group_name
+from .replay import discard_room_log
+from .status import bump_room_version, forget_room
 
 
 def _mark_unsynced(instance):
@@ -14,3 +19,51 @@ def _mark_unsynced(instance):
 @receiver(pre_save, sender=HubGameStep)
 def mark_games_hub_models_unsynced(sender, instance, **kwargs):  # noqa: D401
     _mark_unsynced(instance)
+
+
+def link_hub_participant(sender, instance, **kwargs):
+    """Link a new game participant to the hub player it was created for."""
+    if not instance._state.adding or instance.hub_participant_id or not instance.hub_session_code:
+        return
+    instance.hub_participant_id = (
+        HubParticipant.objects
+        .filter(session__code=instance.hub_session_code, nickname__iexact=instance.name)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+        .first()
+    )
+
+
+for _game_type in GAME_TYPES.values():
+    pre_save.connect(link_hub_participant, sender=_game_type.participant_model, dispatch_uid=f'link_hub_participant_{_game_type.key}')
+
+
+def bump_game_version(sender, instance, **kwargs):
+    bump_room_version(_GAME_KEYS[sender], instance.pk)
+
+
+def bump_room_child_version(sender, instance, **kwargs):
+    bump_room_version(_GAME_KEYS[sender], instance.quiz_id)
+
+
+def forget_deleted_room(sender, instance, **kwargs):
+    forget_room(_GAME_KEYS[sender], instance.room_code, instance.pk)
+    discard_room_log(room_group_name(_GAME_KEYS[sender], instance.room_code))
+
+
+_GAME_KEYS = {}
+for _game_type in GAME_TYPES.values():
+    _GAME_KEYS[_game_type.game_model] = _game_type.key
+    post_save.connect(bump_game_version, sender=_game_type.game_model, dispatch_uid=f'bump_game_version_{_game_type.key}')
+    post_delete.connect(forget_deleted_room, sender=_game_type.game_model, dispatch_uid=f'forget_deleted_room_{_game_type.key}')
+    for _model in (_game_type.participant_model, _game_type.answer_model):
+        _GAME_KEYS[_model] = _game_type.key
+        post_save.connect(bump_room_child_version, sender=_model, dispatch_uid=f'bump_room_version_{_model._meta.label_lower}')
+        post_delete.connect(bump_room_child_version, sender=_model, dispatch_uid=f'bump_room_version_delete_{_model._meta.label_lower}')
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """Count queries per handler and route, record them for profiles."""
+    metrics.install_query_wrapper(connection)
+    profiling.install_query_wrapper(connection)
@@ -0,0 +1,171 @@
+"""Versioned participant status endpoints.
+
+Every game room has a state version in the cache that is bumped whenever
+the game, one of its participants or one of its answers is saved or
+deleted. ``versioned_status`` wraps the per-game status views: responses
+carry an ETag built from the version, a matching ``If-None-Match`` gets a
+304 without touching the database, and ``?wait=<seconds>`` holds a
+matching request open until the version changes (long-poll).
+
+The versions live in the default cache, which every worker has to share
+(redis outside DEBUG, see the CACHES setting): with a per-process cache a
+worker would answer 304 for a room another worker changed. ``check_shared_cache``
+refuses a per-process cache next to a channel layer shared between workers. Saves go through the
+signals in games_hub/signals.py; ``QuerySet.update()`` sends none, so code
+updating game rows that way bumps the version itself.
+
+Polling no longer saves the participant on every request either; polls
+are heartbeats for the presence tracker (see games_hub/presence.py).
+"""
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.checks import Error
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+from .presence import presence
+from .registry import GAME_TYPES, room_group_name
+from .tokens import read_token, token_from_request
+
+
+DEFAULT_LONG_POLL_TIMEOUT = 25
+LONG_POLL_INTERVAL = 0.5
+
+
+def _version_key(game_key, quiz_id):
+    return f'games_hub:room-version:{game_key}:{quiz_id}'
+
+
+def _room_id_key(game_key, room_code):
+    return f'games_hub:room-id:{game_key}:{room_code}'
+
+
+def _initial_version():
+    # Time based, so a version lost to eviction or a restart never repeats
+    return int(time.time() * 1000)
+
+
+def bump_room_version(game_key, quiz_id):
+    key = _version_key(game_key, quiz_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), None)
+
+
+async def aroom_version(game_key, quiz_id):
+    key = _version_key(game_key, quiz_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _initial_version(), None)
+        version = await cache.aget(key)
+    return version
+
+
+async def _aroom_id(game_type, room_code):
+    key = _room_id_key(game_type.key, room_code)
+    quiz_id = await cache.aget(key)
+    if quiz_id is None:
+        quiz_id = await game_type.game_model.objects.filter(room_code=room_code).values_list('pk', flat=True).afirst()
+        if quiz_id is not None:
+            await cache.aset(key, quiz_id, None)
+    return quiz_id
+
+
+def forget_room(game_key, room_code, quiz_id):
+    cache.delete_many([_room_id_key(game_key, room_code), _version_key(game_key, quiz_id)])
+
+
+def check_shared_cache(app_configs=None, **kwargs):
+    """System check: a channel layer shared by several workers needs a shared cache for the room versions."""
+    layer = settings.CHANNEL_LAYERS.get('default', {}).get('BACKEND', '')
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if layer.endswith('.InMemoryChannelLayer') or not backend.endswith(('.LocMemCache', '.DummyCache')):
+        return []
+    return [Error(
+        'The default cache is per process; room versions of the status endpoints would differ between workers.',
+        hint='Configure a shared cache such as django.core.cache.backends.redis.RedisCache in CACHES.',
+        id='games_hub.E002',
+    )]
+
+
+def record_activity(participant, room):
+    """Heartbeat for views that already hold the participant of ``room``.
+
+    ``room`` is the channel group the game's consumer joins, so polling
+    players count in ``present_count`` next to connected sockets.
+    """
+    presence.heartbeat(type(participant), participant.pk, room, participant.hub_session_code)
+    presence.flush_if_due()
+
+
+def _etag(quiz_id, version, participant_name, hub_session):
+    who = hashlib.blake2b(f'{participant_name}\x00{hub_session or ""}'.encode(), digest_size=6).hexdigest()
+    return f'"{quiz_id}.{version}.{who}"'
+
+
+def _wait_seconds(request):
+    try:
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        return 0
+    return max(0, min(wait, getattr(settings, 'STATUS_LONG_POLL_TIMEOUT', DEFAULT_LONG_POLL_TIMEOUT)))
+
+
+def versioned_status(game_key):
+    """Decorator for a ``(request, room_code, participant_name)`` status view."""
+    game_type = GAME_TYPES[game_key]
+
+    def decorator(view):
+        sync_view = sync_to_async(view)
+
+        @wraps(view)
+        async def wrapped(request, room_code, participant_name):
+            quiz_id = await _aroom_id(game_type, room_code)
+            if quiz_id is None:
+                return await sync_view(request, room_code, participant_name)
+
+            hub_session = request.GET.get('hub_session')
+            version = await aroom_version(game_key, quiz_id)
+            etag = _etag(quiz_id, version, participant_name, hub_session)
+            client_etags = parse_etags(request.headers.get('If-None-Match', ''))
+
+            if etag in client_etags:
+                deadline = time.monotonic() + _wait_seconds(request)
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(LONG_POLL_INTERVAL)
+                    if await aroom_version(game_key, quiz_id) != version:
+                        break
+                else:
+                    token = read_token(token_from_request(request), game_key, room_code)
+                    if token and token.name == participant_name:
+                        presence.heartbeat(
+                            game_type.participant_model, token.participant_id,
+                            room_group_name(game_key, room_code), token.session_code,
+                        )
+                        await presence.aflush_if_due()
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    patch_cache_control(response, private=True, no_cache=True)
+                    return response
+                version = await aroom_version(game_key, quiz_id)
+                etag = _etag(quiz_id, version, participant_name, hub_session)
+
+            response = await sync_view(request, room_code, participant_name)
+            if response.status_code == 200:
+                # The version read before the view ran: a change during the
+                # view only costs the client one more full response
+                response['ETag'] = etag
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,869 @@
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import marshal
+import pstats
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from Assign.models import AssignQuestion
+from Estimation.models import EstimationAnswer, EstimationParticipant, EstimationQuestion, EstimationQuiz
+from QuizGame.consumers import QuizConsumer
+from QuizGame.models import Quiz, QuizParticipant
+from games_hub import guard, logs, metrics, permutations, prefetch as prefetching, profiling, replay, wire
+from games_hub.profiling import profiler
+from games_hub.enrolment import enrol_hub_participants
+from games_hub.leaderboard import build_leaderboard
+from games_hub.middleware import ParticipantTokenMiddleware
+from games_hub.models import HubGameStep, HubParticipant, HubSession
+from games_hub.prefetch import PrefetchMixin, asset_url, next_question, prefetch
+from games_hub.presence import ACTIVE, DISCONNECTED, IDLE, presence, present_count
+from games_hub.replay import ResumableRoomMixin, RoomLog, discard_room_log, room_log
+from games_hub.status import check_shared_cache
+from games_hub.tokens import issue_token, participant_lookup, read_token
+from games_website.asgi import application
+from who_is_that.models import WhoThatParticipant, WhoThatQuestion, WhoThatQuiz
+
+
+class HubEnrolmentTest(TestCase):
+    """Sammel-Anmeldung der Lobby beim Start eines Spiels."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = EstimationQuiz.objects.create(title='Lobby', creator=user, max_participants=3)
+        self.session = HubSession.objects.create(code='LOBBY1')
+        for name in ('Anna', 'Ben', 'Cleo', 'Dana'):
+            HubParticipant.objects.create(session=self.session, nickname=name)
+        HubParticipant.objects.filter(nickname='Dana').update(is_active=False)
+
+    def test_enrols_active_lobby_once_and_reactivates(self):
+        """Alle aktiven Spieler werden angelegt; ein zweiter Aufruf legt nichts doppelt an."""
+        EstimationParticipant.objects.create(quiz=self.quiz, name='Ben', hub_session_code='LOBBY1', is_active=False)
+
+        with self.assertNumQueries(6):
+            ids = enrol_hub_participants('LOBBY1', 'estimation', self.quiz.room_code)
+
+        self.assertEqual(set(ids), {'Anna', 'Ben', 'Cleo'})
+        self.assertEqual(enrol_hub_participants('LOBBY1', 'estimation', self.quiz.room_code), ids)
+        self.assertEqual(EstimationParticipant.objects.filter(quiz=self.quiz).count(), 3)
+        self.assertTrue(EstimationParticipant.objects.get(pk=ids['Ben']).is_active)
+
+    def test_respects_max_participants(self):
+        """Die Teilnehmergrenze des Spiels gilt auch für die Sammel-Anmeldung."""
+        HubParticipant.objects.filter(nickname='Dana').update(is_active=True)
+        ids = enrol_hub_participants('LOBBY1', 'estimation', self.quiz.room_code)
+        self.assertEqual(list(ids), ['Anna', 'Ben', 'Cleo'])
+
+    def test_play_page_accepts_preissued_id(self):
+        """Die Spielseite findet den Teilnehmer über die vorab vergebene ID."""
+        ids = enrol_hub_participants('LOBBY1', 'estimation', self.quiz.room_code)
+        url = reverse('estimation:play', args=[self.quiz.room_code, 'Anna'])
+        response = self.client.get(url, {'hub_session': 'LOBBY1', 'pid': ids['Anna']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['participant'].pk, ids['Anna'])
+
+        response = self.client.get(url, {'hub_session': 'LOBBY1', 'pid': ids['Ben']})
+        self.assertEqual(response.context['participant'].pk, ids['Anna'])
+
+
+class SessionLeaderboardTest(TestCase):
+    """Sitzungs-Rangliste über alle Spiele mit einer Abfrage."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.session = HubSession.objects.create(code='RANK1')
+        self.anna = HubParticipant.objects.create(session=self.session, nickname='Anna', score_adjustment=5)
+        self.ben = HubParticipant.objects.create(session=self.session, nickname='Ben')
+
+        self.estimation = EstimationQuiz.objects.create(title='Schätzen', creator=user)
+        self.quiz = Quiz.objects.create(title='Wissen', creator=user)
+        HubGameStep.objects.create(session=self.session, order=0, game_key='estimation', room_code=self.estimation.room_code)
+        HubGameStep.objects.create(session=self.session, order=1, game_key='quiz', room_code=self.quiz.room_code)
+
+        question = EstimationQuestion.objects.create(question_text='Wie viele?', correct_answer=100, created_by=user)
+        anna = EstimationParticipant.objects.create(quiz=self.estimation, name='Anna', hub_session_code='RANK1', total_score=80)
+        EstimationAnswer.objects.create(quiz=self.estimation, participant=anna, question=question, user_answer=90)
+        EstimationParticipant.objects.filter(pk=anna.pk).update(total_score=80)
+        EstimationParticipant.objects.create(quiz=self.estimation, name='Ben', hub_session_code='RANK1', total_score=20)
+        # Andere Schreibweise, aber derselbe Hub-Spieler
+        QuizParticipant.objects.create(quiz=self.quiz, name='ben', hub_session_code='RANK1', total_score=30)
+        QuizParticipant.objects.create(quiz=self.quiz, name='Anna', hub_session_code='RANK1', total_score=10)
+
+    def test_links_new_participants_to_hub_player(self):
+        """Neue Spielteilnehmer werden unabhängig von der Groß-/Kleinschreibung verknüpft."""
+        self.assertEqual(QuizParticipant.objects.get(name='ben').hub_participant, self.ben)
+
+    def test_scores_are_keyed_on_hub_participant(self):
+        """Punkte, Sieger und Anpassungen werden pro Hub-Spieler zusammengefasst."""
+        with self.assertNumQueries(5):
+            data = build_leaderboard(self.session)
+
+        players = {p['name']: p for p in data['participants']}
+        self.assertEqual(set(players), {'Anna', 'Ben'})
+        anna, ben = players['Anna'], players['Ben']
+        self.assertEqual(anna['total_score'], 80 + 10 + 5)
+        self.assertEqual(anna['weighted_score'], 1)
+        self.assertEqual(anna['game_accuracies'][f'estimation:{self.estimation.room_code}'], 90.0)
+        self.assertEqual(ben['weighted_score'], 2)
+        self.assertEqual(ben['games_played'], 2)
+        self.assertEqual(ben['hub_participant_id'], self.ben.pk)
+        self.assertEqual(data['instances'][f'quiz:{self.quiz.room_code}']['title'], 'Wissen')
+        self.assertEqual([g['key'] for g in data['games']], ['estimation', 'quiz'])
+
+
+class ParticipantTokenTest(TestCase):
+    """Signierte Teilnehmer-Tokens für Seiten und Sockets."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = Quiz.objects.create(title='Token', creator=user)
+        self.player = QuizParticipant.objects.create(quiz=self.quiz, name='Anna', hub_session_code='TOK1')
+        self.token = issue_token(self.player)
+
+    def test_round_trip_and_tampering(self):
+        """Ein Token wird ohne Datenbank gelesen; Manipulationen werden abgelehnt."""
+        with self.assertNumQueries(0):
+            token = read_token(self.token, 'quiz', self.quiz.room_code)
+        self.assertEqual(token.participant_id, self.player.pk)
+        self.assertEqual(token.session_code, 'TOK1')
+        self.assertIsNone(read_token(self.token, 'estimation'))
+        self.assertIsNone(read_token(self.token[:-2] + 'xx'))
+
+    def test_status_view_accepts_header(self):
+        """Die Status-API findet den Teilnehmer über das Token statt über hub_session."""
+        url = reverse('quiz:quiz_status', args=[self.quiz.room_code, 'Anna'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        response = self.client.get(url, HTTP_X_PARTICIPANT_TOKEN=self.token)
+        self.assertTrue(response.json()['success'])
+
+    def test_socket_middleware_skips_session_lookup(self):
+        """Sockets mit Token werden ohne Session- und Benutzerabfrage durchgereicht."""
+        seen = {}
+
+        async def app(scope, receive, send):
+            seen.update(scope)
+
+        scope = {'type': 'websocket', 'query_string': f'token={self.token}'.encode(), 'headers': []}
+        with self.assertNumQueries(0):
+            async_to_sync(ParticipantTokenMiddleware(app))(scope, None, None)
+        self.assertEqual(seen['participant'].participant_id, self.player.pk)
+        self.assertEqual(participant_lookup(seen, self.quiz, 'Anna', None), {'pk': self.player.pk})
+        self.assertEqual(participant_lookup(seen, self.quiz, 'Ben', 'TOK1'), {'name': 'Ben', 'hub_session_code': 'TOK1'})
+
+
+class RoomReplayTest(TestCase):
+    """Nummerierte Raum-Events und Wiederholung nach einem Reconnect."""
+
+    def test_since_reports_gaps(self):
+        """Verpasste Events kommen aus dem Puffer; Lücken und fremde Stände erzwingen einen Resync."""
+        log = RoomLog(3)
+        for n in range(5):
+            log.append({'type': 'tick', 'n': n})
+        self.assertEqual([e['n'] for e in log.since(3)], [3, 4])
+        self.assertEqual(log.since(5), [])
+        self.assertIsNone(log.since(1))
+        self.assertIsNone(log.since(9))
+
+    def test_resume_replays_through_handlers(self):
+        """Ein Reconnect mit last_seq bekommt die verpassten Events mit Sequenznummer erneut zugestellt."""
+
+        class Base:
+            async def dispatch(self, message):
+                await getattr(self, message['type'])(message)
+
+            async def send(self, text_data=None, bytes_data=None, close=False):
+                self.sent.append(json.loads(text_data))
+
+        class Consumer(ResumableRoomMixin, Base):
+            room_group_name = 'replay_test'
+            transient_events = ('participant_joined',)
+
+            def __init__(self):
+                self.sent = []
+
+            async def tick(self, event):
+                await self.send(text_data=json.dumps({'type': 'tick', 'n': event['n']}))
+
+        class Layer:
+            async def group_send(self, group, event):
+                pass
+
+        self.addCleanup(discard_room_log, 'replay_test')
+        consumer = Consumer()
+        consumer.channel_layer = Layer()
+        for n in range(3):
+            async_to_sync(consumer.room_send)({'type': 'tick', 'n': n})
+        async_to_sync(consumer.room_send)({'type': 'participant_joined'})
+
+        log_id = room_log('replay_test').id
+        self.assertTrue(async_to_sync(consumer.resume)({'last_seq': 1, 'seq_log': log_id}))
+        self.assertEqual([(m['seq'], m['n']) for m in consumer.sent], [(2, 1), (3, 2)])
+
+        consumer.sent.clear()
+        self.assertFalse(async_to_sync(consumer.resume)({'last_seq': 1, 'seq_log': 'other'}))
+        self.assertEqual(consumer.sent, [{'type': 'resync', 'seq': 3, 'seq_log': log_id}])
+
+    def test_logs_are_discarded_when_quiz_ends_or_game_is_deleted(self):
+        """Nach quiz_ended und nach dem Löschen des Spiels bleibt kein Puffer des Raums im Speicher."""
+
+        class Layer:
+            async def group_send(self, group, event):
+                pass
+
+        class Consumer(ResumableRoomMixin):
+            room_group_name = 'replay_end'
+            channel_layer = Layer()
+
+        self.addCleanup(discard_room_log, 'replay_end')
+        consumer = Consumer()
+        async_to_sync(consumer.room_send)({'type': 'question_started'})
+        async_to_sync(consumer.room_send)({'type': 'quiz_ended'})
+        self.assertNotIn('replay_end', replay._logs)
+
+        quiz = Quiz.objects.create(title='Ende', creator=User.objects.create_user('host', password='pw'))
+        group = f'quiz_{quiz.room_code}'
+        self.addCleanup(discard_room_log, group)
+        room_log(group).append({'type': 'question_started'})
+        quiz.delete()
+        self.assertNotIn(group, replay._logs)
+
+
+class StatusVersionTest(TestCase):
+    """Versionierte Status-API mit ETag und gebündelten Aktivitätszeitstempeln."""
+
+    def setUp(self):
+        cache.clear()
+        presence.clear()
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = Quiz.objects.create(title='Status', creator=user)
+        self.player = QuizParticipant.objects.create(quiz=self.quiz, name='Anna')
+        self.url = reverse('quiz:quiz_status', args=[self.quiz.room_code, 'Anna'])
+        self.headers = {'HTTP_X_PARTICIPANT_TOKEN': issue_token(self.player)}
+
+    def test_unchanged_room_answers_304_without_queries(self):
+        """Solange sich der Raum nicht ändert, kommt ein 304 ohne Datenbankzugriff."""
+        etag = self.client.get(self.url, **self.headers)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 304)
+
+        self.quiz.status = 'active'
+        self.quiz.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_long_poll_returns_after_change(self):
+        """Ein wartender Abruf endet ohne Änderung mit 304, nach einer Änderung mit den neuen Daten."""
+        etag = self.client.get(self.url, **self.headers)['ETag']
+        with self.settings(STATUS_LONG_POLL_TIMEOUT=1):
+            response = self.client.get(self.url, {'wait': 30}, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 304)
+
+        ben = QuizParticipant.objects.create(quiz=self.quiz, name='Ben')
+        presence.connect(QuizParticipant, ben.pk, 'chan-b', f'quiz_{self.quiz.room_code}')
+        response = self.client.get(self.url, {'wait': 30}, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.json()['participant_count'], 2)
+
+    def test_shared_cache_required_with_shared_channel_layer(self):
+        """Mit einem Redis-Channel-Layer verweigert die Systemprüfung einen Cache pro Prozess."""
+        self.assertEqual(check_shared_cache(), [])
+        redis_layer = {'default': {'BACKEND': 'channels_redis.core.RedisChannelLayer'}}
+        with self.settings(CHANNEL_LAYERS=redis_layer):
+            self.assertEqual([e.id for e in check_shared_cache()], ['games_hub.E002'])
+        redis_cache = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379'}}
+        with self.settings(CHANNEL_LAYERS=redis_layer, CACHES=redis_cache):
+            self.assertEqual(check_shared_cache(), [])
+
+    def test_status_counts_present_participants(self):
+        """Nach einem Neustart zählen die aktiven Zeilen, danach Sockets und abfragende Spieler gemeinsam."""
+        ben = QuizParticipant.objects.create(quiz=self.quiz, name='Ben')
+        cleo = QuizParticipant.objects.create(quiz=self.quiz, name='Cleo')
+        QuizParticipant.objects.create(quiz=self.quiz, name='Dora', is_active=False)
+        room = f'quiz_{self.quiz.room_code}'
+        self.assertEqual(present_count(room, self.quiz.participants), 3)
+
+        # Ben holds a socket, Anna only polls, Cleo is gone
+        presence.connect(QuizParticipant, ben.pk, 'chan-b', room)
+        self.assertEqual(self.client.get(self.url, **self.headers).json()['participant_count'], 2)
+        self.assertCountEqual(presence.present(room), [self.player.pk, ben.pk])
+        self.assertNotIn(cleo.pk, presence.present(room))
+
+    def test_polling_does_not_save_participant(self):
+        """Abrufe schreiben keine Zeilen; die Aktivität wird gesammelt nachgetragen."""
+        QuizParticipant.objects.filter(pk=self.player.pk).update(synced=True)
+        before = QuizParticipant.objects.get(pk=self.player.pk).last_activity
+        self.client.get(self.url, **self.headers)
+        self.client.get(self.url, **self.headers)
+        presence.flush()
+        player = QuizParticipant.objects.get(pk=self.player.pk)
+        self.assertTrue(player.synced)
+        self.assertGreater(player.last_activity, before)
+
+
+class PresenceTest(TestCase):
+    """Anwesenheit aus Socket-Lebenszyklus und Heartbeats, gebündelt gespeichert."""
+
+    def setUp(self):
+        presence.clear()
+        self.addCleanup(presence.clear)
+        session = HubSession.objects.create(code='PRES1')
+        self.anna = HubParticipant.objects.create(session=session, nickname='Anna')
+        self.ben = HubParticipant.objects.create(session=session, nickname='Ben')
+        HubParticipant.objects.update(synced=True)
+
+    def test_states_and_counts_follow_sockets(self):
+        """Offene Sockets zählen, geschlossene nicht; ohne Heartbeat wird ein Socket idle."""
+        presence.connect(HubParticipant, self.anna.pk, 'chan-a', 'hub_PRES1')
+        presence.connect(HubParticipant, self.ben.pk, 'chan-b', 'hub_PRES1')
+        presence.connect(HubParticipant, self.ben.pk, 'chan-b2', 'hub_PRES1')
+        self.assertEqual(presence.count('hub_PRES1'), 2)
+
+        presence.disconnect('chan-b')
+        self.assertEqual(presence.state(HubParticipant, self.ben.pk), ACTIVE)
+        presence.disconnect('chan-b2')
+        self.assertEqual(presence.state(HubParticipant, self.ben.pk), DISCONNECTED)
+        self.assertEqual(presence.present('hub_PRES1'), [self.anna.pk])
+
+        with self.settings(PRESENCE_IDLE_AFTER=0):
+            self.assertEqual(presence.state(HubParticipant, self.anna.pk), IDLE)
+
+    async def test_resumed_socket_is_present(self):
+        """Ein Reconnect mit last_seq bekommt die verpassten Events und zählt trotzdem als anwesend."""
+        quiz = await database_sync_to_async(Quiz.objects.create)(
+            title='Anwesend', creator=await database_sync_to_async(User.objects.create_user)('host-pres'),
+        )
+        anna = await database_sync_to_async(QuizParticipant.objects.create)(quiz=quiz, name='Anna')
+        room = f'quiz_{quiz.room_code}'
+        self.addCleanup(discard_room_log, room)
+        join = {'type': 'participant_join', 'participant_name': 'Anna'}
+
+        first = WebsocketCommunicator(application, f'/ws/quiz/{quiz.room_code}/')
+        await first.connect()
+        await first.receive_json_from()
+        await first.send_json_to(join)
+        joined = await first.receive_json_from()
+        await first.disconnect()
+        self.assertEqual(presence.state(QuizParticipant, anna.pk), DISCONNECTED)
+
+        second = WebsocketCommunicator(application, f'/ws/quiz/{quiz.room_code}/')
+        await second.connect()
+        await second.receive_json_from()
+        await second.send_json_to({**join, 'last_seq': joined.get('seq', 0), 'seq_log': room_log(room).id})
+        await second.send_json_to({'type': 'ping'})
+        self.assertEqual((await second.receive_json_from())['type'], 'pong')
+        self.assertEqual(presence.present(room), [anna.pk])
+        self.assertEqual(presence.state(QuizParticipant, anna.pk), ACTIVE)
+        await second.disconnect()
+
+    def test_flush_is_one_update_and_keeps_sync_flag(self):
+        """Heartbeats landen in einer Abfrage in last_seen, ohne die Zeilen für den Sync zu markieren."""
+        before = HubParticipant.objects.get(pk=self.anna.pk).last_seen
+        presence.connect(HubParticipant, self.anna.pk, 'chan-a', 'hub_PRES1')
+        presence.channel_heartbeat('chan-a')
+        presence.heartbeat(HubParticipant, self.ben.pk)
+        with self.assertNumQueries(1):
+            presence.flush()
+        with self.assertNumQueries(0):
+            presence.flush()
+
+        anna = HubParticipant.objects.get(pk=self.anna.pk)
+        self.assertGreater(anna.last_seen, before)
+        self.assertFalse(HubParticipant.objects.filter(synced=False).exists())
+
+
+class WireProtocolTest(TestCase):
+    """Binäres msgpack-Unterprotokoll mit kurzen Feldcodes."""
+
+    def test_round_trip_uses_field_codes(self):
+        """Bekannte Feldnamen werden zu Ein-Byte-Codes, unbekannte bleiben erhalten."""
+        payload = {'type': 'answer_submitted', 'points_earned': 10, 'extra': [{'participant_name': 'Anna'}]}
+        packed = wire.encode(payload)
+        self.assertEqual(wire.decode(packed), payload)
+        self.assertLess(len(packed), len(json.dumps(payload)) / 2)
+        self.assertNotIn(b'points_earned', packed)
+        with self.assertRaises(ValueError):
+            wire.decode(b'\xc1')
+
+    def test_js_field_table_matches(self):
+        """assets/js/wire.js kennt dieselben Feldcodes wie der Server."""
+        js = (Path(settings.BASE_DIR) / 'assets' / 'js' / 'wire.js').read_text()
+        table = re.search(r'const FIELDS = \[(.*?)\];', js, re.S).group(1)
+        self.assertEqual(tuple(re.findall(r"'([a-z_]+)'", table)), wire.FIELDS)
+
+    async def test_socket_negotiates_msgpack(self):
+        """Nur Sockets, die das Unterprotokoll anbieten, bekommen msgpack; sonst bleibt es bei JSON."""
+        binary = WebsocketCommunicator(application, '/ws/quiz/0000/', subprotocols=[wire.SUBPROTOCOL, wire.JSON_SUBPROTOCOL])
+        connected, subprotocol = await binary.connect()
+        self.assertEqual(subprotocol, wire.SUBPROTOCOL)
+        frame = await binary.receive_output()
+        self.assertEqual(wire.decode(frame['bytes'])['type'], 'connection_established')
+        await binary.disconnect()
+
+        plain = WebsocketCommunicator(application, '/ws/quiz/0000/')
+        await plain.connect()
+        self.assertEqual((await plain.receive_json_from())['type'], 'connection_established')
+        await plain.disconnect()
+
+
+class FrameGuardTest(TestCase):
+    """Größen-, Admin- und Ratenprüfung eingehender WebSocket-Frames."""
+
+    def setUp(self):
+        guard.dropped.clear()
+
+    def consumer(self, user=None):
+        consumer = QuizConsumer()
+        consumer.scope = {'user': user or AnonymousUser()}
+        return consumer
+
+    def test_rejects_large_invalid_and_admin_frames(self):
+        """Zu große, kaputte und Admin-Frames von Teilnehmern werden verworfen."""
+        consumer = self.consumer()
+        big = json.dumps({'type': 'ping', 'pad': 'x' * guard.DEFAULT_MAX_FRAME_BYTES})
+        self.assertEqual(consumer.check_frame({'text': big}), (guard.TOO_LARGE, None))
+        self.assertEqual(consumer.check_frame({'text': '[1]'}), (guard.INVALID, None))
+        self.assertEqual(consumer.check_frame({'bytes': b'\x81'}), (guard.INVALID, None))
+        self.assertEqual(consumer.check_frame({'text': '{"type": "admin_end_quiz"}'}), (guard.NOT_ADMIN, guard.OTHER))
+
+        staff = User.objects.create_user('host', password='x', is_staff=True)
+        self.assertEqual(self.consumer(staff).check_frame({'text': '{"type": "admin_end_quiz"}'}), (None, 'admin_end_quiz'))
+
+    def test_token_bucket_per_message_type(self):
+        """Nach dem Burst werden Antworten gedrosselt, andere Typen haben eigene Eimer."""
+        consumer = self.consumer()
+        answer = {'text': '{"type": "participant_submit_answer"}'}
+        rate, burst = guard.DEFAULT_RATE_LIMITS['participant_submit_answer']
+        results = [consumer.check_frame(answer)[0] for _ in range(burst + 3)]
+        self.assertEqual(results.count(None), burst)
+        self.assertEqual(results[-1], guard.RATE_LIMITED)
+        self.assertEqual(consumer.check_frame({'text': '{"type": "ping"}'}), (None, 'ping'))
+
+    async def test_socket_drops_and_counts(self):
+        """Anonyme Sockets bekommen für Admin-Frames einen Fehler, geflutete Pings werden gezählt."""
+        communicator = WebsocketCommunicator(application, '/ws/quiz/0000/')
+        await communicator.connect()
+        await communicator.receive_json_from()
+        await communicator.send_json_to({'type': 'admin_end_quiz'})
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'error', 'message': 'Not allowed'})
+
+        burst = guard.DEFAULT_RATE_LIMITS['ping'][1]
+        for _ in range(burst + 5):
+            await communicator.send_json_to({'type': 'ping'})
+        pongs = 0
+        while not await communicator.receive_nothing(timeout=0.2):
+            await communicator.receive_json_from()
+            pongs += 1
+        await communicator.disconnect()
+        self.assertLessEqual(pongs, burst + 1)
+        counts = guard.dropped_messages()
+        self.assertEqual(counts[('QuizConsumer', guard.NOT_ADMIN, guard.OTHER)], 1)
+        self.assertGreaterEqual(counts[('QuizConsumer', guard.RATE_LIMITED, 'ping')], 4)
+
+
+class MetricsTest(TestCase):
+    """Prometheus-Metriken für Consumer, Routen und Fan-outs."""
+
+    def setUp(self):
+        metrics.clear()
+        guard.dropped.clear()
+
+    def test_endpoint_requires_staff_or_token(self):
+        """/metrics ist nur für Staff oder mit dem Scrape-Token lesbar."""
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with self.settings(METRICS_TOKEN='secret'):
+            response = self.client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE games_http_request_seconds histogram', response.content.decode())
+
+    def test_routes_record_latency_and_queries(self):
+        """Jede Anfrage landet mit ihren Queries im Histogramm ihrer Route."""
+        quiz = Quiz.objects.create(title='Metrik', creator=User.objects.create_user('metrik'))
+        self.client.get(f'/quiz/status/{quiz.room_code}/Anna/')
+        series = metrics.routes['quiz/status/<str:room_code>/<str:participant_name>/']
+        self.assertEqual(series.count, 1)
+        self.assertGreater(series.queries, 0)
+        self.assertIn('route="quiz/status/<str:room_code>/<str:participant_name>/"', metrics.render())
+
+    async def test_consumer_messages_fanouts_and_connections(self):
+        """Socket-Nachrichten, group_send-Aufrufe und offene Sockets werden gezählt."""
+        communicator = WebsocketCommunicator(application, '/ws/quiz/0000/')
+        await communicator.connect()
+        await communicator.receive_json_from()
+        self.assertEqual(metrics.connections['QuizConsumer'], {'quiz_0000': 1})
+        await communicator.send_json_to({'type': 'ping'})
+        await communicator.receive_json_from()
+        await communicator.disconnect()
+
+        self.assertEqual(metrics.handlers['QuizConsumer']['ping'].count, 1)
+        self.assertEqual(metrics.connections['QuizConsumer'], {})
+        text = metrics.render()
+        self.assertIn('games_handler_seconds_count{consumer="QuizConsumer",message_type="ping"} 1', text)
+        self.assertIn('games_executor_queue_depth{executor="thread_sensitive"}', text)
+
+        counts = {}
+        await metrics._CountingLayer(get_channel_layer(), counts).group_send('quiz_0000', {'type': 'quiz_message'})
+        self.assertEqual(counts, {'quiz_message': 1})
+
+
+class StructuredLoggingTest(TestCase):
+    """Strukturierte, gesampelte Logs über eine Hintergrund-Queue."""
+
+    def test_disabled_level_does_not_format(self):
+        """Abgeschaltete Level formatieren ihre Argumente nicht."""
+        class Loud:
+            def __str__(self):
+                raise AssertionError('formatted')
+
+        logger = logging.getLogger('QuizGame.consumers')
+        self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+        logger.debug('Received %s', Loud())
+
+    def test_sample_filter_passes_one_in_every(self):
+        """Debug-Records werden gesampelt, höhere Level immer durchgelassen."""
+        sample = logs.SampleFilter(every=10)
+        debug = logging.LogRecord('x', logging.DEBUG, __file__, 1, 'm', None, None)
+        warning = logging.LogRecord('x', logging.WARNING, __file__, 1, 'm', None, None)
+        self.assertEqual(sum(sample.filter(debug) for _ in range(100)), 10)
+        self.assertTrue(all(sample.filter(warning) for _ in range(5)))
+
+    def test_queue_handler_writes_json_with_context(self):
+        """Der Listener-Thread schreibt JSON-Zeilen mit den gebundenen Kontextfeldern."""
+        stream = io.StringIO()
+        handler = logs.QueueLogHandler(stream)
+        handler.setFormatter(logs.JsonFormatter())
+        handler.addFilter(logs.ContextFilter())
+        logger = logging.getLogger('games_hub.tests.logs')
+        logger.addHandler(handler)
+        logger.propagate = False
+        def log():
+            logs.bind_log_context(room='AB12', participant=7)
+            logger.warning('Rejected %s', 'round')
+
+        try:
+            contextvars.copy_context().run(log)
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+        entry = json.loads(stream.getvalue())
+        self.assertEqual(
+            {k: entry[k] for k in ('level', 'message', 'room', 'participant')},
+            {'level': 'WARNING', 'message': 'Rejected round', 'room': 'AB12', 'participant': 7},
+        )
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Ist die Queue voll, wird verworfen und gezählt statt zu blockieren."""
+        handler = logs.QueueLogHandler(io.StringIO(), maxsize=1)
+        handler.listener.stop()
+        try:
+            for _ in range(3):
+                handler.handle(logging.LogRecord('x', logging.WARNING, __file__, 1, 'm', None, None))
+            self.assertEqual(handler.dropped, 2)
+        finally:
+            handler.queue.get_nowait()
+            handler.close()
+
+
+class ProfilingTest(TestCase):
+    """Profile einzelner Anfragen und Socket-Nachrichten auf Abruf."""
+
+    def setUp(self):
+        profiler.configure(enabled=False)
+        profiler.clear()
+        self.quiz = Quiz.objects.create(title='Profil', creator=User.objects.create_user('profil'))
+        self.addCleanup(profiler.configure, enabled=False)
+
+    def test_nothing_captured_unless_armed(self):
+        """Ohne Scharfschalten wird trotz ?profile=1 nichts aufgezeichnet."""
+        self.client.get(f'/quiz/status/{self.quiz.room_code}/Anna/?profile=1')
+        self.assertEqual(list(profiler.captures), [])
+
+    def test_flagged_request_is_profiled_with_queries(self):
+        """Markierte Anfragen liefern pstats, speedscope und Queries mit Herkunft."""
+        profiler.configure(enabled=True, limit=1)
+        self.client.get(f'/quiz/status/{self.quiz.room_code}/Anna/')
+        self.assertEqual(list(profiler.captures), [])
+        self.client.get(f'/quiz/status/{self.quiz.room_code}/Anna/', headers={'X-Profile': '1'})
+
+        capture, = profiler.captures
+        self.assertEqual(capture.label, 'GET quiz/status/<str:room_code>/<str:participant_name>/')
+        self.assertEqual(capture.room, self.quiz.room_code)
+        self.assertTrue(capture.queries)
+        self.assertTrue(any(origin.startswith('QuizGame/views.py') for _, _, origin in capture.queries))
+        self.assertFalse(profiler.enabled)
+
+        with tempfile.NamedTemporaryFile(suffix='.pstats') as fh:
+            fh.write(capture.stats)
+            fh.flush()
+            self.assertGreater(pstats.Stats(fh.name).total_calls, 0)
+        speedscope = capture.speedscope()
+        self.assertEqual(speedscope['$schema'], 'https://www.speedscope.app/file-format-schema.json')
+        for profile in speedscope['profiles']:
+            self.assertEqual(len(profile['samples']), len(profile['weights']))
+
+    def test_admin_page_lists_and_downloads(self):
+        """Die Admin-Seite schaltet scharf, listet Profile und bietet Downloads an."""
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.client.post(reverse('admin_dashboard:profiling'), {'action': 'arm', 'rooms': 'ab12', 'limit': '3'})
+        self.assertTrue(profiler.enabled)
+        self.assertEqual(profiler.rooms, {'AB12'})
+        self.client.get(f'/quiz/status/{self.quiz.room_code}/Anna/?profile=1')
+
+        capture, = profiler.captures
+        page = self.client.get(reverse('admin_dashboard:profiling'))
+        self.assertContains(page, f'profiling/{capture.id}.pstats')
+        download = self.client.get(reverse('admin_dashboard:download_profile', args=[capture.id, 'speedscope.json']))
+        self.assertEqual(download['Content-Disposition'], f'attachment; filename="profile-{capture.id}.speedscope.json"')
+        self.assertEqual(self.client.get(reverse('admin_dashboard:download_profile', args=[capture.id, 'txt'])).status_code, 404)
+
+    async def test_profiled_post_still_checks_csrf(self):
+        """Ein profilierter POST ohne CSRF-Token wird weiterhin abgelehnt; GETs werden aufgezeichnet."""
+        profiler.configure(enabled=True, limit=5)
+        client = AsyncClient(enforce_csrf_checks=True)
+        response = await client.post('/admin-dashboard/login/?profile=1', {'username': 'x', 'password': 'y'})
+        self.assertEqual(response.status_code, 403)
+
+        await client.get(f'/quiz/status/{self.quiz.room_code}/Anna/?profile=1')
+        self.assertIn(f'GET quiz/status/<str:room_code>/<str:participant_name>/', [c.label for c in profiler.captures])
+
+    async def test_single_profiler_with_interpreter_wide_monitoring(self):
+        """Wie ab Python 3.12: ein Profiler je Capture; hält ein anderes Werkzeug das Monitoring, bleiben Samples und Queries."""
+
+        class MonitoringProfile(cProfile.Profile):
+            # sys.monitoring allows one profiler per interpreter
+            active = None
+
+            def enable(self, *args, **kwargs):
+                if MonitoringProfile.active is not None:
+                    raise ValueError('Another profiling tool is already active')
+                MonitoringProfile.active = self
+                super().enable(*args, **kwargs)
+
+            def disable(self):
+                if MonitoringProfile.active is self:
+                    MonitoringProfile.active = None
+                super().disable()
+
+        profiler.configure(enabled=True, limit=5)
+        url = f'/quiz/status/{self.quiz.room_code}/Anna/?profile=1'
+        with mock.patch.object(profiling, 'PER_THREAD_PROFILES', False), \
+                mock.patch.object(profiling.cProfile, 'Profile', MonitoringProfile):
+            self.assertEqual((await AsyncClient().get(url)).status_code, 404)
+            MonitoringProfile.active = object()
+            self.assertEqual((await AsyncClient().get(url)).status_code, 404)
+            MonitoringProfile.active = None
+
+        second, first = profiler.captures
+        self.assertTrue(first.top_functions())
+        self.assertEqual((second.top_functions(), marshal.loads(second.stats)), ([], {}))
+        self.assertTrue(second.queries)
+
+    def test_view_middleware_must_be_last(self):
+        """Die Systemprüfung meldet ProfilingViewMiddleware vor anderen Middlewares."""
+        self.assertEqual(profiling.check_view_middleware_is_last(), [])
+        middleware = [profiling.VIEW_MIDDLEWARE] + [m for m in settings.MIDDLEWARE if m != profiling.VIEW_MIDDLEWARE]
+        with self.settings(MIDDLEWARE=middleware):
+            self.assertEqual([e.id for e in profiling.check_view_middleware_is_last()], ['games_hub.E001'])
+
+    async def test_consumer_messages_by_type(self):
+        """Socket-Nachrichten der gewählten Typen werden profiliert."""
+        profiler.configure(enabled=True, message_types=['ping'], limit=5)
+        communicator = WebsocketCommunicator(application, '/ws/quiz/0000/')
+        await communicator.connect()
+        await communicator.receive_json_from()
+        await communicator.send_json_to({'type': 'participant_join'})
+        await communicator.send_json_to({'type': 'ping'})
+        while (await communicator.receive_json_from())['type'] != 'pong':
+            pass
+        await communicator.disconnect()
+        self.assertEqual([capture.label for capture in profiler.captures], ['QuizConsumer ping'])
+        self.assertEqual(profiler.remaining, 4)
+
+
+class QuestionPrefetchTest(TestCase):
+    """Vorabladen der Bilder der nächsten Frage, während die aktuelle aufgelöst wird."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = self.settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        presence.clear()
+        prefetch.clear()
+        self.addCleanup(presence.clear)
+        self.addCleanup(prefetch.clear)
+        self.addCleanup(prefetching.forget_assets)
+
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = WhoThatQuiz.objects.create(creator=user)
+        now = timezone.now()
+        self.questions = []
+        for n, name in enumerate(['angela_merkel', 'olaf_scholz', 'helmut_kohl']):
+            question = WhoThatQuestion.objects.create(
+                correct_answer=name, created_by=user,
+                image=SimpleUploadedFile(f'{name}.png', b'\x89PNG' + name.encode(), content_type='image/png'),
+            )
+            WhoThatQuestion.objects.filter(pk=question.pk).update(created_at=now - timedelta(minutes=n))
+            self.questions.append(question)
+        self.quiz.selected_questions.set(self.questions)
+
+    def test_next_question_follows_monitor_order(self):
+        """Die nächste Frage ist die folgende der Monitor-Liste, bereits gestellte werden übersprungen."""
+        first, second, third = self.questions
+        self.assertEqual(next_question(self.quiz, None), first)
+        self.assertEqual(next_question(self.quiz, first.id), second)
+        self.assertEqual(next_question(self.quiz, first.id, {second.id}), third)
+        self.assertIsNone(next_question(self.quiz, third.id))
+
+    def test_asset_url_hides_file_name_and_is_cacheable(self):
+        """Die URL verrät den Dateinamen nicht; das Bild kommt auch nach einem Neustart mit langem Cache."""
+        question = self.questions[0]
+        url = asset_url(question.image)
+        self.assertNotIn('merkel', url)
+        self.assertTrue(url.endswith('.png'))
+
+        prefetching.forget_assets()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'\x89PNGangela_merkel')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(self.client.get(url.replace('.png', '.jpg')).status_code, 404)
+        self.assertEqual(self.client.get(reverse('games_hub:question_asset', args=['0' * 24 + '.png'])).status_code, 404)
+
+    def test_unknown_assets_do_not_rescan_questions(self):
+        """Unbekannte Digests lösen höchstens einen Neuaufbau des Index pro Intervall aus, danach 404."""
+        prefetching.forget_assets()
+        unknown = reverse('games_hub:question_asset', args=['0' * 24 + '.png'])
+        self.assertEqual(self.client.get(unknown).status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(unknown).status_code, 404)
+            self.assertEqual(self.client.get(asset_url(self.questions[1].image)).status_code, 200)
+
+    def test_reveal_announces_next_question_and_counts_ready(self):
+        """Nach dem Auflösen bekommt der Raum nur die Bild-URLs; der Monitor sieht, wer bereit ist."""
+
+        class Base:
+            async def send(self, text_data=None, bytes_data=None, close=False):
+                self.sent.append(json.loads(text_data))
+
+        class Layer:
+            def __init__(self):
+                self.events = []
+
+            async def group_send(self, group, event):
+                self.events.append((group, event))
+
+            async def group_add(self, group, channel):
+                pass
+
+        class Consumer(ResumableRoomMixin, PrefetchMixin, Base):
+            room_group_name = 'who_that_PREF'
+            channel_name = 'chan-staff'
+
+            def __init__(self):
+                self.sent = []
+
+            def is_admin_socket(self):
+                return True
+
+        self.addCleanup(discard_room_log, 'who_that_PREF')
+        anna = WhoThatParticipant.objects.create(quiz=self.quiz, name='Anna')
+        ben = WhoThatParticipant.objects.create(quiz=self.quiz, name='Ben')
+        presence.connect(WhoThatParticipant, anna.pk, 'chan-a', 'who_that_PREF')
+        presence.connect(WhoThatParticipant, ben.pk, 'chan-b', 'who_that_PREF')
+        first, second, _ = self.questions
+
+        consumer = Consumer()
+        consumer.channel_layer = Layer()
+        consumer.question_asked(first.id)
+        async_to_sync(consumer.announce_prefetch)(self.quiz, first.id)
+
+        (room, event), (staff, status) = consumer.channel_layer.events
+        self.assertEqual(room, 'who_that_PREF')
+        self.assertEqual(set(event) - {'seq', 'seq_log'}, {'type', 'question_id', 'assets'})
+        self.assertEqual((event['question_id'], event['assets']), (second.id, [asset_url(second.image)]))
+        self.assertEqual(staff, 'who_that_PREF_staff')
+        self.assertEqual((status['ready'], status['total']), (0, 2))
+
+        consumer.channel_layer.events.clear()
+        # The staff socket joined no participant, whatever name the frame claims
+        async_to_sync(consumer.handle_prefetch_ready)({'question_id': second.id, 'participant_name': 'Ben'})
+        consumer.channel_name = 'chan-a'
+        async_to_sync(consumer.handle_prefetch_ready)({'question_id': first.id})
+        async_to_sync(consumer.handle_prefetch_ready)({'question_id': second.id, 'participant_name': 'Ben'})
+        async_to_sync(consumer.handle_prefetch_ready)({'question_id': second.id})
+        self.assertEqual([e['ready'] for _, e in consumer.channel_layer.events], [1, 1])
+
+        consumer.channel_name = 'chan-staff'
+        async_to_sync(consumer.join_prefetch_staff)()
+        self.assertEqual(consumer.sent[-1], {'type': 'prefetch_status', 'question_id': second.id, 'ready': 1, 'total': 2})
+
+        consumer.question_asked(second.id)
+        self.assertIsNone(prefetch.pending('who_that_PREF'))
+
+
+class PermutationTest(TestCase):
+    """Stabile Mischreihenfolgen je Frage und Raum, unabhängig vom Prozess."""
+
+    def setUp(self):
+        self.addCleanup(permutations.discard_room, 'ABCD')
+        self.addCleanup(permutations.discard_room, 'WXYZ')
+
+    def test_order_is_cached_permutation(self):
+        """Jede Position kommt genau einmal vor; Räume unterscheiden sich, der Cache liefert dieselbe Reihenfolge."""
+        order = permutations.shuffle_order('assign', 7, 'ABCD', 12)
+        self.assertEqual(sorted(order), list(range(12)))
+        self.assertIs(permutations.shuffle_order('assign', 7, 'ABCD', 12), order)
+        self.assertNotEqual(permutations.shuffle_order('assign', 7, 'WXYZ', 12), order)
+
+        permutations.discard_room('ABCD')
+        self.assertEqual(permutations.shuffle_order('assign', 7, 'ABCD', 12), order)
+        self.assertEqual(permutations.to_original(order, ['3', 99, None, -1, 0]), [order[3], order[0]])
+
+    def test_same_order_in_another_process(self):
+        """Ein anderer Worker (anderer Hash-Salt) berechnet dieselbe Reihenfolge."""
+        script = (
+            "import django; django.setup(); "
+            "from games_hub.permutations import shuffle_order; "
+            "print(list(shuffle_order('who_is_lying', 3, 'ABCD', 9)))"
+        )
+        env = dict(os.environ, PYTHONHASHSEED='12345', DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'games_website.settings'))
+        output = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(json.loads(output.strip().splitlines()[-1]), list(permutations.shuffle_order('who_is_lying', 3, 'ABCD', 9)))
+
+    def test_models_use_the_room_order(self):
+        """Die Spielansicht und die Bewertung nutzen dieselbe Zuordnung."""
+        user = User.objects.create_user('host', password='pw')
+        question = AssignQuestion.objects.create(
+            question_text='Hauptstädte', left_items=['DE', 'FR', 'IT'], right_items=['Berlin', 'Paris', 'Rom'],
+            correct_matches={'0': 0, '1': 1, '2': 2}, created_by=user,
+        )
+        randomized = question.get_randomized_items(room_code='ABCD')
+        order = permutations.shuffle_order('assign', question.id, 'ABCD', 3)
+        self.assertEqual(randomized['position_to_original'], dict(enumerate(order)))
+        self.assertEqual([item['text'] for item in randomized['right_items']], [question.right_items[i] for i in order])
@@ -0,0 +1,86 @@
+"""Signed participant tokens.
+
+A token names one game participant (ID, game, room, hub session and name)
+and is signed with ``SECRET_KEY``, so views and sockets can trust it without
+touching the database. Tokens are issued when a participant joins or opens
+the play page and are sent back in the ``X-Participant-Token`` header, a
+``token`` parameter or the socket's query string.
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.core import signing
+from django.http import Http404
+
+from .registry import GAME_TYPES
+
+
+SALT = 'games_hub.participant'
+HEADER = 'HTTP_X_PARTICIPANT_TOKEN'
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+ParticipantToken = namedtuple('ParticipantToken', ['participant_id', 'game_key', 'room_code', 'session_code', 'name'])
+
+_GAME_KEYS = {gt.participant_model: key for key, gt in GAME_TYPES.items()}
+_GAME_KEYS_BY_GAME = {gt.game_model: key for key, gt in GAME_TYPES.items()}
+
+
+def issue_token(participant):
+    """Return a signed token for a game participant."""
+    game_key = _GAME_KEYS[type(participant)]
+    payload = [participant.pk, game_key, participant.quiz.room_code, participant.hub_session_code, participant.name]
+    return signing.dumps(payload, salt=SALT)
+
+
+def read_token(value, game_key=None, room_code=None):
+    """Return the ParticipantToken encoded in ``value``, or None if it is invalid.
+
+    With ``game_key``/``room_code`` the token must also belong to that game.
+    """
+    if not value:
+        return None
+    max_age = getattr(settings, 'PARTICIPANT_TOKEN_MAX_AGE', DEFAULT_MAX_AGE)
+    try:
+        token = ParticipantToken(*signing.loads(value, salt=SALT, max_age=max_age))
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    if game_key and token.game_key != game_key:
+        return None
+    if room_code and token.room_code != room_code:
+        return None
+    return token
+
+
+def token_from_request(request):
+    return request.META.get(HEADER) or request.GET.get('token') or request.POST.get('token')
+
+
+def get_participant_or_404(request, participant_model, quiz, participant_name):
+    """Return the participant a request is made for.
+
+    A valid token for this game resolves by primary key; otherwise the
+    participant is looked up by name and the ``hub_session`` parameter.
+    """
+    token = read_token(token_from_request(request), _GAME_KEYS[participant_model], quiz.room_code)
+    if token and token.name == participant_name:
+        participant = participant_model.objects.filter(pk=token.participant_id, quiz=quiz).first()
+    else:
+        participant = participant_model.objects.filter(
+            quiz=quiz, name=participant_name, hub_session_code=request.GET.get('hub_session'),
+        ).first()
+    if participant is None:
+        raise Http404("Participant not found")
+    return participant
+
+
+def participant_lookup(scope, quiz, participant_name, hub_session):
+    """Return lookup kwargs for a participant named in a socket message.
+
+    Sockets opened with a token for this game resolve the participant by
+    primary key; everything else falls back to name and hub session.
+    """
+    token = scope.get('participant')
+    if (token and token.game_key == _GAME_KEYS_BY_GAME.get(type(quiz))
+            and token.room_code == quiz.room_code and token.name == participant_name):
+        return {'pk': token.participant_id}
+    return {'name': participant_name, 'hub_session_code': hub_session}
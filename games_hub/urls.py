@@ -8,6 +8,8 @@ urlpatterns = [
     path('lobby/<str:session_code>/', views.lobby, name='lobby'),
     path('monitor/<str:session_code>/', views.monitor, name='monitor'),
     path('session/<str:session_code>/leaderboard/', views.session_leaderboard, name='session_leaderboard'),
+    # Question images behind opaque prefetch URLs
+    path('assets/<str:name>', views.question_asset, name='question_asset'),
     # API endpoints
     path('api/session/<str:session_code>/leaderboard/', views.session_leaderboard_api, name='session_leaderboard_api'),
     path('api/session/<str:session_code>/add-step/', views.add_step_to_session, name='add_step_to_session'),
@@ -1,14 +1,21 @@
+import asyncio
+import mimetypes
+import os
 import random
 import string
 import json
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_http_methods, require_POST
 from django.db.models import Max
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, Http404
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, JsonResponse, Http404
 from django.db.models import Sum, F, Case, When, Value, IntegerField, Q
 from django.db import connection
 from .models import HubSession, HubParticipant, HubGameStep, GameVote
+from .leaderboard import build_leaderboard
+from .prefetch import ASSET_MAX_AGE, resolve_asset
 from QuizGame.models import Quiz as QuizGameModel, QuizParticipant, QuizQuestion
 from sorting_ladder.models import SortingLadderGame, SortingLadderParticipant, SortingQuestion
 from clue_rush.models import ClueRushGame, ClueRushParticipant
@@ -118,142 +125,6 @@ def _get_game_instances():
     return {'all_game_instances': games}
 
 
-def get_game_participant_data(session, game_model, participant_model, room_code, game_key):
-    """Helper function to get participant data for a specific game"""
-    try:
-        game = game_model.objects.get(room_code=room_code)
-        # Only include participants who joined during this session's window
-        participants_qs = participant_model.objects.filter(quiz=game, hub_session_code=session.code).select_related('quiz')
-        if session.started_at:
-            participants_qs = participants_qs.filter(joined_at__gte=session.started_at)
-        if session.ended_at:
-            participants_qs = participants_qs.filter(joined_at__lte=session.ended_at)
-        participants = participants_qs
-        
-        data = {}
-        for p in participants:
-            # Some games (e.g., BlackJack) track total_points instead of total_score
-            score_value = getattr(p, 'total_score', None)
-            if score_value is None:
-                score_value = getattr(p, 'total_points', 0)
-            accuracy_fn = getattr(p, 'get_average_accuracy', None)
-            accuracy_value = accuracy_fn() if callable(accuracy_fn) else 0
-            data[p.name] = {
-                'score': score_value,
-                'accuracy': accuracy_value
-            }
-        return data
-    except game_model.DoesNotExist:
-        return {}
-
-def get_leaderboard_data(session):
-    """Generate leaderboard data for a session"""
-
-    try:
-        # Get all game steps for the session
-        steps = session.steps.all().order_by('order')
-        
-        # Initialize response data
-        games = []
-        participants_data = {}
-        instance_meta = {}
-        
-        # Map of game keys to their models and participant models
-        # Keys must match HubGameStep.game_key values used throughout the app
-        GAME_MODELS = {
-            'quiz': (QuizGameModel, QuizParticipant, 'Quiz Game'),
-            'clue_rush': (ClueRushGame, ClueRushParticipant, 'Clue Rush Game'),
-            'estimation': (EstimationQuiz, EstimationParticipant, 'Estimation'),
-            'assign': (AssignQuiz, AssignParticipant, 'Assign'),
-            'who': (WhoQuiz, WhoParticipant, 'Who is Lying?'),
-            'who_that': (WhoThatQuiz, WhoThatParticipant, 'Who is That?'),
-            'where': (WhereQuiz, WhereParticipant, 'Where is This?'),
-            'blackjack': (BlackJackQuiz, BlackJackParticipant, 'Black Jack'),
-            'sorting_ladder': (SortingLadderGame, SortingLadderParticipant, 'Sorting Ladder')
-        }
-        
-        # Process each game step
-        for step in steps:
-            game_key = step.game_key
-            if game_key not in [g['key'] for g in games]:
-                games.append({
-                    'key': game_key,
-                    'name': next((g[2] for k, g in GAME_MODELS.items() if k == game_key), game_key.title())
-                })
-
-            # Get participant data for this specific game instance (room)
-            if game_key in GAME_MODELS and GAME_MODELS[game_key][1] is not None:
-                game_model, participant_model, _ = GAME_MODELS[game_key]
-                game_data = get_game_participant_data(session, game_model, participant_model, step.room_code, game_key)
-
-                # Use a per-instance key so multiple steps of same type don't overwrite
-                instance_key = f"{game_key}:{step.room_code}"
-
-                # Record instance display metadata (title and type)
-                type_name = next((g[2] for k, g in GAME_MODELS.items() if k == game_key), game_key.title())
-                # Prefer the actual quiz object's title; fallback to step.title if present
-                game_obj = None
-                try:
-                    game_obj = game_model.objects.only('title').get(room_code=step.room_code)
-                except Exception:
-                    game_obj = None
-                game_title = (getattr(game_obj, 'title', None) or getattr(step, 'title', '') or '')
-                # Points awarded to the winner of this step: position 1 → 1 pt, position 2 → 2 pts, …
-                hub_points = step.order + 1
-                instance_meta[instance_key] = {
-                    'title': game_title,
-                    'type': type_name,
-                    'hub_points': hub_points,
-                }
-
-                # Determine winner score for this game
-                max_score = max((d['score'] for d in game_data.values()), default=0)
-
-                # Update participants data
-                for name, data in game_data.items():
-                    if name not in participants_data:
-                        participants_data[name] = {
-                            'name': name,
-                            'total_score': 0,
-                            'weighted_score': 0,
-                            'games_played': 0,
-                            'game_scores': {},
-                            'game_accuracies': {}
-                        }
-
-                    # Count every game instance played
-                    participants_data[name]['games_played'] += 1
-
-                    # Store scores per instance to avoid overwriting when multiple steps exist
-                    participants_data[name]['game_scores'][instance_key] = data['score']
-                    participants_data[name]['game_accuracies'][instance_key] = data['accuracy']
-                    participants_data[name]['total_score'] += data['score']
-
-                    # Winner earns hub_points; ties share; 0 if no one scored
-                    if max_score > 0 and data['score'] == max_score:
-                        participants_data[name]['weighted_score'] += hub_points
-        
-        # Apply score adjustments from HubParticipant
-        hub_participants = {
-            hp.nickname: hp
-            for hp in HubParticipant.objects.filter(session=session)
-        }
-        for name, pdata in participants_data.items():
-            hp = hub_participants.get(name)
-            pdata['hub_participant_id'] = hp.id if hp else None
-            pdata['score_adjustment'] = hp.score_adjustment if hp else 0
-            pdata['total_score'] += hp.score_adjustment if hp else 0
-
-        # Convert to list and sort by weighted score
-        participants = sorted(participants_data.values(), key=lambda x: x['weighted_score'], reverse=True)
-    except Exception as e:
-        print("Error getting leaderboard data:", e)
-    return {
-        'games': games,
-        'participants': participants,
-        'instances': instance_meta,
-    }
-
 @login_required
 @require_POST
 def set_hub_participant_score(request):
@@ -275,7 +146,7 @@ def session_leaderboard_api(request, session_code):
     
     try:
         session = HubSession.objects.get(code=session_code)
-        data = get_leaderboard_data(session)
+        data = build_leaderboard(session)
         return JsonResponse(data)
     except HubSession.DoesNotExist:
         return JsonResponse({'error': 'Session not found'}, status=404)
@@ -291,10 +162,30 @@ def lobby(request, session_code: str):
         'participants': list(participants.values('id', 'nickname'))
     })
 
+def _read_asset(name):
+    with default_storage.open(name, 'rb') as handle:
+        return handle.read()
+
+
+async def question_asset(request, name: str):
+    """Question image behind an opaque prefetch URL (see games_hub/prefetch.py)."""
+    digest, extension = os.path.splitext(name)
+    stored = await sync_to_async(resolve_asset)(digest)
+    if stored is None or os.path.splitext(stored)[1].lower() != extension:
+        raise Http404('Asset not found')
+    try:
+        data = await asyncio.to_thread(_read_asset, stored)
+    except OSError:
+        raise Http404('Asset not found')
+    response = HttpResponse(data, content_type=mimetypes.guess_type(stored)[0] or 'application/octet-stream')
+    # The URL changes with the file name, and uploads never overwrite a name
+    response['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
+
 def session_leaderboard(request, session_code: str):
     """Display the final leaderboard for a session."""
     session = get_object_or_404(HubSession, code=session_code)
-    leaderboard_data = get_leaderboard_data(session)
+    leaderboard_data = build_leaderboard(session)
     
     # Convert the data to a JSON string for the template
     leaderboard_json = json.dumps(leaderboard_data['participants'], default=str)
@@ -0,0 +1,157 @@
+"""Opt-in binary WebSocket sub-protocol.
+
+Clients that offer the ``games.msgpack.v1`` subprotocol get every frame
+as msgpack instead of JSON, with the common field names replaced by small
+integer codes (one byte on the wire). JSON stays the default: sockets that
+do not offer the subprotocol, or servers without ``msgpack``, are
+unchanged. Incoming frames may be JSON text or msgpack bytes either way.
+
+``assets/js/wire.js`` is the browser side; ``FIELDS`` there must match
+``FIELDS`` here. The table is append-only; changing existing codes needs
+a new subprotocol name.
+
+``python manage.py wire_compare`` compares sizes and CPU time of both
+encodings on traffic captured with ``WEBSOCKET_CAPTURE_FILE``.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+SUBPROTOCOL = 'games.msgpack.v1'
+# Offered alongside by clients so a server without msgpack can still pick one
+JSON_SUBPROTOCOL = 'games.json.v1'
+
+FIELDS = (
+    'type', 'message', 'seq', 'seq_log', 'room_code', 'game_key', 'id', 'name',
+    'participant', 'participant_name', 'hub_session', 'last_seq', 'question', 'question_id',
+    'question_text', 'question_type', 'question_number', 'time_limit', 'options', 'key',
+    'text', 'answer', 'answer_text', 'user_answer', 'correct_answer', 'formatted_answer', 'is_correct',
+    'points', 'points_earned', 'total_score', 'total_points', 'final_scores', 'time_taken',
+    'accuracy', 'accuracy_percentage', 'status', 'title', 'image_url', 'hint_text', 'event',
+    'rounds_survived', 'is_eliminated', 'is_busted', 'total_possible_points', 'unit', 'round',
+    'survivors', 'correct_order_ids', 'placed_after_id', 'placed_before_id', 'clue', 'session',
+    'step', 'order', 'index', 'explanation', 'difference', 'percentage_difference',
+    'distance_km', 'formatted_distance', 'correct_matches', 'total_matches', 'nickname', 'participants',
+)
+CODES = {name: code for code, name in enumerate(FIELDS)}
+
+_capture_lock = threading.Lock()
+
+
+def available():
+    return msgpack is not None
+
+
+def _pack_keys(value):
+    if isinstance(value, dict):
+        return {CODES.get(k, k): _pack_keys(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_pack_keys(v) for v in value]
+    return value
+
+
+def _unpack_keys(value):
+    if isinstance(value, dict):
+        return {
+            (FIELDS[k] if isinstance(k, int) and 0 <= k < len(FIELDS) else k): _unpack_keys(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_unpack_keys(v) for v in value]
+    return value
+
+
+def encode(payload):
+    """Return the msgpack frame for a JSON-compatible payload."""
+    return msgpack.packb(_pack_keys(payload), use_bin_type=True)
+
+
+def decode(data):
+    """Return the payload of a msgpack frame; raises ValueError if malformed."""
+    try:
+        return _unpack_keys(msgpack.unpackb(data, raw=False, strict_map_key=False))
+    except (ValueError, TypeError, msgpack.exceptions.UnpackException) as e:
+        raise ValueError(str(e)) from e
+
+
+def compare(frames, repeat=100):
+    """Sizes and per-frame CPU time (µs) of JSON and msgpack for captured frames.
+
+    ``server_msgpack`` is what a binary socket costs the server on top of
+    JSON: the consumers still build JSON text, which is re-parsed and packed.
+    """
+    payloads = [json.loads(frame) for frame in frames]
+    texts = [json.dumps(payload) for payload in payloads]
+    packed = [encode(payload) for payload in payloads]
+
+    def per_frame(fn, items):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for item in items:
+                fn(item)
+        return (time.perf_counter() - start) / (repeat * len(items)) * 1e6
+
+    return {
+        'frames': len(payloads),
+        'json_bytes': sum(len(t.encode('utf-8')) for t in texts),
+        'msgpack_bytes': sum(len(b) for b in packed),
+        'json_encode_us': per_frame(json.dumps, payloads),
+        'msgpack_encode_us': per_frame(encode, payloads),
+        'json_decode_us': per_frame(json.loads, texts),
+        'msgpack_decode_us': per_frame(decode, packed),
+        'server_msgpack_us': per_frame(lambda t: encode(json.loads(t)), texts),
+    }
+
+
+def capture(text_data):
+    """Append a frame to ``WEBSOCKET_CAPTURE_FILE`` if capturing is enabled."""
+    path = getattr(settings, 'WEBSOCKET_CAPTURE_FILE', None)
+    if path and text_data:
+        with _capture_lock, open(path, 'a', encoding='utf-8') as fh:
+            fh.write(text_data.replace('\n', ' ') + '\n')
+
+
+class BinaryProtocolMixin:
+    """Consumer mixin: speak msgpack to sockets that negotiated ``SUBPROTOCOL``.
+
+    Consumers keep sending ``json.dumps`` text and parsing text in
+    ``receive``; frames are converted at the socket edge.
+    """
+
+    binary_protocol = False
+
+    async def websocket_connect(self, message):
+        self.binary_protocol = available() and SUBPROTOCOL in self.scope.get('subprotocols', ())
+        await super().websocket_connect(message)
+
+    async def accept(self, subprotocol=None, headers=None):
+        if subprotocol is None:
+            if self.binary_protocol:
+                subprotocol = SUBPROTOCOL
+            elif JSON_SUBPROTOCOL in self.scope.get('subprotocols', ()):
+                subprotocol = JSON_SUBPROTOCOL
+        await super().accept(subprotocol=subprotocol, headers=headers)
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        capture(text_data)
+        if self.binary_protocol and text_data is not None:
+            bytes_data, text_data = encode(json.loads(text_data)), None
+        await super().send(text_data=text_data, bytes_data=bytes_data, close=close)
+
+    async def websocket_receive(self, message):
+        if self.binary_protocol and message.get('bytes') is not None:
+            try:
+                message = {'type': message['type'], 'text': json.dumps(decode(message['bytes']))}
+            except ValueError:
+                await self.send(text_data=json.dumps({'type': 'error', 'message': 'Invalid message'}))
+                return
+        capture(message.get('text'))
+        await super().websocket_receive(message)
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class GamesWebsiteConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'games_website'
+
+    def ready(self):  # noqa: D401
+        from django.core import checks
+
+        from .vendor import check_vendor_assets
+
+        checks.register(check_vendor_assets)
@@ -6,13 +6,22 @@ import os
 from django.core.asgi import get_asgi_application
 from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'games_website.settings')
 
 # Initialize Django ASGI application early to ensure the AppRegistry
 # is populated before importing code that may import ORM models.
-django_asgi_app = ASGIStaticFilesHandler(get_asgi_application())
+django_asgi_app = get_asgi_application()
+
+from django.conf import settings
+from games_website.serving import MediaFiles, PrecompressedStaticFiles
+
+# Production serves collected, precompressed files and the uploads (see
+# games_website/serving.py); in DEBUG urls.py serves the uploads
+if settings.DEBUG:
+    django_asgi_app = ASGIStaticFilesHandler(django_asgi_app)
+else:
+    django_asgi_app = MediaFiles(PrecompressedStaticFiles(django_asgi_app))
 
 # Import routing from all apps
 import QuizGame.routing
@@ -25,6 +34,7 @@ import black_jack_quiz.routing
 import games_hub.routing
 import clue_rush.routing
 import sorting_ladder.routing
+from games_hub.middleware import ParticipantTokenMiddleware
 
 # Combine all WebSocket URL patterns
 websocket_urlpatterns = []
@@ -41,7 +51,7 @@ websocket_urlpatterns.extend(sorting_ladder.routing.websocket_urlpatterns)
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    "websocket": AuthMiddlewareStack(
+    "websocket": ParticipantTokenMiddleware(
         URLRouter(
             websocket_urlpatterns
         )
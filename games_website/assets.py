@@ -0,0 +1,304 @@
+"""Front-end asset pipeline for the game pages.
+
+Scripts and styles of the play and monitor pages live in ``assets/`` (see
+``ASSET_SOURCE_DIR``) instead of inline in the templates:
+
+* ``js/runtime/`` is the client runtime shared by every game (socket with
+  resume and reconnect, question timer, hub session follower), bundled
+  with ``js/wire.js`` into ``js/play.js`` and ``js/monitor.js`` (``BUNDLES``);
+* ``js/games/``, ``js/monitors/``, ``css/games/`` and ``css/monitors/`` are
+  the per-page modules, published under their own names;
+* ``css/play.css`` and ``css/monitor.css`` hold the rules every play
+  (monitor) page shares.
+
+``AssetFinder`` is a staticfiles finder: it builds the outputs into
+``ASSET_BUILD_DIR`` whenever a source is newer than its output, so
+``{% static %}``, the development server and ``collectstatic`` see the built
+files like any other static file. In production the manifest storage (see
+games_website/serving.py) content-hashes and precompresses them, so phones
+cache the runtime once for every game of a hub session.
+
+With ``ASSET_MINIFY`` the outputs are minified by ``minify_js`` and
+``minify_css``. Both are conservative: they drop comments and layout
+whitespace, but keep line breaks in scripts (automatic semicolon insertion)
+and copy strings, template literals and regular expressions verbatim.
+"""
+import os
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import BaseFinder
+from django.contrib.staticfiles.utils import matches_patterns
+from django.core.files.storage import FileSystemStorage
+
+
+# Output name -> sources, concatenated in order
+BUNDLES = {
+    'js/play.js': ['js/wire.js', 'js/runtime/player.js'],
+    'js/monitor.js': ['js/runtime/monitor.js'],
+}
+EXTENSIONS = ('.js', '.css')
+
+
+def source_dir():
+    return Path(getattr(settings, 'ASSET_SOURCE_DIR', Path(settings.BASE_DIR) / 'assets'))
+
+
+def build_dir():
+    return Path(getattr(settings, 'ASSET_BUILD_DIR', Path(settings.BASE_DIR) / 'build' / 'assets'))
+
+
+def outputs():
+    """Return ``{output name: [source names]}``; sources outside a bundle are published as they are."""
+    root = source_dir()
+    bundled = {name for sources in BUNDLES.values() for name in sources}
+    result = dict(BUNDLES)
+    for path in sorted(root.rglob('*')):
+        name = path.relative_to(root).as_posix()
+        if path.is_file() and path.suffix in EXTENSIONS and name not in bundled:
+            result[name] = [name]
+    return result
+
+
+# -- minifiers ---------------------------------------------------------------
+
+# A '/' after one of these starts a regular expression, not a division
+_REGEX_KEYWORDS = frozenset({
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+})
+_WORD = re.compile(r'[\w$]')
+
+
+def _skip_string(src, i):
+    """Index after the quoted string starting at ``src[i]``."""
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == quote or ch == '\n':
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_template(src, i):
+    """Index after the template literal starting at ``src[i]``, ``${...}`` included."""
+    i += 1
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+        elif ch == '`':
+            return i + 1
+        elif src.startswith('${', i):
+            i = _skip_code(src, i + 2)
+        else:
+            i += 1
+    return i
+
+
+def _skip_code(src, i):
+    """Index after the ``}`` closing the expression that starts at ``src[i]``."""
+    depth = 0
+    while i < len(src):
+        ch = src[i]
+        if ch in '\'"':
+            i = _skip_string(src, i)
+        elif ch == '`':
+            i = _skip_template(src, i)
+        elif ch == '{':
+            depth += 1
+            i += 1
+        elif ch == '}':
+            if depth == 0:
+                return i + 1
+            depth -= 1
+            i += 1
+        else:
+            i += 1
+    return i
+
+
+def _skip_regex(src, i):
+    """Index after the regular expression literal at ``src[i]``, or None if it is not one."""
+    j = i + 1
+    in_class = False
+    while j < len(src):
+        ch = src[j]
+        if ch == '\n':
+            return None
+        if ch == '\\':
+            j += 2
+            continue
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            j += 1
+            while j < len(src) and _WORD.match(src[j]):
+                j += 1
+            return j
+        j += 1
+    return None
+
+
+def _regex_allowed(out):
+    """Whether a ``/`` after the emitted code ``out`` starts a regular expression."""
+    text = ''.join(out[-8:]).rstrip(' ')
+    if not text or text.endswith('\n'):
+        return True
+    last = text[-1]
+    if last in ')]':
+        return False
+    if _WORD.match(last):
+        word = re.search(r'[\w$]+$', text).group(0)
+        return word in _REGEX_KEYWORDS
+    return True
+
+
+def _space(out, separator):
+    """Emit one space or line break; a line break wins, none at the start."""
+    if not out or out[-1] == '\n':
+        return
+    if out[-1] == ' ':
+        out[-1] = separator
+    else:
+        out.append(separator)
+
+
+def minify_js(source):
+    """Drop comments, indentation and blank lines; keep line breaks, strings and regexes."""
+    out = []
+    i, n = 0, len(source)
+    while i < n:
+        ch = source[i]
+        if ch in '\'"':
+            j = _skip_string(source, i)
+        elif ch == '`':
+            j = _skip_template(source, i)
+        elif source.startswith('//', i):
+            i = source.find('\n', i)
+            if i < 0:
+                break
+            continue
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            _space(out, '\n' if '\n' in source[i:end] else ' ')
+            i = end
+            continue
+        elif ch == '/' and _regex_allowed(out):
+            j = _skip_regex(source, i) or i + 1
+        elif ch in ' \t\r\n':
+            j = i
+            while j < n and source[j] in ' \t\r\n':
+                j += 1
+            _space(out, '\n' if '\n' in source[i:j] else ' ')
+            i = j
+            continue
+        else:
+            j = i + 1
+        out.append(source[i:j])
+        i = j
+    while out and out[-1] in (' ', '\n'):
+        out.pop()
+    return ''.join(out) + '\n'
+
+
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,])\s*')
+
+
+def _compact_css(code):
+    code = _CSS_PUNCTUATION.sub(r'\1', re.sub(r'\s+', ' ', code))
+    return code.replace(';}', '}')
+
+
+def minify_css(source):
+    """Drop comments and whitespace around ``{ } ; ,``; strings are kept."""
+    parts = []
+    code = []
+    pos = 0
+    for match in _CSS_TOKENS.finditer(source):
+        code.append(source[pos:match.start()])
+        if match.group(1):
+            parts += [_compact_css(''.join(code)), match.group(1)]
+            code = []
+        else:
+            code.append(' ')
+        pos = match.end()
+    code.append(source[pos:])
+    parts.append(_compact_css(''.join(code)))
+    return ''.join(parts).strip() + '\n'
+
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css}
+
+
+# -- building ----------------------------------------------------------------
+
+def _minify():
+    return getattr(settings, 'ASSET_MINIFY', not settings.DEBUG)
+
+
+def build_output(name, sources, force=False):
+    """Build one output if it is missing or older than a source; return its path."""
+    root = source_dir()
+    target = build_dir() / name
+    paths = [root / source for source in sources]
+    if not force and target.exists():
+        built = target.stat().st_mtime_ns
+        if all(path.stat().st_mtime_ns <= built for path in paths):
+            return target
+    content = '\n'.join(path.read_text(encoding='utf-8').rstrip('\n') + '\n' for path in paths)
+    if _minify():
+        content = MINIFIERS[target.suffix](content)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename: the dev server may read the file while it is rebuilt
+    tmp = target.with_name(f'.{target.name}.{os.getpid()}.tmp')
+    tmp.write_text(content, encoding='utf-8')
+    os.replace(tmp, target)
+    return target
+
+
+def build(force=False):
+    """Build every stale output; return ``[(name, source bytes, output bytes)]``."""
+    root = source_dir()
+    sizes = []
+    for name, sources in outputs().items():
+        target = build_output(name, sources, force=force)
+        source_size = sum((root / source).stat().st_size for source in sources)
+        sizes.append((name, source_size, target.stat().st_size))
+    return sizes
+
+
+class AssetFinder(BaseFinder):
+    """Static files finder for the built ``assets/`` outputs."""
+
+    @property
+    def storage(self):
+        return FileSystemStorage(location=build_dir())
+
+    def check(self, **kwargs):
+        return []
+
+    def find(self, path, find_all=False, **kwargs):
+        sources = outputs().get(path) if source_dir().is_dir() else None
+        if sources is None:
+            # Like the built-in finders: a miss is [], None would count as a match
+            return []
+        target = str(build_output(path, sources))
+        return [target] if find_all else target
+
+    def list(self, ignore_patterns):
+        if not source_dir().is_dir():
+            return
+        for name, _, _ in build():
+            if not matches_patterns(name, ignore_patterns):
+                yield name, self.storage
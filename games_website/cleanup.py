@@ -0,0 +1,134 @@
+"""Chunked background deletion of games, sessions and everything below them.
+
+``QuerySet.delete()`` collects the whole cascade (participants, answers,
+submissions, ...) into memory and deletes it in a single transaction, which
+keeps SQLite's write lock for as long as that takes and stalls every live
+room. The helpers here walk the cascade graph themselves, delete the
+deepest rows first in bounded chunks, commit each chunk in its own short
+transaction and pause briefly in between so other writers get a turn.
+
+Cleanups started from the dashboard run in a daemon thread and can be
+polled through :func:`get_job`. The job's progress record is kept in the
+default cache, which all workers share outside DEBUG (see the CACHES
+setting), so a poll answered by another worker than the one deleting still
+finds it. Records expire ``JOB_TTL`` seconds after their last update; a
+job whose worker was restarted stops updating and keeps its last state.
+"""
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from games_hub.registry import cascade_children
+
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_PAUSE = 0.01
+JOB_TTL = 24 * 60 * 60
+
+
+def _job_key(job_id):
+    return f'games_website:cleanup-job:{job_id}'
+
+
+def _save_job(job):
+    job['updated_at'] = timezone.now().isoformat()
+    cache.set(_job_key(job['id']), job, JOB_TTL)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def chunked_delete(queryset, chunk_size=DEFAULT_CHUNK_SIZE, pause=DEFAULT_PAUSE, progress=None, _path=()):
+    """Delete ``queryset`` and its cascade in chunks; returns rows deleted per model label.
+
+    Children reached through ``on_delete=CASCADE`` are deleted before their
+    parents, so the final ``delete()`` of every chunk only has to handle
+    SET_NULL/M2M bookkeeping and signals for a bounded number of rows.
+    """
+    model = queryset.model
+    counts = {}
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+    path = _path + (model,)
+
+    for chunk in _chunks(pks, chunk_size):
+        for child_model, fk_name in cascade_children(model):
+            # Self-referencing or cyclic cascades are left to Django's collector
+            if child_model in path:
+                continue
+            child_qs = child_model._default_manager.filter(**{f'{fk_name}__in': chunk})
+            for label, n in chunked_delete(child_qs, chunk_size, pause, progress, path).items():
+                counts[label] = counts.get(label, 0) + n
+
+        with transaction.atomic():
+            _, deleted = model._default_manager.filter(pk__in=chunk).delete()
+        for label, n in deleted.items():
+            counts[label] = counts.get(label, 0) + n
+        if progress:
+            progress(model._meta.label, sum(deleted.values()))
+        if pause:
+            time.sleep(pause)
+
+    return counts
+
+
+def _run_job(job, querysets, chunk_size, pause):
+    # Only this thread changes ``job`` once it runs; every change is saved
+    def _progress(label, n):
+        job['deleted'] += n
+        job['by_model'][label] = job['by_model'].get(label, 0) + n
+        _save_job(job)
+
+    job['status'] = 'running'
+    _save_job(job)
+    try:
+        for queryset in querysets:
+            chunked_delete(queryset, chunk_size, pause, _progress)
+        job['status'] = 'done'
+    except Exception as e:  # pylint: disable=broad-except
+        job['status'] = 'failed'
+        job['error'] = str(e)
+    finally:
+        job['finished_at'] = timezone.now().isoformat()
+        _save_job(job)
+        connection.close()
+
+
+def start_cleanup(label, querysets, chunk_size=DEFAULT_CHUNK_SIZE, pause=DEFAULT_PAUSE):
+    """Delete ``querysets`` in a background thread and return the job id.
+
+    The thread is started once the current transaction commits, so it never
+    races with rows the calling request has not written yet.
+    """
+    job = {
+        'id': uuid.uuid4().hex,
+        'label': label,
+        'status': 'pending',
+        'deleted': 0,
+        'by_model': {},
+        'error': None,
+        'started_at': timezone.now().isoformat(),
+        'finished_at': None,
+    }
+    _save_job(job)
+
+    def _start():
+        threading.Thread(
+            target=_run_job,
+            args=(job, list(querysets), chunk_size, pause),
+            name=f"cleanup-{job['id'][:8]}",
+            daemon=True,
+        ).start()
+
+    transaction.on_commit(_start)
+    return job['id']
+
+
+def get_job(job_id):
+    """Return the job's progress record, or None if it is unknown or expired."""
+    return cache.get(_job_key(job_id))
@@ -0,0 +1,309 @@
+"""Streaming export of game results as CSV or JSON Lines.
+
+One generic exporter covers every game type in ``games_hub.registry``:
+participant rows carry the final score, answer rows carry the per-question
+result and timing, with the game-specific answer fields collected into a
+single ``answer`` column. Rows are read with ``.values().iterator()`` and
+written out as they arrive, so exporting a large session never holds it in
+memory. Archived games are included, one archive at a time.
+"""
+import csv
+import json
+import zlib
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from games_hub.registry import GAME_TYPES
+from game_archive.models import GameArchive
+
+
+FORMATS = ('csv', 'jsonl')
+KINDS = ('answers', 'participants')
+DEFAULT_CHUNK_SIZE = 2000
+FLUSH_SIZE = 64 * 1024
+
+ANSWER_COLUMNS = [
+    'game', 'session_code', 'room_code', 'game_title', 'participant_id', 'participant',
+    'question_id', 'question', 'answer', 'is_correct', 'points', 'time_taken', 'submitted_at', 'archived',
+]
+PARTICIPANT_COLUMNS = [
+    'game', 'session_code', 'room_code', 'game_title', 'participant_id', 'participant',
+    'score', 'questions_answered', 'is_active', 'joined_at', 'last_activity', 'archived',
+]
+
+# Answer fields shared by all games; everything else goes into ``answer``
+_ANSWER_BASE_FIELDS = {
+    'id', 'synced', 'updated_at', 'quiz', 'participant', 'question',
+    'is_correct', 'points_earned', 'submitted_at', 'time_taken',
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class ExportError(Exception):
+    """Raised for invalid export parameters."""
+
+
+def parse_bound(value, end=False):
+    """Parse an ISO date or datetime filter value into an aware datetime.
+
+    A plain date used as the upper bound includes the whole day.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ExportError(f"Invalid date: {value}")
+            parsed = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _field_names(model):
+    return {f.name for f in model._meta.concrete_fields}
+
+
+def _question_text_field(question_model):
+    return 'question_text' if 'question_text' in _field_names(question_model) else 'statement'
+
+
+def _answer_extra_fields(answer_model):
+    return [f.name for f in answer_model._meta.concrete_fields if f.name not in _ANSWER_BASE_FIELDS]
+
+
+def _in_range(value, since, until):
+    if value is None:
+        return not (since or until)
+    return (since is None or value >= since) and (until is None or value < until)
+
+
+def _answer_rows(game_type, session_code, since, until, chunk_size):
+    model = game_type.answer_model
+    names = _field_names(model)
+    extra = _answer_extra_fields(model)
+    text_field = _question_text_field(game_type.question_model)
+    optional = [f for f in ('is_correct', 'points_earned', 'time_taken') if f in names]
+
+    qs = model.objects.all()
+    if session_code:
+        qs = qs.filter(participant__hub_session_code=session_code)
+    if since:
+        qs = qs.filter(submitted_at__gte=since)
+    if until:
+        qs = qs.filter(submitted_at__lt=until)
+    qs = qs.order_by('quiz_id', 'submitted_at', 'pk').values(
+        'quiz__room_code', 'quiz__title', 'participant_id', 'participant__name',
+        'participant__hub_session_code', 'question_id', f'question__{text_field}', 'submitted_at',
+        *optional, *extra,
+    )
+    for v in qs.iterator(chunk_size=chunk_size):
+        yield {
+            'game': game_type.key,
+            'session_code': v['participant__hub_session_code'],
+            'room_code': v['quiz__room_code'],
+            'game_title': v['quiz__title'],
+            'participant_id': v['participant_id'],
+            'participant': v['participant__name'],
+            'question_id': v['question_id'],
+            'question': v[f'question__{text_field}'],
+            'answer': {f: v[f] for f in extra},
+            'is_correct': v.get('is_correct'),
+            'points': v.get('points_earned'),
+            'time_taken': v.get('time_taken'),
+            'submitted_at': v['submitted_at'],
+            'archived': False,
+        }
+
+    for archive in _archives(game_type, session_code):
+        answers = [
+            obj for obj in archive.load_objects()
+            if isinstance(obj, model) and _in_range(obj.submitted_at, since, until)
+        ]
+        if not answers:
+            continue
+        questions = dict(
+            game_type.question_model.objects
+            .filter(pk__in={a.question_id for a in answers})
+            .values_list('pk', text_field)
+        )
+        for a in sorted(answers, key=lambda a: (a.submitted_at, a.pk)):
+            yield {
+                'game': game_type.key,
+                'session_code': archive.hub_session_code,
+                'room_code': archive.room_code,
+                'game_title': archive.title,
+                'participant_id': a.participant_id,
+                'participant': a.participant.name,
+                'question_id': a.question_id,
+                'question': questions.get(a.question_id),
+                'answer': {f: getattr(a, f) for f in extra},
+                'is_correct': getattr(a, 'is_correct', None),
+                'points': getattr(a, 'points_earned', None),
+                'time_taken': getattr(a, 'time_taken', None),
+                'submitted_at': a.submitted_at,
+                'archived': True,
+            }
+
+
+def _participant_rows(game_type, session_code, since, until, chunk_size):
+    model = game_type.participant_model
+    answered_field = 'questions_answered' if 'questions_answered' in _field_names(model) else 'rounds_survived'
+
+    qs = model.objects.all()
+    if session_code:
+        qs = qs.filter(hub_session_code=session_code)
+    if since:
+        qs = qs.filter(joined_at__gte=since)
+    if until:
+        qs = qs.filter(joined_at__lt=until)
+    qs = qs.order_by('quiz_id', 'joined_at', 'pk').values(
+        'id', 'name', 'hub_session_code', 'quiz__room_code', 'quiz__title',
+        game_type.score_field, answered_field, 'is_active', 'joined_at', 'last_activity',
+    )
+    for v in qs.iterator(chunk_size=chunk_size):
+        yield {
+            'game': game_type.key,
+            'session_code': v['hub_session_code'],
+            'room_code': v['quiz__room_code'],
+            'game_title': v['quiz__title'],
+            'participant_id': v['id'],
+            'participant': v['name'],
+            'score': v[game_type.score_field],
+            'questions_answered': v[answered_field],
+            'is_active': v['is_active'],
+            'joined_at': v['joined_at'],
+            'last_activity': v['last_activity'],
+            'archived': False,
+        }
+
+    for archive in _archives(game_type, session_code):
+        participants = [
+            obj for obj in archive.load_objects()
+            if isinstance(obj, model) and _in_range(obj.joined_at, since, until)
+        ]
+        for p in sorted(participants, key=lambda p: (p.joined_at, p.pk)):
+            yield {
+                'game': game_type.key,
+                'session_code': archive.hub_session_code,
+                'room_code': archive.room_code,
+                'game_title': archive.title,
+                'participant_id': p.pk,
+                'participant': p.name,
+                'score': getattr(p, game_type.score_field),
+                'questions_answered': getattr(p, answered_field),
+                'is_active': p.is_active,
+                'joined_at': p.joined_at,
+                'last_activity': p.last_activity,
+                'archived': True,
+            }
+
+
+def _archives(game_type, session_code):
+    archives = GameArchive.objects.filter(game_key=game_type.key)
+    if session_code:
+        archives = archives.filter(hub_session_code=session_code)
+    # One archive in memory at a time
+    return archives.order_by('archived_at').iterator(chunk_size=1)
+
+
+def iter_rows(kind='answers', session_code=None, game_keys=None, since=None, until=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield result rows as dicts for all (or the selected) game types."""
+    if kind not in KINDS:
+        raise ExportError(f"Unknown kind '{kind}'")
+    unknown = set(game_keys or ()) - set(GAME_TYPES)
+    if unknown:
+        raise ExportError(f"Unknown game type: {', '.join(sorted(unknown))}")
+
+    producer = _answer_rows if kind == 'answers' else _participant_rows
+    # Validate eagerly so callers see errors before streaming starts
+    return (
+        row
+        for key, game_type in GAME_TYPES.items()
+        if not game_keys or key in game_keys
+        for row in producer(game_type, session_code, since, until, chunk_size)
+    )
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return value
+
+
+def _csv_lines(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_cell(row[c]) for c in columns])
+
+
+def _jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _buffered(lines):
+    """Join text lines into byte blocks of about FLUSH_SIZE."""
+    buf, size = [], 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buf.append(data)
+        size += len(data)
+        if size >= FLUSH_SIZE:
+            yield b''.join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b''.join(buf)
+
+
+def _gzipped(blocks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(fmt='csv', kind='answers', session_code=None, game_keys=None, since=None, until=None,
+                compress=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the encoded export as byte blocks, optionally gzip-compressed."""
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format '{fmt}'")
+    rows = iter_rows(kind, session_code, game_keys, since, until, chunk_size)
+    if fmt == 'csv':
+        lines = _csv_lines(rows, ANSWER_COLUMNS if kind == 'answers' else PARTICIPANT_COLUMNS)
+    else:
+        lines = _jsonl_lines(rows)
+    blocks = _buffered(lines)
+    return _gzipped(blocks) if compress else blocks
+
+
+def export_filename(fmt='csv', kind='answers', session_code=None, compress=False):
+    parts = ['results', kind]
+    if session_code:
+        parts.append(session_code)
+    return '-'.join(parts) + f'.{fmt}' + ('.gz' if compress else '')
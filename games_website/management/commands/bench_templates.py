@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateDoesNotExist
+
+from games_website.serving import play_templates, render_benchmark
+
+
+class Command(BaseCommand):
+    help = "Compare template render times with the plain and the cached template loaders"
+
+    def add_arguments(self, parser):
+        parser.add_argument('templates', nargs='*', help="Template names (default: every */play.html)")
+        parser.add_argument('--repeat', type=int, default=50, help="Renders per template and loader")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared serving service."""
+        names = options['templates'] or play_templates()
+        try:
+            rows = render_benchmark(names, repeat=max(1, options['repeat']))
+        except TemplateDoesNotExist as e:
+            raise CommandError(f"Template not found: {e}")
+
+        self.stdout.write(f"{'template':<32} {'plain ms':>10} {'cached ms':>10} {'speedup':>8}")
+        for name, plain_ms, cached_ms in rows:
+            self.stdout.write(f"{name:<32} {plain_ms:>10.3f} {cached_ms:>10.3f} {plain_ms / cached_ms:>7.1f}x")
+        plain_total = sum(row[1] for row in rows)
+        cached_total = sum(row[2] for row in rows)
+        self.stdout.write(self.style.SUCCESS(
+            f"{'total':<32} {plain_total:>10.3f} {cached_total:>10.3f} {plain_total / cached_total:>7.1f}x"
+        ))
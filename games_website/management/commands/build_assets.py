@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games_website.assets import build, source_dir
+
+
+class Command(BaseCommand):
+    help = "Bundle and minify the game page scripts and styles from assets/ (collectstatic does this too)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Rebuild outputs that are up to date")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared asset service."""
+        if not source_dir().is_dir():
+            raise CommandError(f"Asset sources not found: {source_dir()}")
+        sizes = build(force=options['force'])
+
+        self.stdout.write(f"{'output':<32} {'source':>10} {'built':>10}")
+        for name, source_size, built_size in sizes:
+            self.stdout.write(f"{name:<32} {source_size:>10} {built_size:>10}")
+        source_total = sum(row[1] for row in sizes)
+        built_total = sum(row[2] for row in sizes)
+        self.stdout.write(self.style.SUCCESS(f"{'total':<32} {source_total:>10} {built_total:>10}"))
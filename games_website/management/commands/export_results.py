@@ -0,0 +1,59 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from games_hub.registry import GAME_TYPES
+from games_website.export import (
+    DEFAULT_CHUNK_SIZE,
+    FORMATS,
+    KINDS,
+    ExportError,
+    iter_export,
+    parse_bound,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream participant or answer results of all games as CSV or JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='fmt', choices=FORMATS, default='csv')
+        parser.add_argument('--kind', choices=KINDS, default='answers', help="Export answers or participants")
+        parser.add_argument('--session', help="Only rows of this hub session code")
+        parser.add_argument('--game', action='append', choices=sorted(GAME_TYPES), help="Only this game type (repeatable)")
+        parser.add_argument('--since', help="ISO date/datetime, inclusive")
+        parser.add_argument('--until', help="ISO date/datetime; a plain date includes the whole day")
+        parser.add_argument('--gzip', action='store_true', help="Compress the output (implied by a .gz output file)")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows fetched per database round trip")
+        parser.add_argument('-o', '--output', default='-', help="Output file (default: stdout)")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared export service."""
+        output = options['output']
+        compress = options['gzip'] or output.endswith('.gz')
+        try:
+            blocks = iter_export(
+                fmt=options['fmt'],
+                kind=options['kind'],
+                session_code=options['session'],
+                game_keys=options['game'],
+                since=parse_bound(options['since']),
+                until=parse_bound(options['until'], end=True),
+                compress=compress,
+                chunk_size=options['chunk_size'],
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        if output == '-':
+            for block in blocks:
+                sys.stdout.buffer.write(block)
+            sys.stdout.buffer.flush()
+            return
+
+        written = 0
+        with open(output, 'wb') as fh:
+            for block in blocks:
+                fh.write(block)
+                written += len(block)
+        self.stdout.write(self.style.SUCCESS(f"Exported {written} bytes to {output}"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games_website.backup import SnapshotError, find_snapshot, restore_snapshot
+
+
+class Command(BaseCommand):
+    help = "Restore the local SQLite database from a snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument('snapshot', nargs='?', help="Snapshot file name or path (default: newest for --label)")
+        parser.add_argument('--label', help="Restore the newest snapshot with this label")
+        parser.add_argument('--dir', dest='snapshot_dir', help="Snapshot directory (default: settings.DB_SNAPSHOT_DIR)")
+        parser.add_argument('--pages', type=int, default=-1, help="Pages copied per backup step (-1 = all at once)")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared backup service."""
+        try:
+            path = find_snapshot(options['snapshot_dir'], label=options['label'], name=options['snapshot'])
+            restore_snapshot(path, pages=options['pages'], log=self.stdout.write)
+        except SnapshotError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Database restored from: {path.name}"))
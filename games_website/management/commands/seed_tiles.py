@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from games_website.tiles import MAX_ZOOM, count_tiles, seed, store_path
+
+
+class Command(BaseCommand):
+    help = "Pre-seed the local map tile store for the configured regions and zoom levels"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bbox', help="Region to seed instead of MAP_TILE_REGIONS: west,south,east,north")
+        parser.add_argument('--zoom', default='0-5', help="Zoom levels for --bbox, e.g. 0-8 (default: 0-5)")
+        parser.add_argument('--force', action='store_true', help="Download tiles that are already stored again")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the tiles")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared tile service."""
+        if options['bbox']:
+            try:
+                west, south, east, north = (float(v) for v in options['bbox'].split(','))
+                min_zoom, _, max_zoom = options['zoom'].partition('-')
+                min_zoom, max_zoom = int(min_zoom), int(max_zoom or min_zoom)
+            except ValueError:
+                raise CommandError("Expected --bbox west,south,east,north and --zoom min-max")
+            if not (west < east and south < north and 0 <= min_zoom <= max_zoom <= MAX_ZOOM):
+                raise CommandError("Empty bounding box or zoom range")
+            regions = [('bbox', (west, south, east, north), min_zoom, max_zoom)]
+        else:
+            regions = getattr(settings, 'MAP_TILE_REGIONS', [])
+            if not regions:
+                raise CommandError("No regions to seed: pass --bbox and --zoom, or set MAP_TILE_REGIONS")
+
+        total = count_tiles(regions)
+        self.stdout.write(f"{total} tiles in {len(regions)} region(s) -> {store_path()}")
+        if options['dry_run']:
+            return
+
+        def progress(name, done):
+            self.stdout.write(f"  {name}: {done} tiles")
+
+        fetched, skipped, failed = seed(regions, progress=progress, force=options['force'])
+        message = f"{fetched} fetched, {skipped} already stored, {failed} failed"
+        if failed:
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games_website.backup import (
+    DEFAULT_LABEL,
+    DEFAULT_PAGES_PER_STEP,
+    DEFAULT_STEP_DELAY,
+    SnapshotError,
+    list_snapshots,
+    take_snapshot,
+)
+
+
+class Command(BaseCommand):
+    help = "Take an online, compressed snapshot of the local SQLite database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--label', help=f"Snapshot label used for rotation and lookup (default: {DEFAULT_LABEL})")
+        parser.add_argument('--dir', dest='snapshot_dir', help="Snapshot directory (default: settings.DB_SNAPSHOT_DIR)")
+        parser.add_argument('--compression', choices=['auto', 'zstd', 'gzip', 'none'], default='auto')
+        parser.add_argument('--keep', type=int, default=10, help="Number of snapshots to keep for this label")
+        parser.add_argument('--pages', type=int, default=DEFAULT_PAGES_PER_STEP, help="Pages copied per backup step")
+        parser.add_argument('--step-delay', type=float, default=DEFAULT_STEP_DELAY, help="Pause between steps in seconds")
+        parser.add_argument('--force', action='store_true', help="Keep a new snapshot even if nothing changed")
+        parser.add_argument('--list', action='store_true', help="List existing snapshots and exit")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared backup service."""
+        if options['list']:
+            for entry in list_snapshots(options['snapshot_dir'], label=options['label']):
+                self.stdout.write(
+                    f"{entry['file']}  {entry['created_at']}  {entry['compressed_size']} bytes"
+                )
+            return
+
+        try:
+            entry = take_snapshot(
+                snapshot_dir=options['snapshot_dir'],
+                label=options['label'] or DEFAULT_LABEL,
+                compression=options['compression'],
+                keep=options['keep'],
+                pages=options['pages'],
+                step_delay=options['step_delay'],
+                force=options['force'],
+                log=self.stdout.write,
+            )
+        except SnapshotError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Snapshot ready: {entry['file']}"))
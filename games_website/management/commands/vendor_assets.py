@@ -0,0 +1,27 @@
+import urllib.error
+
+from django.core.management.base import BaseCommand, CommandError
+
+from games_website.vendor import VENDOR_ASSETS, download
+
+
+class Command(BaseCommand):
+    help = "Download Bootstrap, Lucide, Leaflet and the Inter font into static/vendor/ so pages need no CDN"
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"Files to download (default: all of {', '.join(VENDOR_ASSETS)})")
+        parser.add_argument('--force', action='store_true', help="Download files that are already present again")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared vendor service."""
+        unknown = sorted(set(options['names']) - set(VENDOR_ASSETS))
+        if unknown:
+            raise CommandError(f"Unknown vendor files: {', '.join(unknown)}")
+        try:
+            written = download(options['names'] or None, force=options['force'])
+        except (urllib.error.URLError, OSError) as e:
+            raise CommandError(f"Download failed: {e}")
+
+        for path, size in written:
+            self.stdout.write(f"{path}  {size} bytes")
+        self.stdout.write(self.style.SUCCESS(f"{len(written)} files written; commit static/vendor/ to serve them"))
@@ -0,0 +1,252 @@
+"""Production serving profile (``DJANGO_DEBUG=0``).
+
+* ``CompressedManifestStaticFilesStorage`` stores content-hashed copies of
+  every static file on ``collectstatic`` and writes ``.gz`` (and ``.br``
+  when the ``brotli`` package is installed) siblings next to them, so no
+  request ever compresses anything.
+* ``PrecompressedStaticFiles`` wraps the Django ASGI app and serves
+  ``STATIC_ROOT`` itself: it picks the smallest encoding the client accepts,
+  answers ``If-None-Match`` with 304 and marks hashed names as immutable
+  for a year. File metadata and small bodies are cached per process;
+  restart after ``collectstatic``.
+* ``MediaFiles`` serves uploads (``MEDIA_URL`` from ``MEDIA_ROOT``) the same
+  way, but they can be replaced at any time: never immutable, cached for
+  ``MEDIA_MAX_AGE`` seconds and looked up on every request.
+* ``render_benchmark`` times templates with the plain and the cached
+  loaders (``python manage.py bench_templates``).
+
+Templates use the cached loader and rendered pages get an ETag from
+``ConditionalGetMiddleware`` (see settings.py).
+"""
+import asyncio
+import gzip
+import json
+import mimetypes
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.template import Context, engines
+from django.template.engine import Engine
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = frozenset({'.css', '.js', '.json', '.svg', '.html', '.txt', '.map', '.xml', '.ico'})
+MIN_COMPRESS_SIZE = 256
+# Keep a compressed copy only if it saves at least this share of the bytes
+MIN_SAVING = 0.05
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+DEFAULT_MAX_AGE = 60
+MEMORY_CACHE_LIMIT = 512 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+PLAIN_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+CACHED_LOADERS = [('django.template.loaders.cached.Loader', PLAIN_LOADERS)]
+
+
+def compress_file(path):
+    """Write ``.gz`` and ``.br`` siblings of ``path``; return the encodings written."""
+    path = Path(path)
+    if path.suffix not in COMPRESSIBLE_EXTENSIONS:
+        return []
+    data = path.read_bytes()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return []
+    compressors = [('gzip', '.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        compressors.insert(0, ('br', '.br', lambda raw: brotli.compress(raw, quality=11)))
+    written = []
+    for encoding, suffix, compress in compressors:
+        target = path.with_name(path.name + suffix)
+        packed = compress(data)
+        if len(packed) <= len(data) * (1 - MIN_SAVING):
+            target.write_bytes(packed)
+            written.append(encoding)
+        elif target.exists():
+            target.unlink()
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Hashed static files with precompressed siblings.
+
+    Not strict: a ``{% static %}`` reference missing from the manifest falls
+    back to the plain name instead of failing the page.
+    """
+
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = []
+        for name, hashed_name, done in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(done, Exception):
+                processed += [name, hashed_name]
+            yield name, hashed_name, done
+        if dry_run:
+            return
+        for name in processed:
+            compress_file(self.path(name))
+
+
+class StaticFile:
+    """One file below ``STATIC_ROOT`` with its precompressed variants."""
+
+    __slots__ = ('variants', 'content_type', 'cache_control')
+
+    def __init__(self, path, immutable, max_age=None):
+        self.content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'application/json'):
+            self.content_type += '; charset=utf-8'
+        if immutable:
+            max_age = IMMUTABLE_MAX_AGE
+        elif max_age is None:
+            max_age = getattr(settings, 'STATIC_MAX_AGE', DEFAULT_MAX_AGE)
+        self.cache_control = f'public, max-age={max_age}' + (', immutable' if immutable else '')
+        # {encoding: [path, size, etag, body or None]}
+        self.variants = {}
+        for encoding, suffix in ENCODINGS + ((None, ''),):
+            variant = path.with_name(path.name + suffix)
+            if variant.is_file():
+                stat = variant.stat()
+                etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}{suffix}"'
+                self.variants[encoding] = [variant, stat.st_size, etag, None]
+
+    def choose(self, accept_encoding):
+        for encoding, _ in ENCODINGS:
+            if encoding in self.variants and encoding in accept_encoding:
+                return encoding, self.variants[encoding]
+        return None, self.variants[None]
+
+
+def _header(scope, name):
+    for key, value in scope.get('headers', ()):
+        if key == name:
+            return value.decode('latin-1')
+    return ''
+
+
+class PrecompressedStaticFiles:
+    """ASGI wrapper serving ``STATIC_URL`` from ``STATIC_ROOT``, precompressed."""
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.root = Path(root or settings.STATIC_ROOT).resolve()
+        self.prefix = prefix or settings.STATIC_URL
+        self._files = {}
+        self._hashed = None
+
+    def _hashed_names(self):
+        if self._hashed is None:
+            try:
+                with open(self.root / ManifestStaticFilesStorage.manifest_name, encoding='utf-8') as f:
+                    self._hashed = frozenset(json.load(f).get('paths', {}).values())
+            except (OSError, ValueError):
+                self._hashed = frozenset()
+        return self._hashed
+
+    def lookup(self, name):
+        """Return the ``StaticFile`` for a URL path below the prefix, or None."""
+        static = self._files.get(name)
+        if static is None:
+            # Misses are not cached, unknown paths must not grow the cache
+            path = (self.root / name).resolve()
+            if not path.is_relative_to(self.root) or not path.is_file() or name.endswith(('.gz', '.br')):
+                return None
+            static = self._files[name] = StaticFile(path, name in self._hashed_names())
+        return static
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get('path', '')
+        if scope['type'] != 'http' or not path.startswith(self.prefix) or scope['method'] not in ('GET', 'HEAD'):
+            await self.application(scope, receive, send)
+            return
+        static = self.lookup(path[len(self.prefix):])
+        if static is None:
+            await self.application(scope, receive, send)
+            return
+
+        encoding, (file_path, size, etag, body) = static.choose(_header(scope, b'accept-encoding'))
+        headers = [
+            (b'cache-control', static.cache_control.encode()),
+            (b'etag', etag.encode()),
+            (b'vary', b'Accept-Encoding'),
+        ]
+        if etag in _header(scope, b'if-none-match'):
+            await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        headers += [(b'content-type', static.content_type.encode()), (b'content-length', str(size).encode())]
+        if encoding is not None:
+            headers.append((b'content-encoding', encoding.encode()))
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        if scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+        elif size <= MEMORY_CACHE_LIMIT:
+            if body is None:
+                body = static.variants[encoding][3] = await asyncio.to_thread(file_path.read_bytes)
+            await send({'type': 'http.response.body', 'body': body})
+        else:
+            await self._stream(file_path, send)
+
+    async def _stream(self, file_path, send):
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, CHUNK_SIZE)
+                more = len(chunk) == CHUNK_SIZE
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': more})
+                if not more:
+                    break
+
+
+class MediaFiles(PrecompressedStaticFiles):
+    """ASGI wrapper serving ``MEDIA_URL`` from ``MEDIA_ROOT``; uploads change, nothing is cached."""
+
+    def __init__(self, application, root=None, prefix=None):
+        super().__init__(application, root or settings.MEDIA_ROOT, prefix or settings.MEDIA_URL)
+
+    def lookup(self, name):
+        path = (self.root / name).resolve()
+        if not path.is_relative_to(self.root) or not path.is_file():
+            return None
+        return StaticFile(path, False, getattr(settings, 'MEDIA_MAX_AGE', DEFAULT_MAX_AGE))
+
+
+def render_benchmark(template_names, repeat=50, context=None):
+    """Return ``[(template, plain_ms, cached_ms)]``, the mean time to load and render each template.
+
+    Plain loaders read and compile the template on every render; the cached
+    loader compiles it once (the warm-up render is not counted).
+    """
+    base = engines['django'].engine
+    options = dict(dirs=base.dirs, libraries=base.libraries, builtins=base.builtins, debug=False)
+    plain = Engine(loaders=PLAIN_LOADERS, **options)
+    cached = Engine(loaders=CACHED_LOADERS, **options)
+
+    def mean_ms(engine, name):
+        engine.get_template(name).render(Context(context or {}))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            engine.get_template(name).render(Context(context or {}))
+        return (time.perf_counter() - start) * 1000 / repeat
+
+    return [(name, mean_ms(plain, name), mean_ms(cached, name)) for name in template_names]
+
+
+def play_templates():
+    """Names of the games' play page templates."""
+    root = Path(settings.BASE_DIR) / 'templates'
+    return sorted(os.path.relpath(path, root) for path in root.glob('*/play.html'))
@@ -15,11 +15,10 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'your_default_secret_key_for_dev')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DJANGO_DEBUG=0 switches to the production serving profile (see games_website/serving.py)
+DEBUG = os.environ.get('DJANGO_DEBUG', '1').lower() in ('1', 'true', 'yes')
 
-ALLOWED_HOSTS = [
-    "*"
-]
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', '*').split(',')
 
 INSTALLED_APPS = [
     'daphne',  # Put daphne FIRST - this is key!
@@ -42,16 +41,23 @@ INSTALLED_APPS = [
     'channels',
     'clue_rush.apps.ClueRushConfig',
     'sorting_ladder.apps.SortingLadderConfig',
+    'game_archive.apps.GameArchiveConfig',
+    'question_import.apps.QuestionImportConfig',
 ]
 
 MIDDLEWARE = [
+    'games_hub.metrics.metrics_middleware',
+    'games_hub.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Must stay last: it answers profiled sync views itself (see games_hub/profiling.py)
+    'games_hub.profiling.ProfilingViewMiddleware',
 ]
 
 ROOT_URLCONF = 'games_website.urls'
@@ -67,10 +73,21 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'games_hub.context_processors.wire',
             ],
         },
     },
 ]
+if not DEBUG:
+    # Compile every template once per process
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove('django.template.context_processors.debug')
 
 WSGI_APPLICATION = 'games_website.wsgi.application'
 ASGI_APPLICATION = 'games_website.asgi.application'
@@ -119,14 +136,135 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    'games_website.assets.AssetFinder',
+]
+# Game page scripts and styles, bundled and minified on demand (see games_website/assets.py)
+ASSET_SOURCE_DIR = BASE_DIR / 'assets'
+ASSET_BUILD_DIR = Path(os.environ.get('ASSET_BUILD_DIR', BASE_DIR / 'build' / 'assets'))
+ASSET_MINIFY = os.environ.get('ASSET_MINIFY', '0' if DEBUG else '1').lower() in ('1', 'true', 'yes')
+# Production: content-hashed, precompressed files served by games_website/serving.py;
+# hashed names are cached for a year, other static files for STATIC_MAX_AGE seconds
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', 60))
+if not DEBUG:
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'games_website.serving.CompressedManifestStaticFilesStorage'},
+    }
+
+# Offline map tiles for the "Where is this?" maps (see games_website/tiles.py).
+# Only what `manage.py seed_tiles` stored is served; MAP_TILE_FETCH_MISSING=1
+# fetches missing tiles from MAP_TILE_UPSTREAM, whose usage policy must allow it
+MAP_TILE_STORE = Path(os.environ.get('MAP_TILE_STORE', BASE_DIR / 'tiles' / 'osm.mbtiles'))
+MAP_TILE_UPSTREAM = os.environ.get('MAP_TILE_UPSTREAM', 'https://tile.openstreetmap.org/{z}/{x}/{y}.png')
+MAP_TILE_FETCH_MISSING = os.environ.get('MAP_TILE_FETCH_MISSING', '0').lower() in ('1', 'true', 'yes')
+MAP_TILE_MAX_AGE = int(os.environ.get('MAP_TILE_MAX_AGE', 7 * 24 * 60 * 60))
+# Regions `seed_tiles` seeds without --bbox: (name, (west, south, east, north), min zoom, max zoom).
+# None by default; list only the areas the questions show
+MAP_TILE_REGIONS = []
+
+# Vendored front-end files missing from static/vendor/ fall back to their CDN
+# with a warning instead of failing the checks (see games_website/vendor.py)
+VENDOR_CDN_FALLBACK = os.environ.get('VENDOR_CDN_FALLBACK', '1' if DEBUG else '0').lower() in ('1', 'true', 'yes')
+
+# Reveal heatmap of the "Where is this?" guesses (see where_is_this/guesses.py)
+WHERE_GUESS_CELL_DEGREES = float(os.environ.get('WHERE_GUESS_CELL_DEGREES', 2.0))
+WHERE_GUESS_CLOSEST = int(os.environ.get('WHERE_GUESS_CLOSEST', 3))
 
 # Media files (user uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Production serves them from the ASGI app for MEDIA_MAX_AGE seconds (see games_website/serving.py)
+MEDIA_MAX_AGE = int(os.environ.get('MEDIA_MAX_AGE', 60))
+
+# Online SQLite snapshots (see games_website/backup.py)
+DB_SNAPSHOT_DIR = Path(os.environ.get('DB_SNAPSHOT_DIR', BASE_DIR / 'snapshots'))
+
+# Lifetime of signed participant tokens in seconds (see games_hub/tokens.py)
+PARTICIPANT_TOKEN_MAX_AGE = int(os.environ.get('PARTICIPANT_TOKEN_MAX_AGE', 24 * 60 * 60))
+
+# Room events kept per room for reconnecting clients (see games_hub/replay.py)
+ROOM_REPLAY_BUFFER_SIZE = int(os.environ.get('ROOM_REPLAY_BUFFER_SIZE', 256))
+
+# Longest hold of a long-polled participant status request (see games_hub/status.py)
+STATUS_LONG_POLL_TIMEOUT = int(os.environ.get('STATUS_LONG_POLL_TIMEOUT', 25))
+
+# Presence: seconds until an open socket counts as idle, and between DB flushes (see games_hub/presence.py)
+PRESENCE_IDLE_AFTER = int(os.environ.get('PRESENCE_IDLE_AFTER', 60))
+PRESENCE_FLUSH_INTERVAL = int(os.environ.get('PRESENCE_FLUSH_INTERVAL', 30))
+
+# Offer the msgpack WebSocket sub-protocol from play pages; append frames to a capture file for wire_compare (see games_hub/wire.py)
+WEBSOCKET_MSGPACK = os.environ.get('WEBSOCKET_MSGPACK', '').lower() in ('1', 'true', 'yes')
+WEBSOCKET_CAPTURE_FILE = os.environ.get('WEBSOCKET_CAPTURE_FILE') or None
+
+# Largest accepted WebSocket frame in bytes; per-type rate limits live in games_hub/guard.py
+WEBSOCKET_MAX_FRAME_BYTES = int(os.environ.get('WEBSOCKET_MAX_FRAME_BYTES', 16 * 1024))
+
+# Bearer token for scraping /metrics without a staff login (see games_hub/metrics.py)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+
+# Structured logging through a background queue (see games_hub/logs.py);
+# LOG_LEVEL_<APP> overrides LOG_LEVEL per app, DEBUG records are sampled 1 in LOG_SAMPLE_EVERY
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_SAMPLE_EVERY = int(os.environ.get('LOG_SAMPLE_EVERY', 100))
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'context': {'()': 'games_hub.logs.ContextFilter'},
+        'sample': {'()': 'games_hub.logs.SampleFilter', 'every': LOG_SAMPLE_EVERY},
+    },
+    'formatters': {
+        'json': {'()': 'games_hub.logs.JsonFormatter'},
+    },
+    'handlers': {
+        'queue': {
+            '()': 'games_hub.logs.QueueLogHandler',
+            'stream': 'ext://sys.stderr',
+            'filters': ['context', 'sample'],
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        app: {
+            'handlers': ['queue'],
+            'level': os.environ.get(f'LOG_LEVEL_{app.upper()}', LOG_LEVEL),
+            'propagate': False,
+        }
+        for app in (
+            'games_hub', 'games_website', 'admin_dashboard', 'QuizGame', 'Assign', 'Estimation',
+            'where_is_this', 'who_is_lying', 'who_is_that', 'black_jack_quiz', 'clue_rush', 'sorting_ladder',
+        )
+    },
+}
+
+# Profiles kept for the admin profiling page and the stack sampling interval in seconds (see games_hub/profiling.py)
+PROFILING_BUFFER_SIZE = int(os.environ.get('PROFILING_BUFFER_SIZE', 20))
+PROFILING_SAMPLE_INTERVAL = float(os.environ.get('PROFILING_SAMPLE_INTERVAL', 0.001))
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache - room state versions and room ids of the status endpoints must be
+# shared by all workers (see games_hub/status.py); the per-process memory
+# cache only serves the single development server
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379')
+if DEBUG:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
 # Channel Layers - Simple Redis setup
 if DEBUG:
     CHANNEL_LAYERS = {
@@ -0,0 +1,18 @@
+from django import template
+from django.urls import reverse
+
+from games_website.vendor import vendor_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor(name):
+    """URL of a self-hosted third-party file (see games_website/vendor.py)."""
+    return vendor_url(name)
+
+
+@register.simple_tag
+def map_tile_url():
+    """Leaflet URL template of the local tile cache (see games_website/tiles.py)."""
+    return reverse('map_tile', args=(0, 0, 0)).replace('/0/0/0.png', '/{z}/{x}/{y}.png')
@@ -0,0 +1,446 @@
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from Estimation.models import EstimationAnswer, EstimationParticipant, EstimationQuestion, EstimationQuiz
+from games_website.assets import AssetFinder, minify_css, minify_js
+from games_website.backup import find_snapshot, list_snapshots, restore_snapshot, take_snapshot
+from games_website.cleanup import chunked_delete, get_job, start_cleanup
+from games_website.export import iter_export
+from games_website import tiles, vendor
+from games_website.serving import MediaFiles, PrecompressedStaticFiles, compress_file, play_templates, render_benchmark
+
+
+class SnapshotServiceTest(SimpleTestCase):
+    """Online-Snapshots über die SQLite-Backup-API."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.db_path = self.root / 'live.sqlite3'
+        self.snapshot_dir = self.root / 'snapshots'
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)')
+            conn.executemany('INSERT INTO item (name) VALUES (?)', [(f'row {i}',) for i in range(500)])
+
+    def _snapshot(self, **kwargs):
+        return take_snapshot(
+            database_path=self.db_path,
+            snapshot_dir=self.snapshot_dir,
+            label='test',
+            compression='gzip',
+            pages=2,
+            step_delay=0,
+            **kwargs,
+        )
+
+    def _row_count(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT COUNT(*) FROM item').fetchone()[0]
+
+    def test_unchanged_database_is_not_stored_twice(self):
+        """Ohne Änderungen wird kein zweiter Snapshot abgelegt."""
+        first = self._snapshot()
+        second = self._snapshot()
+        self.assertEqual(first['file'], second['file'])
+        self.assertTrue(second.get('unchanged'))
+        self.assertEqual(len(list_snapshots(self.snapshot_dir, label='test')), 1)
+
+    def test_retention_keeps_newest(self):
+        """Ältere Snapshots über 'keep' hinaus werden entfernt."""
+        for i in range(3):
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('INSERT INTO item (name) VALUES (?)', (f'extra {i}',))
+            self._snapshot(keep=2)
+        entries = list_snapshots(self.snapshot_dir, label='test')
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(len(list(self.snapshot_dir.glob('test-*'))), 2)
+
+    def test_restore_round_trip(self):
+        """Wiederherstellen setzt die Datenbank auf den Snapshot-Stand zurück."""
+        self._snapshot()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM item')
+        self.assertEqual(self._row_count(), 0)
+
+        restore_snapshot(find_snapshot(self.snapshot_dir, label='test'), database_path=self.db_path)
+        self.assertEqual(self._row_count(), 500)
+
+
+class ChunkedDeleteTest(TestCase):
+    """Löschen in kleinen Blöcken über den Cascade-Graphen."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = EstimationQuiz.objects.create(title='Aufräumen', creator=user)
+        questions = [
+            EstimationQuestion.objects.create(question_text=f'Frage {i}', correct_answer=i, created_by=user)
+            for i in range(3)
+        ]
+        for i in range(5):
+            player = EstimationParticipant.objects.create(quiz=self.quiz, name=f'Spieler {i}')
+            for question in questions:
+                EstimationAnswer.objects.create(quiz=self.quiz, participant=player, question=question, user_answer=1)
+
+    def test_cascade_is_deleted_in_chunks(self):
+        """Spiel, Teilnehmer und Antworten verschwinden; Fortschritt wird je Block gemeldet."""
+        reported = []
+        counts = chunked_delete(
+            EstimationQuiz.objects.filter(id=self.quiz.id),
+            chunk_size=2,
+            pause=0,
+            progress=lambda label, n: reported.append((label, n)),
+        )
+        self.assertFalse(EstimationQuiz.objects.exists())
+        self.assertFalse(EstimationParticipant.objects.exists())
+        self.assertFalse(EstimationAnswer.objects.exists())
+        self.assertEqual(counts['Estimation.EstimationAnswer'], 15)
+        self.assertEqual(counts['Estimation.EstimationParticipant'], 5)
+        # No chunk deletes more than chunk_size rows of its own model
+        self.assertTrue(all(n <= 2 for _, n in reported))
+        self.assertEqual(EstimationQuestion.objects.count(), 3)
+
+    def test_job_progress_is_kept_in_the_cache(self):
+        """Der Fortschritt eines Aufräum-Jobs liegt im gemeinsamen Cache, nicht im Prozess."""
+        with self.captureOnCommitCallbacks(execute=True):
+            job_id = start_cleanup('Leer', [])
+        self.assertEqual(cache.get(f'games_website:cleanup-job:{job_id}')['label'], 'Leer')
+        deadline = time.monotonic() + 5
+        while get_job(job_id)['status'] != 'done' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(get_job(job_id)['status'], 'done')
+        self.assertIsNotNone(get_job(job_id)['finished_at'])
+        self.assertIsNone(get_job('unbekannt'))
+
+
+class ResultExportTest(TestCase):
+    """Streaming-Export der Ergebnisse als CSV/JSONL."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', password='pw', is_staff=True)
+        quiz = EstimationQuiz.objects.create(title='Export', creator=self.admin)
+        question = EstimationQuestion.objects.create(question_text='Wie viele?', correct_answer=10, created_by=self.admin)
+        for i, code in enumerate(('EXP1', 'EXP1', 'OTHER')):
+            player = EstimationParticipant.objects.create(quiz=quiz, name=f'Spieler {i}', hub_session_code=code)
+            EstimationAnswer.objects.create(quiz=quiz, participant=player, question=question, user_answer=9)
+
+    def test_csv_filtered_by_session(self):
+        """CSV enthält Kopfzeile und nur die Antworten der gewählten Session."""
+        data = b''.join(iter_export('csv', 'answers', session_code='EXP1')).decode('utf-8')
+        rows = list(csv.DictReader(io.StringIO(data)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['game'], 'estimation')
+        self.assertEqual(rows[0]['question'], 'Wie viele?')
+        self.assertEqual(json.loads(rows[0]['answer']), {'user_answer': 9.0})
+
+    def test_gzipped_jsonl_endpoint(self):
+        """Der Endpunkt streamt gzip-komprimiertes JSONL mit Teilnehmerzeilen."""
+        self.client.force_login(self.admin)
+        resp = self.client.get(reverse('admin_dashboard:export_results'), {
+            'format': 'jsonl', 'kind': 'participants', 'game': 'estimation', 'gzip': '1',
+        })
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        lines = gzip.decompress(b''.join(resp.streaming_content)).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual({json.loads(line)['session_code'] for line in lines}, {'EXP1', 'OTHER'})
+
+    def test_invalid_parameters_are_rejected(self):
+        """Unbekannte Formate oder Daten liefern 400 statt eines abgebrochenen Streams."""
+        self.client.force_login(self.admin)
+        resp = self.client.get(reverse('admin_dashboard:export_results'), {'format': 'xml'})
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.get(reverse('admin_dashboard:export_results'), {'since': 'gestern'})
+        self.assertEqual(resp.status_code, 400)
+
+
+class ProductionServingTest(SimpleTestCase):
+    """Gehashte, vorkomprimierte statische Dateien, Conditional GET und Render-Benchmark."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+
+    def _get(self, app, path, headers=()):
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'headers': list(headers), 'query_string': b''}
+        async_to_sync(app)(scope, receive, send)
+        return sent[0]['status'], dict(sent[0]['headers']), b''.join(m.get('body', b'') for m in sent[1:])
+
+    def test_compress_file_skips_small_files(self):
+        (self.root / 'app.js').write_text('let x = 1;\n' * 200)
+        (self.root / 'tiny.js').write_text('x')
+        self.assertIn('gzip', compress_file(self.root / 'app.js'))
+        self.assertEqual(compress_file(self.root / 'tiny.js'), [])
+        self.assertEqual(gzip.decompress((self.root / 'app.js.gz').read_bytes()), (self.root / 'app.js').read_bytes())
+        self.assertFalse((self.root / 'tiny.js.gz').exists())
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        storages = {
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'games_website.serving.CompressedManifestStaticFilesStorage'},
+        }
+        with override_settings(STATIC_ROOT=self.root / 'static', STORAGES=storages, ASSET_BUILD_DIR=self.root / 'build'):
+            call_command('collectstatic', interactive=False, verbosity=0)
+        manifest = json.loads((self.root / 'static' / 'staticfiles.json').read_text())
+        hashed = manifest['paths']['js/play.js']
+        self.assertNotEqual(hashed, 'js/play.js')
+        self.assertTrue((self.root / 'static' / (hashed + '.gz')).exists())
+
+    def test_static_app_serves_precompressed_and_immutable_files(self):
+        body = b'body { color: red; }\n' * 100
+        (self.root / 'theme.abc123.css').write_bytes(body)
+        compress_file(self.root / 'theme.abc123.css')
+        (self.root / 'staticfiles.json').write_text(json.dumps({'paths': {'theme.css': 'theme.abc123.css'}}))
+
+        async def fallback(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        app = PrecompressedStaticFiles(fallback, root=self.root, prefix='/static/')
+        status, headers, content = self._get(app, '/static/theme.abc123.css', [(b'accept-encoding', b'gzip, deflate')])
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'content-encoding'], b'gzip')
+        self.assertIn(b'immutable', headers[b'cache-control'])
+        self.assertEqual(gzip.decompress(content), body)
+
+        status, headers, content = self._get(app, '/static/theme.abc123.css')
+        self.assertNotIn(b'content-encoding', headers)
+        self.assertEqual(content, body)
+
+        status, _, content = self._get(app, '/static/theme.abc123.css', [(b'if-none-match', headers[b'etag'])])
+        self.assertEqual((status, content), (304, b''))
+        self.assertEqual(self._get(app, '/static/../tests.py')[0], 404)
+        self.assertEqual(self._get(app, '/static/theme.abc123.css.gz')[0], 404)
+
+    def test_media_app_serves_uploads_without_caching_them(self):
+        """Hochgeladene Bilder kommen ohne DEBUG aus MEDIA_ROOT, nie immutable und nach Austausch neu."""
+        (self.root / 'who_that').mkdir()
+        (self.root / 'who_that' / 'face.png').write_bytes(b'first')
+
+        async def fallback(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        app = MediaFiles(fallback, root=self.root, prefix='/media/')
+        with self.settings(MEDIA_MAX_AGE=30):
+            status, headers, content = self._get(app, '/media/who_that/face.png')
+        self.assertEqual((status, content), (200, b'first'))
+        self.assertEqual(headers[b'cache-control'], b'public, max-age=30')
+        self.assertEqual(headers[b'content-type'], b'image/png')
+
+        (self.root / 'who_that' / 'face.png').write_bytes(b'second')
+        self.assertEqual(self._get(app, '/media/who_that/face.png')[2], b'second')
+        self.assertEqual(self._get(app, '/media/../tests.py')[0], 404)
+        self.assertEqual(self._get(app, '/media/missing.png')[0], 404)
+
+    def test_rendered_pages_answer_conditional_get(self):
+        response = self.client.get('/')
+        self.assertTrue(response.has_header('ETag'))
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_render_benchmark_covers_play_templates(self):
+        names = play_templates()
+        self.assertIn('quiz/play.html', names)
+        rows = render_benchmark(names[:1], repeat=1)
+        self.assertEqual(rows[0][0], names[0])
+        self.assertGreater(rows[0][1], 0)
+        self.assertGreater(rows[0][2], 0)
+
+
+class AssetPipelineTest(SimpleTestCase):
+    """Gebündelte, minifizierte Skripte und Styles der Spielseiten."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+
+    def test_minify_js_keeps_strings_templates_and_regexes(self):
+        source = (
+            "// header\n"
+            "const a = 'x // not a comment';\n"
+            "    const b = `line ${a + `nested ${'}'}`}\n    /* kept */`;\n\n"
+            "/* block\n comment */\n"
+            "const re = /[/]\\/* y/g;\n"
+            "const c = a.length / 2 / 1\n"
+            "return c\n"
+        )
+        self.assertEqual(minify_js(source), (
+            "const a = 'x // not a comment';\n"
+            "const b = `line ${a + `nested ${'}'}`}\n    /* kept */`;\n"
+            "const re = /[/]\\/* y/g;\n"
+            "const c = a.length / 2 / 1\n"
+            "return c\n"
+        ))
+
+    def test_minify_css_keeps_strings(self):
+        source = '/* note */\n.a ,\n.b {\n    color: red;\n    content: "a ;  b";\n}\n'
+        self.assertEqual(minify_css(source), '.a,.b{color: red;content: "a ;  b"}\n')
+
+    def test_finder_builds_bundles_and_rebuilds_stale_outputs(self):
+        sources = self.root / 'assets'
+        (sources / 'js' / 'runtime').mkdir(parents=True)
+        (sources / 'js' / 'wire.js').write_text('var wire = 1;\n')
+        (sources / 'js' / 'runtime' / 'player.js').write_text('var player = 2;\n')
+        (sources / 'js' / 'runtime' / 'monitor.js').write_text('var monitor = 3;\n')
+        (sources / 'js' / 'page.js').write_text('// page\nvar page = 4;\n')
+        with override_settings(ASSET_SOURCE_DIR=sources, ASSET_BUILD_DIR=self.root / 'build', ASSET_MINIFY=True):
+            finder = AssetFinder()
+            bundle = Path(finder.find('js/play.js'))
+            self.assertEqual(bundle.read_text(), 'var wire = 1;\nvar player = 2;\n')
+            self.assertEqual(Path(finder.find('js/page.js')).read_text(), 'var page = 4;\n')
+            self.assertEqual(finder.find('js/runtime/player.js'), [])
+            self.assertEqual(
+                sorted(name for name, _ in finder.list([])),
+                ['js/monitor.js', 'js/page.js', 'js/play.js'],
+            )
+
+            (sources / 'js' / 'wire.js').write_text('var wire = 5;\n')
+            stat = bundle.stat()
+            os.utime(sources / 'js' / 'wire.js', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertEqual(Path(finder.find('js/play.js')).read_text(), 'var wire = 5;\nvar player = 2;\n')
+
+    def test_game_pages_load_bundles_instead_of_inline_code(self):
+        with override_settings(ASSET_BUILD_DIR=self.root / 'build'):
+            play = render_to_string('quiz/play.html', {})
+            monitor = render_to_string('admin_dashboard/quiz_monitor.html', {})
+        self.assertIn('window.GAME_PAGE', play)
+        self.assertIn('/static/js/play.js', play)
+        self.assertIn('/static/js/games/quiz.js', play)
+        self.assertIn('window.MONITOR_PAGE', monitor)
+        self.assertIn('/static/js/monitor.js', monitor)
+        self.assertIn('/static/css/monitors/quiz.css', monitor)
+        self.assertNotIn('class WhereMonitor', monitor)
+
+
+class VendorAssetTest(SimpleTestCase):
+    """Selbst gehostete Drittanbieter-Dateien mit CDN-Fallback."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        for clear in (vendor.vendor_url.cache_clear, finders.get_finder.cache_clear):
+            clear()
+            self.addCleanup(clear)
+
+    def test_vendor_url_prefers_local_copy(self):
+        with override_settings(STATICFILES_DIRS=[self.root], VENDOR_CDN_FALLBACK=True):
+            self.assertEqual(vendor.vendor_url('bootstrap.css'), vendor.VENDOR_ASSETS['bootstrap.css'][1])
+            target = self.root / vendor.VENDOR_ASSETS['bootstrap.css'][0]
+            target.parent.mkdir(parents=True)
+            target.write_text('body {}')
+            vendor.vendor_url.cache_clear()
+            finders.get_finder.cache_clear()
+            self.assertEqual(vendor.vendor_url('bootstrap.css'), '/static/vendor/bootstrap/bootstrap.min.css')
+
+    def test_missing_files_fail_without_cdn_fallback(self):
+        """Ohne CDN-Fallback scheitern Systemprüfung und Template-Tag an fehlenden Dateien."""
+        with override_settings(STATICFILES_DIRS=[self.root], VENDOR_CDN_FALLBACK=False):
+            self.assertEqual([e.id for e in vendor.check_vendor_assets()], ['games_website.E001'])
+            with self.assertRaises(ImproperlyConfigured):
+                vendor.vendor_url('leaflet.js')
+            for path, _ in vendor.VENDOR_ASSETS.values():
+                (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+                (self.root / path).write_bytes(b'x')
+            finders.get_finder.cache_clear()
+            self.assertEqual(vendor.check_vendor_assets(), [])
+            self.assertEqual(vendor.vendor_url('leaflet.js'), '/static/vendor/leaflet/leaflet.js')
+        with override_settings(STATICFILES_DIRS=[Path(self.tmp.name) / 'leer'], VENDOR_CDN_FALLBACK=True):
+            finders.get_finder.cache_clear()
+            self.assertEqual({e.id for e in vendor.check_vendor_assets()}, {'games_website.W001'})
+
+    def test_download_stores_font_files_next_to_stylesheet(self):
+        css = "@font-face { src: url(https://fonts.gstatic.com/s/inter/v13/abc.woff2) format('woff2'); }"
+        files = {vendor.VENDOR_ASSETS['inter.css'][1]: css.encode(), 'https://fonts.gstatic.com/s/inter/v13/abc.woff2': b'font'}
+        with mock.patch.object(vendor, 'vendor_dir', return_value=self.root), \
+                mock.patch.object(vendor, '_download', side_effect=files.__getitem__):
+            written = vendor.download(['inter.css'])
+        self.assertEqual(len(written), 2)
+        self.assertIn('url(inter/abc.woff2)', (self.root / 'vendor' / 'fonts' / 'inter.css').read_text())
+        self.assertEqual((self.root / 'vendor' / 'fonts' / 'inter' / 'abc.woff2').read_bytes(), b'font')
+
+
+class MapTileCacheTest(SimpleTestCase):
+    """Lokaler Kachel-Cache für die Karten von "Where is this?"."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = Path(self.tmp.name) / 'tiles.mbtiles'
+        override = override_settings(MAP_TILE_STORE=self.store, MAP_TILE_FETCH_MISSING=False)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_tiles_in_covers_bbox(self):
+        self.assertEqual(tiles.count_tiles([('world', (-180, -85, 180, 85), 0, 2)]), 1 + 4 + 16)
+        self.assertEqual(list(tiles.tiles_in((2.2, 48.8, 2.4, 48.9), 5, 5)), [(5, 16, 11)])
+
+    def test_seed_skips_stored_tiles(self):
+        fetched = []
+
+        def fetch_tile(z, x, y):
+            fetched.append((z, x, y))
+            return b'png %d' % z
+
+        regions = [('world', (-180, -85, 180, 85), 0, 1)]
+        self.assertEqual(tiles.seed(regions, fetch_tile=fetch_tile), (5, 0, 0))
+        self.assertEqual(tiles.seed(regions, fetch_tile=fetch_tile), (0, 5, 0))
+        self.assertEqual(len(fetched), 5)
+        store = tiles.TileStore(self.store)
+        self.addCleanup(store.close)
+        self.assertEqual(store.get(1, 1, 0), b'png 1')
+        # MBTiles zählt Zeilen von Süden
+        self.assertEqual(store.connection.execute('SELECT tile_row FROM tiles WHERE zoom_level = 1 AND tile_column = 1').fetchall(), [(0,), (1,)])
+
+    def test_tile_endpoint_serves_stored_tiles_with_cache_headers(self):
+        tiles.seed([('point', (2.3, 48.85, 2.3, 48.85), 3, 3)], fetch_tile=lambda z, x, y: b'tile')
+        x, y = tiles.tile_xy(2.3, 48.85, 3)
+        response = self.client.get(reverse('map_tile', args=(3, x, y)))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'tile')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertIn('max-age=', response['Cache-Control'])
+        self.assertEqual(self.client.get(reverse('map_tile', args=(3, 0, 0))).status_code, 404)
+        self.assertEqual(self.client.get(reverse('map_tile', args=(3, 8, 0))).status_code, 404)
+
+    def test_seeding_needs_an_explicit_region(self):
+        """Ohne --bbox und ohne MAP_TILE_REGIONS wird nichts geladen."""
+        with override_settings(MAP_TILE_REGIONS=[]), mock.patch.object(tiles, 'fetch') as fetch:
+            with self.assertRaises(CommandError):
+                call_command('seed_tiles', stdout=io.StringIO())
+        fetch.assert_not_called()
+
+    def test_missing_tiles_are_fetched_once_when_allowed(self):
+        with override_settings(MAP_TILE_FETCH_MISSING=True), \
+                mock.patch.object(tiles, 'fetch', return_value=b'upstream') as fetch:
+            self.assertEqual(tiles.get_tile(2, 1, 1), b'upstream')
+            self.assertEqual(tiles.get_tile(2, 1, 1), b'upstream')
+        fetch.assert_called_once_with(2, 1, 1)
@@ -0,0 +1,183 @@
+"""Local map tile cache for the "Where is this?" maps.
+
+The maps load their tiles from ``/tiles/<z>/<x>/<y>.png`` on this server
+instead of ``tile.openstreetmap.org``. Tiles live in one SQLite file in
+the MBTiles layout (``MAP_TILE_STORE``):
+
+* ``python manage.py seed_tiles`` fills it ahead of the event for a
+  ``--bbox`` and zoom range, or the regions in ``MAP_TILE_REGIONS`` (none
+  by default), so a seeded store serves every phone from the LAN;
+* a tile missing from the store is answered with 404 and the map shows a
+  gap; only with ``MAP_TILE_FETCH_MISSING`` on is it fetched once from
+  ``MAP_TILE_UPSTREAM`` and kept.
+
+Seed only what the games need: the public OpenStreetMap servers do not
+allow bulk downloads (zoom 0-6 of the world is about 5,500 tiles), so
+larger areas need an upstream whose usage policy allows seeding.
+"""
+import math
+import sqlite3
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+
+
+DEFAULT_UPSTREAM = 'https://tile.openstreetmap.org/{z}/{x}/{y}.png'
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+MAX_ZOOM = 19
+# Web Mercator stops at this latitude
+MAX_LATITUDE = 85.0511
+USER_AGENT = 'games-website-tile-cache/1.0'
+TIMEOUT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tiles (
+    zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB,
+    PRIMARY KEY (zoom_level, tile_column, tile_row)
+);
+"""
+
+_local = threading.local()
+
+
+def store_path():
+    return Path(getattr(settings, 'MAP_TILE_STORE', Path(settings.BASE_DIR) / 'tiles' / 'osm.mbtiles'))
+
+
+class TileStore:
+    """Tiles of one MBTiles file, addressed in XYZ (MBTiles rows count from the south)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(
+            "INSERT OR IGNORE INTO metadata (name, value) VALUES ('name', 'games'), ('format', 'png')"
+        )
+        self.connection.commit()
+
+    def get(self, z, x, y):
+        row = self.connection.execute(
+            'SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?',
+            (z, x, (1 << z) - 1 - y),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, z, x, y, data, commit=True):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)',
+            (z, x, (1 << z) - 1 - y, data),
+        )
+        if commit:
+            self.connection.commit()
+
+    def has(self, z, x, y):
+        return self.connection.execute(
+            'SELECT 1 FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?',
+            (z, x, (1 << z) - 1 - y),
+        ).fetchone() is not None
+
+    def count(self):
+        return self.connection.execute('SELECT COUNT(*) FROM tiles').fetchone()[0]
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def local_store():
+    """This thread's connection to ``MAP_TILE_STORE``."""
+    path = store_path()
+    store = getattr(_local, 'store', None)
+    if store is None or store.path != path:
+        store = _local.store = TileStore(path)
+    return store
+
+
+def tile_xy(lon, lat, z):
+    """XYZ tile containing a point."""
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    n = 1 << z
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_in(bbox, min_zoom, max_zoom):
+    """Yield ``(z, x, y)`` of every tile covering ``bbox`` (west, south, east, north)."""
+    west, south, east, north = bbox
+    for z in range(min_zoom, max_zoom + 1):
+        x0, y0 = tile_xy(west, north, z)
+        x1, y1 = tile_xy(east, south, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
+
+
+def fetch(z, x, y):
+    """Download one tile from ``MAP_TILE_UPSTREAM``."""
+    url = getattr(settings, 'MAP_TILE_UPSTREAM', DEFAULT_UPSTREAM).format(z=z, x=x, y=y)
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+        return response.read()
+
+
+def get_tile(z, x, y):
+    """Tile bytes from the store, fetched and stored on a miss if allowed; None if unavailable."""
+    if not (0 <= z <= MAX_ZOOM and 0 <= x < (1 << z) and 0 <= y < (1 << z)):
+        return None
+    store = local_store()
+    data = store.get(z, x, y)
+    if data is None and getattr(settings, 'MAP_TILE_FETCH_MISSING', False):
+        try:
+            data = fetch(z, x, y)
+        except (urllib.error.URLError, OSError):
+            return None
+        store.put(z, x, y, data)
+    return data
+
+
+def seed(regions, fetch_tile=fetch, progress=None, force=False):
+    """Store every tile of ``regions`` (``[(name, bbox, min zoom, max zoom)]``).
+
+    Returns ``(fetched, skipped, failed)``; tiles already in the store are
+    skipped unless ``force``. ``progress(name, done)`` is called per region.
+    """
+    store = TileStore(store_path())
+    fetched = skipped = failed = 0
+    try:
+        for name, bbox, min_zoom, max_zoom in regions:
+            done = 0
+            for z, x, y in tiles_in(bbox, min_zoom, min(max_zoom, MAX_ZOOM)):
+                done += 1
+                if not force and store.has(z, x, y):
+                    skipped += 1
+                    continue
+                try:
+                    store.put(z, x, y, fetch_tile(z, x, y), commit=False)
+                except (urllib.error.URLError, OSError):
+                    failed += 1
+                    continue
+                fetched += 1
+                if fetched % 100 == 0:
+                    store.commit()
+            store.commit()
+            if progress is not None:
+                progress(name, done)
+    finally:
+        store.close()
+    return fetched, skipped, failed
+
+
+def count_tiles(regions):
+    return sum(
+        sum(1 for _ in tiles_in(bbox, min_zoom, min(max_zoom, MAX_ZOOM)))
+        for _, bbox, min_zoom, max_zoom in regions
+    )
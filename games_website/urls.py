@@ -18,6 +18,12 @@ urlpatterns = [
     
     # Home redirect
     path('', views.home_page, name='home'),
+
+    # Prometheus metrics (staff or METRICS_TOKEN)
+    path('metrics', views.metrics, name='metrics'),
+
+    # Map tiles from the local tile cache
+    path('tiles/<int:z>/<int:x>/<int:y>.png', views.map_tile, name='map_tile'),
     
     # Admin dashboard (requires admin access)
     path('admin-dashboard/', include('admin_dashboard.urls')),
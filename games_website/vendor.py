@@ -0,0 +1,145 @@
+"""Self-hosted copies of the third-party front-end files.
+
+``VENDOR_ASSETS`` maps the names used by the ``{% vendor %}`` template tag
+to a file below ``static/vendor/`` and the CDN it was taken from.
+``python manage.py vendor_assets`` downloads them (once, with internet
+access); from then on they are ordinary static files, hashed and
+precompressed like the rest, and the pages load nothing from external
+hosts.
+
+A missing file is an error: ``check_vendor_assets`` fails the startup
+checks and the ``{% vendor %}`` tag raises instead of naming a CDN. Only
+with ``VENDOR_CDN_FALLBACK`` (on with DEBUG) does a missing file still
+point to its CDN, with a warning, so a development checkout keeps working.
+
+Stylesheets that reference other files (Leaflet's images, the font files
+of the Google Fonts stylesheet) are downloaded with them; the font
+stylesheet is rewritten to the local copies.
+"""
+import re
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.templatetags.static import static
+
+
+LEAFLET = 'https://unpkg.com/leaflet@1.9.4/dist/'
+MARKERS = 'https://raw.githubusercontent.com/pointhi/leaflet-color-markers/master/img/'
+
+# name -> (path below STATIC_URL, source URL)
+VENDOR_ASSETS = {
+    'bootstrap.css': ('vendor/bootstrap/bootstrap.min.css',
+                      'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css'),
+    'bootstrap.js': ('vendor/bootstrap/bootstrap.bundle.min.js',
+                     'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js'),
+    'lucide.js': ('vendor/lucide/lucide.js', 'https://unpkg.com/lucide@latest/dist/umd/lucide.js'),
+    'inter.css': ('vendor/fonts/inter.css',
+                  'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap'),
+    'leaflet.css': ('vendor/leaflet/leaflet.css', LEAFLET + 'leaflet.css'),
+    'leaflet.js': ('vendor/leaflet/leaflet.js', LEAFLET + 'leaflet.js'),
+    'marker-red.png': ('vendor/leaflet/markers/marker-icon-red.png', MARKERS + 'marker-icon-red.png'),
+    'marker-green.png': ('vendor/leaflet/markers/marker-icon-green.png', MARKERS + 'marker-icon-green.png'),
+    'marker-shadow.png': ('vendor/leaflet/images/marker-shadow.png', LEAFLET + 'images/marker-shadow.png'),
+}
+
+# Google serves woff2 only to browsers it recognises
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+TIMEOUT = 30
+
+_CSS_URL = re.compile(r'url\((["\']?)([^)"\']+)\1\)')
+
+
+def vendor_dir():
+    return Path(settings.BASE_DIR) / 'static'
+
+
+def _cdn_fallback():
+    return getattr(settings, 'VENDOR_CDN_FALLBACK', settings.DEBUG)
+
+
+def missing_assets():
+    """Names whose file is not in ``static/vendor/`` (or another static directory)."""
+    return [name for name, (path, _) in VENDOR_ASSETS.items() if not finders.find(path)]
+
+
+@lru_cache(maxsize=None)
+def vendor_url(name):
+    """URL of a vendored file; its CDN only if it is missing and ``VENDOR_CDN_FALLBACK`` is on."""
+    path, source = VENDOR_ASSETS[name]
+    if finders.find(path):
+        return static(path)
+    if _cdn_fallback():
+        return source
+    raise ImproperlyConfigured(f"Vendored file {path} is missing; run `manage.py vendor_assets`")
+
+
+def check_vendor_assets(app_configs=None, **kwargs):
+    """System check: every vendored file is present, or the pages would load it from a CDN."""
+    missing = missing_assets()
+    if not missing:
+        return []
+    message = f"Vendored files missing from static/vendor/: {', '.join(missing)}"
+    hint = "Run `python manage.py vendor_assets` and commit static/vendor/."
+    if _cdn_fallback():
+        return [checks.Warning(message, hint=hint + " Until then the pages load them from their CDNs.", id='games_website.W001')]
+    return [checks.Error(message, hint=hint, id='games_website.E001')]
+
+
+def _download(url):
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+        return response.read()
+
+
+def _write(target, data):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+    return len(data)
+
+
+def _fetch_css_references(css, source, target):
+    """Download the files ``css`` references; return the rewritten css and ``[(path, bytes)]``.
+
+    Relative references (Leaflet's images) keep their paths; absolute ones
+    (the font files of Google Fonts) are stored next to the stylesheet.
+    """
+    fetched = []
+
+    def replace(match):
+        quote, ref = match.groups()
+        if ref.startswith('data:'):
+            return match.group(0)
+        if '://' in ref:
+            local = f"{target.stem}/{ref.split('?')[0].rsplit('/', 1)[-1]}"
+        else:
+            local = ref.split('?')[0]
+        path = target.parent / local
+        fetched.append((path, _write(path, _download(urljoin(source, ref)))))
+        return f'url({quote}{local}{quote})'
+
+    return _CSS_URL.sub(replace, css), fetched
+
+
+def download(names=None, force=False):
+    """Download the vendored files; return ``[(path, bytes)]`` of the files written."""
+    root = vendor_dir()
+    written = []
+    for name in names or VENDOR_ASSETS:
+        path, source = VENDOR_ASSETS[name]
+        target = root / path
+        if target.exists() and not force:
+            continue
+        data = _download(source)
+        if target.suffix == '.css':
+            css, fetched = _fetch_css_references(data.decode('utf-8'), source, target)
+            written += fetched
+            data = css.encode('utf-8')
+        written.append((target, _write(target, data)))
+    vendor_url.cache_clear()
+    return written
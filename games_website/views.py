@@ -1,7 +1,37 @@
+import asyncio
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.shortcuts import render
 
+from admin_dashboard.views import is_admin
+from games_hub import metrics as games_metrics
+
+from . import tiles
+
 
 def home_page(request):
 
 
-    return render(request, 'home_page.html')
\ No newline at end of file
+    return render(request, 'home_page.html')
+
+
+async def metrics(request):
+    """Prometheus scrape endpoint (see games_hub/metrics.py)."""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    header = request.headers.get('Authorization', '')
+    scraper = bool(token) and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+    if not scraper and not is_admin(await request.auser()):
+        return HttpResponseForbidden()
+    return HttpResponse(games_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+async def map_tile(request, z, x, y):
+    """Map tile from the local tile cache (see games_website/tiles.py)."""
+    data = await asyncio.to_thread(tiles.get_tile, z, x, y)
+    if data is None:
+        raise Http404('Tile not available')
+    response = HttpResponse(data, content_type='image/png')
+    response['Cache-Control'] = f"public, max-age={getattr(settings, 'MAP_TILE_MAX_AGE', tiles.DEFAULT_MAX_AGE)}"
+    return response
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import ImportedQuestion
+
+
+@admin.register(ImportedQuestion)
+class ImportedQuestionAdmin(admin.ModelAdmin):
+    list_display = ('game_key', 'question_id', 'content_hash', 'source', 'imported_at')
+    list_filter = ('game_key',)
+    search_fields = ('content_hash', 'source')
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class QuestionImportConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'question_import'
+
+    def ready(self):  # noqa: D401
+        from . import signals  # noqa: F401
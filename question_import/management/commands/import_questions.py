@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from games_hub.registry import GAME_TYPES
+from question_import.services import DEFAULT_BATCH_SIZE, QuestionImportError, import_file
+
+
+class Command(BaseCommand):
+    help = "Bulk import questions from a CSV, JSON/JSONL file or a zip archive with images"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV, JSON, JSONL or zip file")
+        parser.add_argument('--game', required=True, choices=sorted(GAME_TYPES), help="Question bank to import into")
+        parser.add_argument('--user', help="Username recorded as creator (default: first superuser)")
+        parser.add_argument('--bundle', help="Add all imported questions to this bundle (created if missing)")
+        parser.add_argument('--dry-run', action='store_true', help="Validate and report without writing anything")
+        parser.add_argument('--skip-invalid', action='store_true', help="Import the valid rows even if some rows fail")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Rows per bulk insert")
+
+    def handle(self, *args, **options):
+        """Delegate to the shared import service."""
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f"File not found: {path}")
+
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('id').first()
+        if user is None:
+            raise CommandError("No user found to record as creator; pass --user")
+
+        try:
+            with open(path, 'rb') as fh:
+                report = import_file(
+                    fh, path.name, options['game'], user,
+                    base_dir=path.parent,
+                    bundle=options['bundle'],
+                    dry_run=options['dry_run'],
+                    skip_invalid=options['skip_invalid'],
+                    batch_size=options['batch_size'],
+                )
+        except QuestionImportError as e:
+            raise CommandError(str(e))
+
+        for error in report.errors:
+            self.stderr.write(f"Row {error['row']}: {'; '.join(error['errors'])}")
+
+        summary = (
+            f"{report.total} rows: {report.created} new, {report.skipped} already imported, "
+            f"{len(report.errors)} invalid"
+        )
+        if report.errors and not options['skip_invalid']:
+            raise CommandError(f"Nothing imported. {summary}")
+        prefix = "Dry run, nothing written. " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(prefix + summary))
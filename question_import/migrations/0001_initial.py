@@ -0,0 +1,38 @@
+# Generated by Django 5.2.11 on 2026-10-19 08:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportedQuestion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("synced", models.BooleanField(default=False)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("game_key", models.CharField(max_length=20)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("question_id", models.BigIntegerField()),
+                ("source", models.CharField(blank=True, max_length=255)),
+                ("imported_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-imported_at"],
+                "unique_together": {("game_key", "content_hash")},
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import models
+from games_website.models import SyncBase
+
+
+class ImportedQuestion(SyncBase):
+    """Content hash of a question created by the bulk importer.
+
+    Re-importing the same file looks rows up by ``(game_key, content_hash)``
+    and skips those that already exist, so imports are idempotent.
+    """
+    game_key = models.CharField(max_length=20)
+    content_hash = models.CharField(max_length=64)
+    question_id = models.BigIntegerField()
+    source = models.CharField(max_length=255, blank=True)
+    imported_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['game_key', 'content_hash']
+        ordering = ['-imported_at']
+
+    def __str__(self):
+        return f"{self.game_key}:{self.question_id} ({self.content_hash[:12]})"
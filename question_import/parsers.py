@@ -0,0 +1,143 @@
+"""Streaming readers for question import files.
+
+Supported inputs are CSV, JSON Lines, JSON (an array, or an object with a
+``questions`` array) and zip archives that contain one of those files plus
+the images it references. CSV and JSON Lines are read row by row; JSON
+arrays are streamed with ``ijson`` when it is installed and loaded in one go
+otherwise.
+"""
+import csv
+import io
+import json
+import posixpath
+import zipfile
+from pathlib import Path
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+
+DATA_SUFFIXES = ('.csv', '.jsonl', '.ndjson', '.json')
+
+
+class ImportFormatError(Exception):
+    """Raised when an import file cannot be read."""
+
+
+def _csv_records(binary):
+    text = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    if not reader.fieldnames:
+        return
+    for record in reader:
+        yield reader.line_num, record
+
+
+def _jsonl_records(binary):
+    text = io.TextIOWrapper(binary, encoding='utf-8-sig')
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            raise ImportFormatError(f"Line {line_no}: invalid JSON ({e})")
+
+
+def _json_records(binary):
+    head = binary.peek(64) if hasattr(binary, 'peek') else b''
+    wrapped = head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'{')
+    if ijson is not None:
+        prefix = 'questions.item' if wrapped else 'item'
+        try:
+            for index, record in enumerate(ijson.items(binary, prefix, use_float=True), start=1):
+                yield index, record
+        except ijson.JSONError as e:
+            raise ImportFormatError(f"Invalid JSON: {e}")
+        return
+
+    try:
+        data = json.load(io.TextIOWrapper(binary, encoding='utf-8-sig'))
+    except ValueError as e:
+        raise ImportFormatError(f"Invalid JSON: {e}")
+    if isinstance(data, dict):
+        data = data.get('questions')
+    if not isinstance(data, list):
+        raise ImportFormatError("JSON must be a list of questions or an object with a 'questions' list")
+    yield from enumerate(data, start=1)
+
+
+def _reader_for(name):
+    suffix = Path(name).suffix.lower()
+    if suffix == '.csv':
+        return _csv_records
+    if suffix in ('.jsonl', '.ndjson'):
+        return _jsonl_records
+    if suffix == '.json':
+        return _json_records
+    raise ImportFormatError(f"Unsupported file type '{suffix or name}'")
+
+
+class ImportSource:
+    """An opened import file: yields ``(row_number, record)`` and resolves images.
+
+    ``fileobj`` must be a binary, seekable file (an uploaded file or an open
+    local file). Images are looked up inside the zip archive next to the
+    data file, or relative to ``base_dir`` for plain files.
+    """
+
+    def __init__(self, fileobj, name, base_dir=None):
+        self.name = name
+        self._zip = None
+        self._image_root = ''
+        self._base_dir = Path(base_dir) if base_dir else None
+
+        if Path(name).suffix.lower() == '.zip':
+            try:
+                self._zip = zipfile.ZipFile(fileobj)
+            except zipfile.BadZipFile as e:
+                raise ImportFormatError(f"Invalid zip archive: {e}")
+            member = self._find_data_member()
+            self.data_name = member
+            self._image_root = posixpath.dirname(member)
+            self._binary = self._zip.open(member)
+        else:
+            self.data_name = name
+            self._binary = fileobj if hasattr(fileobj, 'peek') else io.BufferedReader(fileobj)
+        self._reader = _reader_for(self.data_name)
+
+    def _find_data_member(self):
+        candidates = [
+            n for n in self._zip.namelist()
+            if n.lower().endswith(DATA_SUFFIXES) and not n.startswith('__MACOSX/')
+        ]
+        if not candidates:
+            raise ImportFormatError("Zip archive contains no .csv, .json or .jsonl file")
+        # Prefer the top-most data file if there are several
+        return min(candidates, key=lambda n: (n.count('/'), n))
+
+    def records(self):
+        return self._reader(self._binary)
+
+    def read_image(self, name):
+        """Return the bytes of an image referenced by a row."""
+        name = name.replace('\\', '/').lstrip('/')
+        if '..' in name.split('/'):
+            raise ImportFormatError(f"Invalid image path '{name}'")
+        if self._zip is not None:
+            try:
+                return self._zip.read(posixpath.join(self._image_root, name))
+            except KeyError:
+                raise ImportFormatError(f"Image '{name}' not found in archive")
+        if self._base_dir is None:
+            raise ImportFormatError(f"Image '{name}' referenced, but images can only be uploaded in a zip archive")
+        path = self._base_dir / name
+        if not path.is_file():
+            raise ImportFormatError(f"Image '{name}' not found")
+        return path.read_bytes()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
@@ -0,0 +1,552 @@
+"""Bulk import of questions into the question banks of all games.
+
+An import runs in two passes. The first pass streams the file, converts
+every row into an unsaved question (plus its clues or sorting items),
+validates it with the model's ``full_clean`` and the same rules the
+single-question views apply, and collects per-row errors. Only when the
+whole file is valid does the second pass insert everything with
+``bulk_create`` in batches inside one transaction, followed by the nested
+rows, the bundle memberships and one ``ImportedQuestion`` per question.
+
+Every question is keyed on a hash of its cleaned content (including images
+and nested rows), so importing the same file again skips rows that were
+already imported instead of creating duplicates.
+
+File format: one row per question, columns named after the question
+model's fields (``question_text``, ``points``, ``correct_answer``, ...).
+In CSV, list values are separated by ``|`` and a value can carry an extra
+attribute after ``::``, e.g. ``people = "Anna::liar|Ben|Carla"``. JSON
+files use plain lists and objects instead. Additional columns:
+
+* ``image`` - file name of the image inside the zip archive
+* ``bundle`` - bundle name(s) the question is added to
+* ``clues`` (Clue Rush) - ``"text::duration|..."``
+* ``items`` (Sorting Ladder) - ``"text::rank|..."``; rank defaults to the position
+* ``pairs`` (Assign) - ``"left::right|..."`` instead of left/right items and matches
+"""
+import hashlib
+import json
+from decimal import Decimal, InvalidOperation
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from PIL import Image
+
+from clue_rush.models import Clue
+from games_hub.registry import GAME_TYPES
+from sorting_ladder.models import SortingItem
+from .models import ImportedQuestion
+from .parsers import ImportFormatError, ImportSource
+
+
+DEFAULT_BATCH_SIZE = 200
+LIST_SEPARATOR = '|'
+ATTR_SEPARATOR = '::'
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x', 'liar', 'lying'}
+BUNDLE_COLUMNS = ('bundle', 'bundles')
+
+# Never taken from the import file
+_PROTECTED_FIELDS = {'id', 'synced', 'updated_at', 'created_at', 'created_by'}
+
+class QuestionImportError(Exception):
+    """Raised when an import cannot run at all (bad file, unknown game)."""
+
+
+class ImportReport:
+    """Outcome of an import; ``as_dict()`` is what views and commands print."""
+
+    def __init__(self, game_key, source, dry_run):
+        self.game_key = game_key
+        self.source = source
+        self.dry_run = dry_run
+        self.total = 0
+        self.created = 0
+        self.skipped = 0
+        self.bundled = 0
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def add_error(self, row_number, messages):
+        self.errors.append({'row': row_number, 'errors': messages})
+
+    def as_dict(self):
+        return {
+            'game_type': self.game_key,
+            'source': self.source,
+            'dry_run': self.dry_run,
+            'total': self.total,
+            'created': self.created,
+            'skipped': self.skipped,
+            'bundled': self.bundled,
+            'invalid': len(self.errors),
+            'errors': self.errors,
+        }
+
+
+class _Row:
+    __slots__ = ('number', 'question', 'children', 'bundles', 'content_hash')
+
+    def __init__(self, number, question, children, bundles, content_hash):
+        self.number = number
+        self.question = question
+        self.children = children
+        self.bundles = bundles
+        self.content_hash = content_hash
+
+
+# -- Value parsing -----------------------------------------------------------
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _split(value):
+    if isinstance(value, list):
+        return value
+    return [part.strip() for part in str(value).split(LIST_SEPARATOR) if part.strip()]
+
+
+def _split_attr(part):
+    """Split ``"text::attr"`` into ``(text, attr)``; attr is None if absent."""
+    text, sep, attr = str(part).rpartition(ATTR_SEPARATOR)
+    if not sep:
+        return str(part).strip(), None
+    return text.strip(), attr.strip()
+
+
+def _maybe_json(value):
+    if isinstance(value, str) and value.strip()[:1] in ('[', '{'):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise ValidationError("invalid JSON value")
+    return value
+
+
+def _parse_people(value):
+    value = _maybe_json(value)
+    if isinstance(value, list) and all(isinstance(p, dict) for p in value):
+        return value
+    people = []
+    for part in _split(value):
+        name, flag = _split_attr(part)
+        people.append({'name': name, 'is_lying': bool(flag) and flag.lower() in TRUE_VALUES})
+    return people
+
+
+def _parse_matches(value):
+    value = _maybe_json(value)
+    if isinstance(value, str):
+        pairs = [part.split(':', 1) for part in _split(value)]
+        value = {left: right for left, right in pairs} if all(len(p) == 2 for p in pairs) else None
+    if not isinstance(value, dict):
+        raise ValidationError("expected 'left:right|...' or a JSON object")
+    try:
+        return {str(int(k)): int(v) for k, v in value.items()}
+    except (TypeError, ValueError):
+        raise ValidationError("match indices must be integers")
+
+
+def _parse_json_field(game_key, name, value):
+    if game_key == 'who' and name == 'people':
+        return _parse_people(value)
+    if game_key == 'assign' and name == 'correct_matches':
+        return _parse_matches(value)
+    value = _maybe_json(value)
+    return _split(value) if isinstance(value, str) else value
+
+
+def _parse_pairs(value):
+    value = _maybe_json(value)
+    pairs = []
+    for part in _split(value):
+        if isinstance(part, dict):
+            pairs.append((part.get('left'), part.get('right')))
+        elif isinstance(part, (list, tuple)) and len(part) == 2:
+            pairs.append(tuple(part))
+        else:
+            left, right = _split_attr(part)
+            pairs.append((left, right))
+    if any(_is_blank(left) or _is_blank(right) for left, right in pairs):
+        raise ValidationError("every pair needs a left and a right item")
+    return {
+        'left_items': [str(left) for left, _ in pairs],
+        'right_items': [str(right) for _, right in pairs],
+        'correct_matches': {str(i): i for i in range(len(pairs))},
+    }
+
+
+def _parse_clues(value):
+    clues = []
+    for index, part in enumerate(_split(_maybe_json(value)), start=1):
+        if isinstance(part, dict):
+            text, duration, order = part.get('clue_text') or part.get('text'), part.get('duration'), part.get('order')
+        else:
+            text, duration = _split_attr(part)
+            order = None
+        if _is_blank(text):
+            continue
+        try:
+            clues.append(Clue(
+                clue_text=str(text).strip(),
+                order=int(order or index),
+                duration=int(duration or 10),
+            ))
+        except (TypeError, ValueError):
+            raise ValidationError(f"clue {index}: duration and order must be integers")
+    return clues
+
+
+def _parse_items(value):
+    items = []
+    for index, part in enumerate(_split(_maybe_json(value)), start=1):
+        image_url = None
+        if isinstance(part, dict):
+            text = part.get('text')
+            rank = part.get('correct_rank', part.get('rank', part.get('order')))
+            image_url = part.get('image_url') or None
+        else:
+            text, rank = _split_attr(part)
+        if _is_blank(text):
+            continue
+        try:
+            rank = Decimal(str(rank)) if not _is_blank(rank) else Decimal(index)
+            rank = rank.quantize(Decimal('0.01'))
+        except InvalidOperation:
+            raise ValidationError(f"item {index}: rank must be a number")
+        items.append(SortingItem(text=str(text).strip(), correct_rank=rank, image_url=image_url))
+    return items
+
+
+# -- Game-specific rules (mirroring the add_* views) -------------------------
+
+def _check_quiz(question, children):
+    if question.question_type == 'multiple_choice':
+        options = {'A': question.option_a, 'B': question.option_b, 'C': question.option_c, 'D': question.option_d}
+        if not question.option_a or not question.option_b:
+            yield "multiple choice questions need at least option_a and option_b"
+        if not options.get(question.correct_answer.strip().upper()):
+            yield "correct_answer must be the letter of a filled option (A-D)"
+
+
+def _check_assign(question, children):
+    if not isinstance(question.left_items, list) or not question.left_items:
+        yield "at least one left item is required"
+        return
+    right_items = question.right_items if isinstance(question.right_items, list) else []
+    for left, right in (question.correct_matches or {}).items():
+        if not 0 <= int(left) < len(question.left_items) or not 0 <= int(right) < len(right_items):
+            yield f"match {left}:{right} is out of range"
+
+
+def _check_where(question, children):
+    if not -90 <= question.correct_latitude <= 90 or not -180 <= question.correct_longitude <= 180:
+        yield "coordinates out of range"
+
+
+def _check_who(question, children):
+    people = question.people if isinstance(question.people, list) else []
+    if len(people) < 2:
+        yield "at least 2 people are required"
+    for person in people:
+        if not isinstance(person, dict) or not str(person.get('name') or '').strip() or 'is_lying' not in person:
+            yield "every person needs a name and is_lying"
+            break
+
+
+def _check_clue_rush(question, children):
+    if not children:
+        yield "at least one clue is required"
+    orders = [clue.order for clue in children]
+    if len(orders) != len(set(orders)):
+        yield "clue orders must be unique"
+
+
+def _check_sorting_ladder(question, children):
+    ranks = [item.correct_rank for item in children]
+    if len(ranks) != len(set(ranks)):
+        yield "item ranks must be unique"
+
+
+_CHECKS = {
+    'quiz': _check_quiz,
+    'assign': _check_assign,
+    'where': _check_where,
+    'who': _check_who,
+    'clue_rush': _check_clue_rush,
+    'sorting_ladder': _check_sorting_ladder,
+}
+
+_CHILD_PARSERS = {
+    'clue_rush': ('clues', _parse_clues, 'clue_question'),
+    'sorting_ladder': ('items', _parse_items, 'topic'),
+}
+
+
+# -- Row building ------------------------------------------------------------
+
+def _importable_fields(model):
+    return {
+        f.name: f for f in model._meta.concrete_fields
+        if f.editable and f.name not in _PROTECTED_FIELDS and not f.is_relation
+    }
+
+
+def _verify_image(data, name):
+    try:
+        with Image.open(BytesIO(data)) as img:
+            img.verify()
+    except Exception:  # pylint: disable=broad-except
+        raise ValidationError(f"'{name}' is not a valid image")
+
+
+def _content_hash(game_key, question, fields, children, image_digest):
+    payload = {
+        'game': game_key,
+        'fields': {name: getattr(question, name) for name in sorted(fields) if name != 'image'},
+        'image': image_digest,
+        'children': [
+            {f.name: getattr(child, f.name) for f in child._meta.concrete_fields
+             if not f.is_relation and f.name not in _PROTECTED_FIELDS}
+            for child in children
+        ],
+    }
+    encoded = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _build_row(game_type, fields, record, source, user):
+    """Turn one raw record into a validated ``_Row``; raises ValidationError."""
+    if not isinstance(record, dict):
+        raise ValidationError("row must be an object")
+    if None in record:
+        raise ValidationError("more values than header columns")
+
+    game_key = game_type.key
+    errors = {}
+    values = {}
+    children = []
+    bundles = []
+    image = None
+
+    for column, raw in record.items():
+        column = column.strip()
+        if _is_blank(raw):
+            continue
+        try:
+            if column in BUNDLE_COLUMNS:
+                bundles.extend(str(b) for b in _split(raw))
+            elif column == 'pairs' and game_key == 'assign':
+                values.update(_parse_pairs(raw))
+            elif game_key in _CHILD_PARSERS and column == _CHILD_PARSERS[game_key][0]:
+                children = _CHILD_PARSERS[game_key][1](raw)
+            elif column == 'image' and 'image' in fields:
+                image = str(raw).strip()
+            elif column in fields:
+                field = fields[column]
+                if isinstance(field, models.JSONField):
+                    values[column] = _parse_json_field(game_key, column, raw)
+                elif isinstance(field, models.BooleanField) and isinstance(raw, str):
+                    values[column] = raw.strip().lower() in TRUE_VALUES
+                else:
+                    values[column] = field.to_python(raw.strip() if isinstance(raw, str) else raw)
+            else:
+                errors.setdefault(column, []).append("unknown column")
+        except ValidationError as e:
+            errors.setdefault(column, []).extend(e.messages)
+
+    if bundles and game_type.bundle_model is None:
+        errors.setdefault('bundle', []).append(f"{game_type.label} has no bundles")
+
+    question = game_type.question_model(created_by=user, **values)
+    image_digest = None
+    if image:
+        try:
+            data = source.read_image(image)
+            _verify_image(data, image)
+            image_digest = hashlib.sha256(data).hexdigest()
+            question.image = ContentFile(data, name=PurePosixPath(image).name)
+        except (ImportFormatError, ValidationError) as e:
+            errors.setdefault('image', []).append(str(e.messages[0] if isinstance(e, ValidationError) else e))
+
+    try:
+        # created_by is set by us; skipping it saves one query per row
+        question.full_clean(exclude=list(errors) + ['created_by'])
+    except ValidationError as e:
+        for name, messages in e.message_dict.items():
+            errors.setdefault(name, []).extend(messages)
+
+    if not errors:
+        check = _CHECKS.get(game_key)
+        problems = list(check(question, children)) if check else []
+        if problems:
+            errors['__all__'] = problems
+
+    if errors:
+        raise ValidationError(errors)
+
+    content_hash = _content_hash(game_key, question, fields, children, image_digest)
+    return _Row(None, question, children, bundles, content_hash)
+
+
+def _format_errors(error):
+    if hasattr(error, 'error_dict'):
+        return [
+            f"{name}: {message}" if name != '__all__' else message
+            for name, messages in error.message_dict.items()
+            for message in messages
+        ]
+    return list(error.messages)
+
+
+# -- Import ------------------------------------------------------------------
+
+def _existing_hashes(game_type, hashes, batch_size):
+    """Look up earlier imports of ``hashes``.
+
+    Returns ``(existing, stale)``: a ``{hash: ImportedQuestion}`` dict for
+    questions that still exist, and the entries whose question was deleted
+    since and may be imported again.
+    """
+    found = {}
+    hashes = list(hashes)
+    for start in range(0, len(hashes), batch_size):
+        chunk = hashes[start:start + batch_size]
+        for entry in ImportedQuestion.objects.filter(game_key=game_type.key, content_hash__in=chunk):
+            found[entry.content_hash] = entry
+    alive = set()
+    ids = [e.question_id for e in found.values()]
+    for start in range(0, len(ids), batch_size):
+        alive.update(
+            game_type.question_model.objects
+            .filter(pk__in=ids[start:start + batch_size])
+            .values_list('pk', flat=True)
+        )
+    return {h: e for h, e in found.items() if e.question_id in alive}, [e for e in found.values() if e.question_id not in alive]
+
+
+def _resolve_bundles(game_type, names, user, create):
+    bundles = {}
+    for name in names:
+        bundle = game_type.bundle_model.objects.filter(name=name, creator=user).first()
+        if bundle is None and create:
+            bundle = game_type.bundle_model.objects.create(name=name, creator=user)
+        bundles[name] = bundle
+    return bundles
+
+
+def import_questions(source, game_key, user, bundle=None, dry_run=False, skip_invalid=False,
+                     batch_size=DEFAULT_BATCH_SIZE):
+    """Validate and bulk-insert all questions from an ``ImportSource``.
+
+    Invalid rows abort the whole import unless ``skip_invalid`` is set, in
+    which case only the valid rows are imported. ``bundle`` adds every
+    imported (or already present) question to the bundle with that name.
+    """
+    game_type = GAME_TYPES.get(game_key)
+    if game_type is None:
+        raise QuestionImportError(f"Unknown game type: {game_key}")
+    if bundle and game_type.bundle_model is None:
+        raise QuestionImportError(f"{game_type.label} has no bundles")
+
+    report = ImportReport(game_key, source.name, dry_run)
+    fields = _importable_fields(game_type.question_model)
+    rows = []
+    try:
+        for number, record in source.records():
+            report.total += 1
+            try:
+                row = _build_row(game_type, fields, record, source, user)
+            except ValidationError as e:
+                report.add_error(number, _format_errors(e))
+                continue
+            row.number = number
+            if bundle:
+                row.bundles.append(bundle)
+            rows.append(row)
+    except ImportFormatError as e:
+        raise QuestionImportError(str(e))
+
+    if report.errors and not skip_invalid:
+        return report
+
+    # Drop rows already imported earlier and duplicates within the file
+    existing, stale = _existing_hashes(game_type, {r.content_hash for r in rows}, batch_size)
+    new_rows, seen, bundle_links = [], set(), []
+    for row in rows:
+        if row.content_hash in existing:
+            report.skipped += 1
+            bundle_links.extend((name, existing[row.content_hash].question_id) for name in row.bundles)
+        elif row.content_hash in seen:
+            report.skipped += 1
+        else:
+            seen.add(row.content_hash)
+            new_rows.append(row)
+    report.created = len(new_rows)
+
+    bundle_names = {name for row in rows for name in row.bundles}
+    if dry_run:
+        report.bundled = len(bundle_links) + sum(len(r.bundles) for r in new_rows)
+        return report
+
+    with transaction.atomic():
+        if stale:
+            ImportedQuestion.objects.filter(pk__in=[e.pk for e in stale]).delete()
+
+        questions = [row.question for row in new_rows]
+        game_type.question_model.objects.bulk_create(questions, batch_size=batch_size)
+
+        if game_key in _CHILD_PARSERS:
+            fk_name = _CHILD_PARSERS[game_key][2]
+            children = []
+            for row in new_rows:
+                for child in row.children:
+                    setattr(child, fk_name, row.question)
+                    children.append(child)
+            if children:
+                type(children[0]).objects.bulk_create(children, batch_size=batch_size)
+
+        ImportedQuestion.objects.bulk_create([
+            ImportedQuestion(
+                game_key=game_key,
+                content_hash=row.content_hash,
+                question_id=row.question.pk,
+                source=source.name[:255],
+            )
+            for row in new_rows
+        ], batch_size=batch_size)
+
+        if bundle_names:
+            bundle_links.extend((name, row.question.pk) for row in new_rows for name in row.bundles)
+            bundles = _resolve_bundles(game_type, bundle_names, user, create=True)
+            through = game_type.bundle_model.questions.through
+            m2m = game_type.bundle_model._meta.get_field('questions')
+            bundle_fk = m2m.m2m_field_name() + '_id'
+            question_fk = m2m.m2m_reverse_field_name() + '_id'
+            through.objects.bulk_create(
+                [through(**{bundle_fk: bundles[name].pk, question_fk: qid}) for name, qid in bundle_links],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+            report.bundled = len(bundle_links)
+
+    return report
+
+
+def import_file(fileobj, name, game_key, user, base_dir=None, **options):
+    """Open ``fileobj`` as an import source and run :func:`import_questions`."""
+    try:
+        source = ImportSource(fileobj, name, base_dir=base_dir)
+    except ImportFormatError as e:
+        raise QuestionImportError(str(e))
+    try:
+        return import_questions(source, game_key, user, **options)
+    finally:
+        source.close()
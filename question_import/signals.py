@@ -0,0 +1,14 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .models import ImportedQuestion
+
+
+def _mark_unsynced(instance):
+    if hasattr(instance, "synced"):
+        instance.synced = False
+
+
+@receiver(pre_save, sender=ImportedQuestion)
+def mark_imported_question_unsynced(sender, instance, **kwargs):  # noqa: D401
+    _mark_unsynced(instance)
@@ -0,0 +1,115 @@
+import io
+import json
+import tempfile
+import zipfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from clue_rush.models import ClueQuestion
+from QuizGame.models import QuizBundle, QuizQuestion
+from sorting_ladder.models import SortingQuestion
+from who_is_that.models import WhoThatQuestion
+from question_import.models import ImportedQuestion
+from question_import.services import import_file
+
+
+QUIZ_CSV = (
+    "question_text,option_a,option_b,option_c,option_d,correct_answer,points\n"
+    "Hauptstadt von Frankreich?,Paris,Rom,Madrid,Berlin,A,10\n"
+    "Größter Planet?,Mars,Jupiter,,,B,20\n"
+)
+
+
+def _png_bytes():
+    buf = io.BytesIO()
+    Image.new('RGB', (4, 4), 'red').save(buf, format='PNG')
+    return buf.getvalue()
+
+
+class QuestionImportTest(TestCase):
+    """Massenimport von Fragen aus CSV, JSON und Zip."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('admin', password='pw', is_staff=True)
+
+    def _import(self, content, name, game, **options):
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        return import_file(io.BytesIO(data), name, game, self.user, **options)
+
+    def test_csv_import_is_idempotent(self):
+        """Ein zweiter Import derselben Datei legt keine Duplikate an."""
+        first = self._import(QUIZ_CSV, 'quiz.csv', 'quiz', bundle='Allgemeinwissen')
+        self.assertTrue(first.ok, first.errors)
+        self.assertEqual(first.created, 2)
+        self.assertEqual(QuizBundle.objects.get(name='Allgemeinwissen').questions.count(), 2)
+
+        second = self._import(QUIZ_CSV, 'quiz.csv', 'quiz', bundle='Allgemeinwissen')
+        self.assertEqual((second.created, second.skipped), (0, 2))
+        self.assertEqual(QuizQuestion.objects.count(), 2)
+        self.assertEqual(ImportedQuestion.objects.count(), 2)
+
+    def test_invalid_rows_are_reported_and_nothing_is_written(self):
+        """Fehlerhafte Zeilen werden mit Zeilennummer gemeldet; es wird nichts gespeichert."""
+        content = QUIZ_CSV + "Ohne Antwort,Ja,Nein,,,E,abc\n"
+        report = self._import(content, 'quiz.csv', 'quiz')
+        self.assertEqual(report.errors[0]['row'], 4)
+        self.assertTrue(any('points' in e for e in report.errors[0]['errors']))
+        self.assertFalse(QuizQuestion.objects.exists())
+
+    def test_dry_run_writes_nothing(self):
+        """Ein Probelauf prüft nur und meldet, was angelegt würde."""
+        report = self._import(QUIZ_CSV, 'quiz.csv', 'quiz', dry_run=True)
+        self.assertEqual(report.created, 2)
+        self.assertFalse(QuizQuestion.objects.exists())
+
+    def test_nested_rows_from_json(self):
+        """Clues und Sortier-Elemente werden als verschachtelte Zeilen angelegt."""
+        clue_rows = [{'question_text': 'Wer bin ich?', 'answer': 'Einstein', 'clues': ['Physiker', {'text': 'E=mc²', 'duration': 5}]}]
+        report = self._import(json.dumps(clue_rows), 'clues.json', 'clue_rush')
+        self.assertTrue(report.ok, report.errors)
+        self.assertEqual(list(ClueQuestion.objects.get().clues.values_list('order', 'duration')), [(1, 10), (2, 5)])
+
+        sorting_csv = 'question_text,items\nFläche,Deutschland::357|Ägypten::1001|Malta::0.3\n'
+        report = self._import(sorting_csv, 'sorting.csv', 'sorting_ladder')
+        self.assertTrue(report.ok, report.errors)
+        self.assertEqual(list(SortingQuestion.objects.get().elements.values_list('text', flat=True)), ['Malta', 'Deutschland', 'Ägypten'])
+
+    def test_duplicate_clue_orders_are_row_errors(self):
+        """Doppelte Clue-Reihenfolgen (auch gemischt explizit/implizit) sind Zeilenfehler statt IntegrityError."""
+        clue_rows = [
+            {'question_text': 'Wer bin ich?', 'answer': 'Einstein', 'clues': [{'text': 'Physiker', 'order': 2}, 'E=mc²']},
+            {'question_text': 'Und ich?', 'answer': 'Curie', 'clues': [{'text': 'Radium', 'order': 1}, {'text': 'Nobel', 'order': 1}]},
+        ]
+        report = self._import(json.dumps(clue_rows), 'clues.json', 'clue_rush')
+        self.assertEqual([len(row['errors']) for row in report.errors], [1, 1])
+        self.assertTrue(all('clue orders must be unique' in row['errors'] for row in report.errors))
+        self.assertFalse(ClueQuestion.objects.exists())
+
+    def test_zip_with_images(self):
+        """Bilder werden aus dem Zip-Archiv gelesen und gespeichert."""
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('bank/questions.csv', 'correct_answer,image,alternative_answers\nMarie Curie,img/curie.png,Curie|M. Curie\n')
+            zf.writestr('bank/img/curie.png', _png_bytes())
+
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            report = self._import(archive.getvalue(), 'bank.zip', 'who_that')
+            self.assertTrue(report.ok, report.errors)
+            question = WhoThatQuestion.objects.get()
+            self.assertEqual(question.alternative_answers, ['Curie', 'M. Curie'])
+            self.assertTrue(question.image.storage.exists(question.image.name))
+
+    def test_upload_endpoint(self):
+        """Der Admin-Endpunkt liefert den Bericht als JSON."""
+        self.client.force_login(self.user)
+        resp = self.client.post(reverse('admin_dashboard:import_questions'), {
+            'file': SimpleUploadedFile('quiz.csv', QUIZ_CSV.encode('utf-8')),
+            'game_type': 'quiz',
+            'dry_run': '1',
+        })
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['report']['created'], 2)
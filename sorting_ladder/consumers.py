@@ -1,4 +1,5 @@
 import json
+import logging
 import asyncio
 import random
 from channels.generic.websocket import AsyncWebsocketConsumer
@@ -13,13 +14,25 @@ from .models import (
     RoundSubmission,
     SortingLadderSession,
 )
+from .rounds import end_question, question_rounds, start_question
+from games_hub.guard import GuardMixin
+from games_hub.logs import bind_log_context
+from games_hub.metrics import MetricsMixin
+from games_hub.presence import PresenceMixin
+from games_hub.profiling import ProfilingMixin
+from games_hub.replay import ResumableRoomMixin
+from games_hub.tokens import participant_lookup
+from games_hub.wire import BinaryProtocolMixin
 from games_hub.models import HubGameStep, HubSession
 
+logger = logging.getLogger(__name__)
 
-class SortingLadderGameConsumer(AsyncWebsocketConsumer):
+
+class SortingLadderGameConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, ResumableRoomMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_code = self.scope['url_route']['kwargs']['room_code']
         self.room_group_name = f'sortingladder_{self.room_code}'
+        bind_log_context(room=self.room_code)
 
         await self.channel_layer.group_add(
             self.room_group_name,
@@ -50,7 +63,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             return
 
         msg_type = data.get('type')
-        print("SortingLadderGame Consumer:", msg_type)
+        logger.debug('Received %s', msg_type)
 
         if msg_type == 'admin_start_quiz':
             await self.handle_admin_start_quiz(data)
@@ -85,8 +98,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             return
         await self.start_quiz_db(quiz.id)
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'quiz_started',
                 'message': 'Sorting Ladder quiz has started!'
@@ -131,8 +143,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             }))
             return
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'topic_selected',
                 'topic': {
@@ -160,8 +171,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
 
         round_state = await self.start_next_round_db(quiz.id)
         if not round_state:
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'no_more_rounds',
                     'message': 'All elements have been placed.'
@@ -173,8 +183,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             })
             return
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'round_started',
                 'round': round_state
@@ -197,8 +206,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
 
         survivors = await self.end_round_db(quiz.id)
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'round_ended',
                 'survivors': survivors
@@ -222,8 +230,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
         await self.end_quiz_db(quiz.id)
         final_scores = await self.get_final_scores()
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'quiz_ended',
                 'message': 'Sorting Ladder quiz has ended.',
@@ -262,8 +269,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             }))
             return
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_started',
                 'payload': payload,
@@ -284,8 +290,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
 
         await self.end_question_db(quiz.id)
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_ended',
                 'message': 'Question has ended.',
@@ -306,6 +311,15 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
         name = data.get('name')
         hub_session_code = data.get('hub_session_code')
 
+        participant_payload = await self.get_or_create_participant(name, hub_session_code) if name else None
+        if participant_payload:
+            self.join_presence(SortingLadderParticipant, participant_payload['id'], self.room_group_name, hub_session_code)
+
+        # Reconnects replay missed room events from memory when possible; the
+        # socket joins presence first so a resumed player still counts
+        if await self.resume(data):
+            return
+
         if not name:
             await self.send(text_data=json.dumps({
                 'type': 'error',
@@ -313,7 +327,6 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             }))
             return
 
-        participant_payload = await self.get_or_create_participant(name, hub_session_code)
         if not participant_payload:
             await self.send(text_data=json.dumps({
                 'type': 'error',
@@ -321,8 +334,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             }))
             return
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'participant_joined',
                 'participant': participant_payload
@@ -376,8 +388,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             # Could be duplicate submission or no active round
             return
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'move_submitted',
                 'participant_name': participant_name,
@@ -420,14 +431,13 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             ordered_item_ids=ordered_item_ids,
             round_time_out=round_time_out,
         )
-        print("result  ", result)
+        logger.debug('Round result: %s', result)
 
         if not result:
             # Could be late submission, invalid state, or player already eliminated
             return
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'round_result',
                 'participant_name': participant_name,
@@ -526,6 +536,8 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             'has_more_rounds': event['has_more_rounds'],
             'per_question_rounds': event.get('per_question_rounds'),
             'correct_order_ids': event.get('correct_order_ids'),
+            'placed_ids': event.get('placed_ids'),
+            'remaining_ids': event.get('remaining_ids'),
         }))
 
     # -------- DB helpers --------
@@ -552,6 +564,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
             quiz.end_quiz()
         except SortingLadderGame.DoesNotExist:
             pass
+        end_question(quiz_id)
 
     @database_sync_to_async
     def get_topic(self, topic_id):
@@ -659,6 +672,9 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
         quiz.current_question = question
         quiz.save(update_fields=['current_question'])
 
+        # Items come in correct_rank order (SortingItem.Meta.ordering)
+        start_question(quiz.id, question, [e.id for e in elements], [e.id for e in shuffled])
+
         return {
             'question': {
                 'id': question.id,
@@ -744,6 +760,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
         # Reset current question to None
         quiz.current_question = None
         quiz.save()
+        end_question(quiz.id)
         
         session.is_round_active = False
         session.round_end_time = timezone.now()
@@ -776,7 +793,7 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
         try:
             quiz = SortingLadderGame.objects.select_related('session').get(room_code=self.room_code)
             session = quiz.session
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
         except (SortingLadderGame.DoesNotExist, SortingLadderSession.DoesNotExist, SortingLadderParticipant.DoesNotExist, AttributeError):
             return None
 
@@ -824,213 +841,89 @@ class SortingLadderGameConsumer(AsyncWebsocketConsumer):
     def save_round_full_order(self, participant_name, hub_session_code, ordered_item_ids, round_time_out=False):
         """Validate and persist a participant's result for this round.
 
-        When ``round_time_out`` is False, this behaves as a normal round
-        submission, validating the submitted ordering and computing
-        correctness based on ``SortingItem.correct_rank``.
+        The submission is graded by the question's round engine (see
+        sorting_ladder/rounds.py), which also keeps the participant's
+        played and correct rounds for this question.
 
         When ``round_time_out`` is True, no ordering is required; we record
         a failed ``RoundSubmission`` for the current question, advance the
-        round counter, and leave the shuffled item order unchanged.
+        round counter, and leave the participant's ladder unchanged.
+
+        The result carries the participant's ladder (``placed_ids`` and
+        ``remaining_ids``), so a phone that lost its own, e.g. after a
+        reload, continues from the server's.
         """
         try:
-            quiz = SortingLadderGame.objects.select_related('session', 'current_question').get(room_code=self.room_code)
-            session = quiz.session
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
-        except (SortingLadderGame.DoesNotExist, SortingLadderSession.DoesNotExist, SortingLadderParticipant.DoesNotExist, AttributeError):
+            quiz = SortingLadderGame.objects.select_related('current_question').get(room_code=self.room_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
+        except (SortingLadderGame.DoesNotExist, SortingLadderParticipant.DoesNotExist, AttributeError):
             return None
 
         question = quiz.current_question
         if not question:
-            print("No question found")
+            logger.info('Round submission without a current question')
             return None
 
-        # Ensure shuffled_item_ids is initialized so we can consistently
-        # reason about remaining rounds even on a timeout-only submission.
-        if not session.shuffled_item_ids:
-            all_ids = list(question.elements.values_list('id', flat=True))
-            if not all_ids:
-                print("No elements found")
-                return None
-            session.shuffled_item_ids = ",".join(str(i) for i in all_ids)
-            session.save(update_fields=['shuffled_item_ids'])
-
-        shuffled_ids = [int(x) for x in session.shuffled_item_ids.split(',') if x]
+        rounds = question_rounds(quiz.id, question)
+        if not rounds.item_count:
+            logger.info('Round submission for a question without elements')
+            return None
 
         # If the round ended due to timeout, we record a failed submission
         # without requiring any ordered_item_ids and without modifying the
         # shuffled order.
         if round_time_out:
-            submission = RoundSubmission.objects.create(
-                quiz=quiz,
-                participant=participant,
-                question=question,
-                all_elements=[],
-            )
-
-            # Per-question points for this participant in this quiz/question
-            correct_rounds_for_question = RoundSubmission.objects.filter(
-                quiz=quiz,
-                participant=participant,
-                question=question,
-                is_correct=True,
-            ).count()
-            points_for_question = correct_rounds_for_question * question.points
-
-            # Total rounds played (including this timeout) for this
-            # participant and question. This is used to determine whether
-            # they personally have more rounds available, independent of
-            # other participants.
-            total_rounds_for_participant = RoundSubmission.objects.filter(
-                quiz=quiz,
-                participant=participant,
-                question=question,
-            ).count()
-
-            # Refresh the participant's overall total_score across the quiz
-            try:
-                participant.calculate_total_score()
-            except Exception:
-                # Scoring errors should not break the round flow
-                pass
-
-            # There are more rounds for THIS participant as long as the
-            # number of rounds they have already played (submissions,
-            # including timeouts) is strictly less than the total number of
-            # items for this question. This caps rounds per participant and
-            # avoids relying on the shared session.current_round.
-            print("total_rounds_for_participant", total_rounds_for_participant)
-            print("shuffled ids", shuffled_ids)
-            print("shuffled ids len", len(shuffled_ids))
-            has_more_rounds = total_rounds_for_participant < len(shuffled_ids) - 1
-
-            full_sorted_ids = list(SortingItem.objects.filter(topic=question).order_by('correct_rank'))
-            full_sorted_ids = [item.id for item in full_sorted_ids]
+            played, correct = rounds.record(participant, [], False)
+            has_more_rounds = rounds.has_more_rounds(played)
+            ladder = rounds.ladder(participant.id)
+            logger.debug('Rounds played %s of %s items', played, rounds.item_count)
 
             return {
                 'is_correct': False,
                 'rounds_survived': participant.rounds_survived,
                 'is_eliminated': participant.is_eliminated,
-                'points': points_for_question,
-                'has_more_rounds': bool(has_more_rounds),
-                'per_question_rounds': correct_rounds_for_question,
-                'correct_order_ids': [] if bool(has_more_rounds) else full_sorted_ids,
+                'points': correct * question.points,
+                'has_more_rounds': has_more_rounds,
+                'per_question_rounds': correct,
+                'correct_order_ids': [] if has_more_rounds else list(rounds.correct_order),
+                'placed_ids': ladder.placed_ids,
+                'remaining_ids': ladder.remaining_ids,
             }
 
-        # Do not accept submissions if question is no longer active
-        # now = timezone.now()
-        # if not session.is_round_active or (session.round_end_time and now > session.round_end_time):
-        #     print("Session Ended")
-        #     print("Session Round Active ", session.is_round_active)
-        #     print("Session Round End Time ", session.round_end_time)
-        #     return None
-
-        # Ignore submissions from already eliminated participants
-        # if participant.is_eliminated:
-        #     return None
-
-        # Parse shared shuffled order from session. This is treated as the
-        # master list of all item IDs for this question, but we no longer
-        # require the submitted ladder to match its prefix.
-        try:
-            shuffled_ids = [int(x) for x in session.shuffled_item_ids.split(',') if x]
-        except ValueError:
-            print("Invalid shuffled IDs")
-            return None
-
         try:
             visible_ids = [int(x) for x in ordered_item_ids]
         except (TypeError, ValueError):
-            print("Invalid visible IDs")
+            logger.info('Rejected round: invalid item ids')
             return None
 
-        if not visible_ids:
-            print("No visible IDs")
+        # Submitted IDs must be unique and belong to the question
+        is_correct = rounds.grade(visible_ids)
+        if is_correct is None:
+            logger.info('Rejected round: missing, duplicate or unknown item ids')
             return None
 
-        # Ensure submitted IDs are unique and belong to the master list
-        if len(set(visible_ids)) != len(visible_ids):
-            print("Duplicate IDs")
-            return None
-        if any(i not in shuffled_ids for i in visible_ids):
-            print("Invalid IDs")
-            return None
-
-        # Persist this round as a RoundSubmission row. RoundSubmission.save()
-        # will compute the is_correct flag from the submitted ordering based
-        # on SortingItem.correct_rank.
-        submission = RoundSubmission.objects.create(
-            quiz=quiz,
-            participant=participant,
-            question=question,
-            all_elements=visible_ids,
-        )
+        played, correct = rounds.record(participant, visible_ids, is_correct)
+        sorted_visible_ids = rounds.sorted_ids(visible_ids)
 
-        # Compute the correct ordered prefix for the ladder and update the
-        # shared shuffled order so the visible prefix is always correct.
-        items = list(SortingItem.objects.filter(id__in=visible_ids))
-        if len(items) != len(visible_ids):
-            print("Invalid items")
-            return None
-        rank_map = {item.id: item.correct_rank for item in items}
-        sorted_visible_ids = sorted(visible_ids, key=lambda i: rank_map[i])
-
-        # Rewrite shuffled_ids so that its prefix matches sorted_visible_ids
-        remaining_ids = [i for i in shuffled_ids if i not in sorted_visible_ids]
-        shuffled_ids = sorted_visible_ids + remaining_ids
-        session.shuffled_item_ids = ",".join(str(i) for i in shuffled_ids)
-
-        # Update participant progression based on correctness
-        if submission.is_correct:
-            participant.rounds_survived += 1
-            participant.save(update_fields=['rounds_survived'])
-
-        # Persist any changes to the shared shuffled order, but do not use
-        # session.current_round here; round availability is tracked per
-        # participant via their own RoundSubmission rows.
-        session.save(update_fields=['shuffled_item_ids'])
-
-        # Total rounds played (including this one) for this participant and
-        # question. This determines if they personally can play more rounds.
-        total_rounds_for_participant = RoundSubmission.objects.filter(
-            quiz=quiz,
-            participant=participant,
-            question=question,
-        ).count()
-
-        # Determine if more rounds are possible for this participant. We cap
-        # rounds by the number of items available for this question so each
-        # player only ever gets a fixed number of rounds, independent of
-        # other players' progress.
-        print("total_rounds_for_participant", total_rounds_for_participant)
-        print("shuffled ids", shuffled_ids)
-        print("shuffled ids len", len(shuffled_ids))
-        has_more_rounds = total_rounds_for_participant < len(shuffled_ids) - 1
-
-        # Per-question points for this participant in this quiz/question
-        # = (number of correct RoundSubmission rows) * question.points
-        correct_rounds_for_question = RoundSubmission.objects.filter(
-            quiz=quiz,
-            participant=participant,
-            question=question,
-            is_correct=True,
-        ).count()
-        points_for_question = correct_rounds_for_question * question.points
+        # The submitted items, in correct order, become this participant's
+        # ladder; the shared session order stays as the question started
+        ladder = rounds.place(participant, sorted_visible_ids)
 
-        # Refresh the participant's overall total_score across the quiz
-        try:
-            participant.calculate_total_score()
-        except Exception:
-            # Scoring errors should not break the round flow
-            pass
+        # Rounds are capped per participant by the number of items, independent
+        # of other players' progress
+        has_more_rounds = rounds.has_more_rounds(played)
+        logger.debug('Rounds played %s of %s items', played, rounds.item_count)
 
         return {
-            'is_correct': submission.is_correct,
+            'is_correct': is_correct,
             'rounds_survived': participant.rounds_survived,
             'is_eliminated': participant.is_eliminated,
-            'points': points_for_question,
-            'has_more_rounds': bool(has_more_rounds),
-            'per_question_rounds': correct_rounds_for_question,
+            'points': correct * question.points,
+            'has_more_rounds': has_more_rounds,
+            'per_question_rounds': correct,
             'correct_order_ids': sorted_visible_ids,
+            'placed_ids': ladder.placed_ids,
+            'remaining_ids': ladder.remaining_ids,
         }
 
     @database_sync_to_async
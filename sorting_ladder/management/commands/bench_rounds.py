@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from sorting_ladder.rounds import submission_benchmark
+
+
+class Command(BaseCommand):
+    help = "Measure Sorting Ladder round submissions per second for growing player counts, against the session-row path"
+
+    def add_arguments(self, parser):
+        parser.add_argument('players', nargs='*', type=int, help="Player counts (default: 10 50 200)")
+        parser.add_argument('--items', type=int, default=8, help="Items of the benchmark question")
+
+    def handle(self, *args, **options):
+        """Delegate to the round engine; nothing is kept in the database."""
+        counts = [count for count in options['players'] if count > 0] or [10, 50, 200]
+        item_count = max(2, options['items'])
+
+        self.stdout.write(
+            f"{'path':<12} {'players':>8} {'submissions':>12} {'per second':>11} {'µs each':>9} {'queries':>8} {'row writes':>11}"
+        )
+        for path, session_row in (('ladder', False), ('session row', True)):
+            for players, submissions, per_second, queries, row_writes in submission_benchmark(
+                counts, item_count=item_count, session_row=session_row,
+            ):
+                self.stdout.write(
+                    f"{path:<12} {players:>8} {submissions:>12} {per_second:>11.0f} {1e6 / per_second:>9.1f}"
+                    f" {queries:>8.2f} {row_writes:>11.2f}"
+                )
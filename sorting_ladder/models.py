@@ -68,6 +68,9 @@ class SortingLadderParticipant(SyncBase):
     rounds_survived = models.IntegerField(default=0)
     last_activity = models.DateTimeField(auto_now=True)
     hub_session_code = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    hub_participant = models.ForeignKey(
+        'games_hub.HubParticipant', null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+    )
 
     class Meta:
         unique_together = ['quiz', 'name', 'hub_session_code']
@@ -196,16 +199,18 @@ class RoundSubmission(SyncBase):
     class Meta:
         ordering = ['-submitted_at']
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, grade=True, **kwargs):
         """On first save, compute is_correct from the submitted ordering.
 
         Expects all_elements to be a list/array of SortingItem IDs in the
         order chosen by the player for that round. A submission is marked
         correct if the corresponding items are in non-decreasing
-        correct_rank order.
+        correct_rank order. ``grade=False`` keeps the is_correct given by
+        the caller (the round engine in sorting_ladder/rounds.py has graded
+        it already).
         """
         # Only attempt to compute correctness on initial insert
-        if self.pk is None and self.all_elements:
+        if grade and self.pk is None and self.all_elements:
             try:
                 element_ids = [int(x) for x in self.all_elements]
             except (TypeError, ValueError):
@@ -248,7 +253,9 @@ class SortingLadderSession(SyncBase):
     # 2. active_element: This is the ONE item players must drag into the correct gap.
     # 3. shuffled_item_ids: Comma-separated IDs representing the shared shuffled
     #    order of SortingItem records for the current question. All participants
-    #    see/operate over this same order.
+    #    start from this same order; it is written when the question starts and
+    #    only read afterwards (each participant's ladder lives in
+    #    sorting_ladder/rounds.py).
     placed_elements = models.ManyToManyField(SortingItem, related_name='sessions_as_placed', blank=True)
     active_element = models.ForeignKey(SortingItem, on_delete=models.SET_NULL, null=True, blank=True, related_name='sessions_as_active')
     shuffled_item_ids = models.TextField(blank=True, default="")
@@ -0,0 +1,295 @@
+"""In-memory round engine of the Sorting Ladder questions.
+
+When a question starts, its items are loaded once: ``ranks`` maps each
+item ID to its position in the correct order and ``correct_order`` lists
+the IDs in that order. A round submission is then checked without queries:
+
+* set membership for unknown and duplicate IDs;
+* one pass over the submitted ranks for the order (non-decreasing).
+
+Per participant the engine counts played and correct rounds of the
+question, which answer "more rounds left?" and the question's points. A
+submission is persisted with one ``RoundSubmission`` insert, graded here
+instead of in ``RoundSubmission.save()``, and, if correct, one ``UPDATE``
+adding the round and the points to the participant.
+
+Each participant also has a ``Ladder``: the items already placed, in
+correct order, followed by the ones still to place, in the question's
+shuffled order. The shuffled order is written to the session row once when
+the question starts and only read afterwards, so players submitting at the
+same time neither wait on that row nor overwrite each other's ladder.
+
+Rounds live in process memory like the room replay buffers (see
+games_hub/replay.py). A question that is not loaded (after a restart, or
+started by another worker) is loaded on its first submission, and a
+participant's counters and ladder are read from their submissions once:
+the ladder places the items of their latest round.
+"""
+import random
+import threading
+import time
+from array import array
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from games_hub.status import bump_room_version
+
+from .models import (
+    RoundSubmission,
+    SortingItem,
+    SortingLadderGame,
+    SortingLadderParticipant,
+    SortingLadderSession,
+    SortingQuestion,
+)
+
+
+_rounds = {}
+_rounds_lock = threading.Lock()
+
+
+class Ladder:
+    """Ladder of one participant: ``items[:placed]`` are placed, the rest are still to place."""
+
+    __slots__ = ('items', 'placed')
+
+    def __init__(self, shuffled):
+        self.items = array('q', shuffled)
+        self.placed = 0
+
+    def place(self, sorted_ids):
+        """Make ``sorted_ids`` (in correct order) the placed items; the others keep their order."""
+        on_ladder = set(sorted_ids)
+        remaining = [item_id for item_id in self.items if item_id not in on_ladder]
+        self.items = array('q', sorted_ids)
+        self.items.extend(remaining)
+        self.placed = len(sorted_ids)
+
+    @property
+    def placed_ids(self):
+        return self.items[:self.placed].tolist()
+
+    @property
+    def remaining_ids(self):
+        return self.items[self.placed:].tolist()
+
+
+class QuestionRounds:
+    """Correct order of one question and the round counters and ladders of its players."""
+
+    def __init__(self, quiz_id, question_id, points, correct_order, shuffled=None):
+        self.quiz_id = quiz_id
+        self.question_id = question_id
+        self.points = points
+        self.correct_order = list(correct_order)
+        self.ranks = {item_id: rank for rank, item_id in enumerate(self.correct_order)}
+        shuffled = list(shuffled or ())
+        # A shuffled order that no longer matches the items falls back to the correct one
+        if len(shuffled) != len(self.ranks) or set(shuffled) != self.ranks.keys():
+            shuffled = self.correct_order
+        self.shuffled = tuple(shuffled)
+        # participant id -> [rounds played, rounds correct]
+        self.counters = {}
+        # participant id -> Ladder
+        self.ladders = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, quiz_id, question):
+        ids = SortingItem.objects.filter(topic_id=question.id).order_by('correct_rank').values_list('id', flat=True)
+        shuffled = SortingLadderSession.objects.filter(quiz_id=quiz_id).values_list('shuffled_item_ids', flat=True).first()
+        shuffled = [int(x) for x in (shuffled or '').split(',') if x]
+        return cls(quiz_id, question.id, question.points, ids, shuffled)
+
+    @property
+    def item_count(self):
+        return len(self.correct_order)
+
+    def grade(self, item_ids):
+        """Return True/False for a valid submission (in correct order or not), None if invalid."""
+        ranks = self.ranks
+        if not item_ids or len(set(item_ids)) != len(item_ids):
+            return None
+        if any(item_id not in ranks for item_id in item_ids):
+            return None
+        previous = -1
+        for item_id in item_ids:
+            rank = ranks[item_id]
+            if rank < previous:
+                return False
+            previous = rank
+        return True
+
+    def sorted_ids(self, item_ids):
+        return sorted(item_ids, key=self.ranks.__getitem__)
+
+    def _counters(self, participant_id):
+        counters = self.counters.get(participant_id)
+        if counters is None:
+            totals = RoundSubmission.objects.filter(
+                quiz_id=self.quiz_id, participant_id=participant_id, question_id=self.question_id,
+            ).aggregate(played=Count('id'), correct=Count('id', filter=Q(is_correct=True)))
+            counters = self.counters[participant_id] = [totals['played'], totals['correct']]
+        return counters
+
+    def record(self, participant, item_ids, is_correct):
+        """Persist one round of ``participant``; return ``(rounds played, rounds correct)`` of the question."""
+        with self._lock:
+            counters = self._counters(participant.id)
+            submission = RoundSubmission(
+                quiz_id=self.quiz_id,
+                participant=participant,
+                question_id=self.question_id,
+                all_elements=list(item_ids),
+                is_correct=is_correct,
+            )
+            submission.save(grade=False)
+            counters[0] += 1
+            if is_correct:
+                counters[1] += 1
+        if is_correct:
+            SortingLadderParticipant.objects.filter(pk=participant.pk).update(
+                rounds_survived=F('rounds_survived') + 1,
+                total_score=F('total_score') + self.points,
+                synced=False,
+                updated_at=timezone.now(),
+            )
+            participant.rounds_survived += 1
+            participant.total_score += self.points
+            # update() sends no post_save; the status endpoints must see the new score
+            bump_room_version('sorting_ladder', self.quiz_id)
+        return counters[0], counters[1]
+
+    def _ladder(self, participant_id):
+        ladder = self.ladders.get(participant_id)
+        if ladder is None:
+            ladder = self.ladders[participant_id] = Ladder(self.shuffled)
+            rounds = RoundSubmission.objects.filter(
+                quiz_id=self.quiz_id, participant_id=participant_id, question_id=self.question_id,
+            ).order_by('-id').values_list('all_elements', flat=True)
+            # Timed out rounds submit nothing and leave the ladder as it was
+            latest = next((item_ids for item_ids in rounds.iterator() if item_ids), [])
+            placed = [item_id for item_id in latest if item_id in self.ranks]
+            if placed:
+                ladder.place(self.sorted_ids(placed))
+        return ladder
+
+    def ladder(self, participant_id):
+        with self._lock:
+            return self._ladder(participant_id)
+
+    def place(self, participant, sorted_ids):
+        """Put a graded submission's items on the participant's ladder and return it."""
+        with self._lock:
+            ladder = self._ladder(participant.id)
+            ladder.place(sorted_ids)
+        return ladder
+
+    def has_more_rounds(self, played):
+        # Every player gets one round less than there are items
+        return played < self.item_count - 1
+
+
+def start_question(quiz_id, question, item_ids=None, shuffled_ids=None):
+    """Load the rounds of a question that was just sent; ``item_ids`` in correct order saves the queries."""
+    if item_ids is None:
+        rounds = QuestionRounds.load(quiz_id, question)
+    else:
+        rounds = QuestionRounds(quiz_id, question.id, question.points, item_ids, shuffled_ids)
+    with _rounds_lock:
+        _rounds[quiz_id] = rounds
+    return rounds
+
+
+def question_rounds(quiz_id, question):
+    """Rounds of the quiz's current ``question``, loaded if this process has not yet."""
+    with _rounds_lock:
+        rounds = _rounds.get(quiz_id)
+    if rounds is None or rounds.question_id != question.id:
+        rounds = start_question(quiz_id, question)
+    return rounds
+
+
+def end_question(quiz_id):
+    with _rounds_lock:
+        _rounds.pop(quiz_id, None)
+
+
+def submission_benchmark(player_counts, item_count=8, session_row=False):
+    """Return ``[(players, submissions, per_second, queries_per_submission, row_writes_per_submission)]``.
+
+    Every run plays one question of ``item_count`` items the way a room
+    does: round by round, each player submits their ladder plus the next
+    item, in a random order (graded, recorded and placed). The quiz, its
+    players and their submissions are created in a transaction that is
+    rolled back.
+
+    ``session_row=True`` plays the previous path for comparison: every
+    submission also reads the session row and rewrites its
+    ``shuffled_item_ids``. ``row_writes_per_submission`` counts those
+    writes to the row all players of the room share. Players submit one
+    after another, so the numbers are the cost of a submission and how
+    often it writes the shared row, not the lock waits of concurrent
+    submitters; those happen at exactly these writes.
+    """
+    session_table = SortingLadderSession._meta.db_table
+    rows = []
+    for players in player_counts:
+        with transaction.atomic():
+            user = get_user_model().objects.create(username=f'bench-{time.monotonic_ns()}')
+            quiz = SortingLadderGame.objects.create(creator=user)
+            question = SortingQuestion.objects.create(question_text='Benchmark', created_by=user)
+            items = SortingItem.objects.bulk_create(
+                SortingItem(topic=question, text=f'Item {rank}', correct_rank=rank) for rank in range(item_count)
+            )
+            participants = SortingLadderParticipant.objects.bulk_create(
+                SortingLadderParticipant(quiz=quiz, name=f'Player {i}') for i in range(players)
+            )
+            shuffled = [item.pk for item in items]
+            random.shuffle(shuffled)
+            SortingLadderSession.objects.create(quiz=quiz, shuffled_item_ids=','.join(map(str, shuffled)))
+            rounds = QuestionRounds(quiz.pk, question.pk, question.points, sorted(shuffled), shuffled)
+            for participant in participants:
+                rounds.counters[participant.pk] = [0, 0]
+                rounds.ladders[participant.pk] = Ladder(shuffled)
+
+            submissions = queries = row_writes = 0
+
+            def count_query(execute, sql, params, many, context):
+                nonlocal queries, row_writes
+                queries += 1
+                if sql.startswith('UPDATE') and session_table in sql:
+                    row_writes += 1
+                return execute(sql, params, many, context)
+
+            start = time.perf_counter()
+            with connection.execute_wrapper(count_query):
+                for visible in range(2, item_count + 1):
+                    for participant in participants:
+                        ladder = rounds.ladder(participant.pk)
+                        item_ids = ladder.placed_ids + ladder.remaining_ids[:visible - ladder.placed]
+                        random.shuffle(item_ids)
+                        is_correct = rounds.grade(item_ids)
+                        rounds.record(participant, item_ids, is_correct)
+                        sorted_ids = rounds.sorted_ids(item_ids)
+                        if session_row:
+                            _rewrite_session_order(quiz.pk, sorted_ids)
+                        rounds.place(participant, sorted_ids)
+                        submissions += 1
+            elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        rows.append((players, submissions, submissions / elapsed, queries / submissions, row_writes / submissions))
+    return rows
+
+
+def _rewrite_session_order(quiz_id, sorted_ids):
+    # What a submission did before the ladders: the shared order's prefix
+    # became the submitter's placed items
+    session = SortingLadderSession.objects.get(quiz_id=quiz_id)
+    placed = set(sorted_ids)
+    remaining = [int(x) for x in session.shuffled_item_ids.split(',') if x and int(x) not in placed]
+    session.shuffled_item_ids = ','.join(str(i) for i in list(sorted_ids) + remaining)
+    session.save(update_fields=['shuffled_item_ids'])
@@ -1,3 +1,162 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from games_hub.status import aroom_version
+
+from .consumers import SortingLadderGameConsumer
+from .models import (
+    RoundSubmission,
+    SortingItem,
+    SortingLadderGame,
+    SortingLadderParticipant,
+    SortingLadderSession,
+    SortingQuestion,
+)
+from .rounds import Ladder, end_question, question_rounds, start_question, submission_benchmark
+
+
+class QuestionRoundsTest(TestCase):
+    """Runden einer Frage: einmal geladene Reihenfolge, Zähler im Speicher, ein Insert pro Abgabe."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = SortingLadderGame.objects.create(creator=user)
+        self.question = SortingQuestion.objects.create(question_text='Einwohner', points=10, created_by=user)
+        self.items = [
+            SortingItem.objects.create(topic=self.question, text=text, correct_rank=rank)
+            for rank, text in enumerate(['Malta', 'Irland', 'Polen', 'Deutschland'], start=1)
+        ]
+        self.participant = SortingLadderParticipant.objects.create(quiz=self.quiz, name='Anna')
+        self.addCleanup(end_question, self.quiz.id)
+
+    def ids(self, *positions):
+        return [self.items[i].id for i in positions]
+
+    def test_grade(self):
+        """Ungültige Abgaben (leer, doppelt, fremd) ergeben None, sonst zählt die Reihenfolge."""
+        rounds = start_question(self.quiz.id, self.question)
+        self.assertEqual(rounds.correct_order, self.ids(0, 1, 2, 3))
+        self.assertIs(rounds.grade(self.ids(0, 2)), True)
+        self.assertIs(rounds.grade(self.ids(2, 0)), False)
+        self.assertIsNone(rounds.grade([]))
+        self.assertIsNone(rounds.grade(self.ids(1, 1)))
+        self.assertIsNone(rounds.grade(self.ids(1) + [0]))
+        self.assertEqual(rounds.sorted_ids(self.ids(3, 0, 2)), self.ids(0, 2, 3))
+
+    def test_record_queries_and_counters(self):
+        """Eine falsche Runde kostet ein Insert, eine richtige zusätzlich ein Update des Teilnehmers."""
+        rounds = start_question(self.quiz.id, self.question, self.ids(0, 1, 2, 3))
+        rounds.counters[self.participant.id] = [0, 0]
+
+        with self.assertNumQueries(1):
+            self.assertEqual(rounds.record(self.participant, self.ids(1, 0), False), (1, 0))
+        version = async_to_sync(aroom_version)('sorting_ladder', self.quiz.id)
+        with self.assertNumQueries(2):
+            self.assertEqual(rounds.record(self.participant, self.ids(0, 1), True), (2, 1))
+        self.assertNotEqual(async_to_sync(aroom_version)('sorting_ladder', self.quiz.id), version)
+
+        self.participant.refresh_from_db()
+        self.assertEqual((self.participant.rounds_survived, self.participant.total_score), (1, 10))
+        self.assertEqual(RoundSubmission.objects.filter(quiz=self.quiz, is_correct=True).count(), 1)
+        self.assertTrue(rounds.has_more_rounds(2))
+        self.assertFalse(rounds.has_more_rounds(3))
+
+    def test_counters_are_read_once_after_restart(self):
+        """Ohne geladene Frage werden Reihenfolge und Zähler einmal aus der Datenbank gelesen."""
+        RoundSubmission.objects.create(
+            quiz=self.quiz, participant=self.participant, question=self.question, all_elements=self.ids(0, 1),
+        )
+        end_question(self.quiz.id)
+
+        rounds = question_rounds(self.quiz.id, self.question)
+        self.assertIs(question_rounds(self.quiz.id, self.question), rounds)
+        with self.assertNumQueries(2):
+            self.assertEqual(rounds.record(self.participant, self.ids(2, 1), False), (2, 1))
+
+
+class LadderTest(TestCase):
+    """Leiterstand je Teilnehmer statt der gemeinsamen Sitzungszeile."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = SortingLadderGame.objects.create(creator=user)
+        self.question = SortingQuestion.objects.create(question_text='Höhe', created_by=user)
+        self.items = [
+            SortingItem.objects.create(topic=self.question, text=text, correct_rank=rank)
+            for rank, text in enumerate(['Hügel', 'Berg', 'Gipfel', 'Vulkan'], start=1)
+        ]
+        self.addCleanup(end_question, self.quiz.id)
+
+    def test_place_keeps_remaining_order(self):
+        """Platzierte Elemente stehen vorn in richtiger Reihenfolge, der Rest behält die Mischung."""
+        ladder = Ladder([4, 2, 3, 1])
+        ladder.place([2, 4])
+        self.assertEqual((ladder.placed_ids, ladder.remaining_ids), ([2, 4], [3, 1]))
+        ladder.place([1, 2, 4])
+        self.assertEqual((ladder.placed_ids, ladder.remaining_ids), ([1, 2, 4], [3]))
+
+    def test_ladders_are_per_participant(self):
+        """Abgaben zweier Spieler überschreiben sich nicht; die Sitzung bleibt unverändert."""
+        shuffled = [self.items[i].id for i in (2, 0, 3, 1)]
+        session = SortingLadderSession.objects.create(quiz=self.quiz, shuffled_item_ids=','.join(map(str, shuffled)))
+        end_question(self.quiz.id)
+        rounds = question_rounds(self.quiz.id, self.question)
+        self.assertEqual(rounds.shuffled, tuple(shuffled))
+
+        anna = SortingLadderParticipant.objects.create(quiz=self.quiz, name='Anna')
+        ben = SortingLadderParticipant.objects.create(quiz=self.quiz, name='Ben')
+        rounds.place(anna, rounds.sorted_ids(shuffled[:2]))
+        rounds.place(ben, rounds.sorted_ids(shuffled[1:3]))
+
+        self.assertEqual(rounds.ladder(anna.id).placed_ids, [self.items[0].id, self.items[2].id])
+        self.assertEqual(rounds.ladder(ben.id).placed_ids, [self.items[0].id, self.items[3].id])
+        self.assertEqual(rounds.ladder(ben.id).remaining_ids, [self.items[2].id, self.items[1].id])
+        session.refresh_from_db()
+        self.assertEqual(session.shuffled_item_ids, ','.join(map(str, shuffled)))
+
+    def test_round_result_carries_the_ladder(self):
+        """Das Rundenergebnis enthält die Leiter des Spielers, auch nach einer abgelaufenen Runde."""
+        shuffled = [self.items[i].id for i in (2, 0, 3, 1)]
+        self.quiz.current_question = self.question
+        self.quiz.save()
+        start_question(self.quiz.id, self.question, [item.id for item in self.items], shuffled)
+        SortingLadderParticipant.objects.create(quiz=self.quiz, name='Anna', hub_session_code='HUB1')
+
+        consumer = SortingLadderGameConsumer()
+        consumer.scope, consumer.room_code = {}, self.quiz.room_code
+        save = async_to_sync(consumer.save_round_full_order)
+        result = save('Anna', 'HUB1', shuffled[:2])
+        placed = [self.items[0].id, self.items[2].id]
+        self.assertEqual((result['placed_ids'], result['remaining_ids']), (placed, [self.items[3].id, self.items[1].id]))
+
+        result = save('Anna', 'HUB1', [], round_time_out=True)
+        self.assertEqual((result['correct_order_ids'], result['placed_ids']), ([], placed))
+
+    def test_ladder_is_rebuilt_from_the_latest_round(self):
+        """Ohne Leiter im Speicher (Neustart, anderer Worker) gilt die letzte Abgabe des Spielers."""
+        rounds = start_question(self.quiz.id, self.question)
+        anna = SortingLadderParticipant.objects.create(quiz=self.quiz, name='Anna')
+        rounds.record(anna, [self.items[2].id, self.items[0].id], False)
+        rounds.record(anna, [self.items[3].id, self.items[0].id, self.items[1].id], False)
+        rounds.record(anna, [], False)
+
+        end_question(self.quiz.id)
+        with self.assertNumQueries(3):
+            ladder = question_rounds(self.quiz.id, self.question).ladder(anna.id)
+        self.assertEqual(ladder.placed_ids, [self.items[0].id, self.items[1].id, self.items[3].id])
+        self.assertEqual(ladder.remaining_ids, [self.items[2].id])
+
+    def test_submission_benchmark_rolls_back(self):
+        """Der Benchmark spielt jede Runde für alle Spieler und hinterlässt keine Zeilen."""
+        games = SortingLadderGame.objects.count()
+        (players, submissions, per_second, queries, row_writes), = submission_benchmark([3], item_count=4)
+        self.assertEqual((players, submissions), (3, 9))
+        self.assertGreater(per_second, 0)
+        self.assertLess(queries, 2)
+        self.assertEqual(row_writes, 0)
+
+        (players, submissions, _, queries, row_writes), = submission_benchmark([3], item_count=4, session_row=True)
+        self.assertEqual((submissions, row_writes), (9, 1))
+        self.assertGreater(queries, 2)
+        self.assertEqual(SortingLadderGame.objects.count(), games)
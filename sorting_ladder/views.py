@@ -4,6 +4,9 @@ from django.views.decorators.http import require_POST
 from django.utils import timezone
 import json
 
+from games_hub.enrolment import resolve_play_participant
+from games_hub.status import record_activity, versioned_status
+from games_hub.tokens import get_participant_or_404, issue_token
 from .models import SortingLadderGame, SortingLadderParticipant
 
 
@@ -72,7 +75,7 @@ def join_view(request):
                 participant.hub_session_code = hub_session
             participant.save()
 
-        return JsonResponse({'success': True, 'participant_id': participant.id, 'game_status': quiz.status})
+        return JsonResponse({'success': True, 'participant_id': participant.id, 'token': issue_token(participant), 'game_status': quiz.status})
 
     except json.JSONDecodeError:
         return JsonResponse({'success': False, 'error': 'Invalid request format.'})
@@ -105,18 +108,10 @@ def play(request, room_code, participant_name):
     """Sorting Ladder play page for participants."""
     try:
         session_code = request.GET.get('hub_session')
-        quiz = get_object_or_404(SortingLadderGame, room_code=room_code)
-        participant = get_object_or_404(
-            SortingLadderParticipant,
-            quiz=quiz,
-            name=participant_name,
-            hub_session_code=session_code,
+        quiz, participant = resolve_play_participant(
+            request, SortingLadderGame, SortingLadderParticipant, room_code, participant_name
         )
 
-        participant.is_active = True
-        participant.last_activity = timezone.now()
-        participant.save()
-
         context = {
             'quiz': quiz,
             'participant': participant,
@@ -128,20 +123,16 @@ def play(request, room_code, participant_name):
         return redirect('sorting_ladder:join')
 
 
+@versioned_status('sorting_ladder')
 def get_game_status(request, room_code, participant_name):
     """Get current Sorting Ladder status for a participant."""
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(SortingLadderGame, room_code=room_code)
-        participant = get_object_or_404(
-            SortingLadderParticipant,
-            quiz=quiz,
-            name=participant_name,
-            hub_session_code=session_code,
-        )
+        participant = get_participant_or_404(request, SortingLadderParticipant, quiz, participant_name)
 
-        participant.last_activity = timezone.now()
-        participant.save()
+        # Polls are presence heartbeats (see games_hub/presence.py)
+        record_activity(participant, f'sortingladder_{room_code}')
 
         status_data = {
             'game_status': quiz.status,
@@ -160,12 +151,7 @@ def leave_game(request, room_code, participant_name):
     try:
         session_code = request.GET.get('hub_session')
         quiz = get_object_or_404(SortingLadderGame, room_code=room_code)
-        participant = get_object_or_404(
-            SortingLadderParticipant,
-            quiz=quiz,
-            name=participant_name,
-            hub_session_code=session_code,
-        )
+        participant = get_participant_or_404(request, SortingLadderParticipant, quiz, participant_name)
         participant.is_active = False
         participant.save()
         return JsonResponse({'success': True})
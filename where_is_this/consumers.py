@@ -1,15 +1,29 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
+from .guesses import discard_quiz, guess_summary, start_question
 from .models import WhereQuiz, WhereParticipant, WhereQuestion, WhereAnswer
+from games_hub.guard import GuardMixin
+from games_hub.logs import bind_log_context
+from games_hub.metrics import MetricsMixin
+from games_hub.prefetch import PrefetchMixin, asset_url
+from games_hub.presence import PresenceMixin
+from games_hub.profiling import ProfilingMixin
+from games_hub.replay import ResumableRoomMixin
+from games_hub.tokens import participant_lookup
+from games_hub.wire import BinaryProtocolMixin
 from games_hub.models import HubGameStep
 
+logger = logging.getLogger(__name__)
 
-class WhereConsumer(AsyncWebsocketConsumer):
+
+class WhereConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, ResumableRoomMixin, PrefetchMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_code = self.scope['url_route']['kwargs']['room_code']
         self.room_group_name = f'where_{self.room_code}'
+        bind_log_context(room=self.room_code)
 
         # Join room group
         await self.channel_layer.group_add(
@@ -24,6 +38,7 @@ class WhereConsumer(AsyncWebsocketConsumer):
             'type': 'connection_established',
             'message': 'Connected to Where is this? quiz session'
         }))
+        await self.join_prefetch_staff()
 
     async def disconnect(self, close_code):
         # Leave room group
@@ -31,6 +46,7 @@ class WhereConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             self.channel_name
         )
+        await self.leave_prefetch_staff()
 
     # Receive message from WebSocket
     async def receive(self, text_data):
@@ -38,7 +54,7 @@ class WhereConsumer(AsyncWebsocketConsumer):
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get('type')
             
-            print("Where_is_this Consumer: ", message_type)
+            logger.debug('Received %s', message_type)
             if message_type == 'admin_start_quiz':
                 await self.handle_admin_start_quiz(text_data_json)
             elif message_type == 'admin_send_question':
@@ -51,6 +67,8 @@ class WhereConsumer(AsyncWebsocketConsumer):
                 await self.handle_participant_submit_answer(text_data_json)
             elif message_type == 'participant_join':
                 await self.handle_participant_join(text_data_json)
+            elif message_type == 'prefetch_ready':
+                await self.handle_prefetch_ready(text_data_json)
             elif message_type == 'ping':
                 await self.handle_ping()
                 
@@ -65,15 +83,16 @@ class WhereConsumer(AsyncWebsocketConsumer):
         quiz = await self.get_quiz()
         if quiz:
             await self.start_quiz_db(quiz.id)
+            self.reset_prefetch()
             
             # Broadcast to all participants
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_started',
                     'message': 'Where is this? Quiz has started!'
                 }
             )
+            await self.announce_prefetch(quiz, None)
 
     async def handle_admin_send_question(self, data):
         """Handle admin sending a new question"""
@@ -110,6 +129,8 @@ class WhereConsumer(AsyncWebsocketConsumer):
 
         # Update quiz with new question
         await self.update_quiz_question(quiz, question)
+        self.question_asked(question.id)
+        await database_sync_to_async(start_question)(quiz.id, question.id)
         
         # Get question data
         question_data = await self.get_question_data(question)
@@ -118,8 +139,7 @@ class WhereConsumer(AsyncWebsocketConsumer):
         effective_time_limit = custom_time_limit if custom_time_limit is not None else question.time_limit
 
         # Broadcast new question to all participants
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_started',
                 'question': {
@@ -138,26 +158,33 @@ class WhereConsumer(AsyncWebsocketConsumer):
         """Handle admin ending current question"""
         quiz = await self.get_quiz()
         if quiz:
+            # Where everyone guessed, from the question's grid index
+            guesses = await self.get_guess_summary(quiz)
+
             await self.clear_current_question(quiz.id)
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'question_ended',
-                    'message': 'Question time is up!'
+                    'message': 'Question time is up!',
+                    'guesses': guesses
                 }
             )
 
+            # Phones load the next question's image during the reveal
+            await self.announce_prefetch(quiz, quiz.current_question_id)
+
     async def handle_admin_end_quiz(self, data):
         """Handle admin ending the quiz"""
         quiz = await self.get_quiz()
         if quiz:
             await self.end_quiz_db(quiz.id)
+            self.reset_prefetch()
+            discard_quiz(quiz.id)
             # Collect final scores
             final_scores = await self.get_final_scores()
             
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_ended',
                     'message': 'Where is this? Quiz has ended. Thank you for participating!',
@@ -206,8 +233,7 @@ class WhereConsumer(AsyncWebsocketConsumer):
             }))
 
             # Broadcast to admin dashboard (live answers)
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_answered',
                     'answer': {
@@ -229,11 +255,16 @@ class WhereConsumer(AsyncWebsocketConsumer):
         participant = await self.get_participant_by_name(participant_name, session_code)
         
         if participant:
-            await self.mark_participant_active(participant['id'])
-            
+            self.join_presence(WhereParticipant, participant['id'], self.room_group_name, session_code)
+
+        # Reconnects replay missed room events from memory when possible; the
+        # socket joins presence first so a resumed player still counts
+        if await self.resume(data):
+            return
+
+        if participant:
             # Broadcast to admin
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_joined',
                     'participant': {
@@ -250,6 +281,7 @@ class WhereConsumer(AsyncWebsocketConsumer):
                     'type': 'quiz_started',
                     'message': 'Quiz is already in progress'
                 }))
+                await self.send_pending_prefetch()
 
     async def handle_ping(self):
         """Handle ping for keeping connection alive"""
@@ -276,7 +308,8 @@ class WhereConsumer(AsyncWebsocketConsumer):
         """Send question ended message"""
         await self.send(text_data=json.dumps({
             'type': 'question_ended',
-            'message': event['message']
+            'message': event['message'],
+            'guesses': event.get('guesses')
         }))
 
     async def quiz_ended(self, event):
@@ -336,7 +369,7 @@ class WhereConsumer(AsyncWebsocketConsumer):
     def get_participant_by_name(self, participant_name, hub_session):
         try:
             quiz = WhereQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session))
             return {
                 'id': participant.id,
                 'name': participant.name,
@@ -372,6 +405,16 @@ class WhereConsumer(AsyncWebsocketConsumer):
         quiz.question_start_time = timezone.now()
         quiz.save()
 
+    @database_sync_to_async
+    def get_guess_summary(self, quiz):
+        """Heatmap and clusters of the current question's guesses, with the correct location"""
+        question = quiz.current_question
+        if not question:
+            return None
+        summary = guess_summary(quiz.id, question.id)
+        summary['correct'] = [question.correct_latitude, question.correct_longitude]
+        return summary
+
     @database_sync_to_async
     def clear_current_question(self, quiz_id):
         try:
@@ -385,14 +428,14 @@ class WhereConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def get_question_data(self, question):
         return {
-            'image_url': question.image.url if question.image else None
+            'image_url': asset_url(question.image)
         }
 
     @database_sync_to_async
     def save_participant_answer(self, participant_name, hub_session_code, latitude, longitude, time_taken):
         try:
             quiz = WhereQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
             
             if not quiz.current_question:
                 return None
@@ -430,16 +473,6 @@ class WhereConsumer(AsyncWebsocketConsumer):
         except (WhereQuiz.DoesNotExist, WhereParticipant.DoesNotExist, ValueError, TypeError):
             return None
 
-    @database_sync_to_async
-    def mark_participant_active(self, participant_id):
-        try:
-            participant = WhereParticipant.objects.get(id=participant_id)
-            participant.is_active = True
-            participant.last_activity = timezone.now()
-            participant.save()
-        except WhereParticipant.DoesNotExist:
-            pass
-
     @database_sync_to_async
     def get_final_scores(self):
         try:
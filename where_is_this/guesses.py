@@ -0,0 +1,178 @@
+"""Where everyone guessed: a grid index of the answers to each question.
+
+Every saved answer is added to the grid of its question: the map is cut
+into cells of ``WHERE_GUESS_CELL_DEGREES`` and each cell keeps a count, the
+sum of its coordinates and its closest guess. At the reveal ``summary``
+walks the cells once instead of the answer rows:
+
+* ``heatmap``: ``[lat, lon, count]`` per occupied cell, at the centroid of
+  its guesses;
+* ``clusters``: neighbouring cells merged (across the date line too), with
+  centroid, count and closest guess, largest first;
+* ``closest``: the ``WHERE_GUESS_CLOSEST`` best guesses of the question.
+
+The summary goes out with ``question_ended``. Grids live in process memory
+like the room replay buffers (see games_hub/replay.py), so only answers
+saved by this worker reach them. At the reveal one ``COUNT`` checks the
+grid against the question's answer rows; a grid that is missing (after a
+restart) or missed answers (saved by another worker) is indexed from the
+rows instead.
+"""
+import heapq
+import math
+import threading
+
+from django.conf import settings
+
+from .models import WhereAnswer
+
+
+DEFAULT_CELL_DEGREES = 2.0
+DEFAULT_CLOSEST = 3
+MAX_CLUSTERS = 10
+
+_grids = {}
+_grids_lock = threading.Lock()
+
+
+class GuessGrid:
+    """Guesses of one question, bucketed into grid cells."""
+
+    def __init__(self, cell_degrees, closest=DEFAULT_CLOSEST):
+        self.cell = cell_degrees
+        self.columns = max(1, math.ceil(360 / cell_degrees))
+        self.cells = {}
+        self.count = 0
+        self.closest_size = closest
+        # (-distance, -order, name, lat, lon) of the best guesses, worst on top
+        self._closest = []
+        self._lock = threading.Lock()
+
+    def key(self, lat, lon):
+        row = math.floor((min(max(lat, -90.0), 90.0) + 90) / self.cell)
+        column = math.floor(((lon + 180) % 360) / self.cell) % self.columns
+        return row, column
+
+    def add(self, name, lat, lon, distance_km):
+        guess = (distance_km, name, lat, lon)
+        key = self.key(lat, lon)
+        with self._lock:
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = [0, 0.0, 0.0, guess]
+            cell[0] += 1
+            cell[1] += lat
+            cell[2] += lon
+            if distance_km < cell[3][0]:
+                cell[3] = guess
+            self.count += 1
+            # Ties go to the earlier guess
+            entry = (-distance_km, -self.count, name, lat, lon)
+            if len(self._closest) < self.closest_size:
+                heapq.heappush(self._closest, entry)
+            elif entry > self._closest[0]:
+                heapq.heapreplace(self._closest, entry)
+
+    def _clusters(self, cells):
+        """Connected groups of cell keys (8-neighbourhood, columns wrap around)."""
+        seen = set()
+        for start in cells:
+            if start in seen:
+                continue
+            seen.add(start)
+            group, stack = [], [start]
+            while stack:
+                row, column = stack.pop()
+                group.append((row, column))
+                for dr in (-1, 0, 1):
+                    for dc in (-1, 0, 1):
+                        near = (row + dr, (column + dc) % self.columns)
+                        if near in cells and near not in seen:
+                            seen.add(near)
+                            stack.append(near)
+            yield group
+
+    def summary(self):
+        with self._lock:
+            cells = {key: list(cell) for key, cell in self.cells.items()}
+            closest = sorted(self._closest, reverse=True)
+            count = self.count
+
+        heatmap = [
+            [round(lat_sum / n, 4), round(lon_sum / n, 4), n]
+            for n, lat_sum, lon_sum, _ in cells.values()
+        ]
+        clusters = []
+        for group in self._clusters(cells):
+            n = sum(cells[key][0] for key in group)
+            lat = sum(cells[key][1] for key in group) / n
+            # Longitudes around the date line: average on the circle
+            x = sum(math.cos(math.radians(cells[key][2] / cells[key][0])) * cells[key][0] for key in group)
+            y = sum(math.sin(math.radians(cells[key][2] / cells[key][0])) * cells[key][0] for key in group)
+            distance, name, _, _ = min(cells[key][3] for key in group)
+            clusters.append({
+                'lat': round(lat, 4),
+                'lon': round(math.degrees(math.atan2(y, x)), 4),
+                'count': n,
+                'closest': {'name': name, 'distance_km': round(distance, 1)},
+            })
+        clusters.sort(key=lambda cluster: (-cluster['count'], cluster['closest']['distance_km']))
+        return {
+            'count': count,
+            'cell_degrees': self.cell,
+            'heatmap': heatmap,
+            'clusters': clusters[:MAX_CLUSTERS],
+            'closest': [
+                {'name': name, 'lat': lat, 'lon': lon, 'distance_km': round(-distance, 1)}
+                for distance, _, name, lat, lon in closest
+            ],
+        }
+
+
+def _new_grid():
+    return GuessGrid(
+        getattr(settings, 'WHERE_GUESS_CELL_DEGREES', DEFAULT_CELL_DEGREES),
+        getattr(settings, 'WHERE_GUESS_CLOSEST', DEFAULT_CLOSEST),
+    )
+
+
+def _index(quiz_id, question_id):
+    grid = _new_grid()
+    rows = WhereAnswer.objects.filter(quiz_id=quiz_id, question_id=question_id).values_list(
+        'participant__name', 'user_latitude', 'user_longitude', 'distance_km',
+    )
+    for name, lat, lon, distance in rows:
+        grid.add(name, lat, lon, distance)
+    return grid
+
+
+def record_guess(answer):
+    """Add a saved ``WhereAnswer`` to its question's grid (if that grid is indexed)."""
+    with _grids_lock:
+        grid = _grids.get((answer.quiz_id, answer.question_id))
+    if grid is None:
+        # Indexed from the rows, this answer included, when it is needed
+        return
+    grid.add(answer.participant.name, answer.user_latitude, answer.user_longitude, answer.distance_km)
+
+
+def start_question(quiz_id, question_id):
+    """Index a question that was just sent (a question sent again keeps its answers)."""
+    grid = _index(quiz_id, question_id)
+    with _grids_lock:
+        _grids[(quiz_id, question_id)] = grid
+
+
+def guess_summary(quiz_id, question_id):
+    """Heatmap, clusters and closest guesses of a question; its grid is dropped."""
+    with _grids_lock:
+        grid = _grids.pop((quiz_id, question_id), None)
+    if grid is None or grid.count != WhereAnswer.objects.filter(quiz_id=quiz_id, question_id=question_id).count():
+        grid = _index(quiz_id, question_id)
+    return grid.summary()
+
+
+def discard_quiz(quiz_id):
+    with _grids_lock:
+        for key in [key for key in _grids if key[0] == quiz_id]:
+            del _grids[key]
@@ -1,4 +1,4 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 
 from .models import (
@@ -8,6 +8,7 @@ from .models import (
     WhereAnswer,
     WhereSession,
 )
+from .guesses import record_guess
 
 
 def _mark_unsynced(instance):
@@ -22,3 +23,10 @@ def _mark_unsynced(instance):
 @receiver(pre_save, sender=WhereSession)
 def mark_where_models_unsynced(sender, instance, **kwargs):  # noqa: D401
     _mark_unsynced(instance)
+
+
+@receiver(post_save, sender=WhereAnswer)
+def index_where_guess(sender, instance, created, **kwargs):
+    # Every way an answer is saved (socket, HTTP fallback) feeds the reveal heatmap
+    if created:
+        record_guess(instance)
@@ -1,3 +1,80 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from .guesses import GuessGrid, discard_quiz, guess_summary, start_question
+from .models import WhereAnswer, WhereParticipant, WhereQuestion, WhereQuiz
+
+
+class GuessGridTest(TestCase):
+    """Rasterindex der Tipps für Heatmap und Cluster beim Auflösen."""
+
+    def test_cells_clusters_and_closest(self):
+        """Benachbarte Zellen bilden einen Cluster, auch über die Datumsgrenze; die besten Tipps stehen vorn."""
+        grid = GuessGrid(2.0, closest=2)
+        grid.add('Anna', 52.5, 13.4, 5.0)
+        grid.add('Ben', 52.6, 13.3, 12.0)
+        grid.add('Cleo', 50.1, 14.4, 280.0)
+        grid.add('Dana', -17.0, 179.5, 16000.0)
+        grid.add('Emil', -17.2, -179.5, 15990.0)
+
+        summary = grid.summary()
+        self.assertEqual(summary['count'], 5)
+        self.assertEqual(sorted(cell[2] for cell in summary['heatmap']), [1, 1, 1, 2])
+
+        europe, pacific = summary['clusters']
+        self.assertEqual((europe['count'], europe['closest']['name']), (3, 'Anna'))
+        self.assertEqual((pacific['count'], pacific['closest']['name']), (2, 'Emil'))
+        self.assertGreater(abs(pacific['lon']), 179)
+        self.assertEqual([guess['name'] for guess in summary['closest']], ['Anna', 'Ben'])
+
+
+class GuessSummaryTest(TestCase):
+    """Die Zusammenfassung kommt aus dem laufend gepflegten Index; von den Antworten wird nur die Anzahl gelesen."""
+
+    def setUp(self):
+        user = User.objects.create_user('host', password='pw')
+        self.quiz = WhereQuiz.objects.create(creator=user)
+        self.question = WhereQuestion.objects.create(
+            question_text='Brandenburger Tor', correct_latitude=52.5163, correct_longitude=13.3777, created_by=user,
+        )
+        self.addCleanup(discard_quiz, self.quiz.id)
+
+    def answer(self, name, lat, lon):
+        participant = WhereParticipant.objects.create(quiz=self.quiz, name=name)
+        return WhereAnswer.objects.create(
+            quiz=self.quiz, participant=participant, question=self.question, user_latitude=lat, user_longitude=lon,
+        )
+
+    def test_answers_feed_the_index(self):
+        """Gespeicherte Antworten landen im Index; die Auflösung zählt die Antworten nur."""
+        start_question(self.quiz.id, self.question.id)
+        self.answer('Anna', 52.52, 13.40)
+        self.answer('Ben', 48.14, 11.58)
+
+        with self.assertNumQueries(1):
+            summary = guess_summary(self.quiz.id, self.question.id)
+        self.assertEqual(summary['count'], 2)
+        self.assertEqual(summary['closest'][0]['name'], 'Anna')
+
+    def test_missing_index_is_built_from_rows(self):
+        """Ohne Index (Neustart, anderer Worker) wird er einmal aus den Antworten aufgebaut."""
+        self.answer('Anna', 52.52, 13.40)
+        with self.assertNumQueries(1):
+            summary = guess_summary(self.quiz.id, self.question.id)
+        self.assertEqual(summary['count'], 1)
+        self.assertEqual(summary['clusters'][0]['closest']['name'], 'Anna')
+
+    def test_answers_of_another_worker_are_indexed(self):
+        """Fehlen dem Index Antworten eines anderen Workers, wird er aus den Zeilen neu aufgebaut."""
+        start_question(self.quiz.id, self.question.id)
+        self.answer('Anna', 52.52, 13.40)
+        # bulk_create sends no post_save, like a save on another worker
+        ben = WhereParticipant.objects.create(quiz=self.quiz, name='Ben')
+        WhereAnswer.objects.bulk_create([WhereAnswer(
+            quiz=self.quiz, participant=ben, question=self.question, user_latitude=52.5163, user_longitude=13.3777, distance_km=0.0,
+        )])
+
+        with self.assertNumQueries(2):
+            summary = guess_summary(self.quiz.id, self.question.id)
+        self.assertEqual(summary['count'], 2)
+        self.assertEqual(summary['closest'][0]['name'], 'Ben')
@@ -1,5 +1,6 @@
 from django.db import models
 from games_website.models import SyncBase
+from games_hub.permutations import shuffle_order
 from django.contrib.auth.models import User
 from django.utils import timezone
 import random
@@ -132,46 +133,19 @@ class WhoQuestion(SyncBase):
         return int(accuracy * self.get_total_possible_points())
     
     def get_randomized_people(self, room_code=None):
-        """Return people shuffled for gameplay"""
-        import random
-        
-        # Create a deterministic seed based on question ID and room code
-        seed_string = f"{self.id}_{room_code or 'default'}"
-        seed = abs(hash(seed_string)) % (2**32)
-        
-        # Save the current random state
-        random_state = random.getstate()
-        
-        try:
-            # Set our deterministic seed
-            random.seed(seed)
-            
-            # Create a copy of people with original indices
-            people_with_indices = [(i, person) for i, person in enumerate(self.people)]
-            
-            # Shuffle the people deterministically
-            shuffled_people = people_with_indices.copy()
-            random.shuffle(shuffled_people)
-            
-            # Create mapping from shuffled position to original index
-            position_to_original = {}
-            shuffled_people_formatted = []
-            
-            for new_pos, (original_idx, person) in enumerate(shuffled_people):
-                position_to_original[new_pos] = original_idx
-                shuffled_people_formatted.append({
-                    'id': new_pos, 
-                    'name': person['name'],
-                    'original_index': original_idx
-                })
-            
-        finally:
-            # Always restore the previous random state
-            random.setstate(random_state)
-        
+        """Return people shuffled for gameplay
+
+        The order is the same for the whole room, in every worker (see
+        games_hub/permutations.py).
+        """
+        order = shuffle_order('who_is_lying', self.id, room_code, len(self.people))
+
         return {
-            'people': shuffled_people_formatted,
-            'position_to_original': position_to_original  # Maps shuffled position to original index
+            'people': [
+                {'id': pos, 'name': self.people[idx]['name'], 'original_index': idx}
+                for pos, idx in enumerate(order)
+            ],
+            'position_to_original': dict(enumerate(order))  # Maps shuffled position to original index
         }
     
     def __str__(self):
@@ -187,6 +161,9 @@ class WhoParticipant(SyncBase):
     questions_answered = models.IntegerField(default=0)
     last_activity = models.DateTimeField(auto_now=True)
     hub_session_code = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    hub_participant = models.ForeignKey(
+        'games_hub.HubParticipant', null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+    )
     
     class Meta:
         unique_together = ['quiz', 'name', 'hub_session_code']
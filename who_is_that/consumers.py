@@ -1,15 +1,28 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from .models import WhoThatQuiz, WhoThatParticipant, WhoThatQuestion, WhoThatAnswer
+from games_hub.guard import GuardMixin
+from games_hub.logs import bind_log_context
+from games_hub.metrics import MetricsMixin
+from games_hub.prefetch import PrefetchMixin, asset_url
+from games_hub.presence import PresenceMixin
+from games_hub.profiling import ProfilingMixin
+from games_hub.replay import ResumableRoomMixin
+from games_hub.tokens import participant_lookup
+from games_hub.wire import BinaryProtocolMixin
 from games_hub.models import HubGameStep
 
+logger = logging.getLogger(__name__)
 
-class WhoThatConsumer(AsyncWebsocketConsumer):
+
+class WhoThatConsumer(MetricsMixin, GuardMixin, ProfilingMixin, PresenceMixin, ResumableRoomMixin, PrefetchMixin, BinaryProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_code = self.scope['url_route']['kwargs']['room_code']
         self.room_group_name = f'who_that_{self.room_code}'
+        bind_log_context(room=self.room_code)
 
         # Join room group
         await self.channel_layer.group_add(
@@ -24,6 +37,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
             'type': 'connection_established',
             'message': 'Connected to Who is That quiz session'
         }))
+        await self.join_prefetch_staff()
 
     async def disconnect(self, close_code):
         # Leave room group
@@ -31,6 +45,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             self.channel_name
         )
+        await self.leave_prefetch_staff()
 
     # Receive message from WebSocket
     async def receive(self, text_data):
@@ -38,7 +53,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get('type')
 
-            print("Who_is_that Consumer: ", message_type)
+            logger.debug('Received %s', message_type)
             if message_type == 'admin_start_quiz':
                 await self.handle_admin_start_quiz(text_data_json)
             elif message_type == 'admin_send_question':
@@ -51,6 +66,8 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
                 await self.handle_participant_submit_answer(text_data_json)
             elif message_type == 'participant_join':
                 await self.handle_participant_join(text_data_json)
+            elif message_type == 'prefetch_ready':
+                await self.handle_prefetch_ready(text_data_json)
             elif message_type == 'ping':
                 await self.handle_ping()
 
@@ -65,15 +82,16 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
         quiz = await self.get_quiz()
         if quiz:
             await self.start_quiz_db(quiz.id)
+            self.reset_prefetch()
 
             # Broadcast to all participants
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_started',
                     'message': 'Who is That Quiz has started!'
                 }
             )
+            await self.announce_prefetch(quiz, None)
 
     async def handle_admin_send_question(self, data):
         """Handle admin sending a new question"""
@@ -111,6 +129,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
 
         # Update quiz with new question
         await self.update_quiz_question(quiz, question)
+        self.question_asked(question.id)
 
         # Get question data
         question_data = await self.get_question_data(question)
@@ -119,8 +138,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
         effective_time_limit = custom_time_limit if custom_time_limit is not None else question.time_limit
 
         # Broadcast new question to all participants
-        await self.channel_layer.group_send(
-            self.room_group_name,
+        await self.room_send(
             {
                 'type': 'question_started',
                 'question': {
@@ -144,8 +162,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
 
             await self.clear_current_question(quiz.id)
 
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'question_ended',
                     'message': 'Time\'s up!',
@@ -153,16 +170,19 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
                 }
             )
 
+            # Phones load the next question's image during the reveal
+            await self.announce_prefetch(quiz, quiz.current_question_id)
+
     async def handle_admin_end_quiz(self, data):
         """Handle admin ending the quiz"""
         quiz = await self.get_quiz()
         if quiz:
             await self.end_quiz_db(quiz.id)
+            self.reset_prefetch()
             # Collect final scores
             final_scores = await self.get_final_scores()
 
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'quiz_ended',
                     'message': 'Who is That Quiz has ended. Thank you for participating!',
@@ -207,8 +227,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
             }))
 
             # Broadcast to admin dashboard (live answers)
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_answered',
                     'answer': {
@@ -230,11 +249,16 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
         participant = await self.get_participant_by_name(participant_name, hub_session)
 
         if participant:
-            await self.mark_participant_active(participant['id'])
+            self.join_presence(WhoThatParticipant, participant['id'], self.room_group_name, hub_session)
+
+        # Reconnects replay missed room events from memory when possible; the
+        # socket joins presence first so a resumed player still counts
+        if await self.resume(data):
+            return
 
+        if participant:
             # Broadcast to admin
-            await self.channel_layer.group_send(
-                self.room_group_name,
+            await self.room_send(
                 {
                     'type': 'participant_joined',
                     'participant': {
@@ -251,6 +275,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
                     'type': 'quiz_started',
                     'message': 'Quiz is already in progress'
                 }))
+                await self.send_pending_prefetch()
 
     async def handle_ping(self):
         """Handle ping for keeping connection alive"""
@@ -338,7 +363,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
     def get_participant_by_name(self, participant_name, hub_session):
         try:
             quiz = WhoThatQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session))
             return {
                 'id': participant.id,
                 'name': participant.name,
@@ -392,14 +417,14 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
                 'correct_answer': quiz.current_question.correct_answer,
                 'alternative_answers': quiz.current_question.alternative_answers,
                 'explanation': quiz.current_question.explanation,
-                'image_url': quiz.current_question.image.url if quiz.current_question.image else None
+                'image_url': asset_url(quiz.current_question.image)
             }
         return None
 
     @database_sync_to_async
     def get_question_data(self, question):
         return {
-            'image_url': question.image.url if question.image else None,
+            'image_url': asset_url(question.image),
             'points': question.points
         }
 
@@ -407,7 +432,7 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
     def save_participant_answer(self, participant_name, hub_session_code, user_answer, time_taken):
         try:
             quiz = WhoThatQuiz.objects.get(room_code=self.room_code)
-            participant = quiz.participants.get(name=participant_name, hub_session_code=hub_session_code)
+            participant = quiz.participants.get(**participant_lookup(self.scope, quiz, participant_name, hub_session_code))
 
             if not quiz.current_question:
                 return None
@@ -446,16 +471,6 @@ class WhoThatConsumer(AsyncWebsocketConsumer):
         except (WhoThatQuiz.DoesNotExist, WhoThatParticipant.DoesNotExist):
             return None
 
-    @database_sync_to_async
-    def mark_participant_active(self, participant_id):
-        try:
-            participant = WhoThatParticipant.objects.get(id=participant_id)
-            participant.is_active = True
-            participant.last_activity = timezone.now()
-            participant.save()
-        except WhoThatParticipant.DoesNotExist:
-            pass
-
     @database_sync_to_async
     def get_final_scores(self):
         try: